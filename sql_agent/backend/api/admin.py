@@ -14,9 +14,12 @@ from ..models.system import (
     SystemStatsResponse, 
     PaginatedSystemLogs,
     LogFilterParams,
-    UserActivityStatsResponse
+    UserActivityStatsResponse,
+    PaginatedSlowQueryLogs,
+    SlowQueryLogDetailResponse
 )
 from ..services.system_monitoring_service import SystemMonitoringService
+from ..llm.rate_limiter import get_provider_limiter_stats
 
 bearer_scheme = HTTPBearer()
 
@@ -207,4 +210,205 @@ async def get_performance_metrics(
         "datasets": [
             {"label": "Response Time", "data": [0.5, 0.6]}
         ]
-    }
\ No newline at end of file
+    }
+
+@router.post("/metrics/snapshot")
+async def record_metrics_snapshot(
+    current_user: UserResponse = Depends(get_current_admin_user),
+    db: Session = Depends(get_sync_db)
+):
+    """
+    캐시 및 LLM 통계 스냅샷 기록 (관리자 전용)
+    
+    현재 통계를 시스템 메트릭으로 기록하고 기록한 통계를 반환합니다.
+    통계 조회(GET) 엔드포인트는 메트릭을 기록하지 않으므로 주기적인 기록에는 이 엔드포인트를 사용합니다.
+    """
+    return {
+        "validation_cache": SystemMonitoringService.record_validation_cache_metrics(db),
+        "nl_sql_cache": SystemMonitoringService.record_nl_sql_cache_metrics(db),
+        "embedding_cache": SystemMonitoringService.record_embedding_cache_metrics(db),
+        "llm_hedging": SystemMonitoringService.record_llm_hedging_metrics(db),
+        "model_routing": SystemMonitoringService.record_model_routing_metrics(db)
+    }
+
+@router.get("/validation-cache/stats")
+async def get_validation_cache_stats(
+    current_user: UserResponse = Depends(get_current_admin_user)
+):
+    """
+    SQL 검증 캐시 통계 조회 (관리자 전용)
+    
+    검증 결과 캐시의 적중률, 크기, 무효화 횟수를 반환합니다.
+    """
+    return SystemMonitoringService.get_validation_cache_stats()
+
+@router.get("/nl-sql-cache/stats")
+async def get_nl_sql_cache_stats(
+    current_user: UserResponse = Depends(get_current_admin_user)
+):
+    """
+    자연어-SQL 변환 캐시 통계 조회 (관리자 전용)
+    
+    변환 결과 캐시의 정확 일치/의미 일치 적중 횟수, 적중률, 크기, 만료 및 무효화 횟수를 반환합니다.
+    """
+    return SystemMonitoringService.get_nl_sql_cache_stats()
+
+@router.get("/embedding-cache/stats")
+async def get_embedding_cache_stats(
+    current_user: UserResponse = Depends(get_current_admin_user)
+):
+    """
+    임베딩 캐시 통계 조회 (관리자 전용)
+    
+    인덱싱 시 재사용된 임베딩의 적중률, 저장 횟수, 모델별 항목 수를 반환합니다.
+    """
+    return SystemMonitoringService.get_embedding_cache_stats()
+
+@router.get("/llm-limits/stats")
+async def get_llm_limit_stats(
+    current_user: UserResponse = Depends(get_current_admin_user)
+):
+    """
+    LLM 제공자 요청 제한 통계 조회 (관리자 전용)
+    
+    제공자/모델별 동시 호출 수, 대기 수, 재시도 및 속도 제한(429) 횟수, 우선순위별 평균 대기 시간을 반환합니다.
+    """
+    return get_provider_limiter_stats()
+
+@router.get("/llm-hedging/stats")
+async def get_llm_hedging_stats(
+    current_user: UserResponse = Depends(get_current_admin_user)
+):
+    """
+    LLM 헤지 요청 통계 조회 (관리자 전용)
+    
+    헤지 요청 비율, 헤지 요청이 먼저 응답한 횟수와 그로 줄인 예상 지연 시간,
+    대체 모델 사용 및 마감 시간 초과 횟수, 모델별 지연 시간 백분위수를 반환합니다.
+    """
+    return SystemMonitoringService.get_llm_hedging_stats()
+
+@router.get("/model-routing/stats")
+async def get_model_routing_stats(
+    current_user: UserResponse = Depends(get_current_admin_user)
+):
+    """
+    모델 라우팅 통계 조회 (관리자 전용)
+    
+    경로(빠른 모델, 대형 모델, 승격)별 호출 수와 평균 지연 시간, 빠른 모델의 성공률과
+    검증 실패/호출 실패/실행 실패 횟수를 반환합니다.
+    """
+    return SystemMonitoringService.get_model_routing_stats()
+
+@router.get("/query-stats")
+async def get_query_workload_stats(
+    sort_by: str = Query("total_time", regex="^(total_time|mean_time|max_time|calls|errors|rows|last_seen)$", description="정렬 기준"),
+    limit: int = Query(50, ge=1, le=500, description="반환할 최대 쿼리 유형 수"),
+    db_id: Optional[str] = Query(None, description="데이터베이스 ID 필터"),
+    current_user: UserResponse = Depends(get_current_admin_user),
+    db: Session = Depends(get_sync_db)
+):
+    """
+    쿼리 유형별 워크로드 통계 조회 (관리자 전용)
+    
+    리터럴을 제거하고 정규화한 쿼리 지문(fingerprint)별로 호출 수, 총/평균/p95 실행 시간,
+    반환 행 수, 오류 수, 캐시 적중 수를 반환합니다.
+    
+    - **sort_by**: 정렬 기준 (기본값: 총 실행 시간)
+    - **limit**: 반환할 최대 쿼리 유형 수
+    - **db_id**: 데이터베이스 ID 필터 (선택 사항)
+    """
+    return SystemMonitoringService.get_query_workload_stats(
+        db=db,
+        sort_by=sort_by,
+        limit=limit,
+        db_id=db_id
+    )
+
+@router.get("/query-phases")
+async def get_query_phase_stats(
+    days: int = Query(7, ge=1, le=90, description="조회할 일수"),
+    db_id: Optional[str] = Query(None, description="데이터베이스 ID 필터"),
+    current_user: UserResponse = Depends(get_current_admin_user),
+    db: Session = Depends(get_sync_db)
+):
+    """
+    쿼리 처리 단계별 지연 시간 통계 조회 (관리자 전용)
+    
+    스키마 조회, RAG 검색, LLM 생성, 검증, 방언 변환, 대기, 연결 획득, 서버 실행,
+    결과 가져오기, 저장, 요약 단계별 호출 수, 평균, p50/p90/p95/p99, 최대 시간(ms)을 반환합니다.
+    
+    - **days**: 조회할 일수 (1-90)
+    - **db_id**: 데이터베이스 ID 필터 (선택 사항)
+    """
+    return SystemMonitoringService.get_query_phase_stats(
+        db=db,
+        days=days,
+        db_id=db_id
+    )
+
+@router.get("/slow-queries", response_model=PaginatedSlowQueryLogs)
+async def get_slow_queries(
+    page: int = Query(1, ge=1, description="페이지 번호"),
+    page_size: int = Query(50, ge=1, le=100, description="페이지당 항목 수"),
+    db_id: Optional[str] = Query(None, description="데이터베이스 ID 필터"),
+    user_id: Optional[str] = Query(None, description="사용자 ID 필터"),
+    min_duration_ms: Optional[float] = Query(None, ge=0, description="최소 실행 시간(ms)"),
+    current_user: UserResponse = Depends(get_current_admin_user),
+    db: Session = Depends(get_sync_db)
+):
+    """
+    느린 쿼리 로그 조회 (관리자 전용)
+    
+    임계값을 초과한 쿼리를 최신순으로 조회합니다. 실행 계획은 상세 조회에서 반환됩니다.
+    
+    - **page**: 페이지 번호
+    - **page_size**: 페이지당 항목 수
+    - **db_id**: 데이터베이스 ID 필터
+    - **user_id**: 사용자 ID 필터
+    - **min_duration_ms**: 최소 실행 시간(ms) 필터
+    """
+    return SystemMonitoringService.get_paginated_slow_queries(
+        db=db,
+        page=page,
+        page_size=page_size,
+        db_id=db_id,
+        user_id=user_id,
+        min_duration_ms=min_duration_ms
+    )
+
+@router.get("/slow-queries/{entry_id}", response_model=SlowQueryLogDetailResponse)
+async def get_slow_query(
+    entry_id: str = Path(..., description="느린 쿼리 로그 항목 ID"),
+    current_user: UserResponse = Depends(get_current_admin_user),
+    db: Session = Depends(get_sync_db)
+):
+    """
+    느린 쿼리 상세 조회 (관리자 전용)
+    
+    SQL, 단계별 실행 시간과 서버 실행 계획(MS-SQL showplan XML, SAP HANA 계획 연산자)을 반환합니다.
+    """
+    entry = SystemMonitoringService.get_slow_query_detail(db, entry_id)
+    if not entry:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="느린 쿼리 로그 항목을 찾을 수 없습니다."
+        )
+    
+    return entry
+
+@router.delete("/slow-queries")
+async def purge_slow_queries(
+    retention_days: Optional[int] = Query(None, ge=0, le=3650, description="보존 기간(일), 기본값은 설정값"),
+    current_user: UserResponse = Depends(get_current_admin_user),
+    db: Session = Depends(get_sync_db)
+):
+    """
+    느린 쿼리 로그 정리 (관리자 전용)
+    
+    보존 기간이 지났거나 최대 항목 수를 초과한 느린 쿼리 로그를 삭제합니다.
+    
+    - **retention_days**: 보존 기간(일), 지정하지 않으면 설정된 기본값을 사용합니다
+    """
+    deleted = SystemMonitoringService.purge_slow_queries(db, retention_days=retention_days)
+    
+    return {"status": "success", "deleted": deleted}
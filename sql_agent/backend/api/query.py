@@ -1,19 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Request
-from typing import Dict, Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Request, Query
+from typing import Dict, Any, List, Optional, Tuple
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 from datetime import datetime
 
 from ..services.query_service import QueryService
 from ..services.query_execution_service import QueryExecutionService
 from ..llm.nl_to_sql_service import NLToSQLService
-from ..llm.factory import get_llm_service
+from ..llm.factory import get_llm_service, get_embedding_service
+from ..llm.schema_selector import SchemaSelector
+from ..llm.embedding_pipeline import EmbeddingPipeline
+from ..llm.embedding_cache import embedding_cache
+from ..llm.rate_limiter import configure_provider_limits
+from ..llm.hedging import configure_hedging
+from ..llm.model_router import get_model_router
 from ..rag.rag_service import RagService
 from ..services.database import DatabaseService
+from ..services.policy_service import PolicyService
 from ..models.query import QueryStatus, QueryCreate, QueryUpdate
 from ..db.crud.query import create_query, update_query, get_query_by_id
 from ..core.auth import get_current_user, get_current_user_id
+from ..core.dependencies import get_db
+from ..core.config import settings
+from ..utils.query_timing import PhaseTimer
+from ..utils.deadline import DeadlineExceededError, deadline_scope
+from ..utils.sse import sse_response
+from ..utils.sql_fingerprint import sql_fingerprint
 
 router = APIRouter(
     prefix="/query",
@@ -28,11 +42,26 @@ class NaturalLanguageQuery(BaseModel):
     db_id: str
     use_rag: bool = False
     conversation_id: Optional[str] = None
+    speculative: bool = Field(False, description="Whether to start a row-limited preview of the generated SQL while it is reviewed")
+    timeout_seconds: Optional[float] = Field(None, gt=0, description="Deadline for generating the SQL (defaults to NL_QUERY_DEADLINE_SECONDS)")
 
 class SQLQuery(BaseModel):
     sql: str
     db_id: str
     query_id: Optional[str] = None
+    preview: bool = Field(False, description="Whether to run an approximate preview on a sample of the table")
+    sample_percent: Optional[float] = Field(None, gt=0, lt=100, description="Sample size of the preview in percent")
+    sample_table: Optional[str] = Field(None, description="Table sampled by the preview (defaults to the first table of the FROM clause)")
+
+class BatchStatement(BaseModel):
+    sql: str
+    label: Optional[str] = None
+
+class BatchSQLQuery(BaseModel):
+    db_id: str
+    statements: List[BatchStatement] = Field(..., min_length=1, max_length=50)
+    max_concurrency: Optional[int] = Field(None, ge=1, description="Maximum number of statements running at once")
+    wait: bool = Field(False, description="Whether to wait for all statements and return their results")
 
 class SQLModification(BaseModel):
     sql: str
@@ -48,92 +77,307 @@ class RagQuery(BaseModel):
 # Service instances
 query_service = QueryService()
 query_execution_service = QueryExecutionService()
-llm_service = get_llm_service()
+# 모든 LLM 호출에 적용할 제공자/모델별 요청 제한
+configure_provider_limits(
+    requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+    tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    max_retries=settings.LLM_MAX_RETRIES
+)
+# 지연 시간에 민감한 호출은 응답이 늦어지면 헤지 요청을 보내고, 마감 시간이 임박하면 대체 모델 사용
+configure_hedging(
+    fallback_model=settings.LLM_FALLBACK_MODEL,
+    hedge_percentile=settings.LLM_HEDGE_PERCENTILE,
+    max_hedge_ratio=settings.LLM_HEDGE_MAX_RATIO
+)
+# replay 제공자는 카세트 파일의 녹화 응답을 재생 (record 모드에서는 실제 제공자의 응답을 녹화)
+llm_options = settings.llm_provider_options(settings.LLM_PROVIDER)
+llm_service = get_llm_service(settings.LLM_PROVIDER, settings.OPENAI_MODEL, **llm_options)
 nl_to_sql_service = NLToSQLService(llm_service)
-rag_service = RagService(llm_service)
+# RAG 문서/질의 임베딩 제공자 (local이면 네트워크 없이 인덱싱과 검색 가능)
+embedding_service = get_embedding_service(
+    settings.EMBEDDING_PROVIDER,
+    embedding_dimension=settings.EMBEDDING_DIMENSION,
+    **settings.llm_provider_options(settings.EMBEDDING_PROVIDER)
+)
+rag_service = RagService(llm_service, embedding_service=embedding_service)
+# SQL 생성 프롬프트에는 RAG 인덱스로 고른 관련 테이블만 포함
+llm_service.schema_selector = SchemaSelector(
+    document_store=rag_service.document_store,
+    top_k=settings.SCHEMA_CONTEXT_TOP_K,
+    max_tokens=settings.SCHEMA_CONTEXT_MAX_TOKENS,
+    fk_depth=settings.SCHEMA_CONTEXT_FK_DEPTH
+)
+# 단순한 SQL 생성 요청은 빠른 모델로 처리하고 검증/실행 실패 시에만 대형 모델로 승격
+if settings.LLM_ROUTING_ENABLED and settings.LLM_FAST_MODEL != settings.OPENAI_MODEL:
+    fast_llm_service = get_llm_service(settings.LLM_PROVIDER, settings.LLM_FAST_MODEL, **llm_options)
+    fast_llm_service.schema_selector = llm_service.schema_selector
+    nl_to_sql_service.model_router = get_model_router(
+        fast_llm_service,
+        llm_service,
+        selector=llm_service.schema_selector,
+        max_simple_tables=settings.LLM_ROUTING_MAX_SIMPLE_TABLES,
+        max_simple_join_hints=settings.LLM_ROUTING_MAX_SIMPLE_JOIN_HINTS,
+        max_simple_conversation_depth=settings.LLM_ROUTING_MAX_CONVERSATION_DEPTH
+    )
+# 스키마 인덱싱 임베딩은 토큰 수 기준 배치로 묶어 동시에 생성하고, 내용이 같은 텍스트는 캐시에서 재사용
+rag_service.document_indexer.embedding_pipeline = EmbeddingPipeline(
+    embedding_service,
+    max_batch_tokens=settings.EMBEDDING_BATCH_MAX_TOKENS,
+    max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+    max_concurrency=settings.EMBEDDING_MAX_CONCURRENCY,
+    requests_per_minute=settings.EMBEDDING_REQUESTS_PER_MINUTE,
+    tokens_per_minute=settings.EMBEDDING_TOKENS_PER_MINUTE,
+    cache=embedding_cache
+)
+# 변환 캐시의 의미 일치 조회도 같은 임베딩 서비스와 임베딩 캐시로 질문 임베딩 생성
+nl_to_sql_service.embedding_pipeline = rag_service.document_indexer.embedding_pipeline
 db_service = DatabaseService()
 
+async def _load_schema(db_id: str, timer: PhaseTimer) -> Tuple[Dict[str, Any], str]:
+    """
+    데이터베이스 스키마 정보와 데이터베이스 유형 조회
+    
+    Raises:
+        HTTPException: 데이터베이스나 스키마 정보가 없는 경우 (404)
+    """
+    with timer.phase("schema_fetch"):
+        db_schema = await db_service.get_database_schema(db_id)
+    if not db_schema:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Database with ID {db_id} not found or schema not available"
+        )
+    
+    with timer.phase("schema_fetch"):
+        db_info = await db_service.get_database_by_id(db_id)
+    db_type = db_info.get("type", "mssql")  # 기본값은 mssql
+    
+    return db_schema, db_type
+
+async def _save_generated_query(
+    query: NaturalLanguageQuery,
+    user_id: str,
+    result: Dict[str, Any],
+    timer: PhaseTimer,
+    token: str,
+    db: AsyncSession
+) -> Dict[str, Any]:
+    """
+    생성된 SQL을 쿼리로 저장하고 (요청 시) 투기적 미리보기를 시작한 뒤 응답 생성
+    """
+    # 쿼리 ID 생성 및 저장
+    query_id = str(uuid.uuid4())
+    
+    # 쿼리 생성 및 저장
+    query_data = QueryCreate(
+        user_id=user_id,
+        db_id=query.db_id,
+        natural_language=query.query,
+        generated_sql=result["sql"],
+        phase_timings=timer.timings,
+        # 수정/재작성으로 generated_sql이 바뀌어도 피드백이 실제 제공된 (캐시된) 답변을 무효화하도록 지문 기록
+        answer_fingerprint=sql_fingerprint(result["sql"])
+    )
+    
+    created_query = await create_query(query_data)
+    
+    # 검토 시간 동안 생성된 SQL 미리 실행 (선택 사항)
+    speculative_preview = False
+    if query.speculative:
+        try:
+            user = await get_current_user(token)
+            limit_settings = await PolicyService.get_effective_query_limit_settings(db=db, role=user["role"])
+        except Exception:
+            limit_settings = None
+        speculative_preview = await query_execution_service.start_speculative_preview(
+            user_id=user_id,
+            db_id=query.db_id,
+            sql=result["sql"],
+            query_id=created_query.id,
+            limit_settings=limit_settings
+        )
+    
+    # 응답 생성
+    response = {
+        "query_id": created_query.id,
+        "natural_language": query.query,
+        "generated_sql": result["sql"],
+        "db_id": query.db_id,
+        "confidence": result.get("confidence", 0.9),
+        "explanation": result.get("explanation", ""),
+        "conversation_id": result.get("conversation_id", query.conversation_id),
+        "status": QueryStatus.PENDING.value,
+        "phase_timings": timer.timings,
+        "speculative_preview": speculative_preview,
+        "created_at": datetime.utcnow().isoformat()
+    }
+    
+    return response
+
 @router.post("/natural")
 async def process_natural_language_query(
     query: NaturalLanguageQuery, 
     request: Request,
-    token: str = Depends(oauth2_scheme)
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     자연어 질의를 SQL로 변환
     
     이 엔드포인트는 자연어 질의를 받아 해당 데이터베이스에 맞는 SQL 쿼리로 변환합니다.
     use_rag 파라미터가 True인 경우, RAG 시스템을 사용하여 응답을 생성합니다.
+    speculative 파라미터가 True이면 사용자가 SQL을 검토하는 동안 읽기 전용 쿼리를 행 수를 제한해
+    낮은 우선순위로 미리 실행합니다. 수정 없이 /execute로 실행하면 미리 실행한 결과를 그대로 사용합니다.
+    timeout_seconds(기본값: NL_QUERY_DEADLINE_SECONDS) 안에 SQL을 생성하지 못하면 504를 반환합니다.
     """
     try:
         # 현재 사용자 ID 가져오기
         user_id = await get_current_user_id(token)
         
-        # RAG 시스템 사용 여부에 따라 처리
-        if query.use_rag:
-            # RAG 시스템을 통한 응답 생성
-            rag_query = RagQuery(
-                query=query.query,
-                db_id=query.db_id,
-                conversation_id=query.conversation_id
-            )
-            return await process_rag_query(rag_query, token)
-        
-        # 데이터베이스 스키마 정보 가져오기
-        db_schema = await db_service.get_database_schema(query.db_id)
-        if not db_schema:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Database with ID {query.db_id} not found or schema not available"
-            )
-        
-        # 데이터베이스 유형 가져오기
-        db_info = await db_service.get_database_by_id(query.db_id)
-        db_type = db_info.get("type", "mssql")  # 기본값은 mssql
-        
-        # 자연어를 SQL로 변환
-        result = await nl_to_sql_service.convert_nl_to_sql(
-            user_id=user_id,
-            natural_language=query.query,
-            schema=db_schema,
-            db_type=db_type,
-            conversation_id=query.conversation_id
-        )
-        
-        # 쿼리 ID 생성 및 저장
-        query_id = str(uuid.uuid4())
-        
-        # 쿼리 생성 및 저장
-        query_data = QueryCreate(
-            user_id=user_id,
-            db_id=query.db_id,
-            natural_language=query.query,
-            generated_sql=result["sql"]
-        )
-        
-        created_query = await create_query(query_data)
-        
-        # 응답 생성
-        response = {
-            "query_id": created_query.id,
-            "natural_language": query.query,
-            "generated_sql": result["sql"],
-            "db_id": query.db_id,
-            "confidence": result.get("confidence", 0.9),
-            "explanation": result.get("explanation", ""),
-            "conversation_id": result.get("conversation_id", query.conversation_id),
-            "status": QueryStatus.PENDING.value,
-            "created_at": datetime.utcnow().isoformat()
-        }
+        # 요청 마감 시간 (LLM 호출에 전달되어 남은 시간에 따라 대체 모델 사용, 초과 시 진행 중인 호출 취소)
+        with deadline_scope(query.timeout_seconds or settings.NL_QUERY_DEADLINE_SECONDS):
+            # RAG 시스템 사용 여부에 따라 처리
+            if query.use_rag:
+                # RAG 시스템을 통한 응답 생성
+                rag_query = RagQuery(
+                    query=query.query,
+                    db_id=query.db_id,
+                    conversation_id=query.conversation_id
+                )
+                return await process_rag_query(rag_query, token)
+            
+            # 단계별 처리 시간 측정
+            timer = PhaseTimer()
+            
+            # 데이터베이스 스키마 정보 및 유형 가져오기
+            db_schema, db_type = await _load_schema(query.db_id, timer)
+            
+            # 자연어를 SQL로 변환
+            with timer.phase("llm_generation"):
+                result = await nl_to_sql_service.convert_nl_to_sql(
+                    user_id=user_id,
+                    natural_language=query.query,
+                    schema=db_schema,
+                    db_type=db_type,
+                    conversation_id=query.conversation_id,
+                    db_id=query.db_id
+                )
+        
+        # 쿼리 저장 및 응답 생성
+        response = await _save_generated_query(query, user_id, result, timer, token, db)
         
         return response
         
+    except DeadlineExceededError as e:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"Natural language query deadline exceeded: {str(e)}"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing natural language query: {str(e)}"
         )
 
+@router.post("/natural/stream")
+async def stream_natural_language_query(
+    query: NaturalLanguageQuery,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    자연어 질의를 SQL로 변환 (SSE 스트리밍)
+    
+    /natural과 같은 변환을 수행하되 모델이 생성하는 토큰을 Server-Sent Events로 즉시 전달합니다.
+    이벤트 순서: token* → sql (SQL 코드 블록이 닫힌 직후) → token* (설명) / validation (설명 생성 중 완료되는 SQL 검증)
+    → result (/natural과 같은 응답 본문). 오류는 error 이벤트로 전달됩니다.
+    use_rag가 True이면 /rag/stream과 같은 이벤트를 전달합니다.
+    timeout_seconds(기본값: NL_QUERY_DEADLINE_SECONDS) 안에 SQL 생성을 마치지 못하면 error 이벤트를 전달합니다.
+    """
+    user_id = await get_current_user_id(token)
+    
+    if query.use_rag:
+        rag_query = RagQuery(
+            query=query.query,
+            db_id=query.db_id,
+            conversation_id=query.conversation_id
+        )
+        return sse_response(_rag_events(rag_query))
+    
+    # 요청 마감 시간 (스키마 조회부터 적용되며, 스트림 생성기에서 남은 시간으로 다시 설정)
+    with deadline_scope(query.timeout_seconds or settings.NL_QUERY_DEADLINE_SECONDS) as deadline:
+        timer = PhaseTimer()
+        db_schema, db_type = await _load_schema(query.db_id, timer)
+    
+    async def events():
+        result = None
+        # 스트림은 핸들러가 반환된 뒤 소비되므로 생성기 안에서 마감 시간을 적용
+        with deadline_scope(deadline.remaining()):
+            with timer.phase("llm_generation"):
+                async for event in nl_to_sql_service.stream_nl_to_sql(
+                    user_id=user_id,
+                    natural_language=query.query,
+                    schema=db_schema,
+                    db_type=db_type,
+                    conversation_id=query.conversation_id,
+                    db_id=query.db_id
+                ):
+                    if event["event"] == "done":
+                        result = event
+                    else:
+                        yield event
+        
+        response = await _save_generated_query(query, user_id, result, timer, token, db)
+        yield {"event": "result", **response}
+    
+    return sse_response(events())
+
+def _serialize_sources(sources: List[Any]) -> List[Dict[str, Any]]:
+    """
+    RAG 검색 결과를 응답 형식으로 변환
+    """
+    return [
+        {
+            "document_id": source.document.id,
+            "document_type": source.document.doc_type,
+            "score": source.score,
+            "metadata": source.document.metadata
+        }
+        for source in sources
+    ]
+
+async def _rag_events(query: RagQuery):
+    """
+    RAG 응답 스트리밍 이벤트 생성 (sources → token* → citations → result)
+    """
+    timer = PhaseTimer()
+    with timer.activate():
+        async for event in rag_service.stream_response_async(
+            db_id=query.db_id,
+            query=query.query,
+            top_k=query.top_k,
+            include_citations=query.include_citations
+        ):
+            if event["event"] == "sources":
+                yield {"event": "sources", "sources": _serialize_sources(event["sources"])}
+            elif event["event"] == "done":
+                rag_response = event["response"]
+            else:
+                yield event
+    
+    yield {
+        "event": "result",
+        "query_id": str(uuid.uuid4()),
+        "natural_language": query.query,
+        "db_id": query.db_id,
+        "response": rag_response.response,
+        "sources": _serialize_sources(rag_response.sources),
+        "conversation_id": query.conversation_id,
+        "phase_timings": timer.timings,
+        "created_at": datetime.utcnow().isoformat()
+    }
+
 @router.post("/rag")
 async def process_rag_query(
     query: RagQuery,
@@ -149,13 +393,15 @@ async def process_rag_query(
         # 현재 사용자 ID 가져오기
         user_id = await get_current_user_id(token)
         
-        # RAG 응답 생성
-        rag_response = await rag_service.generate_response_async(
-            db_id=query.db_id,
-            query=query.query,
-            top_k=query.top_k,
-            include_citations=query.include_citations
-        )
+        # RAG 응답 생성 (검색 및 생성 단계 시간은 타이머에 기록됨)
+        timer = PhaseTimer()
+        with timer.activate():
+            rag_response = await rag_service.generate_response_async(
+                db_id=query.db_id,
+                query=query.query,
+                top_k=query.top_k,
+                include_citations=query.include_citations
+            )
         
         # 쿼리 ID 생성
         query_id = str(uuid.uuid4())
@@ -166,16 +412,9 @@ async def process_rag_query(
             "natural_language": query.query,
             "db_id": query.db_id,
             "response": rag_response.response,
-            "sources": [
-                {
-                    "document_id": source.document.id,
-                    "document_type": source.document.doc_type,
-                    "score": source.score,
-                    "metadata": source.document.metadata
-                }
-                for source in rag_response.sources
-            ],
+            "sources": _serialize_sources(rag_response.sources),
             "conversation_id": query.conversation_id,
+            "phase_timings": timer.timings,
             "created_at": datetime.utcnow().isoformat()
         }
         
@@ -187,6 +426,20 @@ async def process_rag_query(
             detail=f"Error processing RAG query: {str(e)}"
         )
 
+@router.post("/rag/stream")
+async def stream_rag_query(
+    query: RagQuery,
+    token: str = Depends(oauth2_scheme)
+):
+    """
+    RAG 시스템을 사용하여 자연어 질의에 대한 응답 생성 (SSE 스트리밍)
+    
+    검색이 끝나면 sources 이벤트를, 모델이 답변을 작성하는 동안 token 이벤트를 전달하고,
+    출처 목록(citations)과 /rag와 같은 응답 본문(result)으로 끝납니다.
+    """
+    await get_current_user_id(token)
+    return sse_response(_rag_events(query))
+
 @router.post("/modify-sql")
 async def modify_sql(
     modification: SQLModification,
@@ -223,6 +476,9 @@ async def modify_sql(
         
         updated_query = await update_query(modification.query_id, query_update)
         
+        # 수정 전 SQL의 미리 실행 취소
+        query_execution_service.discard_speculative_preview(modification.query_id)
+        
         # 응답 생성
         response = {
             "query_id": updated_query.id,
@@ -241,21 +497,102 @@ async def modify_sql(
             detail=f"Error modifying SQL: {str(e)}"
         )
 
+@router.post("/fix/{query_id}")
+async def fix_failed_query(
+    query_id: str,
+    token: str = Depends(oauth2_scheme)
+) -> Dict[str, Any]:
+    """
+    실행에 실패한 생성 SQL 수정
+    
+    이 엔드포인트는 실행에 실패한 쿼리의 SQL을 실행 오류 메시지와 함께 대형 모델에 보내 수정합니다.
+    빠른 모델이 생성한 SQL이 실행에 실패한 경우 모델 라우팅 통계에 빠른 모델의 실패로 기록됩니다.
+    수정된 SQL은 쿼리에 저장되며 /execute로 다시 실행할 수 있습니다.
+    """
+    try:
+        # 현재 사용자 ID 가져오기
+        user_id = await get_current_user_id(token)
+        
+        # 쿼리 존재 여부 및 권한 확인
+        query = await get_query_by_id(query_id)
+        if not query:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Query with ID {query_id} not found"
+            )
+        if query.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to modify this query"
+            )
+        if query.status != QueryStatus.FAILED or not query.error:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Only queries that failed to execute can be fixed"
+            )
+        
+        # 실행 오류 메시지로 SQL 수정
+        timer = PhaseTimer()
+        db_schema, db_type = await _load_schema(query.db_id, timer)
+        with timer.phase("llm_generation"):
+            fixed_sql, modified = await nl_to_sql_service.fix_after_execution_error(
+                query.generated_sql, db_schema, db_type, query.error
+            )
+        
+        if modified:
+            query = await update_query(query_id, QueryUpdate(
+                generated_sql=fixed_sql,
+                status=QueryStatus.PENDING
+            ))
+            query_execution_service.discard_speculative_preview(query_id)
+        
+        return {
+            "query_id": query.id,
+            "natural_language": query.natural_language,
+            "generated_sql": query.generated_sql,
+            "db_id": query.db_id,
+            "status": query.status,
+            "modified": modified,
+            "phase_timings": timer.timings,
+            "updated_at": datetime.utcnow().isoformat()
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fixing SQL: {str(e)}"
+        )
+
 @router.post("/execute")
 async def execute_query(
     query: SQLQuery, 
-    token: str = Depends(oauth2_scheme)
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     SQL 쿼리 실행
     
     이 엔드포인트는 SQL 쿼리를 받아 지정된 데이터베이스에서 실행합니다.
     쿼리 실행은 백그라운드 작업으로 처리되며, 상태는 /status/{query_id} 엔드포인트를 통해 확인할 수 있습니다.
+    쿼리 제한 정책에 예상 비용 임계값이 설정되어 있으면 실행 전에 실행 계획으로 비용을 추정하여
+    차단하거나 낮은 우선순위로 실행합니다.
+    preview가 true이면 테이블의 표본(TABLESAMPLE)만 읽는 근사 미리보기로 실행하며, COUNT와 SUM은
+    전체 테이블 기준 추정치로 보정되고 95% 오차 범위 컬럼이 함께 반환됩니다.
+    정확한 결과는 /exact/{query_id} 엔드포인트로 실행할 수 있습니다.
     """
     try:
         # 현재 사용자 ID 가져오기
         user_id = await get_current_user_id(token)
         
+        # 사용자 역할에 적용되는 쿼리 제한 정책 조회 (실패 시 비용 검사 생략)
+        try:
+            user = await get_current_user(token)
+            limit_settings = await PolicyService.get_effective_query_limit_settings(db=db, role=user["role"])
+        except Exception:
+            limit_settings = None
+        
         # 쿼리 실행
         result = await query_execution_service.execute_query(
             user_id=user_id,
@@ -263,17 +600,174 @@ async def execute_query(
             sql=query.sql,
             query_id=query.query_id,
             timeout=300,  # 5 minutes timeout
-            max_rows=10000  # Maximum 10,000 rows
+            max_rows=10000,  # Maximum 10,000 rows
+            limit_settings=limit_settings,
+            preview=query.preview,
+            sample_percent=query.sample_percent,
+            sample_table=query.sample_table
         )
         
         return result
         
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error executing query: {str(e)}"
         )
 
+@router.post("/exact/{query_id}")
+async def execute_exact_query(
+    query_id: str,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    근사 미리보기의 정확한 쿼리 실행
+    
+    이 엔드포인트는 근사 미리보기로 실행된 쿼리의 원래 SQL을 같은 쿼리 ID로 전체 테이블에 대해 실행합니다.
+    실행이 끝나면 정확한 결과가 미리보기 결과를 대체하며, 상태는 /status/{query_id} 엔드포인트를 통해 확인할 수 있습니다.
+    """
+    try:
+        # 현재 사용자 ID 가져오기
+        user_id = await get_current_user_id(token)
+        
+        # 쿼리 존재 여부 및 사용자 권한 확인
+        stored_query = await get_query_by_id(query_id)
+        if not stored_query:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Query with ID {query_id} not found"
+            )
+        if stored_query.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to execute this query"
+            )
+        
+        # 사용자 역할에 적용되는 쿼리 제한 정책 조회 (실패 시 비용 검사 생략)
+        try:
+            user = await get_current_user(token)
+            limit_settings = await PolicyService.get_effective_query_limit_settings(db=db, role=user["role"])
+        except Exception:
+            limit_settings = None
+        
+        # 정확한 쿼리 실행
+        return await query_execution_service.execute_exact(
+            user_id=user_id,
+            query_id=query_id,
+            timeout=300,  # 5 minutes timeout
+            max_rows=10000,  # Maximum 10,000 rows
+            limit_settings=limit_settings
+        )
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error executing exact query: {str(e)}"
+        )
+
+@router.post("/execute-batch")
+async def execute_query_batch(
+    batch: BatchSQLQuery,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    여러 SQL 쿼리 일괄 실행
+    
+    이 엔드포인트는 같은 데이터베이스에 대한 여러 개의 독립적인 SQL 쿼리를 하나의 배치 ID로 동시에 실행합니다.
+    쿼리는 데이터베이스 연결 풀 크기 안에서 병렬로 실행되며, 각 쿼리는 개별 query_id로
+    /status/{query_id} 또는 /batch/{batch_id} 엔드포인트를 통해 확인할 수 있습니다.
+    wait가 true이면 모든 쿼리가 끝난 뒤 쿼리별 결과를 반환합니다.
+    """
+    try:
+        # 현재 사용자 ID 가져오기
+        user_id = await get_current_user_id(token)
+        
+        # 사용자 역할에 적용되는 쿼리 제한 정책 조회 (실패 시 비용 검사 생략)
+        try:
+            user = await get_current_user(token)
+            limit_settings = await PolicyService.get_effective_query_limit_settings(db=db, role=user["role"])
+        except Exception:
+            limit_settings = None
+        
+        # 배치 실행
+        result = await query_execution_service.execute_many(
+            user_id=user_id,
+            db_id=batch.db_id,
+            statements=[statement.sql for statement in batch.statements],
+            labels=[statement.label for statement in batch.statements],
+            timeout=300,  # 5 minutes timeout per query
+            max_rows=10000,  # Maximum 10,000 rows per query
+            limit_settings=limit_settings,
+            max_concurrency=batch.max_concurrency,
+            wait=batch.wait
+        )
+        
+        return result
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error executing query batch: {str(e)}"
+        )
+
+@router.get("/batch/{batch_id}")
+async def get_batch_status(
+    batch_id: str,
+    token: str = Depends(oauth2_scheme)
+) -> Dict[str, Any]:
+    """
+    배치 실행 상태 조회
+    
+    이 엔드포인트는 지정된 배치 ID에 속한 모든 쿼리의 실행 상태를 조회합니다.
+    """
+    try:
+        # 현재 사용자 ID 가져오기
+        user_id = await get_current_user_id(token)
+        
+        # 배치 상태 조회
+        batch_status = await query_execution_service.get_batch_status(batch_id)
+        
+        # 사용자 권한 확인
+        if batch_status["user_id"] != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to view this batch"
+            )
+        
+        return batch_status
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error getting batch status: {str(e)}"
+        )
+
 @router.get("/status/{query_id}")
 async def get_query_status(
     query_id: str, 
@@ -319,6 +813,56 @@ async def get_query_status(
             detail=f"Error getting query status: {str(e)}"
         )
 
+@router.get("/lob/{query_id}")
+async def get_lob_value(
+    query_id: str,
+    row: int = Query(..., ge=0, description="Zero-based row index in the query result"),
+    column: str = Query(..., description="Column name"),
+    token: str = Depends(oauth2_scheme)
+) -> Dict[str, Any]:
+    """
+    LOB 값 전체 조회
+    
+    이 엔드포인트는 쿼리 결과에서 미리보기 길이보다 길어 플레이스홀더로 저장된 LOB(CLOB/NCLOB/BLOB) 값의
+    전체 내용을 조회합니다. 값을 읽기 위해 쿼리를 다시 실행하며, 결과에 기본 키가 있으면 기본 키로, 없으면 행 위치로
+    행을 찾습니다. 다시 읽은 값이 저장된 미리보기와 다르면(행 순서가 바뀐 경우) 오류를 반환합니다.
+    바이너리 값은 base64로 인코딩되어 반환됩니다.
+    """
+    try:
+        # 현재 사용자 ID 가져오기
+        user_id = await get_current_user_id(token)
+        
+        # 쿼리 존재 여부 확인
+        query = await get_query_by_id(query_id)
+        if not query:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Query with ID {query_id} not found"
+            )
+        
+        # 사용자 권한 확인
+        if query.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to view this query"
+            )
+        
+        # LOB 값 조회
+        return await query_execution_service.get_lob_value(query_id, row, column)
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error getting LOB value: {str(e)}"
+        )
+
 @router.post("/cancel/{query_id}")
 async def cancel_query(
     query_id: str, 
@@ -15,10 +15,15 @@ from fastapi.security import OAuth2PasswordBearer
 
 from ..services.query_execution_service import QueryExecutionService
 from ..db.crud.query_result import get_query_result_by_id, update_query_result_summary
+from ..db.crud.query import merge_query_phase_timings, get_query_by_id
 from ..services.report_generation import ReportGenerator, report_storage_service
 from ..llm.factory import get_llm_service
 from ..llm.result_summary_service import ResultSummaryService
 from ..core.auth import get_current_user_id
+from ..core.config import settings
+from ..utils.query_timing import PhaseTimer
+from ..utils.logging import log_error
+from ..utils.sse import sse_response
 
 # Pydantic models for API
 class PaginationParams(BaseModel):
@@ -68,7 +73,9 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
 # Service instances
 query_execution_service = QueryExecutionService()
-llm_service = get_llm_service()
+llm_service = get_llm_service(
+    settings.LLM_PROVIDER, settings.OPENAI_MODEL, **settings.llm_provider_options(settings.LLM_PROVIDER)
+)
 result_summary_service = ResultSummaryService(llm_service)
 
 # Dictionary to track report generation tasks
@@ -107,6 +114,8 @@ async def get_result(
             "row_count": result.row_count,
             "truncated": result.truncated,
             "total_row_count": result.total_row_count,
+            "approximate": result.approximation is not None,
+            "approximation": result.approximation,
             "summary": result.summary,
             "created_at": result.created_at.isoformat()
         }
@@ -179,6 +188,8 @@ async def get_paginated_result(
             "total_rows": result.row_count,
             "truncated": result.truncated,
             "total_row_count": result.total_row_count,
+            "approximate": result.approximation is not None,
+            "approximation": result.approximation,
             "sort_column": pagination.sort_column,
             "sort_direction": pagination.sort_direction
         }
@@ -223,16 +234,24 @@ async def generate_result_summary(
             }
         
         # Generate summary
-        summary = await result_summary_service.generate_summary(
-            columns=result.columns,
-            rows=result.rows,
-            summary_type=request.summary_type,
-            include_insights=request.include_insights
-        )
+        timer = PhaseTimer()
+        with timer.phase("summary"):
+            summary = await result_summary_service.generate_summary(
+                columns=result.columns,
+                rows=result.rows,
+                summary_type=request.summary_type,
+                include_insights=request.include_insights
+            )
         
         # Update result with summary
         updated_result = await update_query_result_summary(result.id, summary)
         
+        # Record the summary time with the other phases of the query
+        try:
+            await merge_query_phase_timings(result.query_id, timer.timings)
+        except Exception as e:
+            log_error("store_summary_timing_failed", str(e), {"query_id": result.query_id})
+        
         return {
             "result_id": result.id,
             "summary": summary,
@@ -245,6 +264,62 @@ async def generate_result_summary(
         raise HTTPException(status_code=500, detail=f"Failed to generate summary: {str(e)}")
 
 
+@router.post("/{result_id}/summary/stream")
+async def stream_result_summary(
+    result_id: str = Path(..., description="The ID of the result to summarize"),
+    token: str = Depends(oauth2_scheme)
+):
+    """
+    쿼리 결과 요약 생성 (SSE 스트리밍)
+    
+    모델이 요약을 작성하는 동안 token 이벤트를 전달하고, 요약과 인사이트를 담은 done 이벤트로 끝납니다.
+    이미 요약이 있으면 done 이벤트만 전달합니다. 생성된 요약은 결과에 저장됩니다.
+    """
+    # Get current user ID
+    user_id = await get_current_user_id(token)
+    
+    # Get result from database
+    result = await get_query_result_by_id(result_id)
+    if not result:
+        raise HTTPException(status_code=404, detail=f"Result with ID {result_id} not found")
+    
+    async def events():
+        if result.summary:
+            yield {"event": "done", "result_id": result.id, "summary": result.summary, "generated_now": False}
+            return
+        
+        query = await get_query_by_id(result.query_id)
+        query_result = {"columns": result.columns, "rows": result.rows, "row_count": result.row_count}
+        
+        timer = PhaseTimer()
+        with timer.phase("summary"):
+            async for event in llm_service.stream_summarize_results(
+                query_result=query_result,
+                natural_language=query.natural_language if query else "",
+                sql_query=(query.executed_sql or query.generated_sql) if query else ""
+            ):
+                if event["event"] == "done":
+                    summary = event
+                else:
+                    yield event
+        
+        await update_query_result_summary(result.id, summary["summary"])
+        try:
+            await merge_query_phase_timings(result.query_id, timer.timings)
+        except Exception as e:
+            log_error("store_summary_timing_failed", str(e), {"query_id": result.query_id})
+        
+        yield {
+            "event": "done",
+            "result_id": result.id,
+            "summary": summary["summary"],
+            "insights": summary.get("insights", []),
+            "generated_now": True
+        }
+    
+    return sse_response(events())
+
+
 @router.post("/report")
 async def create_report_from_result(
     request: CreateReportFromResultRequest,
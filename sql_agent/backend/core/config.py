@@ -1,7 +1,7 @@
 """
 Application configuration
 """
-from typing import List
+from typing import Any, Dict, List, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
 import os
@@ -38,10 +38,82 @@ class Settings(BaseSettings):
     LLM_PROVIDER: str = Field("openai", env="LLM_PROVIDER")
     OPENAI_API_KEY: str = Field("", env="OPENAI_API_KEY")
     OPENAI_MODEL: str = Field("gpt-4", env="OPENAI_MODEL")
+    
+    # LLM provider limits (per provider/model; retries honor Retry-After)
+    LLM_REQUESTS_PER_MINUTE: int = Field(500, env="LLM_REQUESTS_PER_MINUTE")
+    LLM_TOKENS_PER_MINUTE: int = Field(300000, env="LLM_TOKENS_PER_MINUTE")
+    LLM_MAX_CONCURRENCY: int = Field(8, env="LLM_MAX_CONCURRENCY")
+    LLM_MAX_RETRIES: int = Field(4, env="LLM_MAX_RETRIES")
+
+    # Request deadlines and hedged LLM calls
+    NL_QUERY_DEADLINE_SECONDS: float = Field(30.0, env="NL_QUERY_DEADLINE_SECONDS")
+    LLM_HEDGE_PERCENTILE: float = Field(0.95, env="LLM_HEDGE_PERCENTILE")
+    LLM_HEDGE_MAX_RATIO: float = Field(0.1, env="LLM_HEDGE_MAX_RATIO")
+    LLM_FALLBACK_MODEL: Optional[str] = Field("gpt-3.5-turbo", env="LLM_FALLBACK_MODEL")
+
+    # Model routing (simple requests go to LLM_FAST_MODEL, failures escalate to OPENAI_MODEL)
+    LLM_ROUTING_ENABLED: bool = Field(True, env="LLM_ROUTING_ENABLED")
+    LLM_FAST_MODEL: str = Field("gpt-4o-mini", env="LLM_FAST_MODEL")
+    LLM_ROUTING_MAX_SIMPLE_TABLES: int = Field(2, env="LLM_ROUTING_MAX_SIMPLE_TABLES")
+    LLM_ROUTING_MAX_SIMPLE_JOIN_HINTS: int = Field(1, env="LLM_ROUTING_MAX_SIMPLE_JOIN_HINTS")
+    LLM_ROUTING_MAX_CONVERSATION_DEPTH: int = Field(2, env="LLM_ROUTING_MAX_CONVERSATION_DEPTH")
+
+    # Record/replay LLM provider (LLM_PROVIDER or EMBEDDING_PROVIDER set to "replay")
+    LLM_REPLAY_MODE: str = Field("replay", env="LLM_REPLAY_MODE")
+    LLM_REPLAY_CASSETTE: str = Field("cassettes/llm.jsonl", env="LLM_REPLAY_CASSETTE")
+    LLM_RECORD_PROVIDER: str = Field("openai", env="LLM_RECORD_PROVIDER")
+    LLM_REPLAY_LATENCY: str = Field("recorded", env="LLM_REPLAY_LATENCY")
+    LLM_REPLAY_LATENCY_SCALE: float = Field(1.0, env="LLM_REPLAY_LATENCY_SCALE")
+    LLM_REPLAY_MISS_POLICY: str = Field("fallback", env="LLM_REPLAY_MISS_POLICY")
+    
+    # Replica endpoint health check interval (0 disables the periodic check)
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = Field(30.0, env="REPLICA_HEALTH_CHECK_INTERVAL_SECONDS")
+    
+    # Slow query log settings
+    SLOW_QUERY_THRESHOLD_MS: int = Field(5000, env="SLOW_QUERY_THRESHOLD_MS")
+    SLOW_QUERY_CAPTURE_PLAN: bool = Field(True, env="SLOW_QUERY_CAPTURE_PLAN")
+    SLOW_QUERY_LOG_MAX_ENTRIES: int = Field(10000, env="SLOW_QUERY_LOG_MAX_ENTRIES")
+    SLOW_QUERY_LOG_RETENTION_DAYS: int = Field(30, env="SLOW_QUERY_LOG_RETENTION_DAYS")
+    
+    # Approximate preview settings
+    PREVIEW_SAMPLE_PERCENT: float = Field(1.0, env="PREVIEW_SAMPLE_PERCENT")
+    PREVIEW_TIMEOUT_SECONDS: int = Field(30, env="PREVIEW_TIMEOUT_SECONDS")
+    
+    # Speculative preview settings
+    SPECULATIVE_PREVIEW_MAX_ROWS: int = Field(1000, env="SPECULATIVE_PREVIEW_MAX_ROWS")
+    SPECULATIVE_PREVIEW_TIMEOUT_SECONDS: int = Field(60, env="SPECULATIVE_PREVIEW_TIMEOUT_SECONDS")
+    SPECULATIVE_PREVIEW_MAX_AGE_SECONDS: int = Field(300, env="SPECULATIVE_PREVIEW_MAX_AGE_SECONDS")
+
+    # Schema context settings (tables included in SQL generation prompts)
+    SCHEMA_CONTEXT_TOP_K: int = Field(8, env="SCHEMA_CONTEXT_TOP_K")
+    SCHEMA_CONTEXT_MAX_TOKENS: int = Field(3000, env="SCHEMA_CONTEXT_MAX_TOKENS")
+    SCHEMA_CONTEXT_FK_DEPTH: int = Field(1, env="SCHEMA_CONTEXT_FK_DEPTH")
+
+    # Embedding pipeline settings (token-packed batches sent concurrently)
+    EMBEDDING_PROVIDER: str = Field("openai", env="EMBEDDING_PROVIDER")
+    EMBEDDING_DIMENSION: int = Field(1024, env="EMBEDDING_DIMENSION")
+    EMBEDDING_BATCH_MAX_TOKENS: int = Field(100000, env="EMBEDDING_BATCH_MAX_TOKENS")
+    EMBEDDING_BATCH_MAX_SIZE: int = Field(512, env="EMBEDDING_BATCH_MAX_SIZE")
+    EMBEDDING_MAX_CONCURRENCY: int = Field(4, env="EMBEDDING_MAX_CONCURRENCY")
+    EMBEDDING_REQUESTS_PER_MINUTE: int = Field(3000, env="EMBEDDING_REQUESTS_PER_MINUTE")
+    EMBEDDING_TOKENS_PER_MINUTE: int = Field(1000000, env="EMBEDDING_TOKENS_PER_MINUTE")
 
     # Admin password (for initial admin user creation)
     ADMIN_PASSWORD: str = Field("1qazXSW@", env="ADMIN_PASSWORD")
     
+    def llm_provider_options(self, provider: str) -> Dict[str, Any]:
+        """Provider-specific options passed to get_llm_service/get_embedding_service"""
+        if provider != "replay":
+            return {}
+        return {
+            "replay_mode": self.LLM_REPLAY_MODE,
+            "cassette_path": self.LLM_REPLAY_CASSETTE,
+            "record_provider": self.LLM_RECORD_PROVIDER,
+            "latency_distribution": self.LLM_REPLAY_LATENCY,
+            "latency_scale": self.LLM_REPLAY_LATENCY_SCALE,
+            "miss_policy": self.LLM_REPLAY_MISS_POLICY
+        }
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
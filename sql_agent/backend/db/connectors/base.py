@@ -10,8 +10,11 @@ import logging
 from datetime import datetime
 
 from ...models.database import Database, DatabaseSchema, Schema, Table, Column
-from ...models.query import QueryResult, ResultColumn
+from ...models.query import QueryResult, ResultColumn, QueryCostEstimate
 from .sql_converter import SQLConverter
+from .circuit_breaker import ResilienceError, RetryBudgetExhaustedError
+from .replica_router import ReplicaRouter
+from ...utils.query_timing import timed_phase
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +69,61 @@ class ConnectionPoolManager(ABC):
             Dictionary with pool statistics
         """
         pass
+    
+    def mark_session_dirty(self, connection: Any, db_id: Optional[str] = None) -> None:
+        """
+        Mark a connection's session state as changed so that it is reset before reuse.
+        Pools without session reset support ignore this.
+        
+        Args:
+            connection: Database connection object
+            db_id: Optional database identifier
+        """
+        pass
+    
+    def invalidate_connection(self, connection: Any, db_id: Optional[str] = None) -> None:
+        """
+        Mark a connection as unusable so that it is closed instead of being reused on return.
+        Pools that do not reuse connections ignore this.
+        
+        Args:
+            connection: Database connection object
+            db_id: Optional database identifier
+        """
+        pass
+    
+    def record_success(self, db_id: str) -> None:
+        """
+        Record that a request to a database completed (circuit breaker bookkeeping).
+        Pools without a circuit breaker ignore this.
+        
+        Args:
+            db_id: Database identifier
+        """
+        pass
+    
+    def record_failure(self, db_id: str) -> None:
+        """
+        Record that a request to a database failed with a transient error.
+        Pools without a circuit breaker ignore this.
+        
+        Args:
+            db_id: Database identifier
+        """
+        pass
+    
+    def try_acquire_retry(self, db_id: str) -> bool:
+        """
+        Take a token from the retry budget of a database before retrying a transient error.
+        Pools without a retry budget always allow the retry.
+        
+        Args:
+            db_id: Database identifier
+            
+        Returns:
+            True if the retry may be made, False if the budget is exhausted
+        """
+        return True
 
 class DBConnector(ABC):
     """
@@ -81,6 +139,8 @@ class DBConnector(ABC):
             connection_pool_manager: Connection pool manager instance
         """
         self.connection_pool_manager = connection_pool_manager
+        # Replaced by the factory with a router shared by all connectors
+        self.replica_router = ReplicaRouter(connection_pool_manager)
     
     @abstractmethod
     def test_connection(self, db_config: Database) -> Tuple[bool, Optional[str]]:
@@ -108,15 +168,68 @@ class DBConnector(ABC):
         """
         connection = None
         try:
-            connection = self.connection_pool_manager.get_connection(db_config)
+            with timed_phase("connection_acquire"):
+                connection = self.connection_pool_manager.get_connection(db_config)
             yield connection
+            self.connection_pool_manager.record_success(db_config.id)
         except Exception as e:
             logger.error(f"Error getting connection for database {db_config.id}: {str(e)}")
+            # Connection failures are recorded by the pool; errors after that only count
+            # against the circuit breaker if they indicate the database is unavailable
+            if connection is not None:
+                if self._is_transient_error(e):
+                    self.connection_pool_manager.record_failure(db_config.id)
+                else:
+                    self.connection_pool_manager.record_success(db_config.id)
             raise
         finally:
             if connection:
                 self.connection_pool_manager.release_connection(connection, db_config.id)
     
+    def _is_transient_error(self, error: Exception) -> bool:
+        """
+        Check if an error is transient and can be retried.
+        Connectors override this with driver-specific error codes and messages.
+        
+        Args:
+            error: Exception object
+            
+        Returns:
+            True if the error is transient, False otherwise
+        """
+        return False
+    
+    def _is_connection_error(self, error: Exception) -> bool:
+        """
+        Check if an error means the database could not be reached, as opposed to a
+        failure of the query itself (deadlock, lock timeout, invalid SQL).
+        Connectors override this with driver-specific error codes and messages.
+        
+        Args:
+            error: Exception object
+            
+        Returns:
+            True if the error is a connection-level error, False otherwise
+        """
+        return False
+    
+    def _check_retry_budget(self, db_id: Optional[str], error: Exception) -> None:
+        """
+        Take a retry token before a transient error is re-raised for retry.
+        
+        Args:
+            db_id: Database identifier (no budget is applied if None)
+            error: Transient error about to be retried
+            
+        Raises:
+            RetryBudgetExhaustedError: If the retry budget of the database is exhausted
+        """
+        if db_id is None or isinstance(error, ResilienceError) or not self._is_transient_error(error):
+            return
+        if not self.connection_pool_manager.try_acquire_retry(db_id):
+            logger.warning(f"Retry budget exhausted for database {db_id}, not retrying: {str(error)}")
+            raise RetryBudgetExhaustedError(db_id, error) from error
+    
     def execute_query(self, db_config: Database, query: str, params: Optional[Dict[str, Any]] = None, 
                      timeout: Optional[int] = None, max_rows: Optional[int] = None, 
                      auto_convert: bool = True) -> QueryResult:
@@ -136,13 +249,48 @@ class DBConnector(ABC):
         """
         # Automatically convert the query if enabled
         if auto_convert:
-            converted_query, warnings = SQLConverter.auto_convert(query, db_config)
+            with timed_phase("dialect_conversion"):
+                converted_query, warnings = SQLConverter.auto_convert(query, db_config)
             if converted_query != query:
                 logger.info(f"Query automatically converted for {db_config.type}. Warnings: {warnings}")
                 query = converted_query
         
-        # Execute the query using the concrete implementation
-        return self._execute_query_impl(db_config, query, params, timeout, max_rows)
+        if not db_config.endpoints:
+            # Execute the query using the concrete implementation
+            return self._execute_query_impl(db_config, query, params, timeout, max_rows)
+        
+        # Route to the best endpoint and fail over to the next one if it is unavailable
+        candidates = self.replica_router.get_candidates(db_config, self.is_read_only_query(query))
+        for index, endpoint_config in enumerate(candidates):
+            self.replica_router.record_routed(endpoint_config.id)
+            try:
+                return self._execute_query_impl(endpoint_config, query, params, timeout, max_rows)
+            except Exception as e:
+                is_last = index == len(candidates) - 1
+                if is_last or not (isinstance(e, ResilienceError) or self._is_transient_error(e)):
+                    raise
+                # Only connection failures take the endpoint out of rotation; an open
+                # circuit already does, and deadlocks or timeouts are not the endpoint's fault
+                if self._is_connection_error(e):
+                    self.replica_router.mark_down(endpoint_config.id, f"connection error: {str(e)}")
+                logger.warning(
+                    f"Endpoint {endpoint_config.host}:{endpoint_config.port} of database {db_config.id} "
+                    f"is unavailable, failing over: {str(e)}"
+                )
+    
+    def check_endpoints(self, db_config: Database) -> Dict[str, bool]:
+        """
+        Health-check every endpoint of a database and route around the failing ones.
+        
+        Args:
+            db_config: Database configuration
+            
+        Returns:
+            Dictionary of endpoint address -> healthy
+        """
+        return self.replica_router.check_endpoints(
+            db_config, lambda endpoint_config: self.test_connection(endpoint_config)[0]
+        )
     
     @abstractmethod
     def _execute_query_impl(self, db_config: Database, query: str, params: Optional[Dict[str, Any]] = None, 
@@ -162,6 +310,170 @@ class DBConnector(ABC):
         """
         pass
     
+    def explain_query(self, db_config: Database, query: str, timeout: Optional[int] = None,
+                      auto_convert: bool = True) -> Optional[QueryCostEstimate]:
+        """
+        Estimate the cost of a SQL query from its execution plan without executing it.
+        
+        Args:
+            db_config: Database configuration
+            query: SQL query string
+            timeout: Optional timeout for obtaining the plan in seconds
+            auto_convert: Whether to automatically convert the query to the target dialect
+            
+        Returns:
+            QueryCostEstimate, or None if the connector does not support plan estimation
+        """
+        if auto_convert:
+            query, _ = SQLConverter.auto_convert(query, db_config)
+        
+        return self._explain_query_impl(db_config, query, timeout)
+    
+    def _explain_query_impl(self, db_config: Database, query: str,
+                            timeout: Optional[int] = None) -> Optional[QueryCostEstimate]:
+        """
+        Implementation of plan estimation for specific database types.
+        Connectors that cannot produce a plan return None.
+        
+        Args:
+            db_config: Database configuration
+            query: SQL query string
+            timeout: Optional timeout for obtaining the plan in seconds
+            
+        Returns:
+            QueryCostEstimate or None
+        """
+        return None
+    
+    def capture_plan(self, db_config: Database, query: str, timeout: Optional[int] = None,
+                     auto_convert: bool = True) -> Optional[QueryCostEstimate]:
+        """
+        Get the execution plan of a query that has already run, for diagnostics.
+        Connectors return the plan the server cached for the statement where they can
+        and fall back to a freshly compiled plan.
+        
+        Args:
+            db_config: Database configuration
+            query: SQL query string
+            timeout: Optional timeout for obtaining the plan in seconds
+            auto_convert: Whether to automatically convert the query to the target dialect
+            
+        Returns:
+            QueryCostEstimate with the plan and its source, or None if no plan is available
+        """
+        if auto_convert:
+            query, _ = SQLConverter.auto_convert(query, db_config)
+        
+        return self._capture_plan_impl(db_config, query, timeout)
+    
+    def _capture_plan_impl(self, db_config: Database, query: str,
+                           timeout: Optional[int] = None) -> Optional[QueryCostEstimate]:
+        """
+        Implementation of plan capture for specific database types.
+        Connectors without access to a plan cache compile an estimated plan.
+        
+        Args:
+            db_config: Database configuration
+            query: SQL query string
+            timeout: Optional timeout for obtaining the plan in seconds
+            
+        Returns:
+            QueryCostEstimate or None
+        """
+        estimate = self._explain_query_impl(db_config, query, timeout)
+        if estimate is not None:
+            estimate.plan_source = "estimated"
+        return estimate
+    
+    def fetch_lob_value(self, db_config: Database, query: str, row_index: int, column_name: str,
+                        auto_convert: bool = True, row_key: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Read the full value of a result cell that was returned as a LOB placeholder.
+        The query is executed again; without a row key it must return its rows in a stable order.
+        
+        Args:
+            db_config: Database configuration
+            query: SQL query string that produced the result
+            row_index: Zero-based row index of the cell (ignored if row_key is given)
+            column_name: Column name of the cell
+            auto_convert: Whether to automatically convert the query to the target dialect
+            row_key: Optional primary key values (column name to value) identifying the row
+            
+        Returns:
+            Full cell value
+            
+        Raises:
+            ValueError: If the query is invalid or the row or column does not exist
+        """
+        if auto_convert:
+            query, _ = SQLConverter.auto_convert(query, db_config)
+        
+        return self._fetch_lob_value_impl(db_config, query, row_index, column_name, row_key)
+    
+    def _fetch_lob_value_impl(self, db_config: Database, query: str, row_index: int, column_name: str,
+                              row_key: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Implementation of full LOB reads for specific database types.
+        Connectors that return LOB values in full read the cell from a regular result.
+        
+        Args:
+            db_config: Database configuration
+            query: SQL query string
+            row_index: Zero-based row index of the cell
+            column_name: Column name of the cell
+            row_key: Optional primary key values identifying the row
+            
+        Returns:
+            Full cell value
+        """
+        result = self._execute_query_impl(db_config, query, max_rows=None if row_key else row_index + 1)
+        column_names = [column.name for column in result.columns]
+        if column_name not in column_names:
+            raise ValueError(f"Column {column_name} not found in query result")
+        
+        if row_key:
+            key_indexes = self._get_row_key_indexes(column_names, row_key)
+            for row in result.rows:
+                if self._matches_row_key(row, key_indexes):
+                    return row[column_names.index(column_name)]
+            raise ValueError(f"Row with key {row_key} not found in query result")
+        
+        if row_index >= len(result.rows):
+            raise ValueError(f"Row {row_index} not found in query result")
+        
+        return result.rows[row_index][column_names.index(column_name)]
+    
+    @staticmethod
+    def _get_row_key_indexes(column_names: List[str], row_key: Dict[str, Any]) -> List[Tuple[int, Any]]:
+        """
+        Resolve the columns of a row key to their positions in a result.
+        
+        Args:
+            column_names: Column names of the result
+            row_key: Primary key values (column name to value)
+            
+        Returns:
+            List of (column index, expected value)
+        """
+        missing = [name for name in row_key if name not in column_names]
+        if missing:
+            raise ValueError(f"Key columns {missing} not found in query result")
+        return [(column_names.index(name), value) for name, value in row_key.items()]
+    
+    @staticmethod
+    def _matches_row_key(row: Any, key_indexes: List[Tuple[int, Any]]) -> bool:
+        """
+        Check if a result row has the given key values.
+        
+        Args:
+            row: Result row
+            key_indexes: List of (column index, expected value)
+            
+        Returns:
+            True if every key column has the expected value
+        """
+        return all(row[index] == value for index, value in key_indexes)
+    
     @abstractmethod
     def cancel_query(self, query_id: str) -> bool:
         """
@@ -0,0 +1,284 @@
+"""
+Circuit breaker and retry budget for database connectors.
+This module keeps per-database failure state so that requests to an unavailable
+database fail fast instead of piling up retries on a recovering server.
+"""
+
+import logging
+import time
+from enum import Enum
+from threading import Lock
+from typing import Dict, Any, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    """State of a circuit breaker"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class ResilienceError(RuntimeError):
+    """Base class for errors raised without contacting the database"""
+    pass
+
+
+class CircuitOpenError(ResilienceError):
+    """Raised when a request is rejected because the circuit of a database is open"""
+
+    def __init__(self, db_id: str, retry_after: float, consecutive_failures: int):
+        self.db_id = db_id
+        self.retry_after = retry_after
+        self.consecutive_failures = consecutive_failures
+        super().__init__(
+            f"Database {db_id} is temporarily unavailable: circuit breaker is open after "
+            f"{consecutive_failures} consecutive failures, retry in {retry_after:.1f}s"
+        )
+
+
+class RetryBudgetExhaustedError(ResilienceError):
+    """Raised instead of retrying a transient error when the retry budget of a database is used up"""
+
+    def __init__(self, db_id: str, error: Exception):
+        self.db_id = db_id
+        self.error = error
+        super().__init__(f"Retry budget exhausted for database {db_id}: {str(error)}")
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a single database.
+
+    - closed: requests pass; consecutive failures are counted
+    - open: requests are rejected until the recovery timeout has elapsed
+    - half_open: a limited number of probe requests pass; a success closes the
+      circuit and a failure opens it again
+    """
+
+    def __init__(self, db_id: str, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            db_id: Database identifier
+            failure_threshold: Consecutive failures after which the circuit opens
+            recovery_timeout: Seconds the circuit stays open before probing
+            half_open_max_calls: Concurrent probe requests allowed in the half-open state
+            clock: Monotonic clock function
+        """
+        self.db_id = db_id
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = Lock()
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at = 0.0
+        self._half_open_calls = 0
+        self._times_opened = 0
+        self._rejected_requests = 0
+
+    def _update_state(self, now: float) -> CircuitState:
+        """
+        Move an open circuit to half-open once the recovery timeout has elapsed.
+        Must be called with the lock held.
+
+        Args:
+            now: Current clock value
+
+        Returns:
+            Current state
+        """
+        if self._state == CircuitState.OPEN and now - self._opened_at >= self.recovery_timeout:
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_calls = 0
+            logger.info(f"Circuit breaker for database {self.db_id} is half-open, probing")
+        return self._state
+
+    def _open(self, now: float) -> None:
+        """
+        Open the circuit. Must be called with the lock held.
+
+        Args:
+            now: Current clock value
+        """
+        self._state = CircuitState.OPEN
+        self._opened_at = now
+        self._times_opened += 1
+        logger.warning(
+            f"Circuit breaker for database {self.db_id} opened after "
+            f"{self._consecutive_failures} consecutive failures"
+        )
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state of the circuit"""
+        with self._lock:
+            return self._update_state(self._clock())
+
+    def allow_request(self) -> None:
+        """
+        Check whether a request may be sent to the database.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or the half-open probe slots are taken
+        """
+        with self._lock:
+            now = self._clock()
+            state = self._update_state(now)
+
+            if state == CircuitState.CLOSED:
+                return
+
+            if state == CircuitState.HALF_OPEN:
+                # Probes whose outcome was never reported expire after the recovery timeout
+                if (self._half_open_calls < self.half_open_max_calls
+                        or now - self._probe_started_at >= self.recovery_timeout):
+                    if self._half_open_calls >= self.half_open_max_calls:
+                        self._half_open_calls = 0
+                    self._half_open_calls += 1
+                    self._probe_started_at = now
+                    return
+                retry_after = self.recovery_timeout - (now - self._probe_started_at)
+            else:
+                retry_after = self.recovery_timeout - (now - self._opened_at)
+
+            self._rejected_requests += 1
+            raise CircuitOpenError(self.db_id, max(retry_after, 0.0), self._consecutive_failures)
+
+    def record_success(self) -> None:
+        """
+        Record a successful request. Closes a half-open circuit.
+        """
+        with self._lock:
+            if self._state != CircuitState.CLOSED:
+                logger.info(f"Circuit breaker for database {self.db_id} closed")
+            self._state = CircuitState.CLOSED
+            self._consecutive_failures = 0
+            self._half_open_calls = 0
+
+    def record_failure(self) -> None:
+        """
+        Record a failed request. Opens the circuit when the failure threshold is
+        reached or when a half-open probe fails.
+        """
+        with self._lock:
+            now = self._clock()
+            state = self._update_state(now)
+            self._consecutive_failures += 1
+
+            if state == CircuitState.HALF_OPEN:
+                self._open(now)
+            elif state == CircuitState.CLOSED and self._consecutive_failures >= self.failure_threshold:
+                self._open(now)
+
+    def reset(self) -> None:
+        """
+        Close the circuit and clear the failure count.
+        """
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._consecutive_failures = 0
+            self._half_open_calls = 0
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Get the breaker state for statistics.
+
+        Returns:
+            Dictionary with state, failure counts and remaining open time
+        """
+        with self._lock:
+            now = self._clock()
+            state = self._update_state(now)
+            retry_after = 0.0
+            if state == CircuitState.OPEN:
+                retry_after = max(self.recovery_timeout - (now - self._opened_at), 0.0)
+
+            return {
+                "state": state.value,
+                "consecutive_failures": self._consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "times_opened": self._times_opened,
+                "rejected_requests": self._rejected_requests,
+                "retry_after_seconds": retry_after
+            }
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries of transient errors for a database.
+    Every retry takes a token; tokens refill at a fixed rate up to the capacity,
+    so that concurrent requests cannot multiply the load on a failing server.
+    """
+
+    def __init__(self, capacity: float = 10.0, refill_rate: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the retry budget.
+
+        Args:
+            capacity: Maximum number of tokens (retries that can be made in a burst)
+            refill_rate: Tokens added per second
+            clock: Monotonic clock function
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._clock = clock
+        self._lock = Lock()
+        self._tokens = capacity
+        self._updated_at = clock()
+        self._granted = 0
+        self._denied = 0
+
+    def _refill(self, now: float) -> None:
+        """
+        Add tokens for the time elapsed since the last update. Must be called with the lock held.
+
+        Args:
+            now: Current clock value
+        """
+        elapsed = max(now - self._updated_at, 0.0)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_rate)
+        self._updated_at = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        Take tokens for a retry.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            True if the retry may be made, False if the budget is exhausted
+        """
+        with self._lock:
+            self._refill(self._clock())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                self._granted += 1
+                return True
+            self._denied += 1
+            return False
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Get the budget state for statistics.
+
+        Returns:
+            Dictionary with available tokens and granted/denied retry counts
+        """
+        with self._lock:
+            self._refill(self._clock())
+            return {
+                "tokens": round(self._tokens, 2),
+                "capacity": self.capacity,
+                "refill_rate": self.refill_rate,
+                "retries_granted": self._granted,
+                "retries_denied": self._denied
+            }
@@ -0,0 +1,325 @@
+"""
+Pre-flight query cost estimation for database connectors.
+This module parses execution plans (MS-SQL SHOWPLAN_XML, SAP HANA EXPLAIN PLAN),
+caches them per query fingerprint and evaluates the estimates against query limit policies.
+"""
+
+import logging
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from enum import Enum
+from threading import Lock
+from typing import Dict, Any, Optional, List, Tuple
+
+from sql_agent.backend.models.database import Database
+from sql_agent.backend.models.query import QueryCostEstimate
+from sql_agent.backend.models.policy import QueryLimitPolicySettings
+from sql_agent.backend.utils.sql_fingerprint import sql_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Namespace used by MS-SQL showplan documents
+SHOWPLAN_NAMESPACE = "{http://schemas.microsoft.com/sqlserver/2004/07/showplan}"
+
+# Maximum number of plan operators kept on an estimate
+MAX_PLAN_OPERATORS = 50
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """
+    Convert a plan attribute to float, ignoring missing or malformed values.
+
+    Args:
+        value: Raw attribute value
+
+    Returns:
+        Float value or None
+    """
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_showplan_xml(plan_xml: str) -> QueryCostEstimate:
+    """
+    Parse an MS-SQL SHOWPLAN_XML document.
+
+    Estimated rows and subtree cost are summed over all statements in the batch.
+
+    Args:
+        plan_xml: Showplan XML document
+
+    Returns:
+        QueryCostEstimate with the estimated rows, cost and physical operators
+
+    Raises:
+        ValueError: If the document cannot be parsed
+    """
+    try:
+        root = ET.fromstring(plan_xml)
+    except ET.ParseError as e:
+        raise ValueError(f"Invalid showplan XML: {str(e)}")
+
+    estimated_rows = None
+    estimated_cost = None
+    for statement in root.iter(f"{SHOWPLAN_NAMESPACE}StmtSimple"):
+        rows = _to_float(statement.get("StatementEstRows"))
+        cost = _to_float(statement.get("StatementSubTreeCost"))
+        if rows is not None:
+            estimated_rows = (estimated_rows or 0.0) + rows
+        if cost is not None:
+            estimated_cost = (estimated_cost or 0.0) + cost
+
+    operators = []
+    for rel_op in root.iter(f"{SHOWPLAN_NAMESPACE}RelOp"):
+        if len(operators) >= MAX_PLAN_OPERATORS:
+            break
+        operators.append(rel_op.get("PhysicalOp", "Unknown"))
+
+    return QueryCostEstimate(
+        estimated_rows=estimated_rows,
+        estimated_cost=estimated_cost,
+        operators=operators,
+        plan=plan_xml
+    )
+
+
+def parse_hana_explain_plan(plan_rows: List[Dict[str, Any]]) -> QueryCostEstimate:
+    """
+    Parse rows of the SAP HANA EXPLAIN_PLAN_TABLE for a single statement.
+
+    The root operator (without a parent) carries the output size and subtree cost of the whole plan.
+
+    Args:
+        plan_rows: Plan rows with OPERATOR_ID, PARENT_OPERATOR_ID, OPERATOR_NAME, TABLE_NAME,
+            OUTPUT_SIZE and SUBTREE_COST keys
+
+    Returns:
+        QueryCostEstimate with the estimated rows, cost and operators
+    """
+    estimated_rows = None
+    estimated_cost = None
+    operators = []
+    plan_lines = []
+
+    for row in sorted(plan_rows, key=lambda r: r.get("OPERATOR_ID") or 0):
+        operator = row.get("OPERATOR_NAME") or "UNKNOWN"
+        table_name = row.get("TABLE_NAME")
+        label = f"{operator} {table_name}" if table_name else operator
+
+        if row.get("PARENT_OPERATOR_ID") is None and estimated_rows is None:
+            estimated_rows = _to_float(row.get("OUTPUT_SIZE"))
+            estimated_cost = _to_float(row.get("SUBTREE_COST"))
+
+        if len(operators) < MAX_PLAN_OPERATORS:
+            operators.append(label)
+        plan_lines.append(f"{label} (rows={row.get('OUTPUT_SIZE')}, cost={row.get('SUBTREE_COST')})")
+
+    return QueryCostEstimate(
+        estimated_rows=estimated_rows,
+        estimated_cost=estimated_cost,
+        operators=operators,
+        plan="\n".join(plan_lines) if plan_lines else None
+    )
+
+
+class CostDecision(str, Enum):
+    """Outcome of evaluating a cost estimate against the query limit policy"""
+    ALLOW = "allow"
+    LOW_PRIORITY = "low_priority"
+    BLOCK = "block"
+
+
+def has_cost_thresholds(settings: Optional[QueryLimitPolicySettings]) -> bool:
+    """
+    Check whether a query limit policy defines any cost thresholds.
+
+    Args:
+        settings: Query limit policy settings
+
+    Returns:
+        True if pre-flight cost estimation is required
+    """
+    if settings is None:
+        return False
+    return any(value is not None for value in (
+        settings.max_estimated_rows,
+        settings.max_estimated_cost,
+        settings.warn_estimated_rows,
+        settings.warn_estimated_cost
+    ))
+
+
+def evaluate_cost(estimate: QueryCostEstimate, settings: QueryLimitPolicySettings) -> Tuple[CostDecision, Optional[str]]:
+    """
+    Evaluate a cost estimate against the query limit policy.
+
+    Args:
+        estimate: Query cost estimate
+        settings: Query limit policy settings
+
+    Returns:
+        Tuple of (decision, reason). The reason is None when the query is allowed.
+    """
+    rows = estimate.estimated_rows
+    cost = estimate.estimated_cost
+
+    if rows is not None and settings.max_estimated_rows is not None and rows > settings.max_estimated_rows:
+        return CostDecision.BLOCK, (
+            f"Estimated row count {rows:,.0f} exceeds the policy limit of {settings.max_estimated_rows:,}"
+        )
+    if cost is not None and settings.max_estimated_cost is not None and cost > settings.max_estimated_cost:
+        return CostDecision.BLOCK, (
+            f"Estimated query cost {cost:,.2f} exceeds the policy limit of {settings.max_estimated_cost:,.2f}"
+        )
+    if rows is not None and settings.warn_estimated_rows is not None and rows > settings.warn_estimated_rows:
+        return CostDecision.LOW_PRIORITY, (
+            f"Estimated row count {rows:,.0f} exceeds the warning threshold of {settings.warn_estimated_rows:,}"
+        )
+    if cost is not None and settings.warn_estimated_cost is not None and cost > settings.warn_estimated_cost:
+        return CostDecision.LOW_PRIORITY, (
+            f"Estimated query cost {cost:,.2f} exceeds the warning threshold of {settings.warn_estimated_cost:,.2f}"
+        )
+
+    return CostDecision.ALLOW, None
+
+
+class QueryPlanCache:
+    """
+    LRU cache of query cost estimates keyed by database and query fingerprint.
+    Entries expire after a TTL so that plans follow statistics updates.
+    """
+
+    def __init__(self, max_size: int = 512, ttl_seconds: float = 300.0):
+        """
+        Initialize the plan cache.
+
+        Args:
+            max_size: Maximum number of cached plans
+            ttl_seconds: Time to live of a cached plan in seconds
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, QueryCostEstimate]]" = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, db_id: str, query: str) -> Optional[QueryCostEstimate]:
+        """
+        Get a cached estimate.
+
+        Args:
+            db_id: Database identifier
+            query: SQL query string
+
+        Returns:
+            Cached QueryCostEstimate or None
+        """
+        key = (db_id, sql_fingerprint(query))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, db_id: str, query: str, estimate: QueryCostEstimate) -> None:
+        """
+        Store an estimate.
+
+        Args:
+            db_id: Database identifier
+            query: SQL query string
+            estimate: Query cost estimate
+        """
+        key = (db_id, sql_fingerprint(query))
+        with self._lock:
+            self._entries[key] = (time.monotonic(), estimate)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self, db_id: Optional[str] = None) -> None:
+        """
+        Remove cached plans for a database or all databases.
+
+        Args:
+            db_id: Optional database identifier. If None, clear all plans.
+        """
+        with self._lock:
+            if db_id is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == db_id]:
+                    del self._entries[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss counts and size
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size
+            }
+
+
+class QueryCostEstimator:
+    """
+    Runs pre-flight EXPLAIN through a connector and caches the resulting estimates.
+    Estimation is best effort: failures are logged and reported as "no estimate".
+    """
+
+    def __init__(self, plan_cache: Optional[QueryPlanCache] = None, explain_timeout: int = 30):
+        """
+        Initialize the cost estimator.
+
+        Args:
+            plan_cache: Optional plan cache (a new cache is created if None)
+            explain_timeout: Timeout for the EXPLAIN statement in seconds
+        """
+        self.plan_cache = plan_cache or QueryPlanCache()
+        self.explain_timeout = explain_timeout
+
+    def estimate(self, connector: Any, db_config: Database, query: str) -> Optional[QueryCostEstimate]:
+        """
+        Estimate the cost of a query.
+
+        Args:
+            connector: Database connector implementing explain_query
+            db_config: Database configuration
+            query: SQL query string
+
+        Returns:
+            QueryCostEstimate or None if the plan could not be obtained
+        """
+        cached = self.plan_cache.get(db_config.id, query)
+        if cached is not None:
+            return cached
+
+        try:
+            estimate = connector.explain_query(db_config, query, timeout=self.explain_timeout)
+        except Exception as e:
+            logger.warning(f"Pre-flight cost estimation failed for database {db_config.id}: {str(e)}")
+            return None
+
+        if estimate is not None:
+            self.plan_cache.put(db_config.id, query, estimate)
+        return estimate
@@ -257,8 +257,14 @@ class SQLDialectHandler:
         # Check for dialect-specific features
         for feature, dialects in cls.DIALECT_FEATURES.items():
             for dialect, pattern in dialects.items():
-                if pattern and re.search(pattern, query, re.IGNORECASE):
-                    features[dialect].append(feature)
+                if not pattern:
+                    continue
+                try:
+                    if re.search(pattern, query, re.IGNORECASE):
+                        features[dialect].append(feature)
+                except re.error:
+                    # Some entries are replacement templates (e.g. "\1.NEXTVAL"), not detection patterns
+                    continue
         
         return features
     
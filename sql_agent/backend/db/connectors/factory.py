@@ -2,12 +2,14 @@
 Factory for creating database connectors based on database type.
 """
 
+import asyncio
 import logging
 from typing import Dict, Type, Optional
 
 from ...models.database import Database, DBType
 from .base import DBConnector, ConnectionPoolManager
 from .pool import DefaultConnectionPoolManager
+from .replica_router import ReplicaRouter
 from .query_executor import QueryExecutionTracker
 
 logger = logging.getLogger(__name__)
@@ -23,6 +25,7 @@ class DBConnectorFactory:
         """
         self._connector_classes: Dict[str, Type[DBConnector]] = {}
         self._connection_pool_manager: Optional[ConnectionPoolManager] = None
+        self._replica_router: Optional[ReplicaRouter] = None
         self._query_tracker = QueryExecutionTracker()
     
     def register_connector(self, db_type: str, connector_class: Type[DBConnector]) -> None:
@@ -44,6 +47,7 @@ class DBConnectorFactory:
             pool_manager: Connection pool manager instance
         """
         self._connection_pool_manager = pool_manager
+        self._replica_router = None
         logger.info(f"Set connection pool manager: {pool_manager.__class__.__name__}")
     
     def get_connection_pool_manager(self) -> ConnectionPoolManager:
@@ -60,6 +64,18 @@ class DBConnectorFactory:
         
         return self._connection_pool_manager
     
+    def get_replica_router(self) -> ReplicaRouter:
+        """
+        Get the endpoint router shared by all connectors.
+        
+        Returns:
+            ReplicaRouter instance
+        """
+        if self._replica_router is None:
+            self._replica_router = ReplicaRouter(self.get_connection_pool_manager())
+        
+        return self._replica_router
+    
     def get_query_tracker(self) -> QueryExecutionTracker:
         """
         Get the query execution tracker.
@@ -91,10 +107,27 @@ class DBConnectorFactory:
         pool_manager = self.get_connection_pool_manager()
         
         connector = connector_class(pool_manager)
+        connector.replica_router = self.get_replica_router()
         logger.info(f"Created connector for database: {db_config.name} (type: {db_type})")
         
         return connector
     
+    def check_replica_endpoints(self) -> Dict[str, Dict[str, bool]]:
+        """
+        Health-check the endpoints of every routed database with several endpoints.
+        Endpoints that fail are skipped by the router until a later check passes.
+        
+        Returns:
+            Dictionary of database ID -> endpoint address -> healthy
+        """
+        results = {}
+        for db_config in self.get_replica_router().get_databases():
+            try:
+                results[db_config.id] = self.create_connector(db_config).check_endpoints(db_config)
+            except Exception as e:
+                logger.warning(f"Could not check the endpoints of database {db_config.id}: {str(e)}")
+        return results
+    
     def close_all_connections(self) -> None:
         """
         Close all database connections.
@@ -104,4 +137,21 @@ class DBConnectorFactory:
             logger.info("Closed all database connections")
 
 # Global instance of the connector factory
-connector_factory = DBConnectorFactory()
\ No newline at end of file
+connector_factory = DBConnectorFactory()
+
+
+async def run_endpoint_health_checks(interval_seconds: float, factory: Optional[DBConnectorFactory] = None) -> None:
+    """
+    Health-check replica endpoints right away and then every interval until cancelled.
+    
+    Args:
+        interval_seconds: Seconds between health checks
+        factory: Connector factory whose endpoints are checked (defaults to the global instance)
+    """
+    factory = factory or connector_factory
+    while True:
+        try:
+            await asyncio.to_thread(factory.check_replica_endpoints)
+        except Exception as e:
+            logger.error(f"Endpoint health check failed: {str(e)}")
+        await asyncio.sleep(interval_seconds)
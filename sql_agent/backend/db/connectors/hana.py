@@ -3,6 +3,7 @@ SAP HANA database connector implementation.
 This module provides a full implementation of the DBConnector interface for SAP HANA.
 """
 
+import hashlib
 import logging
 import time
 import uuid
@@ -20,10 +21,14 @@ except ImportError:
     HANA_DRIVER = None
 
 from sql_agent.backend.models.database import Database, DatabaseSchema, Schema, Table, Column, ForeignKey
-from sql_agent.backend.models.query import QueryResult, ResultColumn
+from sql_agent.backend.models.query import QueryResult, ResultColumn, QueryCostEstimate
 from sql_agent.backend.db.connectors.base import DBConnector, ConnectionPoolManager
-from sql_agent.backend.db.connectors.query_executor import QueryResultProcessor, QueryExecutionTracker
+from sql_agent.backend.db.connectors.circuit_breaker import ResilienceError
+from sql_agent.backend.db.connectors.query_executor import QueryResultProcessor, QueryExecutionTracker, make_lob_placeholder
 from sql_agent.backend.db.connectors.sql_validator import SQLValidator
+from sql_agent.backend.db.connectors.cost_estimator import parse_hana_explain_plan
+from sql_agent.backend.db.connectors.query_parameterizer import parameterize_query, PreparedStatementCache
+from sql_agent.backend.utils.query_timing import timed_phase
 
 logger = logging.getLogger(__name__)
 
@@ -145,6 +150,55 @@ class HANAConnector(DBConnector):
         "transport-level error"
     ]
     
+    # Error codes that mean the server could not be reached (as opposed to failed queries)
+    CONNECTION_ERROR_CODES = {
+        -10709,  # Connection failed (RTE:[300015])
+        -10108,  # Session not connected
+        -10102,  # Session already closed
+        -10061,  # Connection refused
+        -10060,  # Connection timeout
+        -10054,  # Connection reset by peer
+        -10053,  # Software caused connection abort
+        -10032,  # Broken pipe
+    }
+    
+    # Error messages that mean the server could not be reached
+    CONNECTION_ERROR_MESSAGES = [
+        "connection failed",
+        "connection timeout",
+        "connection reset",
+        "connection refused",
+        "connection closed",
+        "network error",
+        "socket error",
+        "communication link failure",
+        "transport-level error"
+    ]
+    
+    # Whether inline literals are lifted into prepared statement parameters
+    AUTO_PARAMETERIZE = True
+    
+    # Rows fetched per round trip (hdbcli prefetches only 32 rows by default)
+    DEFAULT_FETCH_SIZE = 1000
+    
+    # Characters (or bytes) of a CLOB/NCLOB/BLOB value read into the result;
+    # longer values are replaced by a placeholder and read on demand
+    DEFAULT_LOB_PREVIEW_LENGTH = 1024
+    
+    # Chunk size for reading full LOB values
+    LOB_READ_CHUNK_SIZE = 1048576
+    
+    # Connection options used by the connector itself and not passed to hdbcli
+    CONNECTOR_OPTIONS = ("fetch_size", "lob_preview_length")
+    
+    # Session variables of every new connection. They are passed as sessionVariable:<name>
+    # connect properties so that session initialization needs no extra round trip.
+    SESSION_VARIABLES = {
+        "QUERY_TIMEOUT": "300",  # 5 minutes query timeout
+        "IDLE_TIMEOUT": "1800",  # 30 minutes idle timeout
+        "ABAP_AS_DECIMAL": "TRUE"  # Handle ABAP decimals correctly
+    }
+    
     def __init__(self, connection_pool_manager: ConnectionPoolManager):
         """
         Initialize the SAP HANA database connector.
@@ -156,10 +210,13 @@ class HANAConnector(DBConnector):
         self.query_processor = QueryResultProcessor()
         self.sql_validator = SQLValidator()
         self.query_tracker = QueryExecutionTracker()
+        self.auto_parameterize = self.AUTO_PARAMETERIZE
+        self.statement_cache = PreparedStatementCache()
         
         # Register connection creator and validator with the pool manager
         connection_pool_manager.register_connection_creator("hana", self._create_connection)
         connection_pool_manager.register_connection_validator("hana", self._validate_connection)
+        connection_pool_manager.register_lifecycle_hook("hana", "on_return", self._reset_session)
     
     def _is_transient_error(self, error: Exception) -> bool:
         """
@@ -184,11 +241,27 @@ class HANAConnector(DBConnector):
         
         return False
     
+    def _is_connection_error(self, error: Exception) -> bool:
+        """
+        Check if an error means the server could not be reached.
+        
+        Args:
+            error: Exception object
+            
+        Returns:
+            True if the error is a connection-level error, False otherwise
+        """
+        if hasattr(error, 'errorcode') and error.errorcode in self.CONNECTION_ERROR_CODES:
+            return True
+        
+        error_str = str(error).lower()
+        return any(message in error_str for message in self.CONNECTION_ERROR_MESSAGES)
+    
     @backoff.on_exception(
         backoff.expo,
         Exception,
         max_tries=MAX_RETRY_ATTEMPTS,
-        giveup=lambda e: not isinstance(e, Exception) or not HANAConnector._is_transient_error(HANAConnector, e),
+        giveup=lambda e: not isinstance(e, Exception) or isinstance(e, ResilienceError) or not HANAConnector._is_transient_error(HANAConnector, e),
         factor=RETRY_DELAY
     )
     def _create_connection(self, db_config: Database) -> Any:
@@ -228,8 +301,15 @@ class HANAConnector(DBConnector):
                 "connectTimeout": 30000,  # 30 seconds connection timeout
             }
             
+            # Set session parameters for optimal performance as part of the connect request
+            for name, value in self.SESSION_VARIABLES.items():
+                options[f"sessionVariable:{name}"] = value
+            
             # Update with user-provided options
-            options.update(db_config.connection_config.options)
+            options.update({
+                name: value for name, value in db_config.connection_config.options.items()
+                if name not in self.CONNECTOR_OPTIONS
+            })
             
             # Create connection
             connection = hana_dbapi.connect(
@@ -241,24 +321,30 @@ class HANAConnector(DBConnector):
                 **options
             )
             
-            # Configure connection settings
-            cursor = connection.cursor()
-            
-            # Set session parameters for optimal performance
-            cursor.execute("SET SESSION 'QUERY_TIMEOUT' = '300'")  # 5 minutes query timeout
-            cursor.execute("SET SESSION 'IDLE_TIMEOUT' = '1800'")  # 30 minutes idle timeout
-            cursor.execute("SET SESSION 'ABAP_AS_DECIMAL' = 'TRUE'")  # Handle ABAP decimals correctly
-            
-            cursor.close()
-            
             logger.info(f"Created new SAP HANA connection to {host}:{port}/{database}")
             return connection
             
         except Exception as e:
             logger.error(f"Failed to create SAP HANA connection: {str(e)}")
             # Re-raise the exception to trigger retry if it's a transient error
+            # and the database's retry budget allows it
+            self._check_retry_budget(db_config.id, e)
             raise
     
+    def _reset_session(self, connection: Any) -> None:
+        """
+        Restore session variables changed by a query before the connection is reused
+        (pool on_return hook, only called for dirty sessions).
+        
+        Args:
+            connection: SAP HANA connection object
+        """
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"SET SESSION 'QUERY_TIMEOUT' = '{self.SESSION_VARIABLES['QUERY_TIMEOUT']}'")
+        finally:
+            cursor.close()
+    
     def _validate_connection(self, connection: Any) -> bool:
         """
         Validate that a SAP HANA connection is still valid.
@@ -284,7 +370,7 @@ class HANAConnector(DBConnector):
         backoff.expo,
         Exception,
         max_tries=MAX_RETRY_ATTEMPTS,
-        giveup=lambda e: not isinstance(e, Exception) or not HANAConnector._is_transient_error(HANAConnector, e),
+        giveup=lambda e: not isinstance(e, Exception) or isinstance(e, ResilienceError) or not HANAConnector._is_transient_error(HANAConnector, e),
         factor=RETRY_DELAY
     )
     def test_connection(self, db_config: Database) -> Tuple[bool, Optional[str]]:
@@ -332,6 +418,7 @@ class HANAConnector(DBConnector):
             # Set timeout if specified
             if timeout is not None:
                 cursor.execute(f"SET SESSION 'QUERY_TIMEOUT' = '{timeout}'")
+                self.connection_pool_manager.mark_session_dirty(connection)
             
             yield cursor
         finally:
@@ -357,7 +444,8 @@ class HANAConnector(DBConnector):
             Exception: If query execution fails after retries
         """
         # Validate the query
-        is_valid, error_message = self.validate_query(db_config, query)
+        with timed_phase("validation"):
+            is_valid, error_message = self.validate_query(db_config, query)
         if not is_valid:
             raise ValueError(f"Invalid query: {error_message}")
         
@@ -375,8 +463,10 @@ class HANAConnector(DBConnector):
             
             try:
                 # Execute the query with retry logic for transient errors
+                fetch_size, lob_preview_length = self._get_fetch_settings(db_config)
                 return self._execute_query_with_retry(
-                    connection, query, params, timeout, max_rows, query_id
+                    connection, query, params, timeout, max_rows, query_id, db_id=db_config.id,
+                    fetch_size=fetch_size, lob_preview_length=lob_preview_length
                 )
             except Exception as e:
                 logger.error(f"Error executing SAP HANA query: {str(e)}")
@@ -389,11 +479,13 @@ class HANAConnector(DBConnector):
         backoff.expo,
         Exception,
         max_tries=MAX_RETRY_ATTEMPTS,
-        giveup=lambda e: not isinstance(e, Exception) or not HANAConnector._is_transient_error(HANAConnector, e),
+        giveup=lambda e: not isinstance(e, Exception) or isinstance(e, ResilienceError) or not HANAConnector._is_transient_error(HANAConnector, e),
         factor=RETRY_DELAY
     )
     def _execute_query_with_retry(self, connection: Any, query: str, params: Optional[Dict[str, Any]], 
-                                timeout: Optional[int], max_rows: Optional[int], query_id: str) -> QueryResult:
+                                timeout: Optional[int], max_rows: Optional[int], query_id: str,
+                                db_id: Optional[str] = None, fetch_size: Optional[int] = None,
+                                lob_preview_length: Optional[int] = None) -> QueryResult:
         """
         Execute a SQL query with retry logic for transient errors.
         
@@ -404,6 +496,10 @@ class HANAConnector(DBConnector):
             timeout: Optional query timeout in seconds
             max_rows: Optional maximum number of rows to return
             query_id: Query identifier
+            db_id: Optional database identifier whose retry budget is charged for retries
+            fetch_size: Rows fetched per round trip (DEFAULT_FETCH_SIZE if None)
+            lob_preview_length: Characters of LOB values read into the result
+                (DEFAULT_LOB_PREVIEW_LENGTH if None)
             
         Returns:
             QueryResult object containing the query results
@@ -413,14 +509,34 @@ class HANAConnector(DBConnector):
             start_time = time.time()
             
             try:
-                if params:
-                    # SAP HANA supports named parameters with :parameter_name syntax
-                    cursor.execute(query, params)
-                else:
-                    cursor.execute(query)
+                result_cursor = cursor
+                
+                with timed_phase("server_execution"):
+                    if params:
+                        # SAP HANA supports named parameters with :parameter_name syntax
+                        cursor.execute(query, params)
+                    else:
+                        # Lift inline literals into parameters of a prepared statement that is
+                        # reused on this connection for every literal variant of the query
+                        statement, values = (parameterize_query(query) if self.auto_parameterize and HANA_DRIVER
+                                             else (query, []))
+                        
+                        if values:
+                            result_cursor = self._get_prepared_statement(connection, statement)
+                            result_cursor.executeprepared(values)
+                        else:
+                            cursor.execute(query)
                 
-                # Process the results
-                result = self.query_processor.process_result(cursor, query, max_rows)
+                # Fetch the results in bulk; LOB columns are only read up to the preview length
+                fetch_size = fetch_size or self.DEFAULT_FETCH_SIZE
+                if lob_preview_length is None:
+                    lob_preview_length = self.DEFAULT_LOB_PREVIEW_LENGTH
+                self._set_fetch_size(result_cursor, fetch_size)
+                with timed_phase("fetch"):
+                    result = self.query_processor.process_result_batched(
+                        result_cursor, query, max_rows, fetch_size,
+                        lambda lob: self._read_lob_preview(lob, lob_preview_length)
+                    )
                 result.query_id = query_id
                 
                 execution_time = time.time() - start_time
@@ -432,14 +548,327 @@ class HANAConnector(DBConnector):
                 execution_time = time.time() - start_time
                 logger.error(f"Query execution failed after {execution_time:.2f}s: {str(e)}")
                 
+                # Prepared statements may be invalid after an error (e.g. schema change, lost session)
+                self.statement_cache.discard_connection(connection)
+                
                 # Check if this is a transient error that can be retried
                 if self._is_transient_error(e):
+                    self._check_retry_budget(db_id, e)
                     logger.info(f"Transient error detected, will retry: {str(e)}")
                     raise  # Re-raise to trigger retry
                 else:
                     # Non-transient error, format and raise
                     raise type(e)(self.format_error(e))
     
+    def _explain_query_impl(self, db_config: Database, query: str,
+                            timeout: Optional[int] = None) -> Optional[QueryCostEstimate]:
+        """
+        Estimate the cost of a query with EXPLAIN PLAN.
+        The plan rows are read from EXPLAIN_PLAN_TABLE and removed afterwards.
+        
+        Args:
+            db_config: Database configuration
+            query: SQL query string
+            timeout: Optional timeout for obtaining the plan in seconds
+            
+        Returns:
+            QueryCostEstimate parsed from the plan table
+        """
+        is_valid, error_message = self.validate_query(db_config, query)
+        if not is_valid:
+            raise ValueError(f"Invalid query: {error_message}")
+        
+        with self.get_connection(db_config) as connection:
+            with self._get_cursor(connection, timeout) as cursor:
+                plan_rows = self._explain_plan_rows(cursor, query)
+        
+        if not plan_rows:
+            return None
+        
+        return parse_hana_explain_plan(plan_rows)
+    
+    @staticmethod
+    def _explain_plan_rows(cursor: Any, target: str) -> List[Dict[str, Any]]:
+        """
+        Run EXPLAIN PLAN and read the resulting rows from EXPLAIN_PLAN_TABLE.
+        
+        Args:
+            cursor: Database cursor
+            target: Statement to explain, or a SQL PLAN CACHE ENTRY clause
+            
+        Returns:
+            List of plan rows
+        """
+        statement_name = f"SQLAGENT_{uuid.uuid4().hex[:16].upper()}"
+        
+        cursor.execute(f"EXPLAIN PLAN SET STATEMENT_NAME = '{statement_name}' FOR {target}")
+        try:
+            cursor.execute(
+                "SELECT OPERATOR_ID, PARENT_OPERATOR_ID, OPERATOR_NAME, TABLE_NAME, OUTPUT_SIZE, SUBTREE_COST "
+                "FROM EXPLAIN_PLAN_TABLE WHERE STATEMENT_NAME = ?",
+                (statement_name,)
+            )
+            column_names = [column[0] for column in cursor.description]
+            return [dict(zip(column_names, row)) for row in cursor.fetchall()]
+        finally:
+            cursor.execute("DELETE FROM EXPLAIN_PLAN_TABLE WHERE STATEMENT_NAME = ?", (statement_name,))
+    
+    def _capture_plan_impl(self, db_config: Database, query: str,
+                           timeout: Optional[int] = None) -> Optional[QueryCostEstimate]:
+        """
+        Get the plan the server used for a query from its M_SQL_PLAN_CACHE entry.
+        Falls back to EXPLAIN PLAN on the statement if the entry was evicted or
+        the user cannot read the monitoring view.
+        
+        Args:
+            db_config: Database configuration
+            query: SQL query string
+            timeout: Optional timeout for obtaining the plan in seconds
+            
+        Returns:
+            QueryCostEstimate parsed from the cached or estimated plan
+        """
+        # The plan cache holds the statement text as it was prepared, i.e. after auto-parameterization
+        statement = query
+        if self.auto_parameterize and HANA_DRIVER:
+            statement, _ = parameterize_query(query)
+        
+        # STATEMENT_STRING is an NCLOB and cannot be compared with =, so match on
+        # STATEMENT_HASH, the MD5 hash of the statement text
+        statement_hash = hashlib.md5(statement.encode("utf-8")).hexdigest()
+        
+        plan_rows = None
+        try:
+            with self.get_connection(db_config) as connection:
+                with self._get_cursor(connection, timeout) as cursor:
+                    cursor.execute(
+                        "SELECT TOP 1 PLAN_ID FROM M_SQL_PLAN_CACHE WHERE LOWER(STATEMENT_HASH) = ? "
+                        "ORDER BY LAST_EXECUTION_TIMESTAMP DESC",
+                        (statement_hash,)
+                    )
+                    row = cursor.fetchone()
+                    if row:
+                        plan_rows = self._explain_plan_rows(cursor, f"SQL PLAN CACHE ENTRY {int(row[0])}")
+        except Exception as e:
+            logger.info(f"Could not read the SAP HANA plan cache, using the estimated plan: {str(e)}")
+        
+        if plan_rows:
+            estimate = parse_hana_explain_plan(plan_rows)
+            estimate.plan_source = "plan_cache"
+            return estimate
+        
+        return super()._capture_plan_impl(db_config, query, timeout)
+    
+    def _get_fetch_settings(self, db_config: Database) -> Tuple[int, int]:
+        """
+        Get the fetch size and LOB preview length of a database.
+        
+        Args:
+            db_config: Database configuration
+            
+        Returns:
+            Tuple of (fetch_size, lob_preview_length)
+        """
+        options = db_config.connection_config.options
+        fetch_size = int(options.get("fetch_size", self.DEFAULT_FETCH_SIZE))
+        lob_preview_length = int(options.get("lob_preview_length", self.DEFAULT_LOB_PREVIEW_LENGTH))
+        return max(fetch_size, 1), max(lob_preview_length, 0)
+    
+    @staticmethod
+    def _set_fetch_size(cursor: Any, fetch_size: int) -> None:
+        """
+        Set the number of rows hdbcli prefetches per round trip.
+        
+        Args:
+            cursor: Database cursor
+            fetch_size: Rows fetched per round trip
+        """
+        if hasattr(cursor, "setfetchsize"):
+            cursor.setfetchsize(fetch_size)
+        else:
+            cursor.arraysize = fetch_size
+    
+    @staticmethod
+    def _read_lob_preview(lob: Any, preview_length: int) -> Any:
+        """
+        Read the beginning of a LOB value.
+        Values longer than the preview length are replaced by a placeholder.
+        
+        Args:
+            lob: hdbcli LOB locator
+            preview_length: Characters (or bytes) to read
+            
+        Returns:
+            The full value if it fits the preview length, otherwise a LOB placeholder
+        """
+        try:
+            data = lob.read(preview_length + 1)
+        finally:
+            if hasattr(lob, "close"):
+                lob.close()
+        
+        if data is None or len(data) <= preview_length:
+            return data
+        
+        if isinstance(data, (bytes, bytearray)):
+            return make_lob_placeholder(None, binary=True, binary_prefix=data[:preview_length])
+        return make_lob_placeholder(data[:preview_length])
+    
+    def _read_lob(self, lob: Any) -> Any:
+        """
+        Read a LOB value completely in chunks.
+        
+        Args:
+            lob: hdbcli LOB locator
+            
+        Returns:
+            Full value as str or bytes
+        """
+        chunks = []
+        try:
+            while True:
+                chunk = lob.read(self.LOB_READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                if len(chunk) < self.LOB_READ_CHUNK_SIZE:
+                    break
+        finally:
+            if hasattr(lob, "close"):
+                lob.close()
+        
+        if chunks and isinstance(chunks[0], (bytes, bytearray)):
+            return b"".join(chunks)
+        return "".join(chunks)
+    
+    def _fetch_lob_value_impl(self, db_config: Database, query: str, row_index: int, column_name: str,
+                              row_key: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Read the full value of a result cell, streaming LOB values in chunks.
+        With a row key, only the keyed row is selected from the query (see _select_keyed_row),
+        so HANA can push the key predicate down to the table's primary key instead of returning
+        the whole result. Otherwise rows before the requested one are skipped in fetch size
+        batches without reading their LOBs.
+        
+        Args:
+            db_config: Database configuration
+            query: SQL query string
+            row_index: Zero-based row index of the cell (ignored if row_key is given)
+            column_name: Column name of the cell
+            row_key: Optional primary key values identifying the row
+            
+        Returns:
+            Full cell value
+        """
+        is_valid, error_message = self.validate_query(db_config, query)
+        if not is_valid:
+            raise ValueError(f"Invalid query: {error_message}")
+        
+        fetch_size, _ = self._get_fetch_settings(db_config)
+        
+        with self.get_connection(db_config) as connection:
+            with self._get_cursor(connection) as cursor:
+                if row_key:
+                    try:
+                        row = self._select_keyed_row(cursor, query, column_name, row_key)
+                    except Exception as e:
+                        # e.g. duplicate column names in the result; locate the row by scanning instead
+                        logger.warning(f"Keyed LOB read failed, scanning the query result instead: {self.format_error(e)}")
+                    else:
+                        if row is None:
+                            raise ValueError(f"Row with key {row_key} not found in query result")
+                        value = row[0]
+                        return self._read_lob(value) if hasattr(value, "read") else value
+                
+                cursor.execute(query)
+                column_names = [column[0] for column in cursor.description or []]
+                if column_name not in column_names:
+                    raise ValueError(f"Column {column_name} not found in query result")
+                column_index = column_names.index(column_name)
+                
+                self._set_fetch_size(cursor, fetch_size)
+                if row_key:
+                    # Find the row by its key instead of its position, which can change between executions
+                    key_indexes = self._get_row_key_indexes(column_names, row_key)
+                    while True:
+                        rows = cursor.fetchmany(fetch_size)
+                        for row in rows:
+                            if self._matches_row_key(row, key_indexes):
+                                value = row[column_index]
+                                return self._read_lob(value) if hasattr(value, "read") else value
+                        if len(rows) < fetch_size:
+                            raise ValueError(f"Row with key {row_key} not found in query result")
+                
+                remaining = row_index
+                while remaining >= fetch_size:
+                    skipped = cursor.fetchmany(fetch_size)
+                    if len(skipped) < fetch_size:
+                        raise ValueError(f"Row {row_index} not found in query result")
+                    remaining -= len(skipped)
+                
+                rows = cursor.fetchmany(remaining + 1)
+                if len(rows) <= remaining:
+                    raise ValueError(f"Row {row_index} not found in query result")
+                
+                value = rows[remaining][column_index]
+                return self._read_lob(value) if hasattr(value, "read") else value
+    
+    @staticmethod
+    def _quote_identifier(name: str) -> str:
+        """
+        Quote a result column name as a HANA delimited identifier.
+        
+        Args:
+            name: Column name as reported by the cursor
+            
+        Returns:
+            Delimited identifier
+        """
+        return '"' + name.replace('"', '""') + '"'
+    
+    def _select_keyed_row(self, cursor: Any, query: str, column_name: str,
+                          row_key: Dict[str, Any]) -> Optional[Any]:
+        """
+        Select one cell of the row with the given primary key values from a query.
+        The query is wrapped as a derived table filtered on the key columns with bound parameters.
+        
+        Args:
+            cursor: Database cursor
+            query: SQL query that produced the result
+            column_name: Column name of the cell
+            row_key: Primary key values identifying the row
+            
+        Returns:
+            Row holding only the cell, or None if no row has the key
+        """
+        conditions = " AND ".join(f"{self._quote_identifier(name)} = ?" for name in row_key)
+        keyed_query = (
+            f"SELECT {self._quote_identifier(column_name)} "
+            f"FROM ({query.strip().rstrip(';')}) AS LOB_SOURCE WHERE {conditions}"
+        )
+        cursor.execute(keyed_query, list(row_key.values()))
+        rows = cursor.fetchmany(1)
+        return rows[0] if rows else None
+    
+    def _get_prepared_statement(self, connection: Any, statement: str) -> Any:
+        """
+        Get a prepared statement cursor for a connection, preparing it if needed.
+        
+        Args:
+            connection: Database connection
+            statement: Parameterized SQL statement
+            
+        Returns:
+            Cursor with the prepared statement
+        """
+        prepared = self.statement_cache.get(connection, statement)
+        if prepared is None:
+            prepared = connection.cursor()
+            prepared.prepare(statement)
+            self.statement_cache.put(connection, statement, prepared)
+        
+        return prepared
+    
     def _cancel_query_internal(self, connection: Any, query_id: str) -> bool:
         """
         Internal method to cancel a running query.
@@ -484,13 +913,29 @@ class HANAConnector(DBConnector):
         backoff.expo,
         Exception,
         max_tries=MAX_RETRY_ATTEMPTS,
-        giveup=lambda e: not isinstance(e, Exception) or not HANAConnector._is_transient_error(HANAConnector, e),
+        giveup=lambda e: not isinstance(e, Exception) or isinstance(e, ResilienceError) or not HANAConnector._is_transient_error(HANAConnector, e),
         factor=RETRY_DELAY
     )
     def get_schema(self, db_config: Database) -> DatabaseSchema:
         """
         Get the SAP HANA database schema with retry logic for transient errors.
         
+        Args:
+            db_config: Database configuration
+            
+        Returns:
+            DatabaseSchema object containing the database schema
+        """
+        try:
+            return self._get_schema_impl(db_config)
+        except Exception as e:
+            self._check_retry_budget(db_config.id, e)
+            raise
+    
+    def _get_schema_impl(self, db_config: Database) -> DatabaseSchema:
+        """
+        Read the SAP HANA database schema.
+        
         Args:
             db_config: Database configuration
             
@@ -24,6 +24,13 @@ try:
 except ImportError:
     HANA_AVAILABLE = False
 
+try:
+    # Local stand-in for offline tests and benchmarks, only needs the standard library
+    from sql_agent.backend.db.connectors.sqlite import SQLiteConnector
+    SQLITE_AVAILABLE = True
+except ImportError:
+    SQLITE_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 def init_db_connectors(config: Optional[Dict[str, Any]] = None) -> None:
@@ -60,6 +67,12 @@ def init_db_connectors(config: Optional[Dict[str, Any]] = None) -> None:
     else:
         logger.warning("SAP HANA connector not available")
     
+    if SQLITE_AVAILABLE:
+        connector_factory.register_connector(DBType.SQLITE.value, SQLiteConnector)
+        logger.info("Registered SQLite connector")
+    else:
+        logger.warning("SQLite connector not available")
+    
     logger.info("Database connectors initialized")
 
 def get_connector_factory():
@@ -24,10 +24,14 @@ except ImportError:
         MSSQL_DRIVER = None
 
 from sql_agent.backend.models.database import Database, DatabaseSchema, Schema, Table, Column, ForeignKey
-from sql_agent.backend.models.query import QueryResult, ResultColumn
+from sql_agent.backend.models.query import QueryResult, ResultColumn, QueryCostEstimate
 from sql_agent.backend.db.connectors.base import DBConnector, ConnectionPoolManager
+from sql_agent.backend.db.connectors.circuit_breaker import ResilienceError
 from sql_agent.backend.db.connectors.query_executor import QueryResultProcessor, QueryExecutionTracker
 from sql_agent.backend.db.connectors.sql_validator import SQLValidator
+from sql_agent.backend.db.connectors.cost_estimator import parse_showplan_xml
+from sql_agent.backend.db.connectors.query_parameterizer import build_sp_executesql, parameterize_query
+from sql_agent.backend.utils.query_timing import timed_phase
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +76,44 @@ class MSSQLConnector(DBConnector):
         "connection is broken"
     ]
     
+    # Error codes that mean the server could not be reached (as opposed to failed queries)
+    CONNECTION_ERROR_CODES = {53, 233, 10053, 10054, 10060, 10061, 40143, 40197, 40613}
+    
+    # Error messages that mean the server could not be reached
+    CONNECTION_ERROR_MESSAGES = [
+        "connection reset",
+        "connection forcibly closed",
+        "socket closed",
+        "transport-level error",
+        "communication link failure",
+        "connection is broken",
+        "database is under recovery",
+        "login timeout expired",
+        "unable to connect"
+    ]
+    
+    # Whether inline literals are lifted into sp_executesql parameters (pyodbc only)
+    AUTO_PARAMETERIZE = True
+    
+    # Session options applied once to every new connection, sent as a single batch
+    SESSION_INIT_SQL = (
+        "SET ARITHABORT ON; SET ANSI_NULLS ON; SET ANSI_WARNINGS ON; "
+        "SET QUOTED_IDENTIFIER ON; SET CONCAT_NULL_YIELDS_NULL ON;"
+    )
+    
+    # Session reset for connections whose state was changed by a query, sent as a single batch
+    SESSION_RESET_SQL = "IF @@TRANCOUNT > 0 ROLLBACK TRANSACTION; SET QUERY_GOVERNOR_COST_LIMIT 0;"
+    
+    # Most recently used cached plan of a statement (requires VIEW SERVER STATE)
+    PLAN_CACHE_SQL = (
+        "SELECT TOP 1 CAST(qp.query_plan AS NVARCHAR(MAX)) "
+        "FROM sys.dm_exec_query_stats AS qs "
+        "CROSS APPLY sys.dm_exec_sql_text(qs.sql_handle) AS st "
+        "CROSS APPLY sys.dm_exec_query_plan(qs.plan_handle) AS qp "
+        "WHERE st.text LIKE ? AND st.text NOT LIKE '%dm_exec_query_stats%' AND qp.query_plan IS NOT NULL "
+        "ORDER BY qs.last_execution_time DESC"
+    )
+    
     def __init__(self, connection_pool_manager: ConnectionPoolManager):
         """
         Initialize the MS-SQL database connector.
@@ -83,10 +125,13 @@ class MSSQLConnector(DBConnector):
         self.query_processor = QueryResultProcessor()
         self.sql_validator = SQLValidator()
         self.query_tracker = QueryExecutionTracker()
+        self.auto_parameterize = self.AUTO_PARAMETERIZE
         
         # Register connection creator and validator with the pool manager
         connection_pool_manager.register_connection_creator("mssql", self._create_connection)
         connection_pool_manager.register_connection_validator("mssql", self._validate_connection)
+        connection_pool_manager.register_lifecycle_hook("mssql", "on_create", self._init_session)
+        connection_pool_manager.register_lifecycle_hook("mssql", "on_return", self._reset_session)
     
     def _is_transient_error(self, error: Exception) -> bool:
         """
@@ -112,11 +157,32 @@ class MSSQLConnector(DBConnector):
         
         return False
     
+    def _is_connection_error(self, error: Exception) -> bool:
+        """
+        Check if an error means the server could not be reached.
+        
+        Args:
+            error: Exception object
+            
+        Returns:
+            True if the error is a connection-level error, False otherwise
+        """
+        if hasattr(error, 'args') and len(error.args) > 0:
+            code = error.args[0]
+            # pymssql reports error numbers, pyodbc reports SQLSTATEs (class 08 is connection exception)
+            if isinstance(code, int) and code in self.CONNECTION_ERROR_CODES:
+                return True
+            if isinstance(code, str) and code.startswith("08"):
+                return True
+        
+        error_str = str(error).lower()
+        return any(message in error_str for message in self.CONNECTION_ERROR_MESSAGES)
+    
     @backoff.on_exception(
         backoff.expo,
         Exception,
         max_tries=MAX_RETRY_ATTEMPTS,
-        giveup=lambda e: not isinstance(e, Exception) or not MSSQLConnector._is_transient_error(MSSQLConnector, e),
+        giveup=lambda e: not isinstance(e, Exception) or isinstance(e, ResilienceError) or not MSSQLConnector._is_transient_error(MSSQLConnector, e),
         factor=RETRY_DELAY
     )
     def _create_connection(self, db_config: Database) -> Any:
@@ -164,15 +230,6 @@ class MSSQLConnector(DBConnector):
                 
                 connection = pyodbc.connect(conn_str)
                 
-                # Configure connection settings
-                cursor = connection.cursor()
-                cursor.execute("SET ARITHABORT ON")
-                cursor.execute("SET ANSI_NULLS ON")
-                cursor.execute("SET ANSI_WARNINGS ON")
-                cursor.execute("SET QUOTED_IDENTIFIER ON")
-                cursor.execute("SET CONCAT_NULL_YIELDS_NULL ON")
-                cursor.close()
-                
             else:  # pymssql
                 # Default options for pymssql
                 options = {
@@ -200,8 +257,37 @@ class MSSQLConnector(DBConnector):
         except Exception as e:
             logger.error(f"Failed to create MS-SQL connection: {str(e)}")
             # Re-raise the exception to trigger retry if it's a transient error
+            # and the database's retry budget allows it
+            self._check_retry_budget(db_config.id, e)
             raise
     
+    def _init_session(self, connection: Any) -> None:
+        """
+        Configure session settings of a new connection (pool on_create hook).
+        
+        Args:
+            connection: MS-SQL connection object
+        """
+        cursor = connection.cursor()
+        try:
+            cursor.execute(self.SESSION_INIT_SQL)
+        finally:
+            cursor.close()
+    
+    def _reset_session(self, connection: Any) -> None:
+        """
+        Reset session state changed by a query before the connection is reused
+        (pool on_return hook, only called for dirty sessions).
+        
+        Args:
+            connection: MS-SQL connection object
+        """
+        cursor = connection.cursor()
+        try:
+            cursor.execute(self.SESSION_RESET_SQL)
+        finally:
+            cursor.close()
+    
     def _validate_connection(self, connection: Any) -> bool:
         """
         Validate that a MS-SQL connection is still valid.
@@ -227,7 +313,7 @@ class MSSQLConnector(DBConnector):
         backoff.expo,
         Exception,
         max_tries=MAX_RETRY_ATTEMPTS,
-        giveup=lambda e: not isinstance(e, Exception) or not MSSQLConnector._is_transient_error(MSSQLConnector, e),
+        giveup=lambda e: not isinstance(e, Exception) or isinstance(e, ResilienceError) or not MSSQLConnector._is_transient_error(MSSQLConnector, e),
         factor=RETRY_DELAY
     )
     def test_connection(self, db_config: Database) -> Tuple[bool, Optional[str]]:
@@ -278,6 +364,7 @@ class MSSQLConnector(DBConnector):
                     cursor.timeout = timeout
                 else:  # pymssql
                     cursor.execute(f"SET QUERY_GOVERNOR_COST_LIMIT {timeout * 1000}")
+                    self.connection_pool_manager.mark_session_dirty(connection)
             
             yield cursor
         finally:
@@ -303,7 +390,8 @@ class MSSQLConnector(DBConnector):
             Exception: If query execution fails after retries
         """
         # Validate the query
-        is_valid, error_message = self.validate_query(db_config, query)
+        with timed_phase("validation"):
+            is_valid, error_message = self.validate_query(db_config, query)
         if not is_valid:
             raise ValueError(f"Invalid query: {error_message}")
         
@@ -322,7 +410,7 @@ class MSSQLConnector(DBConnector):
             try:
                 # Execute the query with retry logic for transient errors
                 return self._execute_query_with_retry(
-                    connection, query, params, timeout, max_rows, query_id
+                    connection, query, params, timeout, max_rows, query_id, db_id=db_config.id
                 )
             except Exception as e:
                 logger.error(f"Error executing MS-SQL query: {str(e)}")
@@ -335,11 +423,12 @@ class MSSQLConnector(DBConnector):
         backoff.expo,
         Exception,
         max_tries=MAX_RETRY_ATTEMPTS,
-        giveup=lambda e: not isinstance(e, Exception) or not MSSQLConnector._is_transient_error(MSSQLConnector, e),
+        giveup=lambda e: not isinstance(e, Exception) or isinstance(e, ResilienceError) or not MSSQLConnector._is_transient_error(MSSQLConnector, e),
         factor=RETRY_DELAY
     )
     def _execute_query_with_retry(self, connection: Any, query: str, params: Optional[Dict[str, Any]], 
-                                timeout: Optional[int], max_rows: Optional[int], query_id: str) -> QueryResult:
+                                timeout: Optional[int], max_rows: Optional[int], query_id: str,
+                                db_id: Optional[str] = None) -> QueryResult:
         """
         Execute a SQL query with retry logic for transient errors.
         
@@ -350,6 +439,7 @@ class MSSQLConnector(DBConnector):
             timeout: Optional query timeout in seconds
             max_rows: Optional maximum number of rows to return
             query_id: Query identifier
+            db_id: Optional database identifier whose retry budget is charged for retries
             
         Returns:
             QueryResult object containing the query results
@@ -359,26 +449,37 @@ class MSSQLConnector(DBConnector):
             start_time = time.time()
             
             try:
-                if params:
-                    # Convert named parameters to positional parameters if using pyodbc
-                    if MSSQL_DRIVER == "pyodbc":
-                        # Extract parameter names from the query
-                        param_names = re.findall(r':(\w+)', query)
-                        
-                        # Replace named parameters with ? placeholders
-                        query_with_placeholders = re.sub(r':(\w+)', '?', query)
-                        
-                        # Create a list of parameter values in the correct order
-                        param_values = [params[name] for name in param_names]
-                        
-                        cursor.execute(query_with_placeholders, param_values)
+                with timed_phase("server_execution"):
+                    if params:
+                        # Convert named parameters to positional parameters if using pyodbc
+                        if MSSQL_DRIVER == "pyodbc":
+                            # Extract parameter names from the query
+                            param_names = re.findall(r':(\w+)', query)
+                            
+                            # Replace named parameters with ? placeholders
+                            query_with_placeholders = re.sub(r':(\w+)', '?', query)
+                            
+                            # Create a list of parameter values in the correct order
+                            param_values = [params[name] for name in param_names]
+                            
+                            cursor.execute(query_with_placeholders, param_values)
+                        else:
+                            cursor.execute(query, params)
                     else:
-                        cursor.execute(query, params)
-                else:
-                    cursor.execute(query)
+                        # Lift inline literals into typed sp_executesql parameters so that
+                        # literal variants of the same query share one cached server plan
+                        rewritten = None
+                        if self.auto_parameterize and MSSQL_DRIVER == "pyodbc":
+                            rewritten = build_sp_executesql(query)
+                        
+                        if rewritten:
+                            cursor.execute(rewritten[0], rewritten[1])
+                        else:
+                            cursor.execute(query)
                 
                 # Process the results
-                result = self.query_processor.process_result(cursor, query, max_rows)
+                with timed_phase("fetch"):
+                    result = self.query_processor.process_result(cursor, query, max_rows)
                 result.query_id = query_id
                 
                 execution_time = time.time() - start_time
@@ -392,12 +493,89 @@ class MSSQLConnector(DBConnector):
                 
                 # Check if this is a transient error that can be retried
                 if self._is_transient_error(e):
+                    self._check_retry_budget(db_id, e)
                     logger.info(f"Transient error detected, will retry: {str(e)}")
                     raise  # Re-raise to trigger retry
                 else:
                     # Non-transient error, format and raise
                     raise type(e)(self.format_error(e))
     
+    def _explain_query_impl(self, db_config: Database, query: str,
+                            timeout: Optional[int] = None) -> Optional[QueryCostEstimate]:
+        """
+        Estimate the cost of a query with SET SHOWPLAN_XML ON.
+        The query is compiled but not executed while showplan is enabled.
+        
+        Args:
+            db_config: Database configuration
+            query: SQL query string
+            timeout: Optional timeout for obtaining the plan in seconds
+            
+        Returns:
+            QueryCostEstimate parsed from the showplan XML
+        """
+        is_valid, error_message = self.validate_query(db_config, query)
+        if not is_valid:
+            raise ValueError(f"Invalid query: {error_message}")
+        
+        with self.get_connection(db_config) as connection:
+            with self._get_cursor(connection, timeout) as cursor:
+                # SET SHOWPLAN_XML must be the only statement in its batch
+                cursor.execute("SET SHOWPLAN_XML ON")
+                try:
+                    cursor.execute(query)
+                    plan_parts = [row[0] for row in cursor.fetchall()]
+                finally:
+                    try:
+                        cursor.execute("SET SHOWPLAN_XML OFF")
+                    except Exception as e:
+                        # A connection left in showplan mode would only compile queries, never run them
+                        logger.warning(f"Could not turn off SHOWPLAN_XML, closing the connection: {str(e)}")
+                        self.connection_pool_manager.invalidate_connection(connection, db_config.id)
+        
+        if not plan_parts:
+            return None
+        
+        return parse_showplan_xml("".join(plan_parts))
+    
+    def _capture_plan_impl(self, db_config: Database, query: str,
+                           timeout: Optional[int] = None) -> Optional[QueryCostEstimate]:
+        """
+        Get the plan the server used for a query from sys.dm_exec_query_plan.
+        Falls back to the estimated showplan if the plan was evicted or the
+        login lacks VIEW SERVER STATE.
+        
+        Args:
+            db_config: Database configuration
+            query: SQL query string
+            timeout: Optional timeout for obtaining the plan in seconds
+            
+        Returns:
+            QueryCostEstimate parsed from the cached or estimated showplan XML
+        """
+        # The plan cache holds the statement text as it was sent, i.e. after auto-parameterization
+        statement = query
+        if self.auto_parameterize and MSSQL_DRIVER == "pyodbc":
+            statement, _ = parameterize_query(query, placeholder=lambda index: f"@p{index}")
+        pattern = "%" + re.sub(r"([\[%_])", r"[\1]", statement.strip().rstrip(";")) + "%"
+        
+        plan_xml = None
+        try:
+            with self.get_connection(db_config) as connection:
+                with self._get_cursor(connection, timeout) as cursor:
+                    cursor.execute(self.PLAN_CACHE_SQL, (pattern,))
+                    row = cursor.fetchone()
+                    plan_xml = row[0] if row else None
+        except Exception as e:
+            logger.info(f"Could not read the MS-SQL plan cache, using the estimated plan: {str(e)}")
+        
+        if plan_xml:
+            estimate = parse_showplan_xml(plan_xml)
+            estimate.plan_source = "plan_cache"
+            return estimate
+        
+        return super()._capture_plan_impl(db_config, query, timeout)
+    
     def _cancel_query_internal(self, connection: Any, query_id: str) -> bool:
         """
         Internal method to cancel a running query.
@@ -443,13 +621,29 @@ class MSSQLConnector(DBConnector):
         backoff.expo,
         Exception,
         max_tries=MAX_RETRY_ATTEMPTS,
-        giveup=lambda e: not isinstance(e, Exception) or not MSSQLConnector._is_transient_error(MSSQLConnector, e),
+        giveup=lambda e: not isinstance(e, Exception) or isinstance(e, ResilienceError) or not MSSQLConnector._is_transient_error(MSSQLConnector, e),
         factor=RETRY_DELAY
     )
     def get_schema(self, db_config: Database) -> DatabaseSchema:
         """
         Get the MS-SQL database schema with retry logic for transient errors.
         
+        Args:
+            db_config: Database configuration
+            
+        Returns:
+            DatabaseSchema object containing the database schema
+        """
+        try:
+            return self._get_schema_impl(db_config)
+        except Exception as e:
+            self._check_retry_budget(db_config.id, e)
+            raise
+    
+    def _get_schema_impl(self, db_config: Database) -> DatabaseSchema:
+        """
+        Read the MS-SQL database schema.
+        
         Args:
             db_config: Database configuration
             
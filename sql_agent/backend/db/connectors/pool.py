@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 
 from sql_agent.backend.models.database import Database
 from sql_agent.backend.db.connectors.base import ConnectionPoolManager
+from sql_agent.backend.db.connectors.circuit_breaker import CircuitBreaker, RetryBudget
 
 logger = logging.getLogger(__name__)
 
@@ -17,13 +18,16 @@ class PooledConnection:
     """
     Wrapper for a database connection with metadata for pool management.
     """
-    def __init__(self, connection: Any, db_id: str):
+    def __init__(self, connection: Any, db_id: str, db_type: Optional[str] = None):
         self.connection = connection
         self.db_id = db_id
+        self.db_type = db_type
         self.created_at = datetime.now()
         self.last_used_at = datetime.now()
         self.in_use = False
         self.use_count = 0
+        self.session_dirty = False  # Session state was changed and must be reset on return
+        self.invalid = False  # Connection is in an unusable state and must be closed on return
 
 class DefaultConnectionPoolManager(ConnectionPoolManager):
     """
@@ -33,11 +37,18 @@ class DefaultConnectionPoolManager(ConnectionPoolManager):
     - Connection pooling with configurable pool size
     - Connection reuse and timeout
     - Connection health check
+    - Lifecycle hooks (on_create, on_checkout, on_return) with latency statistics
+    - Per-database circuit breaker and retry budget
     - Pool statistics
     """
     
+    # Supported lifecycle hook events
+    LIFECYCLE_EVENTS = ("on_create", "on_checkout", "on_return")
+    
     def __init__(self, max_pool_size: int = 10, connection_timeout: int = 600, 
-                 max_connection_age: int = 3600):
+                 max_connection_age: int = 3600, failure_threshold: int = 5,
+                 recovery_timeout: float = 30.0, retry_budget_capacity: float = 10.0,
+                 retry_budget_refill_rate: float = 1.0):
         """
         Initialize the connection pool manager.
         
@@ -45,6 +56,10 @@ class DefaultConnectionPoolManager(ConnectionPoolManager):
             max_pool_size: Maximum number of connections per database
             connection_timeout: Connection idle timeout in seconds
             max_connection_age: Maximum connection age in seconds
+            failure_threshold: Consecutive transient failures after which a database's circuit opens
+            recovery_timeout: Seconds an open circuit rejects requests before probing the database
+            retry_budget_capacity: Maximum burst of retries per database
+            retry_budget_refill_rate: Retries per second added to each database's budget
         """
         self.pools: Dict[str, List[PooledConnection]] = {}  # db_id -> list of connections
         self.max_pool_size = max_pool_size
@@ -53,6 +68,16 @@ class DefaultConnectionPoolManager(ConnectionPoolManager):
         self.lock = Lock()
         self.connection_creators: Dict[str, callable] = {}  # db_type -> connection creator function
         self.connection_validators: Dict[str, callable] = {}  # db_type -> connection validator function
+        self.lifecycle_hooks: Dict[str, Dict[str, callable]] = {}  # db_type -> event -> hook function
+        self.hook_stats: Dict[str, Dict[str, Dict[str, float]]] = {}  # db_id -> event -> latency statistics
+        self._stats_lock = Lock()
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.retry_budget_capacity = retry_budget_capacity
+        self.retry_budget_refill_rate = retry_budget_refill_rate
+        self.circuit_breakers: Dict[str, CircuitBreaker] = {}  # db_id -> circuit breaker
+        self.retry_budgets: Dict[str, RetryBudget] = {}  # db_id -> retry budget
+        self._resilience_lock = Lock()
     
     def register_connection_creator(self, db_type: str, creator_func: callable) -> None:
         """
@@ -74,6 +99,189 @@ class DefaultConnectionPoolManager(ConnectionPoolManager):
         """
         self.connection_validators[db_type] = validator_func
     
+    def register_lifecycle_hook(self, db_type: str, event: str, hook_func: callable) -> None:
+        """
+        Register a connection lifecycle hook for a database type.
+        
+        - on_create: called once after a new connection is created (e.g. session initialization)
+        - on_checkout: called every time a connection is handed out
+        - on_return: called when a connection whose session was marked dirty is released
+        
+        Args:
+            db_type: Database type (e.g., 'mssql', 'hana')
+            event: Lifecycle event name
+            hook_func: Function that receives the connection
+            
+        Raises:
+            ValueError: If the event is not supported
+        """
+        if event not in self.LIFECYCLE_EVENTS:
+            raise ValueError(f"Unsupported lifecycle event: {event}")
+        
+        self.lifecycle_hooks.setdefault(db_type, {})[event] = hook_func
+    
+    def _run_hook(self, event: str, pooled_conn: PooledConnection) -> None:
+        """
+        Run a lifecycle hook for a connection and record its latency.
+        
+        Args:
+            event: Lifecycle event name
+            pooled_conn: Pooled connection
+            
+        Raises:
+            Exception: If the hook fails
+        """
+        hook_func = self.lifecycle_hooks.get(pooled_conn.db_type, {}).get(event)
+        if hook_func is None:
+            return
+        
+        start_time = time.perf_counter()
+        failed = False
+        try:
+            hook_func(pooled_conn.connection)
+        except Exception as e:
+            failed = True
+            logger.warning(f"Connection {event} hook failed for database {pooled_conn.db_id}: {str(e)}")
+            raise
+        finally:
+            self._record_hook_latency(pooled_conn.db_id, event, (time.perf_counter() - start_time) * 1000, failed)
+    
+    def _record_hook_latency(self, db_id: str, event: str, latency_ms: float, failed: bool) -> None:
+        """
+        Record the latency of a lifecycle hook call.
+        
+        Args:
+            db_id: Database identifier
+            event: Lifecycle event name
+            latency_ms: Hook latency in milliseconds
+            failed: Whether the hook raised an exception
+        """
+        with self._stats_lock:
+            event_stats = self.hook_stats.setdefault(db_id, {}).setdefault(
+                event, {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            event_stats["count"] += 1
+            event_stats["total_ms"] += latency_ms
+            event_stats["max_ms"] = max(event_stats["max_ms"], latency_ms)
+            if failed:
+                event_stats["errors"] += 1
+    
+    def _get_hook_stats(self, db_id: str) -> Dict[str, Dict[str, float]]:
+        """
+        Get lifecycle hook latency statistics for a database.
+        
+        Args:
+            db_id: Database identifier
+            
+        Returns:
+            Dictionary of event -> count, errors, avg_ms, max_ms
+        """
+        with self._stats_lock:
+            return {
+                event: {
+                    "count": event_stats["count"],
+                    "errors": event_stats["errors"],
+                    "avg_ms": event_stats["total_ms"] / event_stats["count"] if event_stats["count"] else 0.0,
+                    "max_ms": event_stats["max_ms"]
+                }
+                for event, event_stats in self.hook_stats.get(db_id, {}).items()
+            }
+    
+    def get_circuit_breaker(self, db_id: str) -> CircuitBreaker:
+        """
+        Get the circuit breaker of a database, creating it on first use.
+        
+        Args:
+            db_id: Database identifier
+            
+        Returns:
+            CircuitBreaker for the database
+        """
+        with self._resilience_lock:
+            breaker = self.circuit_breakers.get(db_id)
+            if breaker is None:
+                breaker = CircuitBreaker(db_id, self.failure_threshold, self.recovery_timeout)
+                self.circuit_breakers[db_id] = breaker
+            return breaker
+    
+    def get_retry_budget(self, db_id: str) -> RetryBudget:
+        """
+        Get the retry budget of a database, creating it on first use.
+        
+        Args:
+            db_id: Database identifier
+            
+        Returns:
+            RetryBudget shared by all requests to the database
+        """
+        with self._resilience_lock:
+            budget = self.retry_budgets.get(db_id)
+            if budget is None:
+                budget = RetryBudget(self.retry_budget_capacity, self.retry_budget_refill_rate)
+                self.retry_budgets[db_id] = budget
+            return budget
+    
+    def record_success(self, db_id: str) -> None:
+        """
+        Record that a request to a database completed.
+        
+        Args:
+            db_id: Database identifier
+        """
+        self.get_circuit_breaker(db_id).record_success()
+    
+    def record_failure(self, db_id: str) -> None:
+        """
+        Record that a request to a database failed with a transient error.
+        
+        Args:
+            db_id: Database identifier
+        """
+        self.get_circuit_breaker(db_id).record_failure()
+    
+    def try_acquire_retry(self, db_id: str) -> bool:
+        """
+        Take a token from the retry budget of a database.
+        
+        Args:
+            db_id: Database identifier
+            
+        Returns:
+            True if the retry may be made, False if the budget is exhausted
+        """
+        return self.get_retry_budget(db_id).try_acquire()
+    
+    def _get_resilience_stats(self, db_id: str) -> Dict[str, Any]:
+        """
+        Get circuit breaker and retry budget statistics for a database.
+        
+        Args:
+            db_id: Database identifier
+            
+        Returns:
+            Dictionary with circuit_breaker and retry_budget states
+        """
+        return {
+            "circuit_breaker": self.get_circuit_breaker(db_id).get_state(),
+            "retry_budget": self.get_retry_budget(db_id).get_state()
+        }
+    
+    def _discard_connection(self, pooled_conn: PooledConnection) -> None:
+        """
+        Remove a connection from its pool and close it.
+        
+        Args:
+            pooled_conn: Pooled connection
+        """
+        with self.lock:
+            if pooled_conn in self.pools.get(pooled_conn.db_id, []):
+                self.pools[pooled_conn.db_id].remove(pooled_conn)
+        
+        try:
+            pooled_conn.connection.close()
+        except Exception as e:
+            logger.warning(f"Error closing connection: {str(e)}")
+    
     def _create_new_connection(self, db_config: Database) -> Any:
         """
         Create a new database connection.
@@ -126,8 +334,38 @@ class DefaultConnectionPoolManager(ConnectionPoolManager):
             
         Returns:
             Database connection object
+            
+        Raises:
+            CircuitOpenError: If the circuit of the database is open
+        """
+        # Fail fast while the database is known to be unavailable
+        self.get_circuit_breaker(db_config.id).allow_request()
+        
+        pooled_conn, created = self._acquire_connection(db_config)
+        
+        try:
+            self._run_hook("on_checkout", pooled_conn)
+        except Exception:
+            self._discard_connection(pooled_conn)
+            if created:
+                raise
+            # Try another pooled connection (or a new one)
+            return self.get_connection(db_config)
+        
+        return pooled_conn.connection
+    
+    def _acquire_connection(self, db_config: Database) -> Tuple[PooledConnection, bool]:
+        """
+        Reserve an idle pooled connection or create a new one.
+        
+        Args:
+            db_config: Database configuration
+            
+        Returns:
+            Tuple of (pooled connection, whether it was newly created)
         """
         db_id = db_config.id
+        db_type = db_config.type.value
         
         with self.lock:
             # Initialize pool for this database if it doesn't exist
@@ -138,14 +376,14 @@ class DefaultConnectionPoolManager(ConnectionPoolManager):
             self._cleanup_expired_connections(db_id)
             
             # Try to find an available connection in the pool
-            for pooled_conn in self.pools[db_id]:
+            for pooled_conn in list(self.pools[db_id]):
                 if not pooled_conn.in_use:
                     # Check if the connection is still valid
                     if self._is_connection_valid(pooled_conn.connection, db_config):
                         pooled_conn.in_use = True
                         pooled_conn.last_used_at = datetime.now()
                         pooled_conn.use_count += 1
-                        return pooled_conn.connection
+                        return pooled_conn, False
                     else:
                         # Remove invalid connection from the pool
                         self.pools[db_id].remove(pooled_conn)
@@ -156,14 +394,27 @@ class DefaultConnectionPoolManager(ConnectionPoolManager):
                 # Create a new connection
                 try:
                     new_connection = self._create_new_connection(db_config)
-                    pooled_conn = PooledConnection(new_connection, db_id)
-                    pooled_conn.in_use = True
-                    pooled_conn.use_count = 1
-                    self.pools[db_id].append(pooled_conn)
-                    return new_connection
+                    pooled_conn = PooledConnection(new_connection, db_id, db_type)
                 except Exception as e:
                     logger.error(f"Failed to create new connection for database {db_id}: {str(e)}")
+                    self.record_failure(db_id)
                     raise
+                
+                # Initialize the session before the connection joins the pool
+                try:
+                    self._run_hook("on_create", pooled_conn)
+                except Exception:
+                    self.record_failure(db_id)
+                    try:
+                        new_connection.close()
+                    except Exception as e:
+                        logger.warning(f"Error closing connection: {str(e)}")
+                    raise
+                
+                pooled_conn.in_use = True
+                pooled_conn.use_count = 1
+                self.pools[db_id].append(pooled_conn)
+                return pooled_conn, True
             else:
                 # Pool is full, wait for a connection to become available
                 logger.warning(f"Connection pool for database {db_id} is full")
@@ -172,6 +423,8 @@ class DefaultConnectionPoolManager(ConnectionPoolManager):
     def release_connection(self, connection: Any, db_id: str) -> None:
         """
         Release a connection back to the pool.
+        Connections whose session was marked dirty are reset with the on_return hook first;
+        if the reset fails, or the connection was invalidated, it is closed instead of being reused.
         
         Args:
             connection: Database connection object
@@ -182,13 +435,63 @@ class DefaultConnectionPoolManager(ConnectionPoolManager):
                 logger.warning(f"Attempted to release connection for unknown database: {db_id}")
                 return
             
-            for pooled_conn in self.pools[db_id]:
-                if pooled_conn.connection == connection:
-                    pooled_conn.in_use = False
-                    pooled_conn.last_used_at = datetime.now()
-                    return
+            pooled_conn = next((conn for conn in self.pools[db_id] if conn.connection == connection), None)
+            if pooled_conn is None:
+                logger.warning(f"Attempted to release unknown connection for database: {db_id}")
+                return
             
-            logger.warning(f"Attempted to release unknown connection for database: {db_id}")
+            if not pooled_conn.session_dirty and not pooled_conn.invalid:
+                pooled_conn.in_use = False
+                pooled_conn.last_used_at = datetime.now()
+                return
+        
+        if pooled_conn.invalid:
+            self._discard_connection(pooled_conn)
+            return
+        
+        # Reset the session outside the pool lock
+        try:
+            self._run_hook("on_return", pooled_conn)
+        except Exception:
+            self._discard_connection(pooled_conn)
+            return
+        
+        with self.lock:
+            pooled_conn.session_dirty = False
+            pooled_conn.in_use = False
+            pooled_conn.last_used_at = datetime.now()
+    
+    def mark_session_dirty(self, connection: Any, db_id: Optional[str] = None) -> None:
+        """
+        Mark a connection's session state as changed so that it is reset on return.
+        
+        Args:
+            connection: Database connection object
+            db_id: Optional database identifier. If None, all pools are searched.
+        """
+        with self.lock:
+            pools = [self.pools.get(db_id, [])] if db_id is not None else list(self.pools.values())
+            for connections in pools:
+                for pooled_conn in connections:
+                    if pooled_conn.connection == connection:
+                        pooled_conn.session_dirty = True
+                        return
+    
+    def invalidate_connection(self, connection: Any, db_id: Optional[str] = None) -> None:
+        """
+        Mark a connection as unusable so that it is closed on return.
+        
+        Args:
+            connection: Database connection object
+            db_id: Optional database identifier. If None, all pools are searched.
+        """
+        with self.lock:
+            pools = [self.pools.get(db_id, [])] if db_id is not None else list(self.pools.values())
+            for connections in pools:
+                for pooled_conn in connections:
+                    if pooled_conn.connection == connection:
+                        pooled_conn.invalid = True
+                        return
     
     def close_all_connections(self, db_id: Optional[str] = None) -> None:
         """
@@ -241,7 +544,9 @@ class DefaultConnectionPoolManager(ConnectionPoolManager):
                         "total_connections": total_connections,
                         "active_connections": active_connections,
                         "idle_connections": idle_connections,
-                        "pool_utilization": active_connections / self.max_pool_size if self.max_pool_size > 0 else 0
+                        "pool_utilization": active_connections / self.max_pool_size if self.max_pool_size > 0 else 0,
+                        "hooks": self._get_hook_stats(db_id),
+                        **self._get_resilience_stats(db_id)
                     }
             else:
                 # Get stats for all databases
@@ -254,7 +559,9 @@ class DefaultConnectionPoolManager(ConnectionPoolManager):
                         "total_connections": total_connections,
                         "active_connections": active_connections,
                         "idle_connections": idle_connections,
-                        "pool_utilization": active_connections / self.max_pool_size if self.max_pool_size > 0 else 0
+                        "pool_utilization": active_connections / self.max_pool_size if self.max_pool_size > 0 else 0,
+                        "hooks": self._get_hook_stats(db_id),
+                        **self._get_resilience_stats(db_id)
                     }
             
             return stats
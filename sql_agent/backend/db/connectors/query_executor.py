@@ -2,10 +2,11 @@
 Query execution and result processing utilities for database connectors.
 """
 
+import hashlib
 import logging
 import time
 import uuid
-from typing import Dict, Any, Optional, List, Tuple, Union
+from typing import Dict, Any, Optional, List, Tuple, Union, Callable
 from datetime import datetime
 
 from sql_agent.backend.models.query import QueryResult, ResultColumn
@@ -13,6 +14,74 @@ from sql_agent.backend.models.database import Database
 
 logger = logging.getLogger(__name__)
 
+# Marker key of LOB placeholders in result rows
+LOB_PLACEHOLDER_KEY = "__lob__"
+
+
+def make_lob_placeholder(preview: Optional[str], binary: bool = False,
+                         binary_prefix: Optional[bytes] = None) -> Dict[str, Any]:
+    """
+    Create the placeholder stored in place of a large object value that was not read fully.
+    The full value can be read on demand by its row and column position.
+    
+    Args:
+        preview: Beginning of the value (None for binary values)
+        binary: Whether the value is binary (BLOB)
+        binary_prefix: Beginning of a binary value; only its digest is stored
+        
+    Returns:
+        Placeholder dictionary
+    """
+    placeholder = {
+        LOB_PLACEHOLDER_KEY: True,
+        "type": "BLOB" if binary else "CLOB",
+        "preview": preview,
+        "truncated": True
+    }
+    if binary_prefix is not None:
+        placeholder["prefix_length"] = len(binary_prefix)
+        placeholder["prefix_sha1"] = hashlib.sha1(bytes(binary_prefix)).hexdigest()
+    return placeholder
+
+
+def is_lob_placeholder(value: Any) -> bool:
+    """
+    Check if a result value is a LOB placeholder.
+    
+    Args:
+        value: Result value
+        
+    Returns:
+        True if the value is a LOB placeholder
+    """
+    return isinstance(value, dict) and value.get(LOB_PLACEHOLDER_KEY) is True
+
+
+def lob_matches_placeholder(placeholder: Dict[str, Any], value: Any) -> bool:
+    """
+    Check if a fully read LOB value starts with the prefix recorded in its placeholder.
+    Used to detect that a re-executed query returned a different row at the same position.
+    
+    Args:
+        placeholder: LOB placeholder stored in the result
+        value: Full value read from the database
+        
+    Returns:
+        True if the value matches the placeholder (or the placeholder has no prefix to compare)
+    """
+    preview = placeholder.get("preview")
+    if preview is not None:
+        return isinstance(value, str) and value.startswith(preview)
+    
+    digest = placeholder.get("prefix_sha1")
+    if digest is not None:
+        if not isinstance(value, (bytes, bytearray)):
+            return False
+        prefix = bytes(value[:placeholder.get("prefix_length", 0)])
+        return hashlib.sha1(prefix).hexdigest() == digest
+    
+    return True
+
 class QueryExecutionTracker:
     """
     Tracks running queries and provides methods to cancel them.
@@ -175,4 +244,85 @@ class QueryResultProcessor:
         )
         
         logger.debug(f"Processed query result with {row_count} rows in {time.time() - start_time:.2f}s")
-        return result
\ No newline at end of file
+        return result
+    
+    @staticmethod
+    def process_result_batched(cursor: Any, query: str, max_rows: Optional[int] = None,
+                               fetch_size: int = 1000,
+                               lob_converter: Optional[Callable[[Any], Any]] = None) -> QueryResult:
+        """
+        Process a database cursor into a QueryResult object, fetching rows in fetchmany batches.
+        
+        Rows beyond max_rows are not fetched. Columns holding large object locators (values
+        with a read method) are passed through lob_converter, which decides how much of the
+        value is read.
+        
+        Args:
+            cursor: Database cursor with query results
+            query: SQL query string
+            max_rows: Optional maximum number of rows to return
+            fetch_size: Number of rows fetched per round trip
+            lob_converter: Optional function converting LOB locators to result values
+            
+        Returns:
+            QueryResult object containing the query results
+        """
+        start_time = time.time()
+        
+        columns = []
+        if cursor.description:
+            for col in cursor.description:
+                col_type = str(col[1]) if len(col) > 1 else "unknown"
+                columns.append(ResultColumn(name=col[0], type=col_type))
+        
+        rows: List[List[Any]] = []
+        truncated = False
+        lob_columns: List[int] = []
+        # Columns whose kind is known once they have a non-NULL value
+        undetermined = set(range(len(columns))) if lob_converter is not None else set()
+        
+        while True:
+            batch_size = fetch_size if max_rows is None else min(fetch_size, max_rows + 1 - len(rows))
+            batch = cursor.fetchmany(batch_size)
+            if len(batch) == 0:
+                break
+            
+            for index in list(undetermined):
+                value = next((row[index] for row in batch if row[index] is not None), None)
+                if value is not None:
+                    undetermined.discard(index)
+                    if hasattr(value, "read"):
+                        lob_columns.append(index)
+            
+            if lob_columns:
+                for row in batch:
+                    row = list(row)
+                    for index in lob_columns:
+                        if row[index] is not None:
+                            row[index] = lob_converter(row[index])
+                    rows.append(row)
+            else:
+                rows.extend(list(row) for row in batch)
+            
+            if max_rows is not None and len(rows) > max_rows:
+                del rows[max_rows:]
+                truncated = True
+                break
+        
+        total_row_count = None
+        if truncated and getattr(cursor, "rowcount", -1) > len(rows):
+            total_row_count = cursor.rowcount
+        
+        result = QueryResult(
+            id=str(uuid.uuid4()),
+            query_id="",  # Will be set by the caller
+            columns=columns,
+            rows=rows,
+            row_count=len(rows),
+            truncated=truncated,
+            total_row_count=total_row_count,
+            created_at=datetime.now()
+        )
+        
+        logger.debug(f"Processed query result with {len(rows)} rows in batches of {fetch_size} in {time.time() - start_time:.2f}s")
+        return result
@@ -0,0 +1,318 @@
+"""
+Automatic query parameterization for database connectors.
+This module lifts inline literals of generated SQL into bound parameters so that
+the database server can reuse cached plans across literal variants, and keeps a
+per-connection cache of prepared statements.
+"""
+
+import logging
+import re
+from collections import OrderedDict
+from decimal import Decimal, InvalidOperation
+from threading import Lock
+from typing import Dict, Any, Optional, List, Tuple, Callable
+
+logger = logging.getLogger(__name__)
+
+# SQL tokenizer (order matters: comments and literals are matched before words)
+_TOKEN_PATTERN = re.compile(r"""
+    (?P<comment>--[^\n]*|/\*.*?\*/)
+  | (?P<string>[Nn]?'(?:[^']|'')*')
+  | (?P<quoted>"(?:[^"]|"")*"|\[[^\]]*\])
+  | (?P<number>(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?)
+  | (?P<word>[A-Za-z_@#$][\w@#$]*)
+  | (?P<op><>|!=|<=|>=|=|<|>)
+  | (?P<punct>[(),])
+  | (?P<space>\s+)
+  | (?P<other>.)
+""", re.DOTALL | re.VERBOSE)
+
+# Tokens after which a literal is a comparison operand
+_COMPARISON_TOKENS = {"=", "<>", "!=", "<", ">", "<=", ">=", "LIKE", "BETWEEN"}
+
+# Clauses in which literals are lifted. Literals in SELECT, GROUP BY and ORDER BY
+# are kept inline because the server matches those expressions textually.
+_PARAMETERIZED_CLAUSES = {"WHERE", "HAVING", "ON"}
+
+# Keywords that start a new clause
+_CLAUSE_KEYWORDS = {"SELECT", "FROM", "JOIN", "WHERE", "GROUP", "HAVING", "ORDER", "ON", "UNION", "EXCEPT", "INTERSECT", "LIMIT", "OFFSET", "FETCH", "TOP"}
+
+
+def _literal_value(kind: str, text: str) -> Any:
+    """
+    Convert a literal token to a Python value.
+
+    Args:
+        kind: Token kind ("string" or "number")
+        text: Token text
+
+    Returns:
+        str, int, Decimal or float value
+    """
+    if kind == "string":
+        if text[0] in "Nn":
+            text = text[1:]
+        return text[1:-1].replace("''", "'")
+
+    if "e" in text.lower():
+        return float(text)
+    if "." in text:
+        try:
+            return Decimal(text)
+        except InvalidOperation:
+            return float(text)
+    return int(text)
+
+
+def parameterize_query(query: str, placeholder: Callable[[int], str] = lambda index: "?") -> Tuple[str, List[Any]]:
+    """
+    Replace comparison literals in WHERE, HAVING and ON clauses with bound parameters.
+
+    Queries that already contain parameter markers or variables are returned unchanged.
+
+    Args:
+        query: SQL query string
+        placeholder: Function returning the placeholder text for a parameter index
+
+    Returns:
+        Tuple of (parameterized query, parameter values). The value list is empty
+        when nothing was parameterized.
+    """
+    tokens = [(match.lastgroup, match.group()) for match in _TOKEN_PATTERN.finditer(query)]
+
+    # Leave queries with existing parameters or variables alone
+    for kind, text in tokens:
+        if kind == "other" and text in ("?", ":"):
+            return query, []
+        if kind == "word" and text.startswith("@"):
+            return query, []
+
+    parts = []
+    values: List[Any] = []
+    clause = None
+    clause_stack: List[Optional[str]] = []
+    in_list_stack: List[bool] = []
+    prev = None
+    between_pending = False
+
+    for kind, text in tokens:
+        if kind in ("space", "comment"):
+            parts.append(text)
+            continue
+
+        upper = text.upper() if kind in ("word", "op", "punct") else None
+
+        if kind in ("string", "number"):
+            in_list = bool(in_list_stack) and in_list_stack[-1] and prev in ("(", ",")
+            is_operand = prev in _COMPARISON_TOKENS or (prev == "AND" and between_pending) or in_list
+
+            if clause in _PARAMETERIZED_CLAUSES and is_operand:
+                parts.append(placeholder(len(values)))
+                values.append(_literal_value(kind, text))
+            else:
+                parts.append(text)
+
+            if prev == "BETWEEN":
+                between_pending = True
+            elif prev == "AND":
+                between_pending = False
+            prev = "<literal>"
+            continue
+
+        if upper == "(":
+            clause_stack.append(clause)
+            in_list_stack.append(prev == "IN")
+        elif upper == ")":
+            if clause_stack:
+                clause = clause_stack.pop()
+            if in_list_stack:
+                in_list_stack.pop()
+        elif kind == "word" and upper in _CLAUSE_KEYWORDS:
+            clause = upper
+            # A subquery inside IN (...) is not a literal list
+            if in_list_stack and prev == "(":
+                in_list_stack[-1] = False
+
+        parts.append(text)
+        prev = upper if upper is not None else text
+
+    if not values:
+        return query, []
+
+    return "".join(parts), values
+
+
+def _mssql_parameter_type(value: Any) -> str:
+    """
+    Get the declared MS-SQL type for a parameter value.
+    Declared types are stable per value kind so that plans are shared across values.
+
+    Args:
+        value: Parameter value
+
+    Returns:
+        MS-SQL type declaration
+    """
+    if isinstance(value, bool):
+        return "bit"
+    if isinstance(value, int):
+        return "bigint" if -2**63 <= value < 2**63 else "decimal(38, 0)"
+    if isinstance(value, Decimal):
+        exponent = value.as_tuple().exponent
+        scale = min(max(-exponent, 0), 38) if isinstance(exponent, int) else 0
+        return f"decimal(38, {scale})"
+    if isinstance(value, float):
+        return "float"
+
+    text = str(value)
+    # Non-unicode parameters avoid implicit conversion of varchar columns
+    if all(ord(char) < 128 for char in text):
+        return "varchar(8000)" if len(text) <= 8000 else "varchar(max)"
+    return "nvarchar(4000)" if len(text) <= 4000 else "nvarchar(max)"
+
+
+def build_sp_executesql(query: str) -> Optional[Tuple[str, List[Any]]]:
+    """
+    Rewrite a query as an sp_executesql call with typed parameters.
+
+    Args:
+        query: SQL query string
+
+    Returns:
+        Tuple of (EXEC statement with ? markers, bound values) or None if the query
+        has no literals to parameterize
+    """
+    statement, values = parameterize_query(query, placeholder=lambda index: f"@p{index}")
+    if not values:
+        return None
+
+    declarations = ", ".join(f"@p{index} {_mssql_parameter_type(value)}" for index, value in enumerate(values))
+    markers = ", ".join("?" for _ in range(len(values) + 2))
+    return f"EXEC sp_executesql {markers}", [statement, declarations] + values
+
+
+class PreparedStatementCache:
+    """
+    LRU cache of prepared statement handles per pooled connection.
+    """
+
+    def __init__(self, max_statements_per_connection: int = 64, max_connections: int = 128):
+        """
+        Initialize the prepared statement cache.
+
+        Args:
+            max_statements_per_connection: Maximum number of statements kept per connection
+            max_connections: Maximum number of connections tracked
+        """
+        self.max_statements_per_connection = max_statements_per_connection
+        self.max_connections = max_connections
+        # id(connection) -> (connection, statement -> handle)
+        self._connections: "OrderedDict[int, Tuple[Any, OrderedDict]]" = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _close_handle(handle: Any) -> None:
+        """
+        Close a prepared statement handle, ignoring errors.
+
+        Args:
+            handle: Prepared statement handle
+        """
+        try:
+            handle.close()
+        except Exception:
+            pass
+
+    def get(self, connection: Any, statement: str) -> Optional[Any]:
+        """
+        Get a cached prepared statement handle.
+
+        Args:
+            connection: Database connection
+            statement: Parameterized SQL statement
+
+        Returns:
+            Prepared statement handle or None
+        """
+        with self._lock:
+            entry = self._connections.get(id(connection))
+            if entry is None or entry[0] is not connection:
+                self._misses += 1
+                return None
+
+            handle = entry[1].get(statement)
+            if handle is None:
+                self._misses += 1
+                return None
+
+            entry[1].move_to_end(statement)
+            self._connections.move_to_end(id(connection))
+            self._hits += 1
+            return handle
+
+    def put(self, connection: Any, statement: str, handle: Any) -> None:
+        """
+        Store a prepared statement handle.
+
+        Args:
+            connection: Database connection
+            statement: Parameterized SQL statement
+            handle: Prepared statement handle
+        """
+        evicted = []
+        with self._lock:
+            entry = self._connections.get(id(connection))
+            if entry is None or entry[0] is not connection:
+                if entry is not None:
+                    evicted.extend(entry[1].values())
+                entry = (connection, OrderedDict())
+                self._connections[id(connection)] = entry
+
+            entry[1][statement] = handle
+            entry[1].move_to_end(statement)
+            self._connections.move_to_end(id(connection))
+
+            while len(entry[1]) > self.max_statements_per_connection:
+                evicted.append(entry[1].popitem(last=False)[1])
+
+            while len(self._connections) > self.max_connections:
+                _, (_, statements) = self._connections.popitem(last=False)
+                evicted.extend(statements.values())
+
+        for stale_handle in evicted:
+            self._close_handle(stale_handle)
+
+    def discard_connection(self, connection: Any) -> None:
+        """
+        Drop and close all handles of a connection (e.g. after an error or when it is closed).
+
+        Args:
+            connection: Database connection
+        """
+        with self._lock:
+            entry = self._connections.get(id(connection))
+            if entry is None or entry[0] is not connection:
+                return
+            del self._connections[id(connection)]
+
+        for handle in entry[1].values():
+            self._close_handle(handle)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss counts and sizes
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "connections": len(self._connections),
+                "statements": sum(len(statements) for _, statements in self._connections.values())
+            }
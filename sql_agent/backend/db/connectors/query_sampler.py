@@ -0,0 +1,515 @@
+"""
+Approximate preview execution for database connectors.
+This module rewrites a query to read a random sample of one table (TABLESAMPLE on
+MS-SQL and SAP HANA, a random() filter on SQLite) and scales COUNT and SUM
+aggregates of the sampled result back to estimates with 95% error bounds.
+"""
+
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Tuple
+
+from sql_agent.backend.models.query import QueryResult, ResultColumn
+from sql_agent.backend.db.connectors.query_parameterizer import _TOKEN_PATTERN
+
+logger = logging.getLogger(__name__)
+
+# z-score of the two-sided 95% confidence interval
+CONFIDENCE_Z = 1.96
+
+# Sampling methods supported per database type (the first one is the default)
+SAMPLING_METHODS = {
+    "mssql": ["system"],
+    "hana": ["system", "bernoulli"],
+    "sqlite": ["bernoulli"],
+}
+
+# Resolution of the random() filter used where TABLESAMPLE is not available
+_SQLITE_SAMPLE_RESOLUTION = 1000000
+
+# Aggregates whose sampled value is scaled by the inverse sampling fraction
+_SCALED_AGGREGATES = {"COUNT", "COUNT_BIG", "SUM"}
+
+# Keywords that end a table reference in a FROM clause
+_TABLE_REFERENCE_END = {
+    "WHERE", "GROUP", "HAVING", "ORDER", "JOIN", "INNER", "LEFT", "RIGHT", "FULL", "CROSS",
+    "OUTER", "ON", "USING", "UNION", "EXCEPT", "INTERSECT", "LIMIT", "OFFSET", "FETCH", "WITH",
+    "FOR", "OPTION", "TABLESAMPLE", "APPLY", "PARTITION", "NATURAL"
+}
+
+# Keywords that follow an expression in a select list but are not column aliases
+_NON_ALIAS_KEYWORDS = {"END", "NULL", "DISTINCT", "ALL", "AND", "OR", "NOT", "IS", "ELSE", "THEN"}
+
+
+@dataclass
+class SampledAggregate:
+    """
+    A COUNT or SUM item of the select list that is scaled to an estimate.
+    """
+    position: int  # Index of the item in the select list and of its result column
+    function: str  # COUNT or SUM
+    square_position: Optional[int] = None  # Result column of the sum of squares (SUM only)
+
+
+@dataclass
+class SampledQuery:
+    """
+    A query rewritten to read a sample of one table.
+    """
+    original_sql: str
+    sql: str
+    table: str
+    percent: float
+    method: str
+    aggregates: List[SampledAggregate] = field(default_factory=list)
+    column_count: Optional[int] = None  # Number of result columns of the original query (None if unknown)
+    row_level: bool = False  # Whether result rows are sampled rows (no aggregation, grouping or DISTINCT)
+    warnings: List[str] = field(default_factory=list)
+
+
+def _tokenize(query: str) -> List[Tuple[str, str]]:
+    """
+    Split a query into (kind, text) tokens.
+
+    Args:
+        query: SQL query string
+
+    Returns:
+        List of tokens
+    """
+    return [(match.lastgroup, match.group()) for match in _TOKEN_PATTERN.finditer(query)]
+
+
+def _is_significant(token: Tuple[str, str]) -> bool:
+    """
+    Check whether a token is neither whitespace nor a comment.
+    """
+    return token[0] not in ("space", "comment")
+
+
+def _upper(token: Tuple[str, str]) -> str:
+    """
+    Get the upper-cased text of a word or punctuation token.
+    """
+    return token[1].upper() if token[0] in ("word", "punct", "op", "other") else ""
+
+
+def _unquote(name: str) -> str:
+    """
+    Remove identifier quotes and fold the case of a name part.
+    """
+    if name[:1] in ('"', "[") and len(name) > 1:
+        return name[1:-1].lower()
+    return name.lower()
+
+
+def _top_level_positions(tokens: List[Tuple[str, str]]) -> List[int]:
+    """
+    Get the indexes of the significant tokens outside parentheses.
+
+    Raises:
+        ValueError: If the parentheses are unbalanced
+    """
+    positions = []
+    depth = 0
+    for index, token in enumerate(tokens):
+        if not _is_significant(token):
+            continue
+        if token[1] == "(":
+            if depth == 0:
+                positions.append(index)
+            depth += 1
+        elif token[1] == ")":
+            depth -= 1
+            if depth < 0:
+                raise ValueError("Unbalanced parentheses in query")
+        elif depth == 0:
+            positions.append(index)
+    if depth != 0:
+        raise ValueError("Unbalanced parentheses in query")
+    return positions
+
+
+def _split_select_list(tokens: List[Tuple[str, str]], start: int, end: int) -> List[Tuple[int, int]]:
+    """
+    Split the select list tokens[start:end] at top-level commas.
+
+    Returns:
+        List of (start, end) token ranges, one per select item
+    """
+    items = []
+    depth = 0
+    item_start = start
+    for index in range(start, end):
+        text = tokens[index][1]
+        if not _is_significant(tokens[index]):
+            continue
+        if text == "(":
+            depth += 1
+        elif text == ")":
+            depth -= 1
+        elif text == "," and depth == 0:
+            items.append((item_start, index))
+            item_start = index + 1
+    items.append((item_start, end))
+    return items
+
+
+def _item_expression(tokens: List[Tuple[str, str]], item: Tuple[int, int]) -> List[Tuple[str, str]]:
+    """
+    Get the significant tokens of a select item without its column alias.
+    """
+    significant = [tokens[i] for i in range(*item) if _is_significant(tokens[i])]
+    if len(significant) >= 3 and _upper(significant[-2]) == "AS":
+        return significant[:-2]
+    if len(significant) >= 2 and significant[-1][0] in ("word", "quoted"):
+        last, previous = significant[-1], significant[-2]
+        is_alias = (
+            _upper(last) not in _NON_ALIAS_KEYWORDS
+            and (previous[1] == ")" or previous[0] in ("word", "quoted", "number", "string"))
+            and previous[1] != "."
+        )
+        if is_alias:
+            return significant[:-1]
+    return significant
+
+
+def _scaled_aggregate(expression: List[Tuple[str, str]]) -> Optional[Tuple[str, List[Tuple[str, str]]]]:
+    """
+    Match a select item that consists of a single COUNT or SUM call.
+
+    Returns:
+        Tuple of (function, argument tokens), or None if the item is not a scalable aggregate
+    """
+    if len(expression) < 4 or expression[0][0] != "word" or expression[1][1] != "(" or expression[-1][1] != ")":
+        return None
+
+    function = _upper(expression[0])
+    if function not in _SCALED_AGGREGATES:
+        return None
+
+    # The closing parenthesis of the call must end the item (excludes window functions and arithmetic)
+    depth = 0
+    for index, token in enumerate(expression[1:], start=1):
+        if token[1] == "(":
+            depth += 1
+        elif token[1] == ")":
+            depth -= 1
+            if depth == 0 and index != len(expression) - 1:
+                return None
+
+    argument = expression[2:-1]
+    if argument and _upper(argument[0]) in ("DISTINCT", "ALL"):
+        if _upper(argument[0]) == "DISTINCT":
+            return None
+        argument = argument[1:]
+    return ("SUM" if function == "SUM" else "COUNT"), argument
+
+
+def _join_tokens(tokens: List[Tuple[str, str]]) -> str:
+    """
+    Join significant tokens back into SQL text.
+    """
+    text = ""
+    for kind, token in tokens:
+        if text and not (token in (")", ",", ".") or text.endswith(("(", "."))):
+            text += " "
+        text += token
+    return text
+
+
+def _table_reference(tokens: List[Tuple[str, str]], positions: List[int], start: int) -> Tuple[str, str, int, int]:
+    """
+    Parse the table reference starting at positions[start].
+
+    Returns:
+        Tuple of (qualified name, alias, index of the first name token, index after the alias)
+
+    Raises:
+        ValueError: If the reference is a derived table or function call
+    """
+    first = positions[start]
+    if tokens[first][1] == "(":
+        raise ValueError("Sampling a derived table is not supported")
+
+    parts = []
+    cursor = start
+    while cursor < len(positions):
+        kind, text = tokens[positions[cursor]]
+        if kind not in ("word", "quoted"):
+            break
+        parts.append(text)
+        if cursor + 1 < len(positions) and tokens[positions[cursor + 1]][1] == ".":
+            cursor += 2
+            continue
+        cursor += 1
+        break
+
+    if not parts:
+        raise ValueError("Could not find the table to sample")
+    if cursor < len(positions) and tokens[positions[cursor]][1] == "(":
+        raise ValueError("Sampling a table-valued function is not supported")
+
+    alias = ""
+    end = positions[cursor - 1] + 1
+    if cursor < len(positions) and _upper(tokens[positions[cursor]]) == "AS":
+        cursor += 1
+    if cursor < len(positions):
+        kind, text = tokens[positions[cursor]]
+        if kind in ("word", "quoted") and text.upper() not in _TABLE_REFERENCE_END:
+            alias = text
+            end = positions[cursor] + 1
+            cursor += 1
+    if cursor < len(positions) and _upper(tokens[positions[cursor]]) == "TABLESAMPLE":
+        raise ValueError("Query already samples its table")
+
+    return ".".join(parts), alias, first, end
+
+
+def _sample_clause(db_type: str, method: str, percent: float) -> str:
+    """
+    Build the TABLESAMPLE clause for a database type.
+    """
+    percent_text = f"{percent:g}"
+    if db_type == "mssql":
+        return f"TABLESAMPLE SYSTEM ({percent_text} PERCENT)"
+    return f"TABLESAMPLE {method.upper()} ({percent_text})"
+
+
+def _float_cast(db_type: str) -> str:
+    """
+    Get the floating point type used to sum squares without overflow.
+    """
+    return "DOUBLE" if db_type == "hana" else "FLOAT"
+
+
+def build_sampled_query(
+    query: str,
+    db_type: str,
+    percent: float,
+    method: Optional[str] = None,
+    table: Optional[str] = None
+) -> SampledQuery:
+    """
+    Rewrite a SELECT query to read a random sample of one of its tables.
+
+    The first table of the outermost FROM clause is sampled unless another table of
+    the FROM clause or its joins is named. COUNT and SUM items of the select list are
+    complemented with the columns needed for their error bounds.
+
+    Args:
+        query: SQL query string
+        db_type: Database type ("mssql", "hana" or "sqlite")
+        percent: Sample size in percent of the table (0 < percent < 100)
+        method: Sampling method ("system" samples pages, "bernoulli" rows); defaults per database type
+        table: Optional name of the table to sample
+
+    Returns:
+        SampledQuery with the rewritten SQL
+
+    Raises:
+        ValueError: If the query cannot be sampled
+    """
+    db_type = getattr(db_type, "value", db_type)
+    if db_type not in SAMPLING_METHODS:
+        raise ValueError(f"Sampling is not supported for database type {db_type}")
+    if not 0 < percent < 100:
+        raise ValueError("Sample percent must be greater than 0 and less than 100")
+
+    method = (method or SAMPLING_METHODS[db_type][0]).lower()
+    warnings = []
+    if method not in ("system", "bernoulli"):
+        raise ValueError(f"Unknown sampling method: {method}")
+    if method not in SAMPLING_METHODS[db_type]:
+        warnings.append(f"{method.upper()} sampling is not available, using {SAMPLING_METHODS[db_type][0].upper()}")
+        method = SAMPLING_METHODS[db_type][0]
+
+    tokens = _tokenize(query.strip().rstrip(";"))
+    positions = _top_level_positions(tokens)
+    if not positions or _upper(tokens[positions[0]]) != "SELECT":
+        raise ValueError("Only SELECT queries can be sampled")
+
+    keywords = [(cursor, _upper(tokens[index])) for cursor, index in enumerate(positions)]
+    for _, keyword in keywords:
+        if keyword in ("UNION", "EXCEPT", "INTERSECT", "MINUS"):
+            raise ValueError("Sampling queries with set operations is not supported")
+
+    from_cursor = next((cursor for cursor, keyword in keywords if keyword == "FROM"), None)
+    if from_cursor is None or from_cursor + 1 >= len(positions):
+        raise ValueError("Query has no table to sample")
+
+    # Skip DISTINCT and TOP n [PERCENT] [WITH TIES] in front of the select list
+    list_cursor = 1
+    while list_cursor < from_cursor:
+        keyword = _upper(tokens[positions[list_cursor]])
+        if keyword in ("DISTINCT", "ALL"):
+            list_cursor += 1
+        elif keyword == "TOP":
+            list_cursor += 2
+            while list_cursor < from_cursor and _upper(tokens[positions[list_cursor]]) in ("PERCENT", "WITH", "TIES"):
+                list_cursor += 1
+        else:
+            break
+    list_start = positions[list_cursor]
+    list_end = positions[from_cursor]
+
+    # Candidate tables: the first reference of the FROM clause and every joined reference
+    references = [from_cursor + 1]
+    for cursor, keyword in keywords[from_cursor + 1:]:
+        if keyword == "JOIN" and cursor + 1 < len(positions):
+            references.append(cursor + 1)
+        elif keyword in ("WHERE", "GROUP", "HAVING", "ORDER"):
+            break
+
+    if table:
+        wanted = [_unquote(part) for part in table.split(".")]
+        reference = None
+        for cursor in references:
+            if tokens[positions[cursor]][1] == "(":
+                continue
+            name, alias, first, end = _table_reference(tokens, positions, cursor)
+            parts = [_unquote(part) for part in name.split(".")]
+            if parts[-len(wanted):] == wanted or (alias and [_unquote(alias)] == wanted):
+                reference = (name, alias, first, end)
+                break
+        if reference is None:
+            raise ValueError(f"Table {table} is not referenced in the FROM clause")
+    else:
+        reference = _table_reference(tokens, positions, references[0])
+    name, alias, first, end = reference
+
+    # Select items: COUNT and SUM are scaled, a SUM gets a sum-of-squares column for its error bound
+    items = _split_select_list(tokens, list_start, list_end)
+    expressions = [_item_expression(tokens, item) for item in items]
+    has_star = any(
+        expression and expression[-1][1] == "*" and (len(expression) == 1 or expression[-2][1] == ".")
+        for expression in expressions
+    )
+
+    aggregates = []
+    extra_items = []
+    if not has_star:
+        for position, expression in enumerate(expressions):
+            match = _scaled_aggregate(expression)
+            if match is None:
+                continue
+            function, argument = match
+            aggregate = SampledAggregate(position=position, function=function)
+            if function == "SUM":
+                aggregate.square_position = len(items) + len(extra_items)
+                value = f"CAST({_join_tokens(argument)} AS {_float_cast(db_type)})"
+                extra_items.append(f"SUM({value} * {value}) AS sample_sq_{position}")
+            aggregates.append(aggregate)
+
+        if aggregates and any(keyword == "HAVING" for _, keyword in keywords):
+            warnings.append("HAVING conditions are evaluated on sampled, unscaled values")
+        if any(expression and _upper(expression[0]) in ("MIN", "MAX") for expression in expressions):
+            warnings.append("MIN and MAX are taken from the sample and may miss extreme values")
+        if any(
+            len(expression) > 2 and _upper(expression[0]) in _SCALED_AGGREGATES and _upper(expression[2]) == "DISTINCT"
+            for expression in expressions
+        ):
+            warnings.append("COUNT(DISTINCT ...) and SUM(DISTINCT ...) are not scaled and understate the full result")
+    elif any(_scaled_aggregate(expression) for expression in expressions):
+        warnings.append("Aggregates are not scaled when the select list contains *")
+
+    row_level = not any(keyword in ("GROUP", "DISTINCT") for _, keyword in keywords) and not any(
+        expression and _upper(expression[0]) in ("MIN", "MAX", "AVG", "COUNT", "COUNT_BIG", "SUM")
+        for expression in expressions
+    )
+
+    if method == "system":
+        warnings.append("SYSTEM sampling reads whole pages; error bounds assume independently sampled rows")
+
+    # Rewrite the table reference (it follows the select list, so list_end stays valid)
+    if db_type == "sqlite":
+        threshold = int(round(percent / 100 * _SQLITE_SAMPLE_RESOLUTION))
+        replacement = (
+            f"(SELECT * FROM {name} WHERE abs(random() % {_SQLITE_SAMPLE_RESOLUTION}) < {threshold}) "
+            f"AS {alias or name.split('.')[-1]}"
+        )
+        tokens = tokens[:first] + [("other", replacement)] + tokens[end:]
+    else:
+        tokens = tokens[:end] + [("other", " " + _sample_clause(db_type, method, percent))] + tokens[end:]
+
+    if extra_items:
+        insert_at = list_end
+        while insert_at > 0 and not _is_significant(tokens[insert_at - 1]):
+            insert_at -= 1
+        tokens = tokens[:insert_at] + [("other", ", " + ", ".join(extra_items))] + tokens[insert_at:]
+
+    return SampledQuery(
+        original_sql=query,
+        sql="".join(text for _, text in tokens),
+        table=name,
+        percent=percent,
+        method=method,
+        aggregates=aggregates,
+        column_count=None if has_star else len(items),
+        row_level=row_level,
+        warnings=warnings
+    )
+
+
+def scale_sampled_result(result: QueryResult, sampled: SampledQuery) -> Tuple[QueryResult, Dict[str, Any]]:
+    """
+    Scale the COUNT and SUM columns of a sampled result to estimates for the full table.
+
+    Each scaled column gets an "<name>_error_bound" column with the half-width of its
+    95% confidence interval (Horvitz-Thompson variance of a row sample). The helper
+    sum-of-squares columns are removed.
+
+    Args:
+        result: Result of the sampled query
+        sampled: Sampled query that produced the result
+
+    Returns:
+        Tuple of (scaled result, approximation details)
+    """
+    fraction = sampled.percent / 100
+    column_count = sampled.column_count if sampled.column_count is not None else len(result.columns)
+    columns = list(result.columns[:column_count])
+    scaled_columns = {}
+
+    for aggregate in sampled.aggregates:
+        name = columns[aggregate.position].name
+        bound_name = f"{name}_error_bound"
+        columns.append(ResultColumn(name=bound_name, type="FLOAT"))
+        scaled_columns[name] = {"function": aggregate.function, "error_bound_column": bound_name}
+
+    rows = []
+    for row in result.rows:
+        scaled = list(row[:column_count])
+        bounds = []
+        for aggregate in sampled.aggregates:
+            value = row[aggregate.position]
+            if value is None:
+                bounds.append(None)
+                continue
+            value = float(value)
+            if aggregate.function == "COUNT":
+                squares = value
+                scaled[aggregate.position] = int(round(value / fraction))
+            else:
+                squares = row[aggregate.square_position]
+                squares = float(squares) if squares is not None else 0.0
+                scaled[aggregate.position] = value / fraction
+            bounds.append(CONFIDENCE_Z * math.sqrt(max((1 - fraction) * squares, 0.0)) / fraction)
+        rows.append(scaled + bounds)
+
+    approximation = {
+        "approximate": True,
+        "original_sql": sampled.original_sql,
+        "sampled_table": sampled.table,
+        "sample_percent": sampled.percent,
+        "sampling_method": sampled.method,
+        "confidence": 0.95,
+        "scaled_columns": scaled_columns,
+        "warnings": sampled.warnings,
+    }
+    if sampled.row_level and not result.truncated:
+        approximation["estimated_total_rows"] = int(round(result.row_count / fraction))
+
+    scaled_result = result.model_copy(update={"columns": columns, "rows": rows})
+    return scaled_result, approximation
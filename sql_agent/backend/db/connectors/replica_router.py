@@ -0,0 +1,228 @@
+"""
+Endpoint routing for logical databases with several endpoints.
+Read-only queries are spread over readable replicas (MS-SQL availability group
+secondaries, SAP HANA read-enabled system replication secondaries) by smooth
+weighted round-robin, with pool utilization breaking ties; writes and schema access
+go to the primary. Endpoints that fail their health check or drop connections are
+skipped until they recover.
+"""
+
+import logging
+import time
+from threading import Lock
+from typing import Dict, Any, Optional, List, Callable
+
+from sql_agent.backend.models.database import Database, DatabaseEndpoint, EndpointRole
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaRouter:
+    """
+    Chooses the endpoint of a logical database for a query.
+    """
+
+    def __init__(self, connection_pool_manager: Any, down_interval: float = 30.0):
+        """
+        Initialize the router.
+
+        Args:
+            connection_pool_manager: Connection pool manager used for utilization and breaker state
+            down_interval: Seconds an unavailable endpoint is skipped
+        """
+        self.connection_pool_manager = connection_pool_manager
+        self.down_interval = down_interval
+        self._databases: Dict[str, Database] = {}  # logical db_id -> configuration with several endpoints
+        self._down_until: Dict[str, float] = {}  # endpoint db_id -> monotonic time
+        self._routed: Dict[str, int] = {}  # endpoint db_id -> number of routed queries
+        self._current_weights: Dict[str, float] = {}  # endpoint db_id -> smooth weighted round-robin state
+        self._lock = Lock()
+
+    def _endpoint_load(self, endpoint_id: str) -> Optional[float]:
+        """
+        Get the pool utilization of an endpoint, or None if the endpoint is unavailable.
+
+        Args:
+            endpoint_id: Endpoint database identifier
+
+        Returns:
+            Pool utilization between 0 and 1, or None
+        """
+        with self._lock:
+            down_until = self._down_until.get(endpoint_id)
+            if down_until is not None:
+                if time.monotonic() < down_until:
+                    return None
+                del self._down_until[endpoint_id]
+
+        stats = self.connection_pool_manager.get_pool_stats(endpoint_id).get(endpoint_id, {})
+        if stats.get("circuit_breaker", {}).get("state") == "open":
+            return None
+        return stats.get("pool_utilization", 0.0)
+
+    def get_candidates(self, db_config: Database, read_only: bool) -> List[Database]:
+        """
+        Get the endpoints a query may run on, best first.
+
+        Read-only queries go to replicas in smooth weighted round-robin order, so that each
+        replica receives a share of the queries proportional to its weight, followed by the
+        primaries as fallback. Pool utilization only breaks ties between equal turns.
+        Other queries only run on primaries.
+        Unavailable endpoints are left out unless no endpoint of the required role is available.
+
+        Args:
+            db_config: Logical database configuration
+            read_only: Whether the query is read-only
+
+        Returns:
+            List of endpoint database configurations
+        """
+        endpoints = db_config.get_endpoints()
+        if len(endpoints) == 1:
+            return [db_config]
+
+        # Remember the database so that the periodic health check covers its endpoints
+        with self._lock:
+            self._databases[db_config.id] = db_config
+
+        primaries = [e for e in endpoints if e.role == EndpointRole.PRIMARY]
+        replicas = [e for e in endpoints if e.role == EndpointRole.REPLICA] if read_only else []
+
+        def rank(group: List[DatabaseEndpoint]) -> List[Database]:
+            available = []
+            for index, endpoint in enumerate(group):
+                endpoint_config = db_config.for_endpoint(endpoint)
+                load = self._endpoint_load(endpoint_config.id)
+                if load is not None:
+                    available.append((endpoint, endpoint_config, load, index))
+            if not available:
+                return []
+
+            # Smooth weighted round-robin: every available endpoint gains its weight, the one
+            # with the highest accumulated weight is chosen and gives back the total weight
+            total_weight = sum(endpoint.weight for endpoint, _, _, _ in available)
+            with self._lock:
+                scored = []
+                for endpoint, endpoint_config, load, index in available:
+                    current = self._current_weights.get(endpoint_config.id, 0.0) + endpoint.weight
+                    self._current_weights[endpoint_config.id] = current
+                    scored.append((-current, load, index, endpoint_config))
+                scored.sort(key=lambda item: item[:3])
+                self._current_weights[scored[0][3].id] -= total_weight
+            return [endpoint_config for _, _, _, endpoint_config in scored]
+
+        candidates = rank(replicas) + rank(primaries)
+        if not candidates:
+            # Everything is marked down; try the primary anyway rather than failing without an attempt
+            candidates = [db_config.for_endpoint(primaries[0])]
+        return candidates
+
+    def route(self, db_config: Database, read_only: bool) -> Database:
+        """
+        Choose the endpoint for a query.
+
+        Args:
+            db_config: Logical database configuration
+            read_only: Whether the query is read-only
+
+        Returns:
+            Endpoint database configuration
+        """
+        return self.get_candidates(db_config, read_only)[0]
+
+    def record_routed(self, endpoint_id: str) -> None:
+        """
+        Count a query routed to an endpoint.
+
+        Args:
+            endpoint_id: Endpoint database identifier
+        """
+        with self._lock:
+            self._routed[endpoint_id] = self._routed.get(endpoint_id, 0) + 1
+
+    def get_databases(self) -> List[Database]:
+        """
+        Get the logical databases with several endpoints that have been routed.
+
+        Returns:
+            List of database configurations
+        """
+        with self._lock:
+            return list(self._databases.values())
+
+    def mark_down(self, endpoint_id: str, reason: Optional[str] = None) -> None:
+        """
+        Skip an unavailable endpoint for the down interval.
+
+        Args:
+            endpoint_id: Endpoint database identifier
+            reason: Optional description of why the endpoint is unavailable
+        """
+        detail = f" ({reason})" if reason else ""
+        logger.warning(f"Endpoint {endpoint_id} is unavailable{detail}, routing around it for {self.down_interval}s")
+        with self._lock:
+            self._down_until[endpoint_id] = time.monotonic() + self.down_interval
+
+    def mark_up(self, endpoint_id: str) -> None:
+        """
+        Make an endpoint available for routing again.
+
+        Args:
+            endpoint_id: Endpoint database identifier
+        """
+        with self._lock:
+            self._down_until.pop(endpoint_id, None)
+
+    def check_endpoints(self, db_config: Database, probe: Callable[[Database], bool]) -> Dict[str, bool]:
+        """
+        Run a health check against every endpoint of a database and update their availability.
+
+        Args:
+            db_config: Logical database configuration
+            probe: Function returning True if an endpoint is healthy
+
+        Returns:
+            Dictionary of endpoint address -> healthy
+        """
+        results = {}
+        for endpoint in db_config.get_endpoints():
+            endpoint_config = db_config.for_endpoint(endpoint)
+            try:
+                healthy = bool(probe(endpoint_config))
+                reason = "health check failed"
+            except Exception as e:
+                healthy = False
+                reason = f"health check failed: {str(e)}"
+
+            if healthy:
+                self.mark_up(endpoint_config.id)
+            else:
+                self.mark_down(endpoint_config.id, reason)
+            results[endpoint.address] = healthy
+        return results
+
+    def get_routing_stats(self, db_config: Database) -> List[Dict[str, Any]]:
+        """
+        Get routing state of every endpoint of a database.
+
+        Args:
+            db_config: Logical database configuration
+
+        Returns:
+            List of endpoint dictionaries with role, weight, availability, load and routed count
+        """
+        stats = []
+        for endpoint in db_config.get_endpoints():
+            endpoint_id = db_config.for_endpoint(endpoint).id
+            load = self._endpoint_load(endpoint_id)
+            with self._lock:
+                routed = self._routed.get(endpoint_id, 0)
+            stats.append({
+                "address": endpoint.address,
+                "role": endpoint.role.value,
+                "weight": endpoint.weight,
+                "available": load is not None,
+                "pool_utilization": load,
+                "routed_queries": routed
+            })
+        return stats
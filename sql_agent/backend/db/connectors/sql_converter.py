@@ -39,7 +39,9 @@ class SQLConverter:
         # Determine target dialect
         if target_db_config.type == DBType.MSSQL:
             target_dialect = SQLDialectHandler.DB_TYPE_MSSQL
-        elif target_db_config.type == DBType.HANA:
+        elif target_db_config.type in (DBType.HANA, DBType.SQLITE):
+            # SQLite shares LIMIT, IFNULL and || with SAP HANA; the SQLite connector
+            # registers the remaining HANA date and string functions
             target_dialect = SQLDialectHandler.DB_TYPE_HANA
         else:
             warnings.append(f"Unsupported database type: {target_db_config.type}. Query will not be converted.")
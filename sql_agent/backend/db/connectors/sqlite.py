@@ -0,0 +1,690 @@
+"""
+SQLite database connector implementation.
+This module provides a local stand-in for MS-SQL and SAP HANA so that the connector,
+pool and query execution pipeline can be tested and benchmarked without a database
+server. Latency and failures can be injected through connection options.
+"""
+
+import logging
+import random
+import sqlite3
+import threading
+import time
+import uuid
+import backoff
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sql_agent.backend.models.database import Database, DatabaseSchema, Schema, Table, Column, ForeignKey
+from sql_agent.backend.models.query import QueryResult, QueryCostEstimate
+from sql_agent.backend.db.connectors.base import DBConnector, ConnectionPoolManager
+from sql_agent.backend.db.connectors.circuit_breaker import ResilienceError
+from sql_agent.backend.db.connectors.query_executor import QueryResultProcessor, QueryExecutionTracker
+from sql_agent.backend.db.connectors.query_parameterizer import parameterize_query
+from sql_agent.backend.utils.query_timing import timed_phase
+from sql_agent.backend.db.connectors.sql_validator import SQLValidator
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    """
+    Parse a SQLite date/time value (ISO text or Julian day number).
+
+    Args:
+        value: Column value
+
+    Returns:
+        datetime or None
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, (int, float)):
+        # Julian day number
+        return datetime(1970, 1, 1) + timedelta(days=value - 2440587.5)
+    return datetime.fromisoformat(str(value).replace("Z", ""))
+
+
+def _format_datetime(value: datetime) -> str:
+    """
+    Format a datetime the way SQLite stores it.
+
+    Args:
+        value: datetime value
+
+    Returns:
+        ISO text in SQLite's format
+    """
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    """
+    Add months to a datetime, clamping the day to the end of the target month.
+
+    Args:
+        value: datetime value
+        months: Number of months to add
+
+    Returns:
+        Shifted datetime
+    """
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    next_month = datetime(year + (month == 12), month % 12 + 1, 1)
+    last_day = (next_month - timedelta(days=1)).day
+    return value.replace(year=year, month=month, day=min(value.day, last_day))
+
+
+def _null_safe(func):
+    """
+    Wrap a SQL function so that NULL arguments produce NULL.
+
+    Args:
+        func: Function implementation
+
+    Returns:
+        Wrapped function
+    """
+    def wrapper(*args):
+        if any(arg is None for arg in args):
+            return None
+        return func(*args)
+    return wrapper
+
+
+# SAP HANA functions emitted by SQLDialectHandler that SQLite lacks.
+# Queries are converted to the HANA dialect for SQLite targets (see SQLConverter).
+DIALECT_FUNCTIONS = {
+    ("DAYS_BETWEEN", 2): _null_safe(lambda a, b: (_parse_datetime(b) - _parse_datetime(a)).days),
+    ("SECONDS_BETWEEN", 2): _null_safe(
+        lambda a, b: int((_parse_datetime(b) - _parse_datetime(a)).total_seconds())
+    ),
+    ("MONTHS_BETWEEN", 2): _null_safe(
+        lambda a, b: (_parse_datetime(b).year - _parse_datetime(a).year) * 12
+        + _parse_datetime(b).month - _parse_datetime(a).month
+    ),
+    ("ADD_DAYS", 2): _null_safe(lambda d, n: _format_datetime(_parse_datetime(d) + timedelta(days=n))),
+    ("ADD_SECONDS", 2): _null_safe(lambda d, n: _format_datetime(_parse_datetime(d) + timedelta(seconds=n))),
+    ("ADD_MONTHS", 2): _null_safe(lambda d, n: _format_datetime(_add_months(_parse_datetime(d), int(n)))),
+    ("LOCATE", 2): _null_safe(lambda haystack, needle: str(haystack).find(str(needle)) + 1),
+    ("LOCATE", 3): _null_safe(lambda haystack, needle, start: str(haystack).find(str(needle), max(int(start) - 1, 0)) + 1),
+    ("CONCAT", 2): lambda a, b: f"{'' if a is None else a}{'' if b is None else b}",
+    ("NOW", 0): lambda: _format_datetime(datetime.now()),
+}
+
+
+class SQLiteConnector(DBConnector):
+    """
+    SQLite database connector implementation.
+
+    The database file is taken from the "path" connection option; without it every
+    database id gets its own shared in-memory database. Other options:
+
+    - attach: mapping of schema alias -> database file attached to every connection
+      (e.g. {"dbo": "bench.db"} so that dbo.table names resolve)
+    - latency_ms / latency_jitter_ms: artificial latency added to every query
+    - connect_latency_ms: artificial latency added to every new connection
+    - failure_rate / connect_failure_rate: probability of an injected transient error
+    - seed: random seed for reproducible latency jitter and failures
+    """
+
+    # Maximum number of retry attempts for transient errors
+    MAX_RETRY_ATTEMPTS = 3
+
+    # Delay between retry attempts (in seconds)
+    RETRY_DELAY = 0.1
+
+    # Error messages that indicate transient errors
+    TRANSIENT_ERROR_MESSAGES = [
+        "database is locked",
+        "database table is locked",
+        "database is busy",
+        "injected transient failure"
+    ]
+
+    # Whether inline literals are lifted into statement parameters
+    AUTO_PARAMETERIZE = True
+
+    # Number of SQLite VM instructions between timeout/cancellation checks
+    PROGRESS_HANDLER_INTERVAL = 1000
+
+    def __init__(self, connection_pool_manager: ConnectionPoolManager):
+        """
+        Initialize the SQLite database connector.
+
+        Args:
+            connection_pool_manager: Connection pool manager instance
+        """
+        super().__init__(connection_pool_manager)
+        self.query_processor = QueryResultProcessor()
+        self.sql_validator = SQLValidator()
+        self.query_tracker = QueryExecutionTracker()
+        self.auto_parameterize = self.AUTO_PARAMETERIZE
+        self._randoms: Dict[str, random.Random] = {}  # db_id -> fault injection random source
+        self._random_lock = threading.Lock()
+
+        # Register connection creator and validator with the pool manager
+        connection_pool_manager.register_connection_creator("sqlite", self._create_connection)
+        connection_pool_manager.register_connection_validator("sqlite", self._validate_connection)
+
+    def _is_transient_error(self, error: Exception) -> bool:
+        """
+        Check if an error is transient and can be retried.
+
+        Args:
+            error: Exception object
+
+        Returns:
+            True if the error is transient, False otherwise
+        """
+        error_str = str(error).lower()
+        return any(message in error_str for message in self.TRANSIENT_ERROR_MESSAGES)
+
+    def _get_random(self, db_config: Database) -> random.Random:
+        """
+        Get the random source used for latency jitter and failure injection of a database.
+
+        Args:
+            db_config: Database configuration
+
+        Returns:
+            Random instance
+        """
+        with self._random_lock:
+            if db_config.id not in self._randoms:
+                self._randoms[db_config.id] = random.Random(db_config.connection_config.options.get("seed"))
+            return self._randoms[db_config.id]
+
+    def _inject_fault(self, db_config: Database, latency_option: str, failure_option: str,
+                      cancel_event: Optional[threading.Event] = None) -> None:
+        """
+        Apply the configured artificial latency and failure injection.
+
+        Args:
+            db_config: Database configuration
+            latency_option: Name of the latency option in milliseconds
+            failure_option: Name of the failure rate option
+            cancel_event: Optional event that interrupts the latency wait
+
+        Raises:
+            sqlite3.OperationalError: If a failure is injected or the wait is cancelled
+        """
+        options = db_config.connection_config.options
+        rng = self._get_random(db_config)
+
+        latency_ms = float(options.get(latency_option, 0) or 0)
+        jitter_ms = float(options.get("latency_jitter_ms", 0) or 0) if latency_option == "latency_ms" else 0.0
+        with self._random_lock:
+            delay = max(latency_ms + (rng.uniform(-jitter_ms, jitter_ms) if jitter_ms else 0.0), 0.0) / 1000
+            fail = rng.random() < float(options.get(failure_option, 0) or 0)
+
+        if delay:
+            if cancel_event is not None:
+                if cancel_event.wait(delay):
+                    raise sqlite3.OperationalError("interrupted")
+            else:
+                time.sleep(delay)
+
+        if fail:
+            raise sqlite3.OperationalError("injected transient failure")
+
+    @staticmethod
+    def _database_path(db_config: Database) -> Tuple[str, bool]:
+        """
+        Get the database location of a configuration.
+
+        Args:
+            db_config: Database configuration
+
+        Returns:
+            Tuple of (path or URI, whether it is a URI)
+        """
+        path = db_config.connection_config.options.get("path")
+        if path:
+            return str(path), str(path).startswith("file:")
+        # Shared in-memory database that lives as long as a pooled connection is open
+        return f"file:sql_agent_{db_config.id}?mode=memory&cache=shared", True
+
+    @backoff.on_exception(
+        backoff.expo,
+        Exception,
+        max_tries=MAX_RETRY_ATTEMPTS,
+        giveup=lambda e: not isinstance(e, Exception) or isinstance(e, ResilienceError) or not SQLiteConnector._is_transient_error(SQLiteConnector, e),
+        factor=RETRY_DELAY
+    )
+    def _create_connection(self, db_config: Database) -> Any:
+        """
+        Create a new SQLite connection with retry logic for transient errors.
+
+        Args:
+            db_config: Database configuration
+
+        Returns:
+            New database connection
+        """
+        try:
+            self._inject_fault(db_config, "connect_latency_ms", "connect_failure_rate")
+
+            path, is_uri = self._database_path(db_config)
+            timeout = db_config.connection_config.options.get("timeout", 30)
+            # Pooled connections are used from worker threads
+            connection = sqlite3.connect(path, uri=is_uri, timeout=timeout, check_same_thread=False)
+
+            for alias, attach_path in db_config.connection_config.options.get("attach", {}).items():
+                connection.execute("ATTACH DATABASE ? AS " + self._quote_identifier(alias), (str(attach_path),))
+
+            self._register_dialect_functions(connection)
+
+            logger.info(f"Created new SQLite connection to {path}")
+            return connection
+
+        except Exception as e:
+            logger.error(f"Failed to create SQLite connection: {str(e)}")
+            # Re-raise the exception to trigger retry if it's a transient error
+            # and the database's retry budget allows it
+            self._check_retry_budget(db_config.id, e)
+            raise
+
+    @staticmethod
+    def _quote_identifier(name: str) -> str:
+        """
+        Quote an identifier for use in SQLite statements.
+
+        Args:
+            name: Identifier
+
+        Returns:
+            Quoted identifier
+        """
+        return '"' + str(name).replace('"', '""') + '"'
+
+    @staticmethod
+    def _register_dialect_functions(connection: Any) -> None:
+        """
+        Register SQL functions of the SAP HANA dialect on a connection.
+
+        Args:
+            connection: SQLite connection object
+        """
+        for (name, arg_count), func in DIALECT_FUNCTIONS.items():
+            connection.create_function(name, arg_count, func, deterministic=name != "NOW")
+
+    def _validate_connection(self, connection: Any) -> bool:
+        """
+        Validate that a SQLite connection is still valid.
+
+        Args:
+            connection: SQLite connection object
+
+        Returns:
+            True if the connection is valid, False otherwise
+        """
+        try:
+            connection.execute("SELECT 1").fetchone()
+            return True
+        except Exception as e:
+            logger.warning(f"SQLite connection validation failed: {str(e)}")
+            return False
+
+    def test_connection(self, db_config: Database) -> Tuple[bool, Optional[str]]:
+        """
+        Test the connection to the SQLite database.
+
+        Args:
+            db_config: Database configuration
+
+        Returns:
+            Tuple of (success: bool, error_message: Optional[str])
+        """
+        try:
+            connection = self._create_connection(db_config)
+            version = connection.execute("SELECT sqlite_version()").fetchone()[0]
+            connection.close()
+
+            return True, f"Successfully connected to SQLite: {version}"
+        except Exception as e:
+            logger.error(f"Failed to connect to SQLite database: {str(e)}")
+            return False, f"Connection failed: {str(e)}"
+
+    def _execute_query_impl(self, db_config: Database, query: str, params: Optional[Dict[str, Any]] = None,
+                            timeout: Optional[int] = None, max_rows: Optional[int] = None) -> QueryResult:
+        """
+        Implementation of query execution for SQLite.
+
+        Args:
+            db_config: Database configuration
+            query: SQL query string
+            params: Optional query parameters (":name" placeholders)
+            timeout: Optional query timeout in seconds
+            max_rows: Optional maximum number of rows to return
+
+        Returns:
+            QueryResult object containing the query results
+
+        Raises:
+            ValueError: If the query is not valid
+            Exception: If query execution fails after retries
+        """
+        with timed_phase("validation"):
+            is_valid, error_message = self.validate_query(db_config, query)
+        if not is_valid:
+            raise ValueError(f"Invalid query: {error_message}")
+
+        query_id = str(uuid.uuid4())
+
+        with self.get_connection(db_config) as connection:
+            cancel_event = threading.Event()
+            self.query_tracker.register_query(
+                query_id,
+                db_config.id,
+                lambda: self._cancel_query_internal(connection, cancel_event, query_id)
+            )
+
+            try:
+                return self._execute_query_with_retry(
+                    connection, db_config, query, params, timeout, max_rows, query_id, cancel_event
+                )
+            except Exception as e:
+                logger.error(f"Error executing SQLite query: {str(e)}")
+                raise
+            finally:
+                self.query_tracker.unregister_query(query_id)
+
+    @backoff.on_exception(
+        backoff.expo,
+        Exception,
+        max_tries=MAX_RETRY_ATTEMPTS,
+        giveup=lambda e: not isinstance(e, Exception) or isinstance(e, ResilienceError) or not SQLiteConnector._is_transient_error(SQLiteConnector, e),
+        factor=RETRY_DELAY
+    )
+    def _execute_query_with_retry(self, connection: Any, db_config: Database, query: str,
+                                  params: Optional[Dict[str, Any]], timeout: Optional[int],
+                                  max_rows: Optional[int], query_id: str,
+                                  cancel_event: Optional[threading.Event] = None) -> QueryResult:
+        """
+        Execute a SQL query with retry logic for transient errors.
+
+        Args:
+            connection: Database connection
+            db_config: Database configuration
+            query: SQL query string
+            params: Optional query parameters
+            timeout: Optional query timeout in seconds
+            max_rows: Optional maximum number of rows to return
+            query_id: Query identifier
+            cancel_event: Optional event set when the query is cancelled
+
+        Returns:
+            QueryResult object containing the query results
+        """
+        start_time = time.time()
+        deadline = start_time + timeout if timeout else None
+
+        def check_progress() -> int:
+            # A non-zero return value aborts the statement with "interrupted"
+            if cancel_event is not None and cancel_event.is_set():
+                return 1
+            return 1 if deadline is not None and time.time() > deadline else 0
+
+        connection.set_progress_handler(check_progress, self.PROGRESS_HANDLER_INTERVAL)
+        cursor = connection.cursor()
+        try:
+            with timed_phase("server_execution"):
+                self._inject_fault(db_config, "latency_ms", "failure_rate", cancel_event)
+
+                if params:
+                    # sqlite3 supports named parameters with :parameter_name syntax
+                    cursor.execute(query, params)
+                else:
+                    # Lift inline literals into parameters so that sqlite3's per-connection
+                    # statement cache reuses the compiled statement for every literal variant
+                    statement, values = parameterize_query(query) if self.auto_parameterize else (query, [])
+                    # SQLite stores decimal literals as REAL
+                    cursor.execute(statement, [float(v) if isinstance(v, Decimal) else v for v in values])
+            with timed_phase("fetch"):
+                result = self.query_processor.process_result(cursor, query, max_rows)
+            result.query_id = query_id
+            self._infer_column_types(result)
+
+            execution_time = time.time() - start_time
+            logger.info(f"Executed SQLite query in {execution_time:.2f}s: {query[:100]}...")
+
+            return result
+
+        except Exception as e:
+            execution_time = time.time() - start_time
+            logger.error(f"Query execution failed after {execution_time:.2f}s: {str(e)}")
+
+            if "interrupted" in str(e).lower():
+                if cancel_event is not None and cancel_event.is_set():
+                    raise sqlite3.OperationalError(f"Query {query_id} was cancelled")
+                raise TimeoutError(f"Query exceeded the timeout of {timeout}s")
+
+            if self._is_transient_error(e):
+                self._check_retry_budget(db_config.id, e)
+                logger.info(f"Transient error detected, will retry: {str(e)}")
+                raise  # Re-raise to trigger retry
+
+            raise type(e)(self.format_error(e))
+        finally:
+            cursor.close()
+            connection.set_progress_handler(None, 0)
+
+    @staticmethod
+    def _infer_column_types(result: QueryResult) -> None:
+        """
+        Fill in column types from the returned values; SQLite cursors do not report them.
+
+        Args:
+            result: Query result to update in place
+        """
+        type_names = {int: "INTEGER", float: "REAL", str: "TEXT", bytes: "BLOB"}
+        for index, column in enumerate(result.columns):
+            if column.type not in ("None", "unknown"):
+                continue
+            value = next((row[index] for row in result.rows if row[index] is not None), None)
+            column.type = type_names.get(type(value), "NULL")
+
+    def _explain_query_impl(self, db_config: Database, query: str,
+                            timeout: Optional[int] = None) -> Optional[QueryCostEstimate]:
+        """
+        Describe the plan of a query with EXPLAIN QUERY PLAN.
+        SQLite does not estimate rows or cost, so only the plan operators are returned.
+
+        Args:
+            db_config: Database configuration
+            query: SQL query string
+            timeout: Optional timeout for obtaining the plan in seconds
+
+        Returns:
+            QueryCostEstimate with the plan operators
+        """
+        is_valid, error_message = self.validate_query(db_config, query)
+        if not is_valid:
+            raise ValueError(f"Invalid query: {error_message}")
+
+        with self.get_connection(db_config) as connection:
+            rows = connection.execute(f"EXPLAIN QUERY PLAN {query}").fetchall()
+
+        details = [row[-1] for row in rows]
+        return QueryCostEstimate(operators=details, plan="\n".join(details) if details else None)
+
+    def _cancel_query_internal(self, connection: Any, cancel_event: threading.Event, query_id: str) -> bool:
+        """
+        Internal method to cancel a running query.
+
+        Args:
+            connection: Database connection
+            cancel_event: Event checked by the progress handler and latency wait
+            query_id: Query identifier
+
+        Returns:
+            True if the query was cancelled
+        """
+        try:
+            cancel_event.set()
+            connection.interrupt()
+            logger.info(f"Cancelled SQLite query {query_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Error cancelling SQLite query {query_id}: {str(e)}")
+            return False
+
+    def cancel_query(self, query_id: str) -> bool:
+        """
+        Cancel a running query.
+
+        Args:
+            query_id: Query identifier
+
+        Returns:
+            True if the query was successfully cancelled, False otherwise
+        """
+        return self.query_tracker.cancel_query(query_id)
+
+    @backoff.on_exception(
+        backoff.expo,
+        Exception,
+        max_tries=MAX_RETRY_ATTEMPTS,
+        giveup=lambda e: not isinstance(e, Exception) or isinstance(e, ResilienceError) or not SQLiteConnector._is_transient_error(SQLiteConnector, e),
+        factor=RETRY_DELAY
+    )
+    def get_schema(self, db_config: Database) -> DatabaseSchema:
+        """
+        Get the SQLite database schema with retry logic for transient errors.
+        The main database and every attached database are reported as schemas.
+
+        Args:
+            db_config: Database configuration
+
+        Returns:
+            DatabaseSchema object containing the database schema
+        """
+        try:
+            return self._get_schema_impl(db_config)
+        except Exception as e:
+            self._check_retry_budget(db_config.id, e)
+            raise
+
+    def _get_schema_impl(self, db_config: Database) -> DatabaseSchema:
+        """
+        Read the SQLite database schema.
+
+        Args:
+            db_config: Database configuration
+
+        Returns:
+            DatabaseSchema object containing the database schema
+        """
+        schemas = []
+
+        with self.get_connection(db_config) as connection:
+            schema_names = [row[1] for row in connection.execute("PRAGMA database_list") if row[1] != "temp"]
+
+            for schema_name in schema_names:
+                quoted_schema = self._quote_identifier(schema_name)
+                table_names = [
+                    row[0] for row in connection.execute(
+                        f"SELECT name FROM {quoted_schema}.sqlite_master "
+                        f"WHERE type IN ('table', 'view') AND name NOT LIKE 'sqlite_%' ORDER BY name"
+                    )
+                ]
+
+                tables = []
+                for table_name in table_names:
+                    quoted_table = self._quote_identifier(table_name)
+
+                    # cid, name, type, notnull, dflt_value, pk
+                    column_rows = connection.execute(f"PRAGMA {quoted_schema}.table_info({quoted_table})").fetchall()
+                    if not column_rows:
+                        continue
+
+                    columns = [
+                        Column(
+                            name=row[1],
+                            type=row[2] or "ANY",
+                            nullable=not row[3] and not row[5],
+                            default_value=row[4]
+                        )
+                        for row in column_rows
+                    ]
+                    primary_key = [row[1] for row in sorted(column_rows, key=lambda r: r[5]) if row[5]]
+
+                    # id, seq, table, from, to, on_update, on_delete, match
+                    fk_dict: Dict[int, Dict[str, Any]] = {}
+                    for row in connection.execute(f"PRAGMA {quoted_schema}.foreign_key_list({quoted_table})"):
+                        fk = fk_dict.setdefault(row[0], {
+                            "columns": [],
+                            "reference_table": f"{schema_name}.{row[2]}",
+                            "reference_columns": []
+                        })
+                        fk["columns"].append(row[3])
+                        fk["reference_columns"].append(row[4] or row[3])
+
+                    tables.append(Table(
+                        name=table_name,
+                        columns=columns,
+                        primary_key=primary_key,
+                        foreign_keys=[ForeignKey(**fk) for fk in fk_dict.values()]
+                    ))
+
+                schemas.append(Schema(name=schema_name, tables=tables))
+
+        return DatabaseSchema(
+            db_id=db_config.id,
+            schemas=schemas,
+            last_updated=datetime.now()
+        )
+
+    def validate_query(self, db_config: Database, query: str) -> Tuple[bool, Optional[str]]:
+        """
+        Validate a SQL query without executing it.
+
+        Args:
+            db_config: Database configuration
+            query: SQL query string
+
+        Returns:
+            Tuple of (is_valid: bool, error_message: Optional[str])
+        """
+        return self.sql_validator.validate_query(query)
+
+    def is_read_only_query(self, query: str) -> bool:
+        """
+        Check if a query is read-only (SELECT, SHOW, DESCRIBE, etc.).
+
+        Args:
+            query: SQL query string
+
+        Returns:
+            True if the query is read-only, False otherwise
+        """
+        return self.sql_validator.is_read_only_query(query)
+
+    def format_error(self, error: Exception) -> str:
+        """
+        Format an exception into a user-friendly error message.
+
+        Args:
+            error: Exception object
+
+        Returns:
+            Formatted error message
+        """
+        error_message = str(error)
+
+        if isinstance(error, sqlite3.IntegrityError):
+            return f"Integrity constraint violation: {error_message}"
+        elif isinstance(error, sqlite3.OperationalError):
+            if "syntax error" in error_message.lower() or "no such" in error_message.lower():
+                return f"SQL syntax error: {error_message}"
+            return f"Database operational error: {error_message}"
+        elif isinstance(error, sqlite3.DataError):
+            return f"Data error: {error_message}"
+
+        return f"{type(error).__name__}: {error_message}"
@@ -1,7 +1,22 @@
 # CRUD operations package
 from .user import get_user, get_user_by_username, get_user_by_email, get_users, get_admin_users
-from .query import create_query, get_query_by_id, get_queries_by_user, update_query, delete_query
-from .query_stats import get_query_count, get_recent_queries, get_avg_query_time, get_query_error_count
+from .query import create_query, get_query_by_id, get_queries_by_user, update_query, delete_query, merge_query_phase_timings
+from .query_stats import (
+    get_query_count,
+    get_recent_queries,
+    get_avg_query_time,
+    get_query_error_count,
+    record_fingerprint_execution,
+    get_fingerprint_stats,
+    get_phase_latency_percentiles
+)
+from .slow_query_log import (
+    create_slow_query_log,
+    get_slow_query_logs,
+    count_slow_query_logs,
+    get_slow_query_log,
+    trim_slow_query_logs
+)
 from .feedback import create_feedback, get_feedback, get_feedbacks, update_feedback, delete_feedback
 from .system_log import (
     create_system_log, 
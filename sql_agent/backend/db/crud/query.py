@@ -31,6 +31,8 @@ async def create_query(query_data: QueryCreate) -> Query:
             natural_language=query_data.natural_language,
             generated_sql=query_data.generated_sql,
             executed_sql=query_data.executed_sql,
+            phase_timings=query_data.phase_timings,
+            answer_fingerprint=query_data.answer_fingerprint,
             status=QueryStatus.PENDING,
             start_time=datetime.utcnow(),
             created_at=datetime.utcnow()
@@ -148,4 +150,32 @@ async def delete_query(query_id: str) -> bool:
         
         await session.commit()
         
-        return result.rowcount > 0
\ No newline at end of file
+        return result.rowcount > 0
+
+
+async def merge_query_phase_timings(query_id: str, phase_timings: Dict[str, float]) -> Optional[Query]:
+    """
+    Merge phase timings into a query record, replacing phases measured again
+    
+    Args:
+        query_id: Query ID
+        phase_timings: Phase name -> milliseconds
+        
+    Returns:
+        Updated query if found, None otherwise
+    """
+    async with get_session() as session:
+        result = await session.execute(
+            select(Query).where(Query.id == query_id)
+        )
+        query = result.scalars().first()
+        if not query:
+            return None
+        
+        # Assign a new dictionary so that the JSON column is detected as changed
+        query.phase_timings = {**(query.phase_timings or {}), **phase_timings}
+        
+        await session.commit()
+        await session.refresh(query)
+        
+        return query
@@ -33,6 +33,7 @@ async def create_query_result(result_data: QueryResultCreate) -> QueryResult:
             truncated=result_data.truncated,
             total_row_count=result_data.total_row_count,
             summary=result_data.summary,
+            approximation=result_data.approximation,
             created_at=datetime.utcnow()
         )
         
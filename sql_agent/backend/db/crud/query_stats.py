@@ -4,9 +4,28 @@ CRUD operations for query statistics
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from sqlalchemy import func, and_, or_, desc
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.future import select
 from sqlalchemy.orm import Session
 
-from ..models.query import QueryDB
+from ..models.query import QueryDB, QueryFingerprintStatsDB
+from ...db.session import get_session
+from ...utils.sql_fingerprint import normalize_sql_shape
+from ...utils.query_timing import QUERY_PHASES
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000, 300000]
+
+# Columns the fingerprint statistics can be sorted by
+FINGERPRINT_STATS_SORT_COLUMNS = {
+    "total_time": QueryFingerprintStatsDB.total_time_ms,
+    "mean_time": QueryFingerprintStatsDB.total_time_ms / QueryFingerprintStatsDB.calls,
+    "max_time": QueryFingerprintStatsDB.max_time_ms,
+    "calls": QueryFingerprintStatsDB.calls,
+    "errors": QueryFingerprintStatsDB.errors,
+    "rows": QueryFingerprintStatsDB.total_rows,
+    "last_seen": QueryFingerprintStatsDB.last_seen,
+}
 
 
 def get_query_count(db: Session, user_id: Optional[str] = None, days: Optional[int] = None) -> int:
@@ -111,4 +130,258 @@ def get_query_error_count(db: Session, user_id: Optional[str] = None, days: Opti
         start_date = datetime.utcnow() - timedelta(days=days)
         query = query.filter(QueryDB.start_time >= start_date)
     
-    return query.scalar() or 0
\ No newline at end of file
+    return query.scalar() or 0
+
+
+def latency_bucket(duration_ms: float) -> int:
+    """
+    Get the latency histogram bucket of a duration
+    
+    Args:
+        duration_ms: Duration in milliseconds
+        
+    Returns:
+        Bucket index
+    """
+    for index, upper_bound in enumerate(LATENCY_BUCKETS_MS):
+        if duration_ms <= upper_bound:
+            return index
+    return len(LATENCY_BUCKETS_MS)
+
+
+def latency_percentile(histogram: List[int], percentile: float, max_time_ms: Optional[float] = None) -> Optional[float]:
+    """
+    Estimate a latency percentile from a histogram by interpolating within the bucket
+    
+    Args:
+        histogram: Call counts per latency bucket
+        percentile: Percentile between 0 and 100
+        max_time_ms: Optional maximum observed latency (bounds the estimate)
+        
+    Returns:
+        Estimated latency in milliseconds, or None for an empty histogram
+    """
+    total = sum(histogram)
+    if not total:
+        return None
+    
+    rank = percentile / 100 * total
+    cumulative = 0
+    for index, count in enumerate(histogram):
+        if count and cumulative + count >= rank:
+            lower = LATENCY_BUCKETS_MS[index - 1] if index > 0 else 0.0
+            upper = LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else (max_time_ms or lower)
+            estimate = lower + (upper - lower) * (rank - cumulative) / count
+            return min(estimate, max_time_ms) if max_time_ms is not None else estimate
+        cumulative += count
+    return max_time_ms
+
+
+def _apply_execution(stats: QueryFingerprintStatsDB, duration_ms: float, row_count: int,
+                     error: bool, cache_hit: bool, executed_at: datetime) -> None:
+    """
+    Add one execution to a fingerprint statistics record
+    
+    Args:
+        stats: Statistics record
+        duration_ms: Execution time in milliseconds
+        row_count: Number of returned rows
+        error: Whether the execution failed
+        cache_hit: Whether the result was served from a cache
+        executed_at: Execution time
+    """
+    histogram = list(stats.latency_histogram or [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    histogram[latency_bucket(duration_ms)] += 1
+    
+    stats.calls = (stats.calls or 0) + 1
+    stats.errors = (stats.errors or 0) + (1 if error else 0)
+    stats.cache_hits = (stats.cache_hits or 0) + (1 if cache_hit else 0)
+    stats.total_rows = (stats.total_rows or 0) + row_count
+    stats.total_time_ms = (stats.total_time_ms or 0.0) + duration_ms
+    stats.min_time_ms = duration_ms if stats.min_time_ms is None else min(stats.min_time_ms, duration_ms)
+    stats.max_time_ms = duration_ms if stats.max_time_ms is None else max(stats.max_time_ms, duration_ms)
+    stats.latency_histogram = histogram
+    stats.last_seen = executed_at
+
+
+async def record_fingerprint_execution(
+    fingerprint: str,
+    db_id: str,
+    sql: str,
+    duration_ms: float,
+    row_count: int = 0,
+    error: bool = False,
+    cache_hit: bool = False
+) -> None:
+    """
+    Incrementally update the workload statistics of a query fingerprint
+    
+    Args:
+        fingerprint: Query shape fingerprint
+        db_id: Database ID
+        sql: Executed SQL query (stored in normalized form)
+        duration_ms: Execution time in milliseconds
+        row_count: Number of returned rows
+        error: Whether the execution failed
+        cache_hit: Whether the result was served from a cache
+    """
+    executed_at = datetime.utcnow()
+    
+    # Retry once if a concurrent execution of a new fingerprint inserted the row first
+    for attempt in range(2):
+        async with get_session() as session:
+            result = await session.execute(
+                select(QueryFingerprintStatsDB).where(
+                    QueryFingerprintStatsDB.fingerprint == fingerprint,
+                    QueryFingerprintStatsDB.db_id == db_id
+                ).with_for_update()
+            )
+            stats = result.scalars().first()
+            if stats is None:
+                stats = QueryFingerprintStatsDB(
+                    fingerprint=fingerprint,
+                    db_id=db_id,
+                    normalized_sql=normalize_sql_shape(sql),
+                    first_seen=executed_at
+                )
+                session.add(stats)
+            
+            _apply_execution(stats, duration_ms, row_count, error, cache_hit, executed_at)
+            
+            try:
+                await session.commit()
+                return
+            except IntegrityError:
+                await session.rollback()
+                if attempt:
+                    raise
+
+
+def get_fingerprint_stats(
+    db: Session,
+    sort_by: str = "total_time",
+    limit: int = 50,
+    db_id: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Get workload statistics per query fingerprint, most expensive first
+    
+    Args:
+        db: Database session
+        sort_by: Sort column (total_time, mean_time, max_time, calls, errors, rows, last_seen)
+        limit: Maximum number of fingerprints to return
+        db_id: Optional database ID to filter by
+        
+    Returns:
+        List of fingerprint statistics
+    """
+    if sort_by not in FINGERPRINT_STATS_SORT_COLUMNS:
+        raise ValueError(f"Invalid sort column: {sort_by}")
+    
+    query = db.query(QueryFingerprintStatsDB)
+    
+    if db_id:
+        query = query.filter(QueryFingerprintStatsDB.db_id == db_id)
+    
+    records = query.order_by(desc(FINGERPRINT_STATS_SORT_COLUMNS[sort_by])).limit(limit).all()
+    
+    # Share of the total time of all fingerprints (of the database, if filtered)
+    total_query = db.query(func.sum(QueryFingerprintStatsDB.total_time_ms))
+    if db_id:
+        total_query = total_query.filter(QueryFingerprintStatsDB.db_id == db_id)
+    overall_time_ms = total_query.scalar() or 0.0
+    
+    return [
+        {
+            "fingerprint": record.fingerprint,
+            "db_id": record.db_id,
+            "normalized_sql": record.normalized_sql,
+            "calls": record.calls,
+            "errors": record.errors,
+            "cache_hits": record.cache_hits,
+            "rows": record.total_rows,
+            "total_time_ms": record.total_time_ms,
+            "mean_time_ms": record.total_time_ms / record.calls if record.calls else 0.0,
+            "min_time_ms": record.min_time_ms,
+            "max_time_ms": record.max_time_ms,
+            "p95_time_ms": latency_percentile(record.latency_histogram or [], 95, record.max_time_ms),
+            "time_share": record.total_time_ms / overall_time_ms if overall_time_ms else 0.0,
+            "first_seen": record.first_seen,
+            "last_seen": record.last_seen
+        }
+        for record in records
+    ]
+
+
+def _nearest_rank(sorted_values: List[float], percentile: float) -> float:
+    """
+    Get a percentile of sorted values with the nearest-rank method
+    
+    Args:
+        sorted_values: Values in ascending order
+        percentile: Percentile between 0 and 100
+        
+    Returns:
+        Percentile value
+    """
+    rank = max(1, int(-(-percentile * len(sorted_values) // 100)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def get_phase_latency_percentiles(
+    db: Session,
+    days: Optional[int] = 7,
+    db_id: Optional[str] = None,
+    max_queries: int = 10000
+) -> Dict[str, Any]:
+    """
+    Get latency percentiles of each query lifecycle phase
+    
+    Args:
+        db: Database session
+        days: Number of days to look back (None for all time)
+        db_id: Optional database ID to filter by
+        max_queries: Maximum number of most recent queries to aggregate
+        
+    Returns:
+        Dictionary with the number of aggregated queries and per-phase statistics
+    """
+    query = db.query(QueryDB.phase_timings).filter(QueryDB.phase_timings.isnot(None))
+    
+    # Filter on the creation time: queries that were generated but never executed
+    # still carry schema_fetch and llm_generation timings
+    if days:
+        start_date = datetime.utcnow() - timedelta(days=days)
+        query = query.filter(QueryDB.created_at >= start_date)
+    
+    if db_id:
+        query = query.filter(QueryDB.db_id == db_id)
+    
+    samples: Dict[str, List[float]] = {}
+    query_count = 0
+    for (phase_timings,) in query.order_by(desc(QueryDB.created_at)).limit(max_queries):
+        if not phase_timings:
+            continue
+        query_count += 1
+        for phase, duration_ms in phase_timings.items():
+            samples.setdefault(phase, []).append(float(duration_ms))
+    
+    phases = {}
+    for phase in QUERY_PHASES + sorted(set(samples) - set(QUERY_PHASES)):
+        values = sorted(samples.get(phase, []))
+        if not values:
+            continue
+        phases[phase] = {
+            "count": len(values),
+            "mean_ms": sum(values) / len(values),
+            "p50_ms": _nearest_rank(values, 50),
+            "p90_ms": _nearest_rank(values, 90),
+            "p95_ms": _nearest_rank(values, 95),
+            "p99_ms": _nearest_rank(values, 99),
+            "max_ms": values[-1]
+        }
+    
+    return {
+        "query_count": query_count,
+        "phases": phases
+    }
@@ -0,0 +1,160 @@
+"""
+CRUD operations for the slow query log
+"""
+from typing import List, Optional, Dict, Any
+from datetime import datetime, timedelta
+from sqlalchemy import func, desc
+from sqlalchemy.orm import Session
+
+from ..models.query import SlowQueryLogDB
+from ...db.session import get_session
+
+
+def _filter_slow_query_logs(
+    query,
+    db_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    min_duration_ms: Optional[float] = None
+):
+    """
+    Apply optional filters to a slow query log query
+    
+    Args:
+        query: SQLAlchemy query
+        db_id: Optional database ID to filter by
+        user_id: Optional user ID to filter by
+        min_duration_ms: Optional minimum duration in milliseconds
+        
+    Returns:
+        Filtered query
+    """
+    if db_id:
+        query = query.filter(SlowQueryLogDB.db_id == db_id)
+    
+    if user_id:
+        query = query.filter(SlowQueryLogDB.user_id == user_id)
+    
+    if min_duration_ms is not None:
+        query = query.filter(SlowQueryLogDB.duration_ms >= min_duration_ms)
+    
+    return query
+
+
+def trim_slow_query_logs(db: Session, max_entries: int, retention_days: int) -> int:
+    """
+    Delete slow query log entries older than the retention period or beyond the maximum size
+    
+    Args:
+        db: Database session
+        max_entries: Maximum number of entries kept (the newest ones)
+        retention_days: Number of days entries are kept
+        
+    Returns:
+        Number of deleted entries
+    """
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    deleted = db.query(SlowQueryLogDB).filter(
+        SlowQueryLogDB.created_at < cutoff
+    ).delete(synchronize_session=False)
+    
+    # Entries past the newest max_entries are removed oldest first
+    oldest_kept = db.query(SlowQueryLogDB.created_at).order_by(
+        desc(SlowQueryLogDB.created_at)
+    ).offset(max_entries - 1).limit(1).scalar() if max_entries > 0 else None
+    if oldest_kept is not None:
+        deleted += db.query(SlowQueryLogDB).filter(
+            SlowQueryLogDB.created_at < oldest_kept
+        ).delete(synchronize_session=False)
+    
+    return deleted
+
+
+async def create_slow_query_log(
+    entry_data: Dict[str, Any],
+    max_entries: int,
+    retention_days: int
+) -> SlowQueryLogDB:
+    """
+    Add an entry to the slow query log and keep the log within its bounds
+    
+    Args:
+        entry_data: Column values of the entry
+        max_entries: Maximum number of entries kept
+        retention_days: Number of days entries are kept
+        
+    Returns:
+        Created slow query log entry
+    """
+    async with get_session() as session:
+        entry = SlowQueryLogDB(**entry_data)
+        session.add(entry)
+        await session.flush()
+        await session.run_sync(trim_slow_query_logs, max_entries, retention_days)
+        await session.commit()
+        await session.refresh(entry)
+        
+        return entry
+
+
+def get_slow_query_logs(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    db_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    min_duration_ms: Optional[float] = None
+) -> List[SlowQueryLogDB]:
+    """
+    Get slow query log entries, newest first
+    
+    Args:
+        db: Database session
+        skip: Number of records to skip
+        limit: Maximum number of records to return
+        db_id: Optional database ID to filter by
+        user_id: Optional user ID to filter by
+        min_duration_ms: Optional minimum duration in milliseconds
+        
+    Returns:
+        List of slow query log entries
+    """
+    query = _filter_slow_query_logs(db.query(SlowQueryLogDB), db_id, user_id, min_duration_ms)
+    
+    return query.order_by(desc(SlowQueryLogDB.created_at)).offset(skip).limit(limit).all()
+
+
+def count_slow_query_logs(
+    db: Session,
+    db_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    min_duration_ms: Optional[float] = None
+) -> int:
+    """
+    Count slow query log entries
+    
+    Args:
+        db: Database session
+        db_id: Optional database ID to filter by
+        user_id: Optional user ID to filter by
+        min_duration_ms: Optional minimum duration in milliseconds
+        
+    Returns:
+        Count of slow query log entries
+    """
+    query = _filter_slow_query_logs(db.query(func.count(SlowQueryLogDB.id)), db_id, user_id, min_duration_ms)
+    
+    return query.scalar() or 0
+
+
+def get_slow_query_log(db: Session, entry_id: str) -> Optional[SlowQueryLogDB]:
+    """
+    Get a slow query log entry by ID
+    
+    Args:
+        db: Database session
+        entry_id: Entry ID
+        
+    Returns:
+        Slow query log entry or None if not found
+    """
+    return db.query(SlowQueryLogDB).filter(SlowQueryLogDB.id == entry_id).first()
@@ -1,5 +1,5 @@
 # Database models package
 from .user import User, UserPreference, UserDatabasePermission, UserSession, Role
-from .query import QueryDB, QueryResultDB, ReportDB, QueryHistoryDB, SharedQueryDB
+from .query import QueryDB, QueryResultDB, ReportDB, QueryHistoryDB, SharedQueryDB, QueryFingerprintStatsDB, SlowQueryLogDB
 from .feedback import Feedback, FeedbackResponse, FeedbackCategory, FeedbackStatus, FeedbackPriority
 from .system_log import SystemLog, SystemMetric
\ No newline at end of file
@@ -1,7 +1,7 @@
 """
 Database models for queries, results, and related entities
 """
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Table, Integer, Text, JSON, ARRAY
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Table, Integer, Float, Text, JSON, ARRAY, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
@@ -25,6 +25,8 @@ class QueryDB(BaseModel):
     end_time = Column(DateTime, nullable=True)
     error = Column(Text, nullable=True)
     result_id = Column(String(36), ForeignKey("query_results.id"), nullable=True)
+    phase_timings = Column(JSON, nullable=True)  # Lifecycle phase name -> milliseconds
+    answer_fingerprint = Column(String(64), nullable=True)  # sql_fingerprint of the SQL answer served to the user
     
     # Relationships
     # Commented result relationship due to mapper direction conflict for now
@@ -49,6 +51,7 @@ class QueryResultDB(BaseModel):
     total_row_count = Column(Integer, nullable=True)
     summary = Column(Text, nullable=True)
     report_id = Column(String(36), ForeignKey("reports.id"), nullable=True)
+    approximation = Column(JSON, nullable=True)  # Sampling details of approximate (preview) results
     
     # Relationships
     # from .query import QueryDB  # type: ignore; for forward reference
@@ -114,4 +117,55 @@ class SharedQueryDB(BaseModel):
         """Check if the shared query has expired"""
         if self.expires_at is None:
             return False
-        return datetime.utcnow() > self.expires_at
\ No newline at end of file
+        return datetime.utcnow() > self.expires_at
+
+class QueryFingerprintStatsDB(BaseModel):
+    """Database model for workload statistics per query fingerprint and database"""
+    __tablename__ = "query_fingerprint_stats"
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    fingerprint = Column(String(64), nullable=False, index=True)  # SHA-256 of the normalized query shape
+    db_id = Column(String(100), nullable=False)
+    normalized_sql = Column(Text, nullable=False)
+    calls = Column(Integer, default=0, nullable=False)
+    errors = Column(Integer, default=0, nullable=False)
+    cache_hits = Column(Integer, default=0, nullable=False)
+    total_rows = Column(Integer, default=0, nullable=False)
+    total_time_ms = Column(Float, default=0.0, nullable=False)
+    min_time_ms = Column(Float, nullable=True)
+    max_time_ms = Column(Float, nullable=True)
+    latency_histogram = Column(JSON, nullable=False)  # Call counts per latency bucket
+    first_seen = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_seen = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint('fingerprint', 'db_id', name='uq_query_fingerprint_stats_fingerprint_db'),
+    )
+    
+    def __repr__(self):
+        return f"<QueryFingerprintStats {self.fingerprint[:12]} - {self.calls} calls>"
+
+class SlowQueryLogDB(BaseModel):
+    """Database model for queries that exceeded the slow query threshold"""
+    __tablename__ = "slow_query_log"
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    query_id = Column(String(36), nullable=True, index=True)
+    user_id = Column(String(36), nullable=True, index=True)
+    db_id = Column(String(100), nullable=False, index=True)
+    fingerprint = Column(String(64), nullable=True, index=True)
+    sql = Column(Text, nullable=False)
+    status = Column(String(20), nullable=False)  # completed, failed
+    error = Column(Text, nullable=True)
+    duration_ms = Column(Float, nullable=False)
+    phase_timings = Column(JSON, nullable=True)  # Phase name -> milliseconds
+    row_count = Column(Integer, nullable=True)
+    plan = Column(Text, nullable=True)  # Showplan XML (MS-SQL) or plan operator listing (SAP HANA)
+    plan_source = Column(String(20), nullable=True)  # plan_cache, estimated
+    plan_error = Column(Text, nullable=True)
+    estimated_cost = Column(Float, nullable=True)
+    estimated_rows = Column(Float, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    
+    def __repr__(self):
+        return f"<SlowQueryLog {self.id} - {self.duration_ms:.0f}ms>"
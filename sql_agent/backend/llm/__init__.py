@@ -18,6 +18,7 @@ from .prompt_utils import (
 from .response_utils import (
     ResponseParsingError,
     ResponseValidationError,
+    StreamingSQLExtractor,
     extract_sql_from_response,
     extract_python_code_from_response,
     extract_insights_from_response,
@@ -27,6 +28,10 @@ from .response_utils import (
 )
 from .openai_service import OpenAIService
 from .nl_to_sql_service import NLToSQLService
+from .embedding_pipeline import EmbeddingPipeline
+from .rate_limiter import AsyncRateLimiter, ProviderLimiter, RequestPriority, get_provider_limiter, configure_provider_limits
+from .embedding_cache import EmbeddingCache, embedding_cache
+from .local_embedding_service import LocalEmbeddingService, HashingEmbedder
 
 
 __all__ = [
@@ -44,6 +49,7 @@ __all__ = [
     'create_result_structure',
     'ResponseParsingError',
     'ResponseValidationError',
+    'StreamingSQLExtractor',
     'extract_sql_from_response',
     'extract_python_code_from_response',
     'extract_insights_from_response',
@@ -51,5 +57,15 @@ __all__ = [
     'validate_python_code',
     'parse_llm_response',
     'OpenAIService',
-    'NLToSQLService'
+    'NLToSQLService',
+    'EmbeddingPipeline',
+    'AsyncRateLimiter',
+    'EmbeddingCache',
+    'embedding_cache',
+    'LocalEmbeddingService',
+    'HashingEmbedder',
+    'ProviderLimiter',
+    'RequestPriority',
+    'get_provider_limiter',
+    'configure_provider_limits'
 ]
\ No newline at end of file
@@ -1,6 +1,33 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Awaitable, List, Optional, Tuple, AsyncIterator, TypeVar
 from enum import Enum
+import asyncio
+
+
+T = TypeVar("T")
+
+
+def run_sync(coroutine: Awaitable[T]) -> T:
+    """
+    코루틴을 동기적으로 실행
+    
+    실행 중인 이벤트 루프 안(예: FastAPI 핸들러)에서는 asyncio.run을 호출할 수 없으므로
+    별도 스레드의 새 이벤트 루프에서 실행합니다.
+    
+    Args:
+        coroutine (Awaitable[T]): 실행할 코루틴
+        
+    Returns:
+        T: 코루틴 실행 결과
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
 
 
 class LLMProvider(str, Enum):
@@ -9,6 +36,8 @@ class LLMProvider(str, Enum):
     AZURE_OPENAI = "azure_openai"
     HUGGINGFACE = "huggingface"
     ANTHROPIC = "anthropic"
+    LOCAL = "local"
+    REPLAY = "replay"
     CUSTOM = "custom"
 
 
@@ -166,8 +195,7 @@ class LLMService(ABC):
         Returns:
             List[List[float]]: 생성된 임베딩 목록
         """
-        import asyncio
-        return asyncio.run(self.get_embeddings(texts))
+        return run_sync(self.get_embeddings(texts))
         
     @abstractmethod
     async def generate_rag_response(self, query: str, context: str) -> str:
@@ -181,4 +209,58 @@ class LLMService(ABC):
         Returns:
             str: 생성된 응답
         """
-        pass
\ No newline at end of file
+        pass
+    
+    # 스트리밍 변형: 이벤트 딕셔너리를 순서대로 전달
+    #   {"event": "token", "content": str}  - 모델이 생성한 텍스트 조각
+    #   {"event": "sql", "sql": str, ...}    - SQL 코드 블록이 닫힌 직후 (generate_sql만 해당)
+    #   {"event": "done", ...}               - 비스트리밍 메서드와 같은 최종 결과
+    # 기본 구현은 비스트리밍 메서드의 결과를 한 번에 전달하며, 토큰 단위 스트리밍을 지원하는 서비스가 재정의합니다.
+    
+    async def stream_generate_sql(self, natural_language: str, schema: Dict[str, Any], db_type: str, context: Optional[List[Dict[str, Any]]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        자연어를 SQL로 변환 (스트리밍)
+        
+        Args:
+            natural_language (str): 자연어 질의
+            schema (Dict[str, Any]): DB 스키마 정보
+            db_type (str): 데이터베이스 유형 ('mssql' 또는 'hana')
+            context (List[Dict[str, Any]], optional): 대화 컨텍스트
+            
+        Yields:
+            Dict[str, Any]: 스트리밍 이벤트
+        """
+        result = await self.generate_sql(natural_language, schema, db_type, context)
+        yield {"event": "sql", "sql": result["sql"]}
+        yield {"event": "done", **result}
+    
+    async def stream_rag_response(self, query: str, context: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        RAG 컨텍스트를 기반으로 응답 생성 (스트리밍)
+        
+        Args:
+            query (str): 사용자 질의
+            context (str): 검색된 문서 컨텍스트
+            
+        Yields:
+            Dict[str, Any]: 스트리밍 이벤트 ("done" 이벤트의 "response"에 전체 응답)
+        """
+        response = await self.generate_rag_response(query, context)
+        yield {"event": "token", "content": response}
+        yield {"event": "done", "response": response}
+    
+    async def stream_summarize_results(self, query_result: Dict[str, Any], natural_language: str, sql_query: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        쿼리 결과 요약 (스트리밍)
+        
+        Args:
+            query_result (Dict[str, Any]): 쿼리 실행 결과
+            natural_language (str): 원본 자연어 질의
+            sql_query (str): 실행된 SQL 쿼리
+            
+        Yields:
+            Dict[str, Any]: 스트리밍 이벤트 ("done" 이벤트에 요약 및 인사이트)
+        """
+        result = await self.summarize_results(query_result, natural_language, sql_query)
+        yield {"event": "token", "content": result.get("summary", "")}
+        yield {"event": "done", **result}
@@ -0,0 +1,413 @@
+"""
+임베딩 영구 캐시
+
+이 모듈은 (임베딩 모델, 전처리된 텍스트의 SHA-256)을 키로 임베딩을 디스크에 저장합니다.
+모델별로 메모리 매핑된 float32 배열 파일과 추가 전용 키 인덱스(JSONL 저널) 파일을 사용하므로,
+내용이 바뀌지 않은 문서를 다시 인덱싱할 때 임베딩 API를 호출하지 않습니다.
+저장할 때마다 인덱스 전체를 다시 쓰지 않고 저널에 한 줄씩 추가하며, 저널이 길어지면 압축합니다.
+여러 프로세스가 같은 캐시 디렉터리를 사용할 수 있도록 행 할당과 인덱스 기록은 파일 잠금(fcntl.flock)으로 보호합니다.
+"""
+from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from threading import Lock
+import hashlib
+import json
+import logging
+import os
+import re
+
+import numpy as np
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows에서는 사용할 수 없으므로 한 프로세스만 캐시에 기록해야 함
+
+
+logger = logging.getLogger(__name__)
+
+
+def text_hash(text: str) -> str:
+    """
+    임베딩 캐시 키로 사용할 텍스트 해시 계산
+
+    Args:
+        text (str): 전처리된 텍스트
+
+    Returns:
+        str: SHA-256 16진수 문자열
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class _ModelStore:
+    """한 임베딩 모델의 벡터 파일과 키 인덱스 저널"""
+
+    VECTORS_FILE = "vectors.f32"
+    INDEX_FILE = "index.jsonl"
+    LOCK_FILE = "lock"
+
+    def __init__(self, directory: str, initial_capacity: int, compact_after: int = 1024):
+        """
+        모델 저장소 열기 (파일이 있으면 기존 항목을 읽음)
+
+        Args:
+            directory (str): 모델 저장소 디렉터리
+            initial_capacity (int): 처음 생성할 벡터 파일의 행 수
+            compact_after (int): 압축할 저널 줄 수
+        """
+        self.directory = directory
+        self.initial_capacity = initial_capacity
+        self.compact_after = compact_after
+        self.dimension: Optional[int] = None
+        self.rows: Dict[str, int] = {}
+        self._vectors: Optional[np.memmap] = None
+        self._next_row = 0
+        self._journal_id: Optional[tuple] = None  # (장치, inode) - 압축으로 교체되면 처음부터 다시 읽음
+        self._journal_offset = 0
+        self._journal_lines = 0
+
+        if os.path.exists(self._path(self.INDEX_FILE)):
+            with self._file_lock(fcntl.LOCK_SH if fcntl else None):
+                self._refresh()
+
+    def _path(self, filename: str) -> str:
+        """저장소 디렉터리 안의 파일 경로"""
+        return os.path.join(self.directory, filename)
+
+    @contextmanager
+    def _file_lock(self, mode: Optional[int]):
+        """
+        다른 프로세스와의 동시 접근을 막는 파일 잠금
+
+        Args:
+            mode (Optional[int]): fcntl.LOCK_SH 또는 fcntl.LOCK_EX (fcntl이 없으면 None)
+        """
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(self.LOCK_FILE), "a") as f:
+            fcntl.flock(f.fileno(), mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    @property
+    def capacity(self) -> int:
+        """벡터 파일에 할당된 행 수"""
+        return 0 if self._vectors is None else self._vectors.shape[0]
+
+    def _refresh(self) -> None:
+        """다른 프로세스가 저널에 추가한 항목 읽기 (파일 잠금을 잡은 상태에서 호출)"""
+        path = self._path(self.INDEX_FILE)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return
+
+        journal_id = (stat.st_dev, stat.st_ino)
+        if journal_id != self._journal_id:
+            self._journal_id = journal_id
+            self._journal_offset = 0
+            self._journal_lines = 0
+            self.rows = {}
+            self._next_row = 0
+        if stat.st_size <= self._journal_offset:
+            return
+
+        try:
+            with open(path, "rb") as f:
+                f.seek(self._journal_offset)
+                data = f.read()
+            # 중단된 기록으로 끝에 남은 불완전한 줄은 읽지 않음
+            complete = data[:data.rfind(b"\n") + 1]
+            for line in complete.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if "dimension" in entry:
+                    self.dimension = entry["dimension"]
+                for key, row in entry.get("rows", {}).items():
+                    self.rows[key] = row
+                    self._next_row = max(self._next_row, row + 1)
+                self._journal_lines += 1
+            self._journal_offset += len(complete)
+            if self.dimension is not None and self._next_row > self.capacity:
+                self._open_vectors()
+        except Exception as e:
+            logger.warning(f"임베딩 캐시를 읽지 못해 새로 시작합니다 ({self.directory}): {str(e)}")
+            self.dimension = None
+            self.rows = {}
+            self._next_row = 0
+            self._vectors = None
+
+    def _open_vectors(self) -> None:
+        """벡터 파일을 메모리 매핑으로 열기"""
+        path = self._path(self.VECTORS_FILE)
+        rows = os.path.getsize(path) // (4 * self.dimension)
+        self._vectors = np.memmap(path, dtype=np.float32, mode="r+", shape=(rows, self.dimension))
+
+    def _reserve(self, rows: int) -> None:
+        """
+        벡터 파일 크기를 두 배씩 늘려 필요한 행 수 확보 (다른 프로세스가 늘린 파일은 다시 매핑)
+
+        Args:
+            rows (int): 필요한 전체 행 수
+        """
+        if rows <= self.capacity:
+            return
+
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(self.VECTORS_FILE)
+        current = os.path.getsize(path) // (4 * self.dimension) if os.path.exists(path) else 0
+        if rows > current:
+            capacity = max(self.initial_capacity, current * 2, rows)
+            with open(path, "ab") as f:
+                f.truncate(capacity * self.dimension * 4)
+        self._open_vectors()
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """
+        키에 해당하는 임베딩 조회
+
+        Args:
+            key (str): 텍스트 해시
+
+        Returns:
+            Optional[List[float]]: 임베딩 또는 None
+        """
+        row = self.rows.get(key)
+        if row is None or self._vectors is None or row >= self.capacity:
+            return None
+        return self._vectors[row].tolist()
+
+    def get_many(self, keys: List[str]) -> List[Optional[List[float]]]:
+        """
+        여러 키의 임베딩 조회 (없는 키가 있으면 다른 프로세스가 추가한 항목을 읽은 뒤 다시 조회)
+
+        Args:
+            keys (List[str]): 텍스트 해시 목록
+
+        Returns:
+            List[Optional[List[float]]]: 입력 순서와 같은 임베딩 목록
+        """
+        if any(key not in self.rows for key in keys) and self._journal_changed():
+            with self._file_lock(fcntl.LOCK_SH if fcntl else None):
+                self._refresh()
+        return [self.get(key) for key in keys]
+
+    def _journal_changed(self) -> bool:
+        """마지막으로 읽은 뒤 저널이 바뀌었는지 여부"""
+        try:
+            stat = os.stat(self._path(self.INDEX_FILE))
+        except FileNotFoundError:
+            return False
+        return (stat.st_dev, stat.st_ino) != self._journal_id or stat.st_size > self._journal_offset
+
+    def put(self, items: Dict[str, List[float]]) -> int:
+        """
+        임베딩을 벡터 파일에 추가하고 인덱스 저널에 기록
+
+        파일 잠금을 잡은 상태에서 다른 프로세스의 기록을 먼저 읽어 행을 할당하고,
+        벡터를 기록한 뒤 저널에 한 줄을 추가하므로 저널은 항상 기록이 끝난 행만 가리킵니다.
+
+        Args:
+            items (Dict[str, List[float]]): 텍스트 해시 -> 임베딩
+
+        Returns:
+            int: 새로 저장된 항목 수
+        """
+        with self._file_lock(fcntl.LOCK_EX if fcntl else None):
+            self._refresh()
+            new_items = {key: vector for key, vector in items.items() if key not in self.rows}
+            if not new_items:
+                return 0
+
+            header = self.dimension is None
+            if header:
+                self.dimension = len(next(iter(new_items.values())))
+
+            vectors = [(key, vector) for key, vector in new_items.items() if len(vector) == self.dimension]
+            if len(vectors) < len(new_items):
+                logger.warning(f"차원이 다른 임베딩 {len(new_items) - len(vectors)}개는 캐시에 저장하지 않습니다.")
+            if not vectors:
+                return 0
+
+            start = self._next_row
+            self._reserve(start + len(vectors))
+            self._vectors[start:start + len(vectors)] = np.asarray([vector for _, vector in vectors], dtype=np.float32)
+            self._vectors.flush()
+
+            rows = {key: start + offset for offset, (key, _) in enumerate(vectors)}
+            entry: Dict[str, Any] = {"rows": rows}
+            if header:
+                entry["dimension"] = self.dimension
+            self._append(entry)
+            self.rows.update(rows)
+            self._next_row = start + len(vectors)
+
+            if self._journal_lines > self.compact_after:
+                self._compact()
+        return len(vectors)
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        """인덱스 저널에 한 줄 추가 (파일 잠금을 잡은 상태에서 호출)"""
+        path = self._path(self.INDEX_FILE)
+        data = (json.dumps(entry) + "\n").encode("utf-8")
+        with open(path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        stat = os.stat(path)
+        self._journal_id = (stat.st_dev, stat.st_ino)
+        self._journal_offset = stat.st_size
+        self._journal_lines += 1
+
+    def _compact(self) -> None:
+        """인덱스 저널을 한 줄로 압축해 임시 파일에 쓴 뒤 교체 (파일 잠금을 잡은 상태에서 호출)"""
+        path = self._path(self.INDEX_FILE)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"dimension": self.dimension, "rows": self.rows}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        stat = os.stat(path)
+        self._journal_id = (stat.st_dev, stat.st_ino)
+        self._journal_offset = stat.st_size
+        self._journal_lines = 1
+
+
+class EmbeddingCache:
+    """(임베딩 모델, 텍스트 해시) 기반 임베딩 영구 캐시 클래스"""
+
+    def __init__(self, cache_dir: str = os.path.join("indexes", "embedding_cache"), initial_capacity: int = 1024):
+        """
+        임베딩 캐시 초기화 (모델별 파일은 처음 사용할 때 열림)
+
+        Args:
+            cache_dir (str): 캐시 파일을 저장할 디렉터리
+            initial_capacity (int): 모델별 벡터 파일의 초기 행 수
+        """
+        self.cache_dir = cache_dir
+        self.initial_capacity = initial_capacity
+        self._stores: Dict[str, _ModelStore] = {}
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+
+    def _store(self, model: str) -> _ModelStore:
+        """
+        모델 저장소 조회 (없으면 열기)
+
+        Args:
+            model (str): 임베딩 모델 이름
+
+        Returns:
+            _ModelStore: 모델 저장소
+        """
+        store = self._stores.get(model)
+        if store is None:
+            directory = os.path.join(self.cache_dir, re.sub(r"[^\w.-]", "_", model))
+            store = _ModelStore(directory, self.initial_capacity)
+            self._stores[model] = store
+        return store
+
+    def get_many(self, model: str, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        여러 텍스트의 캐시된 임베딩을 한 번에 조회
+
+        Args:
+            model (str): 임베딩 모델 이름
+            texts (List[str]): 전처리된 텍스트 목록
+
+        Returns:
+            List[Optional[List[float]]]: 입력 순서와 같은 임베딩 목록 (캐시에 없으면 None)
+        """
+        with self._lock:
+            embeddings = self._store(model).get_many([text_hash(text) for text in texts])
+            hits = sum(1 for embedding in embeddings if embedding is not None)
+            self._hits += hits
+            self._misses += len(texts) - hits
+        return embeddings
+
+    def put_many(self, model: str, texts: List[str], embeddings: List[Optional[List[float]]]) -> int:
+        """
+        여러 텍스트의 임베딩을 한 번에 저장 (None인 항목은 건너뜀)
+
+        Args:
+            model (str): 임베딩 모델 이름
+            texts (List[str]): 전처리된 텍스트 목록
+            embeddings (List[Optional[List[float]]]): 텍스트별 임베딩
+
+        Returns:
+            int: 새로 저장된 항목 수
+        """
+        items = {
+            text_hash(text): embedding
+            for text, embedding in zip(texts, embeddings)
+            if embedding is not None
+        }
+        if not items:
+            return 0
+
+        with self._lock:
+            try:
+                written = self._store(model).put(items)
+            except Exception as e:
+                logger.error(f"임베딩 캐시 저장 실패: {str(e)}")
+                return 0
+            self._writes += written
+        return written
+
+    def clear(self) -> None:
+        """메모리에 열린 모델 저장소를 닫고 캐시 파일 삭제"""
+        with self._lock:
+            for store in self._stores.values():
+                store._vectors = None
+            self._stores.clear()
+
+            if not os.path.isdir(self.cache_dir):
+                return
+            for model_dir in os.listdir(self.cache_dir):
+                directory = os.path.join(self.cache_dir, model_dir)
+                for filename in (_ModelStore.VECTORS_FILE, _ModelStore.INDEX_FILE, _ModelStore.LOCK_FILE):
+                    path = os.path.join(directory, filename)
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계 조회
+
+        Returns:
+            Dict[str, Any]: 적중/실패 횟수, 적중률, 모델별 항목 수 등 통계 정보
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "writes": self._writes,
+                "size": sum(len(store.rows) for store in self._stores.values()),
+                "models": {model: len(store.rows) for model, store in self._stores.items()},
+                "cache_dir": self.cache_dir
+            }
+
+    def reset_stats(self) -> None:
+        """통계 카운터 초기화"""
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._writes = 0
+
+
+# 모든 임베딩 파이프라인이 공유하는 기본 캐시
+embedding_cache = EmbeddingCache()
@@ -0,0 +1,174 @@
+"""
+임베딩 생성 파이프라인
+
+이 모듈은 많은 텍스트의 임베딩을 토큰 수 기준으로 묶은 배치로 나누고,
+요청 속도 제한 안에서 여러 배치를 동시에 생성하는 기능을 제공합니다.
+임베딩 캐시가 설정되면 캐시에 없는 텍스트만 API로 보냅니다.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+from .base import LLMService, run_sync
+from .embedding_cache import EmbeddingCache
+from .rate_limiter import AsyncRateLimiter
+from .schema_selector import count_tokens
+
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingPipeline:
+    """토큰 수 기준 배치와 동시 요청으로 임베딩을 생성하는 파이프라인"""
+
+    def __init__(
+        self,
+        llm_service: LLMService,
+        max_batch_tokens: int = 100000,
+        max_batch_size: int = 512,
+        max_concurrency: int = 4,
+        requests_per_minute: Optional[int] = 3000,
+        tokens_per_minute: Optional[int] = 1000000,
+        cache: Optional[EmbeddingCache] = None,
+        model_name: Optional[str] = None
+    ):
+        """
+        임베딩 파이프라인 초기화
+
+        Args:
+            llm_service (LLMService): 임베딩을 생성할 LLM 서비스
+            max_batch_tokens (int, optional): 한 요청에 담을 최대 토큰 수
+            max_batch_size (int, optional): 한 요청에 담을 최대 텍스트 수
+            max_concurrency (int, optional): 동시에 보낼 최대 요청 수
+            requests_per_minute (Optional[int], optional): 분당 최대 요청 수 (None이면 제한 없음)
+            tokens_per_minute (Optional[int], optional): 분당 최대 토큰 수 (None이면 제한 없음)
+            cache (Optional[EmbeddingCache], optional): 임베딩 영구 캐시 (None이면 사용하지 않음)
+            model_name (Optional[str], optional): 캐시 키에 사용할 임베딩 모델 이름 (기본값: LLM 설정의 임베딩 모델)
+        """
+        self.llm_service = llm_service
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.max_concurrency = max(1, max_concurrency)
+        self.request_limiter = AsyncRateLimiter(requests_per_minute) if requests_per_minute else None
+        self.token_limiter = AsyncRateLimiter(tokens_per_minute) if tokens_per_minute else None
+        self.cache = cache
+        self.model_name = model_name or getattr(getattr(llm_service, "config", None), "embedding_model", None) or "default"
+
+    def pack_batches(self, texts: List[str]) -> List[List[int]]:
+        """
+        텍스트를 토큰 수 한도에 맞춰 배치로 묶기
+
+        입력 순서대로 배치를 채우며, 한도보다 긴 텍스트는 단독 배치가 됩니다.
+
+        Args:
+            texts (List[str]): 임베딩을 생성할 텍스트 목록
+
+        Returns:
+            List[List[int]]: 배치별 텍스트 인덱스 목록
+        """
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+
+        for index, text in enumerate(texts):
+            tokens = count_tokens(text)
+            if current and (current_tokens + tokens > self.max_batch_tokens or len(current) >= self.max_batch_size):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(index)
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _embed_batch(
+        self, texts: List[str], semaphore: asyncio.Semaphore
+    ) -> List[Optional[List[float]]]:
+        """
+        한 배치의 임베딩 생성
+
+        Args:
+            texts (List[str]): 배치에 포함된 텍스트 목록
+            semaphore (asyncio.Semaphore): 동시 요청 수 제한
+
+        Returns:
+            List[Optional[List[float]]]: 임베딩 목록 (실패 시 None)
+        """
+        async with semaphore:
+            if self.request_limiter:
+                await self.request_limiter.acquire()
+            if self.token_limiter:
+                await self.token_limiter.acquire(sum(count_tokens(text) for text in texts))
+
+            try:
+                embeddings = await self.llm_service.get_embeddings(texts)
+            except Exception as e:
+                logger.error(f"임베딩 배치 생성 실패 ({len(texts)}개): {str(e)}")
+                return [None] * len(texts)
+
+            if len(embeddings) != len(texts):
+                logger.error(f"임베딩 개수 불일치: 요청 {len(texts)}개, 응답 {len(embeddings)}개")
+                return [None] * len(texts)
+            return embeddings
+
+    async def embed(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        텍스트 목록의 임베딩을 배치 단위로 동시에 생성
+
+        캐시에 있는 텍스트는 API를 호출하지 않고, 같은 텍스트가 여러 번 있으면 한 번만 요청합니다.
+        실패한 배치의 텍스트는 None으로 반환되므로 호출자는 임베딩 없이 계속 진행할 수 있습니다.
+
+        Args:
+            texts (List[str]): 임베딩을 생성할 텍스트 목록
+
+        Returns:
+            List[Optional[List[float]]]: 입력 순서와 같은 임베딩 목록
+        """
+        if not texts:
+            return []
+
+        started_at = time.perf_counter()
+        unique_texts = list(dict.fromkeys(texts))
+        if self.cache:
+            cached = await asyncio.to_thread(self.cache.get_many, self.model_name, unique_texts)
+        else:
+            cached = [None] * len(unique_texts)
+        found = {text: embedding for text, embedding in zip(unique_texts, cached) if embedding is not None}
+        missing = [text for text in unique_texts if text not in found]
+
+        batches = self.pack_batches(missing)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        batch_results = await asyncio.gather(*[
+            self._embed_batch([missing[index] for index in batch], semaphore) for batch in batches
+        ])
+
+        generated: Dict[str, List[float]] = {}
+        for batch, results in zip(batches, batch_results):
+            for index, embedding in zip(batch, results):
+                if embedding is not None:
+                    generated[missing[index]] = embedding
+
+        if self.cache and generated:
+            await asyncio.to_thread(self.cache.put_many, self.model_name, list(generated), list(generated.values()))
+
+        embeddings = [found.get(text) or generated.get(text) for text in texts]
+        failed = sum(1 for embedding in embeddings if embedding is None)
+        logger.info(
+            f"임베딩 {len(texts)}개 생성 완료: 캐시 적중 {len(found)}/{len(unique_texts)}개, "
+            f"배치 {len(batches)}개, 실패 {failed}개, {time.perf_counter() - started_at:.2f}초"
+        )
+        return embeddings
+
+    def embed_sync(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        텍스트 목록의 임베딩 생성 (동기 버전)
+
+        Args:
+            texts (List[str]): 임베딩을 생성할 텍스트 목록
+
+        Returns:
+            List[Optional[List[float]]]: 입력 순서와 같은 임베딩 목록
+        """
+        return run_sync(self.embed(texts))
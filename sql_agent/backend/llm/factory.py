@@ -7,6 +7,8 @@ from typing import Dict, Any, Optional
 import logging
 from .base import LLMService, LLMConfig, LLMProvider
 from .openai_service import OpenAIService
+from .local_embedding_service import LocalEmbeddingService
+from .replay_service import ReplayLLMService, RECORD_MODE
 
 
 logger = logging.getLogger(__name__)
@@ -50,6 +52,23 @@ class LLMServiceFactory:
         elif config.provider == LLMProvider.ANTHROPIC:
             # Anthropic 서비스 구현 필요
             raise NotImplementedError("Anthropic 서비스는 아직 구현되지 않았습니다.")
+        elif config.provider == LLMProvider.LOCAL:
+            service = LocalEmbeddingService(config)
+        elif config.provider == LLMProvider.REPLAY:
+            # record 모드는 실제 제공자(record_provider, 기본값 openai)의 응답을 녹화
+            delegate = None
+            if config.additional_config.get("replay_mode") == RECORD_MODE:
+                delegate = cls.create_service(LLMConfig(
+                    provider=LLMProvider(config.additional_config.get("record_provider", "openai")),
+                    model_name=config.model_name,
+                    api_key=config.api_key,
+                    api_base=config.api_base,
+                    api_version=config.api_version,
+                    max_tokens=config.max_tokens,
+                    temperature=config.temperature,
+                    timeout=config.timeout
+                ))
+            service = ReplayLLMService(config, delegate=delegate)
         else:
             raise ValueError(f"지원되지 않는 LLM 제공자: {config.provider}")
         
@@ -79,13 +98,14 @@ class LLMServiceFactory:
         cls._instances.clear()
         logger.info("LLM 서비스 캐시가 초기화되었습니다.")
 
-def get_llm_service(provider: str = "openai", model_name: str = "gpt-4") -> LLMService:
+def get_llm_service(provider: str = "openai", model_name: str = "gpt-4", **options: Any) -> LLMService:
     """
     LLM 서비스 인스턴스를 가져오는 편의 함수
     
     Args:
         provider (str): LLM 제공자 (기본값: "openai")
         model_name (str): 모델 이름 (기본값: "gpt-4")
+        **options: 제공자별 추가 설정 (예: replay 제공자의 cassette_path, replay_mode)
         
     Returns:
         LLMService: LLM 서비스 인스턴스
@@ -96,6 +116,32 @@ def get_llm_service(provider: str = "openai", model_name: str = "gpt-4") -> LLMS
         model_name=model_name,
         api_key="",  # 실제 구현에서는 환경변수에서 가져와야 함
         temperature=0.7,
-        max_tokens=2000
+        max_tokens=2000,
+        **options
     )
-    return LLMServiceFactory.create_service(config)
\ No newline at end of file
+    return LLMServiceFactory.create_service(config)
+
+
+def get_embedding_service(provider: str = "openai", model_name: str = "gpt-4", embedding_dimension: int = 1024, **options: Any) -> LLMService:
+    """
+    임베딩 생성에 사용할 서비스 인스턴스를 가져오는 편의 함수
+    
+    Args:
+        provider (str): 임베딩 제공자 ("openai", 네트워크 없이 동작하는 "local" 또는 녹화 응답을 재생하는 "replay")
+        model_name (str): LLM 모델 이름 (원격 제공자인 경우)
+        embedding_dimension (int): 로컬 임베딩 차원
+        **options: 원격/재생 제공자의 추가 설정 (get_llm_service 참고)
+        
+    Returns:
+        LLMService: 임베딩 서비스 인스턴스
+    """
+    if LLMProvider(provider) != LLMProvider.LOCAL:
+        return get_llm_service(provider, model_name, **options)
+    
+    config = LLMConfig(
+        provider=LLMProvider.LOCAL,
+        model_name=f"hashing-{embedding_dimension}",
+        api_key="",
+        embedding_dimension=embedding_dimension
+    )
+    return LLMServiceFactory.create_service(config)
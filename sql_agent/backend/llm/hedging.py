@@ -0,0 +1,369 @@
+"""
+헤지(hedged) 요청과 마감 시간 기반 LLM 호출
+
+이 모듈은 지연 시간에 민감한 LLM 호출의 긴 꼬리 지연을 줄이기 위한 기능을 제공합니다.
+첫 요청이 관측된 지연 시간 백분위수(예: p95)를 넘도록 응답하지 않으면 같은 요청을 하나 더 보내고,
+먼저 도착한 응답을 사용한 뒤 나머지 요청은 취소합니다.
+요청 마감 시간이 얼마 남지 않아 기본 모델의 예상 지연 시간 안에 응답을 받기 어려우면
+더 저렴하고 빠른 대체 모델로 요청합니다.
+"""
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+import asyncio
+import logging
+import threading
+import time
+
+from ..utils.deadline import DeadlineExceededError, current_deadline
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """모델별 최근 응답 지연 시간 기록"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        """
+        지연 시간 기록기 초기화
+
+        Args:
+            window (int): 보관할 최근 표본 수
+            min_samples (int): 백분위수 계산에 필요한 최소 표본 수
+        """
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """
+        지연 시간 표본 추가
+
+        Args:
+            seconds (float): 지연 시간 (초)
+        """
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float, default: float) -> float:
+        """
+        지연 시간 백분위수 조회
+
+        Args:
+            fraction (float): 백분위 (0~1, 예: 0.95)
+            default (float): 표본이 부족할 때 사용할 값
+
+        Returns:
+            float: 지연 시간 (초)
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return default
+            samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    def tail_mean(self, threshold: float) -> float:
+        """
+        기준값 이상인 표본의 평균 (기준값을 넘긴 요청의 예상 완료 시간)
+
+        Args:
+            threshold (float): 기준 지연 시간 (초)
+
+        Returns:
+            float: 평균 지연 시간 (기준 이상 표본이 없으면 기준값)
+        """
+        with self._lock:
+            tail = [sample for sample in self._samples if sample >= threshold]
+        return sum(tail) / len(tail) if tail else threshold
+
+
+class HedgedCaller:
+    """헤지 요청, 마감 시간, 대체 모델을 적용해 LLM 요청을 실행하는 클래스"""
+
+    def __init__(
+        self,
+        name: str,
+        model_name: str,
+        fallback_model: Optional[str] = None,
+        hedge_percentile: float = 0.95,
+        max_hedge_ratio: float = 0.1,
+        default_hedge_delay: float = 8.0,
+        default_latency: float = 2.0
+    ):
+        """
+        헤지 호출기 초기화
+
+        Args:
+            name (str): 호출기 이름 (제공자:모델)
+            model_name (str): 기본 모델 이름
+            fallback_model (Optional[str], optional): 마감 시간이 임박했을 때 사용할 대체 모델
+            hedge_percentile (float, optional): 헤지 요청을 보내기까지 기다릴 지연 시간 백분위
+            max_hedge_ratio (float, optional): 전체 호출 대비 헤지 요청의 최대 비율
+            default_hedge_delay (float, optional): 표본이 부족할 때의 헤지 대기 시간 (초)
+            default_latency (float, optional): 표본이 부족할 때의 예상 지연 시간 (초)
+        """
+        self.name = name
+        self.model_name = model_name
+        self.fallback_model = fallback_model
+        self.hedge_percentile = hedge_percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.default_hedge_delay = default_hedge_delay
+        self.default_latency = default_latency
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "hedged": 0,
+            "hedge_wins": 0,
+            "fallbacks": 0,
+            "deadline_exceeded": 0,
+            "latency_saved_seconds": 0.0
+        }
+
+    def configure(self, **options: Any) -> None:
+        """
+        설정 변경 (fallback_model, hedge_percentile, max_hedge_ratio 등)
+
+        Args:
+            **options: 변경할 설정
+        """
+        for key, value in options.items():
+            if not hasattr(self, key):
+                raise ValueError(f"알 수 없는 헤지 설정: {key}")
+            setattr(self, key, value)
+
+    def tracker(self, model_name: str) -> LatencyTracker:
+        """
+        모델별 지연 시간 기록기 조회
+
+        Args:
+            model_name (str): 모델 이름
+
+        Returns:
+            LatencyTracker: 지연 시간 기록기
+        """
+        with self._lock:
+            tracker = self._trackers.get(model_name)
+            if tracker is None:
+                tracker = self._trackers[model_name] = LatencyTracker()
+            return tracker
+
+    def _count(self, key: str, amount: float = 1) -> None:
+        """통계 항목 증가"""
+        with self._lock:
+            self._stats[key] += amount
+
+    def _choose_model(self, remaining: Optional[float]) -> str:
+        """
+        남은 시간으로 요청할 모델 선택
+
+        기본 모델의 중앙값 지연 시간보다 남은 시간이 짧으면 대체 모델을 사용합니다.
+
+        Args:
+            remaining (Optional[float]): 마감 시간까지 남은 시간 (초)
+
+        Returns:
+            str: 모델 이름
+        """
+        if remaining is None or not self.fallback_model or self.fallback_model == self.model_name:
+            return self.model_name
+
+        expected = self.tracker(self.model_name).percentile(0.5, self.default_latency)
+        if remaining >= expected:
+            return self.model_name
+
+        logger.info(f"마감 시간까지 {remaining:.2f}초 남아 대체 모델 {self.fallback_model}로 요청합니다.")
+        self._count("fallbacks")
+        return self.fallback_model
+
+    def _hedge_allowed(self) -> bool:
+        """헤지 요청 비율 한도 확인"""
+        with self._lock:
+            return self._stats["hedged"] < self.max_hedge_ratio * self._stats["calls"]
+
+    async def _timed(self, request: Callable[[str], Awaitable[T]], model_name: str) -> T:
+        """
+        요청을 실행하고 지연 시간 기록
+
+        Args:
+            request (Callable[[str], Awaitable[T]]): 모델 이름을 받아 요청을 실행하는 함수
+            model_name (str): 모델 이름
+
+        Returns:
+            T: 요청 결과
+        """
+        started_at = time.monotonic()
+        result = await request(model_name)
+        self.tracker(model_name).record(time.monotonic() - started_at)
+        return result
+
+    def _record_cancelled(self, model_name: str, elapsed: float) -> None:
+        """
+        취소된 요청의 지연 시간 기록
+
+        취소된 요청은 실제 지연 시간의 하한(자신이 시작된 후 경과 시간)만 알 수 있습니다.
+        이미 헤지 기준 지연 시간을 넘긴 요청만 기록해 느린 꼬리가 표본에서 빠지지 않도록 하고,
+        헤지 요청이 지는 경우처럼 짧게 실행되다 취소된 요청은 완료 표본으로 기록하지 않습니다.
+
+        Args:
+            model_name (str): 모델 이름
+            elapsed (float): 요청 시작 후 취소까지의 경과 시간 (초)
+        """
+        tracker = self.tracker(model_name)
+        if elapsed >= tracker.percentile(self.hedge_percentile, self.default_hedge_delay):
+            tracker.record(elapsed)
+
+    async def run(self, request: Callable[[str], Awaitable[T]], hedge: bool = True) -> T:
+        """
+        요청 실행
+
+        마감 시간(utils.deadline)이 설정되어 있으면 그 안에 응답이 없을 때
+        DeadlineExceededError를 발생시키고 진행 중인 요청을 취소합니다.
+
+        Args:
+            request (Callable[[str], Awaitable[T]]): 모델 이름을 받아 요청을 실행하는 함수
+            hedge (bool): 지연 시간이 길어지면 헤지 요청을 보낼지 여부
+
+        Returns:
+            T: 먼저 성공한 요청의 결과
+
+        Raises:
+            DeadlineExceededError: 마감 시간 안에 응답을 받지 못한 경우
+        """
+        deadline = current_deadline()
+        self._count("calls")
+        if deadline is not None and deadline.expired:
+            self._count("deadline_exceeded")
+            raise DeadlineExceededError("LLM 요청 전에 마감 시간이 지났습니다.")
+
+        started_at = time.monotonic()
+        primary_model = self._choose_model(deadline.remaining() if deadline else None)
+        primary = asyncio.ensure_future(self._timed(request, primary_model))
+        pending = {primary: primary_model}
+        task_started_at = {primary: started_at}
+        hedge_task: Optional[asyncio.Future] = None
+        hedge_at = None
+        if hedge:
+            hedge_delay = self.tracker(primary_model).percentile(self.hedge_percentile, self.default_hedge_delay)
+            hedge_at = started_at + hedge_delay
+        last_error: Optional[BaseException] = None
+
+        try:
+            while pending:
+                now = time.monotonic()
+                timeouts = [deadline.expires_at - now] if deadline else []
+                if hedge_at is not None:
+                    timeouts.append(hedge_at - now)
+                timeout = max(0.0, min(timeouts)) if timeouts else None
+
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.pop(task)
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+
+                    if task is hedge_task:
+                        self._count("hedge_wins")
+                        elapsed = time.monotonic() - started_at
+                        expected = self.tracker(primary_model).tail_mean(elapsed)
+                        self._count("latency_saved_seconds", max(0.0, expected - elapsed))
+                    return task.result()
+
+                if not pending:
+                    break
+
+                if deadline is not None and deadline.expired:
+                    self._count("deadline_exceeded")
+                    raise DeadlineExceededError("마감 시간 안에 LLM 응답을 받지 못했습니다.")
+
+                if hedge_at is not None and time.monotonic() >= hedge_at:
+                    hedge_at = None
+                    if self._hedge_allowed():
+                        hedge_model = self._choose_model(deadline.remaining() if deadline else None)
+                        logger.info(f"{self.name} 응답 지연으로 {hedge_model} 모델에 헤지 요청을 보냅니다.")
+                        self._count("hedged")
+                        hedge_task = asyncio.ensure_future(self._timed(request, hedge_model))
+                        pending[hedge_task] = hedge_model
+                        task_started_at[hedge_task] = time.monotonic()
+
+            raise last_error
+        finally:
+            now = time.monotonic()
+            for task, model_name in pending.items():
+                task.cancel()
+                self._record_cancelled(model_name, now - task_started_at[task])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        헤지 통계 조회
+
+        Returns:
+            Dict[str, Any]: 호출/헤지/헤지 승리/대체 모델/마감 초과 횟수, 헤지 비율, 절감 시간, 모델별 지연 시간
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            models = list(self._trackers)
+        stats["hedge_rate"] = stats["hedged"] / stats["calls"] if stats["calls"] else 0.0
+        stats["latency"] = {
+            model: {
+                "p50": self.tracker(model).percentile(0.5, 0.0),
+                f"p{int(self.hedge_percentile * 100)}": self.tracker(model).percentile(self.hedge_percentile, 0.0)
+            }
+            for model in models
+        }
+        return stats
+
+
+# 제공자/모델별 공유 헤지 호출기와 새 호출기에 적용할 기본 설정
+_hedged_callers: Dict[str, HedgedCaller] = {}
+_default_options: Dict[str, Any] = {}
+_registry_lock = threading.Lock()
+
+
+def get_hedged_caller(provider: str, model_name: str) -> HedgedCaller:
+    """
+    제공자/모델별 공유 헤지 호출기 조회 (없으면 기본 설정으로 생성)
+
+    Args:
+        provider (str): LLM 제공자
+        model_name (str): 기본 모델 이름
+
+    Returns:
+        HedgedCaller: 헤지 호출기
+    """
+    name = f"{provider}:{model_name}"
+    with _registry_lock:
+        caller = _hedged_callers.get(name)
+        if caller is None:
+            caller = HedgedCaller(name, model_name, **_default_options)
+            _hedged_callers[name] = caller
+        return caller
+
+
+def configure_hedging(**options: Any) -> None:
+    """
+    모든 헤지 호출기의 설정 변경 (이미 생성된 호출기에도 적용)
+
+    Args:
+        **options: HedgedCaller 설정 (fallback_model, hedge_percentile, max_hedge_ratio 등)
+    """
+    with _registry_lock:
+        _default_options.update(options)
+        callers = list(_hedged_callers.values())
+    for caller in callers:
+        caller.configure(**options)
+
+
+def get_hedging_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    모든 헤지 호출기의 통계 조회
+
+    Returns:
+        Dict[str, Dict[str, Any]]: 호출기 이름 -> 통계
+    """
+    with _registry_lock:
+        callers = list(_hedged_callers.values())
+    return {caller.name: caller.get_stats() for caller in callers}
@@ -0,0 +1,211 @@
+"""
+로컬 임베딩 서비스 구현
+
+이 모듈은 네트워크 없이 동작하는 특징 해싱(feature hashing) 기반 임베딩 제공자를 구현합니다.
+단어, 스네이크/카멜 표기 하위 단어, 문자 3-gram, 인접 단어 쌍을 고정 차원 벡터로 해싱하므로
+같은 텍스트는 항상 같은 벡터가 되며, 학습이나 외부 모델 파일이 필요하지 않습니다.
+텍스트 생성 기능은 제공하지 않으므로 임베딩 전용 제공자로 사용합니다.
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import logging
+import re
+
+import numpy as np
+
+from .base import LLMService, LLMConfig
+
+
+logger = logging.getLogger(__name__)
+
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+# 특징 종류별 가중치 (단어 > 하위 단어 > 단어 쌍 > 문자 3-gram)
+WORD_WEIGHT = 1.0
+SUBWORD_WEIGHT = 0.7
+BIGRAM_WEIGHT = 0.5
+CHAR_NGRAM_WEIGHT = 0.3
+
+
+@lru_cache(maxsize=200000)
+def _hash_feature(feature: str, dimension: int) -> Tuple[int, float]:
+    """
+    특징 문자열을 벡터 인덱스와 부호로 해싱
+
+    파이썬 내장 hash()는 프로세스마다 달라지므로 blake2b를 사용합니다.
+
+    Args:
+        feature (str): 특징 문자열
+        dimension (int): 벡터 차원
+
+    Returns:
+        Tuple[int, float]: (인덱스, 부호)
+    """
+    value = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+    return value % dimension, (1.0 if value >> 63 else -1.0)
+
+
+def extract_features(text: str) -> List[Tuple[str, float]]:
+    """
+    텍스트에서 해싱할 특징과 가중치 추출
+
+    Args:
+        text (str): 입력 텍스트
+
+    Returns:
+        List[Tuple[str, float]]: (특징, 가중치) 목록
+    """
+    features: List[Tuple[str, float]] = []
+    words: List[str] = []
+
+    for token in _WORD_PATTERN.findall(text):
+        parts = [part.lower() for part in _CAMEL_BOUNDARY.sub("_", token).split("_") if part]
+        word = token.lower()
+        words.append(word)
+        features.append(("w:" + word, WORD_WEIGHT))
+
+        if len(parts) > 1:
+            features.extend(("w:" + part, SUBWORD_WEIGHT) for part in parts)
+
+        padded = f"<{word}>"
+        features.extend(("c:" + padded[i:i + 3], CHAR_NGRAM_WEIGHT) for i in range(len(padded) - 2))
+
+    features.extend((f"b:{first} {second}", BIGRAM_WEIGHT) for first, second in zip(words, words[1:]))
+    return features
+
+
+class HashingEmbedder:
+    """특징 해싱 기반 결정적 임베딩 생성기"""
+
+    def __init__(self, dimension: int = 1024):
+        """
+        임베딩 생성기 초기화
+
+        Args:
+            dimension (int): 임베딩 차원
+        """
+        self.dimension = dimension
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        텍스트 목록을 한 번에 임베딩
+
+        특징 빈도는 log(1 + tf)로 완화하고 각 행을 L2 정규화하므로
+        내적이 코사인 유사도가 됩니다.
+
+        Args:
+            texts (List[str]): 임베딩할 텍스트 목록
+
+        Returns:
+            np.ndarray: (텍스트 수, 차원) float32 배열
+        """
+        rows: List[int] = []
+        columns: List[int] = []
+        values: List[float] = []
+
+        for row, text in enumerate(texts):
+            for feature, weight in extract_features(text):
+                column, sign = _hash_feature(feature, self.dimension)
+                rows.append(row)
+                columns.append(column)
+                values.append(sign * weight)
+
+        flat_index = np.asarray(rows, dtype=np.int64) * self.dimension + np.asarray(columns, dtype=np.int64)
+        matrix = np.bincount(flat_index, weights=values, minlength=len(texts) * self.dimension)
+        matrix = matrix.reshape(len(texts), self.dimension).astype(np.float32)
+
+        matrix = np.sign(matrix) * np.log1p(np.abs(matrix))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+
+class LocalEmbeddingService(LLMService):
+    """네트워크 없이 동작하는 로컬 임베딩 서비스 (텍스트 생성 미지원)"""
+
+    def __init__(self, config: LLMConfig):
+        """
+        로컬 임베딩 서비스 초기화
+
+        Args:
+            config (LLMConfig): LLM 서비스 설정 (추가 설정 embedding_dimension으로 차원 지정, 기본값 1024)
+        """
+        super().__init__(config)
+        self.embedder = HashingEmbedder(int(config.additional_config.get("embedding_dimension", 1024)))
+
+        # 임베딩 캐시 키가 해싱 차원별로 구분되도록 모델 이름 지정
+        self.config.embedding_model = f"local-hashing-{self.embedder.dimension}"
+
+    def _unsupported(self, feature: str) -> NotImplementedError:
+        """
+        지원하지 않는 기능에 대한 예외 생성
+
+        Args:
+            feature (str): 기능 이름
+
+        Returns:
+            NotImplementedError: 예외 객체
+        """
+        return NotImplementedError(f"로컬 임베딩 제공자는 {feature} 기능을 지원하지 않습니다.")
+
+    async def generate_sql(self, natural_language: str, schema: Dict[str, Any], db_type: str, context: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        raise self._unsupported("SQL 생성")
+
+    async def summarize_results(self, query_result: Dict[str, Any], natural_language: str, sql_query: str) -> Dict[str, Any]:
+        raise self._unsupported("결과 요약")
+
+    async def generate_python_code(self, query_result: Dict[str, Any], natural_language: str, sql_query: str, analysis_request: Dict[str, Any]) -> Dict[str, Any]:
+        raise self._unsupported("Python 코드 생성")
+
+    async def validate_and_fix_sql(self, sql_query: str, schema: Dict[str, Any], db_type: str, error_message: Optional[str] = None) -> Tuple[str, bool]:
+        raise self._unsupported("SQL 수정")
+
+    async def generate_rag_response(self, query: str, context: str) -> str:
+        raise self._unsupported("RAG 응답 생성")
+
+    async def get_model_info(self) -> Dict[str, Any]:
+        """
+        모델 정보 조회
+
+        Returns:
+            Dict[str, Any]: 모델 정보 (제공자, 모델명, 기능 등)
+        """
+        return {
+            "provider": self.config.provider.value,
+            "model_name": self.config.embedding_model,
+            "capabilities": ["embeddings"],
+            "embedding_dimension": self.embedder.dimension
+        }
+
+    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        텍스트에 대한 임베딩 생성
+
+        계산은 CPU 작업이므로 이벤트 루프를 막지 않도록 작업 스레드에서 수행합니다.
+
+        Args:
+            texts (List[str]): 임베딩을 생성할 텍스트 목록
+
+        Returns:
+            List[List[float]]: 생성된 임베딩 목록
+        """
+        if not texts:
+            return []
+        return (await asyncio.to_thread(self.embedder.embed, texts)).tolist()
+
+    def get_embeddings_sync(self, texts: List[str]) -> List[List[float]]:
+        """
+        텍스트에 대한 임베딩 생성 (동기 버전, 이벤트 루프 없이 직접 계산)
+
+        Args:
+            texts (List[str]): 임베딩을 생성할 텍스트 목록
+
+        Returns:
+            List[List[float]]: 생성된 임베딩 목록
+        """
+        if not texts:
+            return []
+        return self.embedder.embed(texts).tolist()
@@ -0,0 +1,395 @@
+"""
+모델 라우팅 (빠른 모델 우선, 실패 시 대형 모델로 승격)
+
+이 모듈은 SQL 생성 요청의 복잡도를 스키마 선택 결과의 테이블 수, 질문에 나타난 조인 힌트 수,
+대화 깊이로 분류하여 단순한 요청은 빠르고 저렴한 모델로, 복잡한 요청은 대형 모델로 보냅니다.
+빠른 모델의 결과가 SQL 검증(SQLValidator.validate_sql)이나 실행에 실패한 경우에만 대형 모델로 승격하며,
+경로별 호출 수, 지연 시간, 빠른 모델의 성공률(win rate)을 기록합니다.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import hashlib
+import logging
+import re
+import threading
+import time
+
+from .base import LLMService
+from .schema_selector import SchemaSelector, TableSelection, schema_selector as default_schema_selector
+from ..utils.deadline import DeadlineExceededError
+
+
+logger = logging.getLogger(__name__)
+
+# 경로 이름
+ROUTE_FAST = "fast"
+ROUTE_STRONG = "strong"
+ROUTE_ESCALATED = "escalated"
+
+# 여러 테이블의 조인이나 그룹별 집계가 필요함을 나타내는 표현
+_JOIN_HINT_PATTERN = re.compile(
+    r"\b(?:join(?:ed|s)?|per|each|every|across|compare[sd]?|versus|vs|along with|together with|"
+    r"group(?:ed)? by|breakdown|broken down|rank(?:ed|ing)?|top \d+|for each)\b"
+    r"|별로|별 |각각|각 |대비|비교|함께|기준으로|순위|상위|하위",
+    re.IGNORECASE
+)
+
+
+def count_join_hints(text: str) -> int:
+    """
+    질문에 나타난 조인/그룹별 집계 힌트 수 계산
+
+    Args:
+        text (str): 자연어 질문
+
+    Returns:
+        int: 힌트 수
+    """
+    return len(_JOIN_HINT_PATTERN.findall(text))
+
+
+def _sql_key(sql: str) -> str:
+    """생성된 SQL을 경로 조회용 키로 변환 (공백/대소문자 정규화)"""
+    return hashlib.sha256(" ".join(sql.split()).lower().encode("utf-8")).hexdigest()
+
+
+@dataclass
+class RouteDecision:
+    """요청 복잡도 분류 결과"""
+    route: str
+    tables: int
+    join_hints: int
+    conversation_depth: int
+    reasons: List[str] = field(default_factory=list)
+
+
+class ModelRouter:
+    """빠른 모델과 대형 모델 사이의 SQL 생성 경로 선택 클래스"""
+
+    def __init__(
+        self,
+        fast_service: LLMService,
+        strong_service: LLMService,
+        selector: Optional[SchemaSelector] = None,
+        max_simple_tables: int = 2,
+        max_simple_join_hints: int = 1,
+        max_simple_conversation_depth: int = 2,
+        max_tracked_queries: int = 10000
+    ):
+        """
+        모델 라우터 초기화
+
+        Args:
+            fast_service (LLMService): 단순한 요청에 사용할 빠른 모델 서비스
+            strong_service (LLMService): 복잡한 요청과 승격에 사용할 대형 모델 서비스
+            selector (Optional[SchemaSelector]): 관련 테이블 선택기 (기본값: 공유 선택기)
+            max_simple_tables (int): 단순 요청으로 분류할 최대 관련 테이블 수
+            max_simple_join_hints (int): 단순 요청으로 분류할 최대 조인 힌트 수
+            max_simple_conversation_depth (int): 단순 요청으로 분류할 최대 이전 대화 수
+            max_tracked_queries (int): 실행 결과를 경로에 연결하기 위해 기억할 생성 SQL 수
+        """
+        self.fast_service = fast_service
+        self.strong_service = strong_service
+        self.selector = selector or default_schema_selector
+        self.max_simple_tables = max_simple_tables
+        self.max_simple_join_hints = max_simple_join_hints
+        self.max_simple_conversation_depth = max_simple_conversation_depth
+        self.max_tracked_queries = max_tracked_queries
+        self._generated_routes: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """경로별 통계 초기화"""
+        with self._lock:
+            self._routes = {
+                route: {"calls": 0, "errors": 0, "total_latency": 0.0}
+                for route in (ROUTE_FAST, ROUTE_STRONG, ROUTE_ESCALATED)
+            }
+            self._fast = {
+                "attempts": 0,
+                "validation_failures": 0,
+                "errors": 0,
+                "execution_failures": 0
+            }
+            self._failed_executions: "OrderedDict[str, None]" = OrderedDict()  # 실행 실패가 이미 집계된 SQL
+
+    def classify(
+        self,
+        natural_language: str,
+        schema: Dict[str, Any],
+        context: Optional[List[Dict[str, Any]]] = None,
+        db_id: Optional[str] = None,
+        selection: Optional[TableSelection] = None
+    ) -> RouteDecision:
+        """
+        요청 복잡도 분류
+
+        Args:
+            natural_language (str): 자연어 질의
+            schema (Dict[str, Any]): DB 스키마 정보
+            context (Optional[List[Dict[str, Any]]]): 이전 대화 컨텍스트
+            db_id (Optional[str]): 데이터베이스 ID (RAG 기반 테이블 선택에 사용)
+            selection (Optional[TableSelection]): 이미 계산한 테이블 선택 결과 (없으면 계산)
+
+        Returns:
+            RouteDecision: 경로와 분류 근거
+        """
+        table_count = self.selector.count_relevant_tables(schema, natural_language, db_id, selection)
+        join_hints = count_join_hints(natural_language)
+        depth = len(context or [])
+
+        reasons = []
+        if table_count > self.max_simple_tables:
+            reasons.append(f"관련 테이블 {table_count}개")
+        if join_hints > self.max_simple_join_hints:
+            reasons.append(f"조인 힌트 {join_hints}개")
+        if depth > self.max_simple_conversation_depth:
+            reasons.append(f"대화 깊이 {depth}")
+
+        return RouteDecision(
+            route=ROUTE_STRONG if reasons else ROUTE_FAST,
+            tables=table_count,
+            join_hints=join_hints,
+            conversation_depth=depth,
+            reasons=reasons
+        )
+
+    def _record(self, route: str, latency: float, error: bool = False) -> None:
+        """경로별 호출 결과 기록"""
+        with self._lock:
+            stats = self._routes[route]
+            stats["calls"] += 1
+            stats["total_latency"] += latency
+            if error:
+                stats["errors"] += 1
+
+    def _count_fast(self, key: str) -> None:
+        """빠른 모델 결과 통계 증가"""
+        with self._lock:
+            self._fast[key] += 1
+
+    def _remember(self, sql: str, route: str) -> None:
+        """생성된 SQL의 경로 기억 (실행 실패를 경로에 연결하기 위함)"""
+        with self._lock:
+            key = _sql_key(sql)
+            self._generated_routes[key] = route
+            self._generated_routes.move_to_end(key)
+            while len(self._generated_routes) > self.max_tracked_queries:
+                self._generated_routes.popitem(last=False)
+
+    def route_for_sql(self, sql: str) -> Optional[str]:
+        """
+        SQL을 생성한 경로 조회
+
+        Args:
+            sql (str): 생성된 SQL
+
+        Returns:
+            Optional[str]: 경로 이름 (기억하지 못하면 None)
+        """
+        with self._lock:
+            return self._generated_routes.get(_sql_key(sql))
+
+    def record_execution_failure(self, sql: str) -> bool:
+        """
+        생성된 SQL의 실행 실패 기록 (빠른 모델이 생성한 SQL만 성공률에 반영, SQL당 한 번)
+
+        Args:
+            sql (str): 실행에 실패한 SQL
+
+        Returns:
+            bool: 빠른 모델의 실행 실패로 새로 집계되었는지 여부
+        """
+        key = _sql_key(sql)
+        with self._lock:
+            if self._generated_routes.get(key) != ROUTE_FAST or key in self._failed_executions:
+                return False
+            self._failed_executions[key] = None
+            while len(self._failed_executions) > self.max_tracked_queries:
+                self._failed_executions.popitem(last=False)
+            self._fast["execution_failures"] += 1
+        return True
+
+    async def generate_sql(
+        self,
+        natural_language: str,
+        schema: Dict[str, Any],
+        db_type: str,
+        context: Optional[List[Dict[str, Any]]] = None,
+        db_id: Optional[str] = None,
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> Dict[str, Any]:
+        """
+        경로를 선택해 SQL 생성
+
+        단순한 요청은 빠른 모델로 생성하고, 결과가 검증에 실패하거나 호출이 실패하면
+        대형 모델로 다시 생성합니다.
+
+        Args:
+            natural_language (str): 자연어 질의
+            schema (Dict[str, Any]): DB 스키마 정보
+            db_type (str): 데이터베이스 유형
+            context (Optional[List[Dict[str, Any]]]): 이전 대화 컨텍스트
+            db_id (Optional[str]): 데이터베이스 ID
+            validate (Optional[Callable[[str], bool]]): 생성된 SQL 검증 함수
+
+        Returns:
+            Dict[str, Any]: 생성된 SQL 및 메타데이터 ("route"에 경로, "model"에 사용한 모델)
+        """
+        # 테이블 선택은 스레드에서 실행하고, 선택기 캐시를 통해 SQL 생성 프롬프트에서도 재사용
+        selection = await self.selector.select_tables_async(schema, natural_language, db_id)
+        decision = self.classify(natural_language, schema, context, db_id, selection)
+        started_at = time.monotonic()
+
+        if decision.route == ROUTE_FAST:
+            self._count_fast("attempts")
+            try:
+                result = await self.fast_service.generate_sql(natural_language, schema, db_type, context)
+                if result.get("sql") and (validate is None or validate(result["sql"])):
+                    self._record(ROUTE_FAST, time.monotonic() - started_at)
+                    return self._annotate(result, ROUTE_FAST, self.fast_service)
+                self._count_fast("validation_failures")
+                logger.info("빠른 모델이 생성한 SQL이 검증에 실패해 대형 모델로 승격합니다.")
+            except DeadlineExceededError:
+                self._record(ROUTE_FAST, time.monotonic() - started_at, error=True)
+                raise
+            except Exception as e:
+                self._count_fast("errors")
+                logger.warning(f"빠른 모델 SQL 생성 실패, 대형 모델로 승격합니다: {str(e)}")
+            route = ROUTE_ESCALATED
+        else:
+            logger.info(f"복잡한 요청({', '.join(decision.reasons)})을 대형 모델로 보냅니다.")
+            route = ROUTE_STRONG
+
+        try:
+            result = await self.strong_service.generate_sql(natural_language, schema, db_type, context)
+        except Exception:
+            self._record(route, time.monotonic() - started_at, error=True)
+            raise
+        self._record(route, time.monotonic() - started_at)
+        return self._annotate(result, route, self.strong_service)
+
+    def _annotate(self, result: Dict[str, Any], route: str, service: LLMService) -> Dict[str, Any]:
+        """결과에 경로와 모델 정보 추가"""
+        result["route"] = route
+        result["model"] = service.config.model_name
+        if result.get("sql"):
+            self._remember(result["sql"], route)
+        return result
+
+    async def escalate_after_execution_error(
+        self,
+        sql: str,
+        schema: Dict[str, Any],
+        db_type: str,
+        error_message: str
+    ) -> Tuple[str, bool]:
+        """
+        실행에 실패한 SQL을 대형 모델로 수정
+
+        Args:
+            sql (str): 실행에 실패한 SQL
+            schema (Dict[str, Any]): DB 스키마 정보
+            db_type (str): 데이터베이스 유형
+            error_message (str): 실행 오류 메시지
+
+        Returns:
+            Tuple[str, bool]: (수정된 SQL, 수정 여부)
+        """
+        self.record_execution_failure(sql)
+
+        started_at = time.monotonic()
+        try:
+            fixed_sql, modified = await self.strong_service.validate_and_fix_sql(sql, schema, db_type, error_message)
+        except Exception:
+            self._record(ROUTE_ESCALATED, time.monotonic() - started_at, error=True)
+            raise
+        self._record(ROUTE_ESCALATED, time.monotonic() - started_at)
+        if modified:
+            self._remember(fixed_sql, ROUTE_ESCALATED)
+        return fixed_sql, modified
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        라우팅 통계 조회
+
+        Returns:
+            Dict[str, Any]: 경로별 호출 수/오류 수/평균 지연 시간, 빠른 모델 성공률과 실패 원인별 횟수
+        """
+        with self._lock:
+            routes = {route: dict(stats) for route, stats in self._routes.items()}
+            fast = dict(self._fast)
+
+        for stats in routes.values():
+            total_latency = stats.pop("total_latency")
+            stats["avg_latency_ms"] = round(total_latency / stats["calls"] * 1000, 2) if stats["calls"] else 0.0
+
+        failures = fast["validation_failures"] + fast["errors"] + fast["execution_failures"]
+        fast["wins"] = max(0, fast["attempts"] - failures)
+        fast["win_rate"] = fast["wins"] / fast["attempts"] if fast["attempts"] else 0.0
+        return {
+            "fast_model": self.fast_service.config.model_name,
+            "strong_model": self.strong_service.config.model_name,
+            "routes": routes,
+            "fast": fast
+        }
+
+
+# 빠른 모델/대형 모델 조합별 공유 라우터
+_model_routers: Dict[str, ModelRouter] = {}
+_registry_lock = threading.Lock()
+
+
+def get_model_router(fast_service: LLMService, strong_service: LLMService, **options: Any) -> ModelRouter:
+    """
+    빠른 모델/대형 모델 조합별 공유 라우터 조회 (없으면 생성, 있으면 설정 변경)
+
+    Args:
+        fast_service (LLMService): 빠른 모델 서비스
+        strong_service (LLMService): 대형 모델 서비스
+        **options: ModelRouter 설정 (selector, max_simple_tables 등)
+
+    Returns:
+        ModelRouter: 모델 라우터
+    """
+    name = f"{fast_service.config.model_name}->{strong_service.config.model_name}"
+    with _registry_lock:
+        router = _model_routers.get(name)
+        if router is None:
+            router = _model_routers[name] = ModelRouter(fast_service, strong_service, **options)
+        else:
+            for key, value in options.items():
+                setattr(router, key, value)
+        return router
+
+
+def record_execution_failure(sql: str) -> Optional[str]:
+    """
+    실행에 실패한 SQL을 생성한 라우터에 실패 기록 (쿼리가 FAILED 상태가 될 때 호출)
+
+    Args:
+        sql (str): 실행에 실패한 SQL
+
+    Returns:
+        Optional[str]: 실패가 집계된 라우터 이름 (빠른 모델이 생성한 SQL이 아니면 None)
+    """
+    with _registry_lock:
+        routers = dict(_model_routers)
+    for name, router in routers.items():
+        if router.record_execution_failure(sql):
+            return name
+    return None
+
+
+def get_model_routing_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    모든 모델 라우터의 통계 조회
+
+    Returns:
+        Dict[str, Dict[str, Any]]: 라우터 이름(빠른 모델->대형 모델) -> 통계
+    """
+    with _registry_lock:
+        routers = dict(_model_routers)
+    return {name: router.get_stats() for name, router in routers.items()}
@@ -0,0 +1,337 @@
+"""
+자연어-SQL 변환 결과 캐시
+
+이 모듈은 NLToSQLService.convert_nl_to_sql의 결과를 두 단계로 캐시합니다.
+1단계는 정규화된 질문, 데이터베이스, 스키마 버전, 대화 컨텍스트 해시가 모두 같은 경우의 정확 일치이고,
+2단계는 같은 데이터베이스/스키마 버전/대화 컨텍스트 안에서 질문 임베딩의 코사인 유사도가
+임계값 이상이고 질문의 리터럴(숫자, 따옴표 문자열)이 같은 경우의 의미 일치입니다. 검증을 통과한 SQL만 저장되며, 항목은 TTL이 지나거나
+LRU 순서로 밀려나거나 피드백으로 잘못된 답변이 보고되면 제거됩니다.
+"""
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+from threading import Lock
+import copy
+import hashlib
+import json
+import logging
+import re
+import time
+import unicodedata
+
+import numpy as np
+
+from ..utils.sql_fingerprint import sql_fingerprint
+
+
+logger = logging.getLogger(__name__)
+
+# 질문 끝의 문장 부호 (정규화 시 제거)
+_TRAILING_PUNCTUATION = re.compile(r"[\s?？!！.。]+$")
+
+# 질문 속 리터럴 (따옴표 문자열과 숫자)
+_QUOTED_LITERAL = re.compile(r"'([^']*)'|\"([^\"]*)\"|“([^”]*)”|‘([^’]*)’|`([^`]*)`")
+_NUMBER_LITERAL = re.compile(r"\d+(?:[.,]\d+)*")
+
+CacheKey = Tuple[str, str, str, str]  # (데이터베이스 키, 스키마 버전, 컨텍스트 해시, 정규화된 질문)
+
+
+def normalize_question(question: str) -> str:
+    """
+    캐시 키용 질문 정규화 (유니코드 NFKC, 소문자, 공백 축약, 끝 문장 부호 제거)
+
+    Args:
+        question (str): 자연어 질문
+
+    Returns:
+        str: 정규화된 질문
+    """
+    text = unicodedata.normalize("NFKC", question).lower()
+    text = " ".join(text.split())
+    return _TRAILING_PUNCTUATION.sub("", text)
+
+
+def extract_literals(question: str) -> Tuple[str, ...]:
+    """
+    질문에서 리터럴 추출 (의미 일치 시 연도, 수량, 이름 등 값만 다른 질문을 구분하기 위함)
+
+    Args:
+        question (str): 자연어 질문 (정규화된 질문 권장)
+
+    Returns:
+        Tuple[str, ...]: 등장 순서대로의 따옴표 문자열과 숫자
+    """
+    quoted = [next(group for group in match.groups() if group is not None) for match in _QUOTED_LITERAL.finditer(question)]
+    numbers = _NUMBER_LITERAL.findall(_QUOTED_LITERAL.sub(" ", question))
+    return tuple(quoted + numbers)
+
+
+def context_hash(context: Optional[List[Dict[str, Any]]]) -> str:
+    """
+    대화 컨텍스트 해시 계산 (질문과 답변만 사용)
+
+    Args:
+        context (Optional[List[Dict[str, Any]]]): 대화 컨텍스트
+
+    Returns:
+        str: 컨텍스트 해시 (컨텍스트가 없으면 "none")
+    """
+    if not context:
+        return "none"
+
+    items = [[item.get("question", ""), item.get("answer", "")] for item in context]
+    content = json.dumps(items, ensure_ascii=False)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+class NLSQLCache:
+    """자연어-SQL 변환 결과 2단계(정확 일치/의미 일치) 캐시 클래스"""
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl_seconds: float = 3600,
+        similarity_threshold: float = 0.95,
+        max_rejected: int = 4096
+    ):
+        """
+        변환 결과 캐시 초기화
+
+        Args:
+            max_size (int): 캐시에 보관할 최대 항목 수
+            ttl_seconds (float): 항목 유효 시간(초)
+            similarity_threshold (float): 의미 일치로 인정할 최소 코사인 유사도
+            max_rejected (int): 잘못된 답변으로 보고된 SQL을 기억할 최대 개수
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.max_rejected = max_rejected
+        self._entries: "OrderedDict[CacheKey, Dict[str, Any]]" = OrderedDict()
+        self._rejected: "OrderedDict[Tuple[str, str], None]" = OrderedDict()  # (데이터베이스 키, SQL 지문)
+        self._lock = Lock()
+        self._exact_hits = 0
+        self._semantic_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._literal_mismatches = 0
+
+    @staticmethod
+    def make_key(question: str, db_key: str, schema_version: str, context_key: str) -> CacheKey:
+        """
+        캐시 키 생성
+
+        Args:
+            question (str): 자연어 질문
+            db_key (str): 데이터베이스 ID (없으면 DB 유형)
+            schema_version (str): 스키마 버전
+            context_key (str): 대화 컨텍스트 해시
+
+        Returns:
+            CacheKey: (데이터베이스 키, 스키마 버전, 컨텍스트 해시, 정규화된 질문)
+        """
+        return (db_key, schema_version, context_key, normalize_question(question))
+
+    def _is_expired(self, entry: Dict[str, Any], now: float) -> bool:
+        """항목의 TTL 만료 여부"""
+        return now - entry["created_at"] > self.ttl_seconds
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """
+        정확 일치 조회
+
+        Args:
+            key (CacheKey): 캐시 키
+
+        Returns:
+            Optional[Dict[str, Any]]: 캐시된 변환 결과 사본 또는 None
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_expired(entry, now):
+                del self._entries[key]
+                self._expirations += 1
+                entry = None
+            if entry is None:
+                return None
+
+            self._entries.move_to_end(key)
+            self._exact_hits += 1
+            return copy.deepcopy(entry["result"])
+
+    def get_similar(self, key: CacheKey, embedding: List[float]) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        의미 일치 조회 (같은 데이터베이스, 스키마 버전, 대화 컨텍스트이고 리터럴이 같은 항목만 비교)
+
+        Args:
+            key (CacheKey): 조회 중인 질문의 캐시 키
+            embedding (List[float]): 질문 임베딩
+
+        Returns:
+            Optional[Tuple[Dict[str, Any], float]]: (캐시된 변환 결과 사본, 유사도) 또는 None
+        """
+        vector = self._unit_vector(embedding)
+        literals = extract_literals(key[3])
+        now = time.monotonic()
+        with self._lock:
+            best_key, best_similarity = None, -1.0
+            literal_mismatch = False
+            for entry_key, entry in list(self._entries.items()):
+                if entry_key[:3] != key[:3] or entry["embedding"] is None:
+                    continue
+                if self._is_expired(entry, now):
+                    del self._entries[entry_key]
+                    self._expirations += 1
+                    continue
+                if entry["embedding"].shape != vector.shape:
+                    continue
+                similarity = float(np.dot(entry["embedding"], vector))
+                # 값만 다른 질문("2023년 매출"/"2024년 매출")은 임베딩이 거의 같아도 다른 SQL이 필요함
+                if entry["literals"] != literals:
+                    literal_mismatch = literal_mismatch or similarity >= self.similarity_threshold
+                    continue
+                if similarity > best_similarity:
+                    best_key, best_similarity = entry_key, similarity
+
+            if best_key is None or best_similarity < self.similarity_threshold:
+                if literal_mismatch:
+                    self._literal_mismatches += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(best_key)
+            self._semantic_hits += 1
+            return copy.deepcopy(self._entries[best_key]["result"]), best_similarity
+
+    def record_miss(self) -> None:
+        """의미 일치 조회 없이 끝난 조회를 실패로 기록"""
+        with self._lock:
+            self._misses += 1
+
+    def put(self, key: CacheKey, result: Dict[str, Any], embedding: Optional[List[float]] = None) -> bool:
+        """
+        검증된 변환 결과 저장
+
+        Args:
+            key (CacheKey): 캐시 키
+            result (Dict[str, Any]): 변환 결과 ("sql" 포함)
+            embedding (Optional[List[float]]): 질문 임베딩 (없으면 정확 일치로만 조회됨)
+
+        Returns:
+            bool: 저장 여부 (잘못된 답변으로 보고된 SQL은 저장하지 않음)
+        """
+        fingerprint = sql_fingerprint(result["sql"])
+        entry = {
+            "result": copy.deepcopy(result),
+            "embedding": self._unit_vector(embedding) if embedding else None,
+            "sql_fingerprint": fingerprint,
+            "literals": extract_literals(key[3]),
+            "created_at": time.monotonic()
+        }
+        with self._lock:
+            if (key[0], fingerprint) in self._rejected:
+                return False
+
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return True
+
+    def invalidate_answer(self, db_key: str, sql: str) -> int:
+        """
+        잘못된 답변으로 보고된 SQL의 항목 제거 (이후 같은 SQL은 다시 저장되지 않음)
+
+        Args:
+            db_key (str): 데이터베이스 ID (없으면 DB 유형)
+            sql (str): 잘못된 SQL
+
+        Returns:
+            int: 제거된 항목 수
+        """
+        return self.invalidate_fingerprint(db_key, sql_fingerprint(sql))
+
+    def invalidate_fingerprint(self, db_key: str, fingerprint: str) -> int:
+        """
+        잘못된 답변으로 보고된 SQL 지문의 항목 제거 (이후 같은 지문의 SQL은 다시 저장되지 않음)
+
+        Args:
+            db_key (str): 데이터베이스 ID (없으면 DB 유형)
+            fingerprint (str): 제공된 답변의 SQL 지문 (utils.sql_fingerprint.sql_fingerprint)
+
+        Returns:
+            int: 제거된 항목 수
+        """
+        with self._lock:
+            self._rejected[(db_key, fingerprint)] = None
+            while len(self._rejected) > self.max_rejected:
+                self._rejected.popitem(last=False)
+
+            stale_keys = [
+                key for key, entry in self._entries.items()
+                if key[0] == db_key and entry["sql_fingerprint"] == fingerprint
+            ]
+            for key in stale_keys:
+                del self._entries[key]
+            self._invalidations += len(stale_keys)
+
+        if stale_keys:
+            logger.info(f"잘못된 답변으로 보고된 SQL의 변환 캐시 항목 {len(stale_keys)}개를 무효화했습니다: {db_key}")
+        return len(stale_keys)
+
+    def invalidate(self, db_key: Optional[str] = None) -> int:
+        """
+        캐시 항목 무효화
+
+        Args:
+            db_key (Optional[str]): 무효화할 데이터베이스 키 (None이면 전체 무효화)
+
+        Returns:
+            int: 제거된 항목 수
+        """
+        with self._lock:
+            stale_keys = [key for key in self._entries if db_key is None or key[0] == db_key]
+            for key in stale_keys:
+                del self._entries[key]
+            self._invalidations += len(stale_keys)
+        return len(stale_keys)
+
+    @staticmethod
+    def _unit_vector(embedding: List[float]) -> np.ndarray:
+        """단위 길이로 정규화한 임베딩 벡터"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계 조회
+
+        Returns:
+            Dict[str, Any]: 단계별 적중 횟수, 적중률, 크기 등 통계 정보
+        """
+        with self._lock:
+            hits = self._exact_hits + self._semantic_hits
+            lookups = hits + self._misses
+            return {
+                "exact_hits": self._exact_hits,
+                "semantic_hits": self._semantic_hits,
+                "misses": self._misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "similarity_threshold": self.similarity_threshold,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "literal_mismatches": self._literal_mismatches,
+                "rejected_answers": len(self._rejected)
+            }
+
+
+# 모든 NLToSQLService 인스턴스가 공유하는 기본 캐시
+nl_sql_cache = NLSQLCache()
@@ -5,7 +5,7 @@
 DB 스키마 정보를 활용한 프롬프트 생성, 자연어 질의를 SQL로 변환하는 로직,
 컨텍스트 관리 및 대화 이력 처리 기능을 제공합니다.
 """
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, AsyncIterator
 import json
 import logging
 import asyncio
@@ -19,6 +19,11 @@ from .prompt_utils import (
     ENHANCED_SQL_GENERATION_TEMPLATE
 )
 from .response_utils import parse_llm_response, ResponseParsingError, ResponseValidationError
+from .nl_sql_cache import NLSQLCache, nl_sql_cache as default_nl_sql_cache, context_hash
+from .validation_cache import get_schema_version
+from .sql_validator import SQLValidator
+from .model_router import ModelRouter
+from .embedding_pipeline import EmbeddingPipeline
 
 
 logger = logging.getLogger(__name__)
@@ -27,15 +32,34 @@ logger = logging.getLogger(__name__)
 class NLToSQLService:
     """자연어-SQL 변환 서비스 클래스"""
     
-    def __init__(self, llm_service: LLMService):
+    def __init__(
+        self,
+        llm_service: LLMService,
+        cache: Optional[NLSQLCache] = None,
+        use_cache: bool = True,
+        sql_validator: Optional[SQLValidator] = None,
+        model_router: Optional[ModelRouter] = None,
+        embedding_pipeline: Optional[EmbeddingPipeline] = None
+    ):
         """
         자연어-SQL 변환 서비스 초기화
         
         Args:
             llm_service (LLMService): LLM 서비스 인스턴스
+            cache (Optional[NLSQLCache]): 변환 결과 캐시 (기본값: 공유 캐시)
+            use_cache (bool): 변환 결과 캐시 사용 여부
+            sql_validator (Optional[SQLValidator]): 캐시에 저장하기 전 SQL 검증기
+            model_router (Optional[ModelRouter]): 요청 복잡도에 따라 빠른 모델/대형 모델을 선택하는 라우터
+                (없으면 llm_service만 사용)
+            embedding_pipeline (Optional[EmbeddingPipeline]): 의미 일치 캐시 조회용 질문 임베딩 파이프라인
+                (임베딩 서비스와 임베딩 캐시를 공유하며, 없으면 llm_service로 임베딩 생성)
         """
         self.llm_service = llm_service
         self.conversation_history: Dict[str, List[Dict[str, Any]]] = {}
+        self.cache = (cache or default_nl_sql_cache) if use_cache else None
+        self.sql_validator = sql_validator or SQLValidator()
+        self.model_router = model_router
+        self.embedding_pipeline = embedding_pipeline
     
     async def convert_nl_to_sql(
         self,
@@ -44,11 +68,15 @@ class NLToSQLService:
         schema: Dict[str, Any],
         db_type: str,
         conversation_id: Optional[str] = None,
-        max_context_items: int = 5
+        max_context_items: int = 5,
+        db_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         자연어 질의를 SQL로 변환
         
+        같은 질문(정규화 기준)이나 의미가 거의 같은 질문에 대해 같은 스키마와 대화 컨텍스트로
+        이미 검증된 SQL이 캐시에 있으면 LLM을 호출하지 않고 캐시된 결과를 반환합니다.
+        
         Args:
             user_id (str): 사용자 ID
             natural_language (str): 자연어 질의
@@ -56,9 +84,10 @@ class NLToSQLService:
             db_type (str): 데이터베이스 유형 ('mssql' 또는 'hana')
             conversation_id (Optional[str], optional): 대화 ID
             max_context_items (int, optional): 컨텍스트에 포함할 최대 이전 대화 항목 수
+            db_id (Optional[str], optional): 데이터베이스 ID (캐시 키에 사용, 없으면 DB 유형 사용)
             
         Returns:
-            Dict[str, Any]: 생성된 SQL 및 메타데이터
+            Dict[str, Any]: 생성된 SQL 및 메타데이터 (캐시 적중 시 "cache"에 "exact" 또는 "semantic")
         """
         try:
             # 대화 ID가 없으면 새로 생성
@@ -68,31 +97,22 @@ class NLToSQLService:
             # 대화 컨텍스트 가져오기
             context = self._get_conversation_context(user_id, conversation_id, max_context_items)
             
-            # LLM 서비스를 통해 SQL 생성
-            result = await self.llm_service.generate_sql(
-                natural_language=natural_language,
-                schema=schema,
-                db_type=db_type,
-                context=context
-            )
-            
-            # 대화 이력에 추가
-            self._add_to_conversation_history(
-                user_id=user_id,
-                conversation_id=conversation_id,
-                question=natural_language,
-                answer=result["sql"],
-                metadata={
-                    "db_type": db_type,
-                    "timestamp": datetime.now().isoformat(),
-                    "explanation": result.get("explanation", "")
-                }
-            )
+            # 캐시 조회 (정확 일치 후 의미 일치)
+            cache_key, embedding, result = await self._lookup_cache(natural_language, schema, db_type, context, db_id)
             
-            # 결과에 대화 ID 추가
-            result["conversation_id"] = conversation_id
+            if result is None:
+                # LLM 서비스를 통해 SQL 생성 (라우터가 있으면 복잡도에 따라 모델 선택)
+                result = await self._generate_sql(natural_language, schema, db_type, context, db_id)
+                
+                # 검증을 통과한 SQL만 캐시에 저장
+                if cache_key is not None and result.get("sql"):
+                    is_valid, _, _ = self.sql_validator.validate_sql(
+                        result["sql"], db_type, schema, schema_version=cache_key[1], db_id=db_id
+                    )
+                    if is_valid:
+                        self.cache.put(cache_key, result, embedding)
             
-            return result
+            return self._complete_conversion(user_id, conversation_id, natural_language, db_type, result)
             
         except ResponseParsingError as e:
             logger.error(f"SQL 생성 응답 파싱 실패: {str(e)}")
@@ -104,6 +124,275 @@ class NLToSQLService:
             logger.error(f"자연어-SQL 변환 중 오류 발생: {str(e)}")
             raise
     
+    async def _generate_sql(
+        self,
+        natural_language: str,
+        schema: Dict[str, Any],
+        db_type: str,
+        context: List[Dict[str, Any]],
+        db_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        SQL 생성 (라우터가 있으면 빠른 모델의 결과가 검증에 실패할 때만 대형 모델 사용)
+        
+        Args:
+            natural_language (str): 자연어 질의
+            schema (Dict[str, Any]): DB 스키마 정보
+            db_type (str): 데이터베이스 유형
+            context (List[Dict[str, Any]]): 대화 컨텍스트
+            db_id (Optional[str]): 데이터베이스 ID
+            
+        Returns:
+            Dict[str, Any]: 생성된 SQL 및 메타데이터
+        """
+        if self.model_router is None:
+            return await self.llm_service.generate_sql(
+                natural_language=natural_language,
+                schema=schema,
+                db_type=db_type,
+                context=context
+            )
+        
+        def validate(sql: str) -> bool:
+            is_valid, _, _ = self.sql_validator.validate_sql(sql, db_type, schema, db_id=db_id)
+            return is_valid
+        
+        return await self.model_router.generate_sql(
+            natural_language, schema, db_type, context, db_id=db_id, validate=validate
+        )
+    
+    async def fix_after_execution_error(
+        self,
+        sql: str,
+        schema: Dict[str, Any],
+        db_type: str,
+        error_message: str
+    ) -> Tuple[str, bool]:
+        """
+        실행에 실패한 SQL 수정 (라우터가 있으면 대형 모델로 승격)
+        
+        Args:
+            sql (str): 실행에 실패한 SQL
+            schema (Dict[str, Any]): DB 스키마 정보
+            db_type (str): 데이터베이스 유형
+            error_message (str): 실행 오류 메시지
+            
+        Returns:
+            Tuple[str, bool]: (수정된 SQL, 수정 여부)
+        """
+        if self.model_router is None:
+            return await self.llm_service.validate_and_fix_sql(sql, schema, db_type, error_message)
+        return await self.model_router.escalate_after_execution_error(sql, schema, db_type, error_message)
+    
+    async def stream_nl_to_sql(
+        self,
+        user_id: str,
+        natural_language: str,
+        schema: Dict[str, Any],
+        db_type: str,
+        conversation_id: Optional[str] = None,
+        max_context_items: int = 5,
+        db_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        자연어 질의를 SQL로 변환 (스트리밍)
+        
+        LLM 서비스의 스트리밍 이벤트를 그대로 전달하면서, SQL 코드 블록이 닫히는 즉시
+        모델이 설명을 작성하는 동안 백그라운드에서 SQL 검증을 시작하고 끝나면 "validation" 이벤트를 전달합니다.
+        캐시 적중 시에는 LLM을 호출하지 않고 "sql", "validation", "done" 이벤트만 전달합니다.
+        
+        Args:
+            user_id (str): 사용자 ID
+            natural_language (str): 자연어 질의
+            schema (Dict[str, Any]): DB 스키마 정보
+            db_type (str): 데이터베이스 유형 ('mssql' 또는 'hana')
+            conversation_id (Optional[str], optional): 대화 ID
+            max_context_items (int, optional): 컨텍스트에 포함할 최대 이전 대화 항목 수
+            db_id (Optional[str], optional): 데이터베이스 ID (캐시 키에 사용, 없으면 DB 유형 사용)
+            
+        Yields:
+            Dict[str, Any]: "token", "sql", "validation" 이벤트와 convert_nl_to_sql과 같은 결과를 담은 "done" 이벤트
+        """
+        if not conversation_id:
+            conversation_id = f"{user_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        
+        context = self._get_conversation_context(user_id, conversation_id, max_context_items)
+        cache_key, embedding, result = await self._lookup_cache(natural_language, schema, db_type, context, db_id)
+        schema_version = cache_key[1] if cache_key is not None else None
+        
+        if result is not None:
+            yield {"event": "sql", "sql": result["sql"], "cache": result["cache"]}
+            yield {"event": "validation", "sql": result["sql"], "valid": True, "errors": [], "warnings": []}
+            yield {"event": "done", **self._complete_conversion(user_id, conversation_id, natural_language, db_type, result)}
+            return
+        
+        validated_sql: Optional[str] = None
+        validation_task: Optional[asyncio.Future] = None
+        validation_sent = False
+        try:
+            async for event in self.llm_service.stream_generate_sql(
+                natural_language=natural_language,
+                schema=schema,
+                db_type=db_type,
+                context=context
+            ):
+                if event["event"] == "done":
+                    result = {key: value for key, value in event.items() if key != "event"}
+                    break
+                
+                if event["event"] == "sql" and validation_task is None:
+                    # 모델이 설명을 작성하는 동안 SQL 검증 수행
+                    validated_sql = event["sql"]
+                    validation_task = asyncio.ensure_future(asyncio.to_thread(
+                        self.sql_validator.validate_sql,
+                        validated_sql, db_type, schema, schema_version=schema_version, db_id=db_id
+                    ))
+                yield event
+                
+                if validation_task is not None and not validation_sent and validation_task.done():
+                    yield self._validation_event(validated_sql, validation_task.result())
+                    validation_sent = True
+            
+            if result is None:
+                raise ResponseParsingError("SQL 생성 응답 스트림이 결과 없이 종료되었습니다.")
+            
+            # 코드 블록 추출 결과와 최종 파싱 결과가 다르면 최종 SQL을 다시 검증
+            if validation_task is None or validated_sql != result["sql"]:
+                if validation_task is not None:
+                    validation_task.cancel()
+                validated_sql = result["sql"]
+                validation_task = asyncio.ensure_future(asyncio.to_thread(
+                    self.sql_validator.validate_sql,
+                    validated_sql, db_type, schema, schema_version=schema_version, db_id=db_id
+                ))
+                validation_sent = False
+            
+            validation = await validation_task
+            if not validation_sent:
+                yield self._validation_event(validated_sql, validation)
+        except BaseException:
+            if validation_task is not None:
+                validation_task.cancel()
+            raise
+        
+        # 검증을 통과한 SQL만 캐시에 저장
+        if cache_key is not None and validation[0]:
+            self.cache.put(cache_key, result, embedding)
+        
+        yield {"event": "done", **self._complete_conversion(user_id, conversation_id, natural_language, db_type, result)}
+    
+    @staticmethod
+    def _validation_event(sql: str, validation: Tuple[bool, List[str], List[str]]) -> Dict[str, Any]:
+        """SQL 검증 결과 이벤트 생성"""
+        is_valid, errors, warnings = validation
+        return {"event": "validation", "sql": sql, "valid": is_valid, "errors": errors, "warnings": warnings}
+    
+    async def _lookup_cache(
+        self,
+        natural_language: str,
+        schema: Dict[str, Any],
+        db_type: str,
+        context: List[Dict[str, Any]],
+        db_id: Optional[str]
+    ) -> Tuple[Optional[tuple], Optional[List[float]], Optional[Dict[str, Any]]]:
+        """
+        변환 결과 캐시 조회 (정확 일치 후 의미 일치)
+        
+        Args:
+            natural_language (str): 자연어 질의
+            schema (Dict[str, Any]): DB 스키마 정보
+            db_type (str): 데이터베이스 유형
+            context (List[Dict[str, Any]]): 대화 컨텍스트
+            db_id (Optional[str]): 데이터베이스 ID
+            
+        Returns:
+            Tuple: (캐시 키, 질문 임베딩, 캐시된 결과) - 캐시를 사용하지 않으면 캐시 키는 None, 적중하지 않으면 결과는 None
+        """
+        if self.cache is None:
+            return None, None, None
+        
+        schema_version = get_schema_version(schema)
+        cache_key = NLSQLCache.make_key(
+            natural_language, db_id or db_type, schema_version, context_hash(context)
+        )
+        result = self.cache.get(cache_key)
+        if result is not None:
+            result["cache"] = "exact"
+            return cache_key, None, result
+        
+        embedding = await self._embed_question(cache_key[3])
+        match = self.cache.get_similar(cache_key, embedding) if embedding else None
+        if match is not None:
+            result, similarity = match
+            result["cache"] = "semantic"
+            result["cache_similarity"] = round(similarity, 4)
+            result["original_question"] = natural_language
+        elif not embedding:
+            self.cache.record_miss()
+        return cache_key, embedding, result
+    
+    def _complete_conversion(
+        self,
+        user_id: str,
+        conversation_id: str,
+        natural_language: str,
+        db_type: str,
+        result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        변환 결과를 대화 이력에 추가하고 결과에 대화 ID 설정
+        
+        Args:
+            user_id (str): 사용자 ID
+            conversation_id (str): 대화 ID
+            natural_language (str): 자연어 질의
+            db_type (str): 데이터베이스 유형
+            result (Dict[str, Any]): 변환 결과
+            
+        Returns:
+            Dict[str, Any]: 대화 ID가 추가된 변환 결과
+        """
+        # 대화 이력에 추가
+        self._add_to_conversation_history(
+            user_id=user_id,
+            conversation_id=conversation_id,
+            question=natural_language,
+            answer=result["sql"],
+            metadata={
+                "db_type": db_type,
+                "timestamp": datetime.now().isoformat(),
+                "explanation": result.get("explanation", "")
+            }
+        )
+        
+        # 결과에 대화 ID 추가
+        result["conversation_id"] = conversation_id
+        
+        return result
+    
+    async def _embed_question(self, question: str) -> Optional[List[float]]:
+        """
+        의미 일치 캐시 조회용 질문 임베딩 생성 (실패 시 None)
+        
+        임베딩 파이프라인이 설정되어 있으면 RAG 인덱스와 같은 임베딩 서비스와 임베딩 캐시를 사용하므로
+        같은 질문은 임베딩 API를 다시 호출하지 않습니다.
+        
+        Args:
+            question (str): 정규화된 질문
+            
+        Returns:
+            Optional[List[float]]: 질문 임베딩
+        """
+        try:
+            if self.embedding_pipeline is not None:
+                embeddings = await self.embedding_pipeline.embed([question])
+            else:
+                embeddings = await self.llm_service.get_embeddings([question])
+            return embeddings[0] if embeddings else None
+        except Exception as e:
+            logger.warning(f"질문 임베딩 생성 실패, 의미 일치 캐시를 건너뜁니다: {str(e)}")
+            return None
+    
     def _get_conversation_context(
         self,
         user_id: str,
@@ -3,12 +3,12 @@ OpenAI LLM 서비스 구현
 
 이 모듈은 OpenAI API를 사용하여 LLM 서비스 인터페이스를 구현합니다.
 """
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, AsyncIterator
 import json
 import asyncio
 import logging
-import numpy as np
-from openai import AsyncOpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from openai.types.chat import ChatCompletion
 
 from .base import LLMService, LLMConfig, LLMProvider
@@ -16,12 +16,21 @@ from .prompt_utils import (
     SQL_GENERATION_TEMPLATE,
     RESULT_SUMMARY_TEMPLATE,
     PYTHON_CODE_GENERATION_TEMPLATE,
-    create_schema_context,
     create_conversation_context,
     create_result_context,
     create_result_structure
 )
-from .response_utils import parse_llm_response, ResponseParsingError, ResponseValidationError
+from .response_utils import (
+    parse_llm_response,
+    validate_sql_query,
+    ResponseParsingError,
+    ResponseValidationError,
+    StreamingSQLExtractor
+)
+from .schema_selector import SchemaContext, schema_selector, count_tokens
+from .rate_limiter import RequestPriority, get_provider_limiter
+from .hedging import get_hedged_caller
+from ..utils.deadline import DeadlineExceededError, current_deadline
 
 
 logger = logging.getLogger(__name__)
@@ -39,38 +48,153 @@ class OpenAIService(LLMService):
         """
         super().__init__(config)
         
-        # OpenAI 클라이언트 초기화
+        # OpenAI 클라이언트 초기화 (연결 풀 재사용, 재시도는 제공자 제한기에서 처리)
+        http_limits = httpx.Limits(
+            max_connections=config.additional_config.get("http_max_connections", 100),
+            max_keepalive_connections=config.additional_config.get("http_max_keepalive_connections", 20),
+            keepalive_expiry=config.additional_config.get("http_keepalive_expiry", 30.0)
+        )
         self.client = AsyncOpenAI(
             api_key=config.api_key,
             base_url=config.api_base if config.api_base else None,
-            timeout=config.timeout
+            timeout=config.timeout,
+            max_retries=0,
+            http_client=DefaultAsyncHttpxClient(limits=http_limits)
+        )
+        
+        # 제공자/모델별 요청 수, 토큰 수, 동시 호출 수 제한기
+        self.rate_limiter = get_provider_limiter(config.provider.value, config.model_name)
+        
+        # 마감 시간, 헤지 요청, 대체 모델을 적용하는 호출기
+        self.hedger = get_hedged_caller(config.provider.value, config.model_name)
+        
+        # 프롬프트에 포함할 관련 테이블 선택기
+        self.schema_selector = schema_selector
+    
+    def _log_schema_pruning(self, task: str, schema_context: SchemaContext, prompt: str) -> None:
+        """
+        스키마 선택 전후의 프롬프트 토큰 수 기록
+        
+        Args:
+            task (str): 프롬프트 용도
+            schema_context (SchemaContext): 선택된 스키마 컨텍스트
+            prompt (str): 선택된 스키마로 생성한 프롬프트
+        """
+        tokens_after = count_tokens(prompt)
+        tokens_before = tokens_after - schema_context.tokens_after + schema_context.tokens_before
+        logger.info(
+            f"{task} 프롬프트 토큰 수: {tokens_before} -> {tokens_after} "
+            f"(테이블 {len(schema_context.tables)}/{schema_context.total_tables}개 포함)"
         )
     
-    async def _call_openai_api(self, messages: List[Dict[str, str]]) -> str:
+    def _estimate_tokens(self, messages: List[Dict[str, str]]) -> int:
+        """
+        요청의 예상 토큰 수 계산 (제공자와 같이 프롬프트 토큰과 최대 출력 토큰을 합산)
+        
+        Args:
+            messages (List[Dict[str, str]]): 메시지 목록
+            
+        Returns:
+            int: 예상 토큰 수
+        """
+        return sum(count_tokens(message.get("content") or "") for message in messages) + self.config.max_tokens
+    
+    async def _call_openai_api(
+        self,
+        messages: List[Dict[str, str]],
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+        hedge: bool = False
+    ) -> str:
         """
         OpenAI API 호출
         
+        요청 마감 시간이 설정되어 있으면 남은 시간을 요청 타임아웃으로 사용하고,
+        남은 시간이 부족하면 대체 모델로 요청합니다.
+        
         Args:
             messages (List[Dict[str, str]]): 메시지 목록
+            priority (RequestPriority): 요청 우선순위 (기본값: 대화형)
+            hedge (bool): 응답이 늦어지면 헤지 요청을 보낼지 여부 (지연 시간에 민감한 호출용)
             
         Returns:
             str: API 응답 텍스트
             
         Raises:
-            Exception: API 호출 실패 시
+            DeadlineExceededError: 마감 시간 안에 응답을 받지 못한 경우
+            Exception: 재시도 후에도 API 호출 실패 시
         """
-        try:
-            response: ChatCompletion = await self.client.chat.completions.create(
-                model=self.config.model_name,
-                messages=messages,
-                temperature=self.config.temperature,
-                max_tokens=self.config.max_tokens
+        tokens = self._estimate_tokens(messages)
+        
+        async def request(model_name: str) -> ChatCompletion:
+            limiter = self.rate_limiter
+            if model_name != self.config.model_name:
+                limiter = get_provider_limiter(self.config.provider.value, model_name)
+            
+            deadline = current_deadline()
+            timeout = max(1.0, deadline.remaining()) if deadline else self.config.timeout
+            return await limiter.call(
+                lambda: self.client.chat.completions.create(
+                    model=model_name,
+                    messages=messages,
+                    temperature=self.config.temperature,
+                    max_tokens=self.config.max_tokens,
+                    timeout=timeout
+                ),
+                tokens=tokens,
+                priority=priority
             )
+        
+        try:
+            response: ChatCompletion = await self.hedger.run(request, hedge=hedge)
             
             return response.choices[0].message.content or ""
         except Exception as e:
             logger.error(f"OpenAI API 호출 실패: {str(e)}")
             raise
+    
+    async def _stream_openai_api(
+        self, messages: List[Dict[str, str]], priority: RequestPriority = RequestPriority.INTERACTIVE
+    ) -> AsyncIterator[str]:
+        """
+        OpenAI API 스트리밍 호출
+        
+        요청 마감 시간이 설정되어 있으면 남은 시간을 요청 타임아웃으로 사용하고,
+        응답 조각을 받는 도중 마감 시간이 지나면 스트림을 중단합니다.
+        
+        Args:
+            messages (List[Dict[str, str]]): 메시지 목록
+            priority (RequestPriority): 요청 우선순위 (기본값: 대화형)
+            
+        Yields:
+            str: 생성되는 응답 텍스트 조각
+            
+        Raises:
+            DeadlineExceededError: 마감 시간 안에 응답을 마치지 못한 경우
+            Exception: 재시도 후에도 API 호출 실패 시
+        """
+        deadline = current_deadline()
+        try:
+            stream = self.rate_limiter.stream(
+                lambda: self.client.chat.completions.create(
+                    model=self.config.model_name,
+                    messages=messages,
+                    temperature=self.config.temperature,
+                    max_tokens=self.config.max_tokens,
+                    stream=True,
+                    timeout=max(1.0, deadline.remaining()) if deadline else self.config.timeout
+                ),
+                tokens=self._estimate_tokens(messages),
+                priority=priority
+            )
+            
+            async for chunk in stream:
+                if deadline is not None and deadline.expired:
+                    raise DeadlineExceededError("OpenAI 스트리밍 응답이 요청 마감 시간을 초과했습니다.")
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            logger.error(f"OpenAI API 스트리밍 호출 실패: {str(e)}")
+            raise
             
     async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
@@ -100,24 +224,23 @@ class OpenAIService(LLMService):
             
             return embeddings
         except Exception as e:
+            # 임의의 벡터로 대체하면 인덱스가 오염되므로 호출자가 실패를 처리하도록 예외 전달
             logger.error(f"임베딩 생성 실패: {str(e)}")
-            # 오류 발생 시 임의의 임베딩 반환 (실제 구현에서는 적절한 오류 처리 필요)
-            return [np.random.rand(1536).tolist() for _ in texts]
+            raise
             
-    async def generate_rag_response(self, query: str, context: str) -> str:
+    def _rag_messages(self, query: str, context: str) -> List[Dict[str, str]]:
         """
-        RAG 컨텍스트를 기반으로 응답 생성
+        RAG 응답 생성 메시지 구성
         
         Args:
             query (str): 사용자 질의
             context (str): 검색된 문서 컨텍스트
             
         Returns:
-            str: 생성된 응답
+            List[Dict[str, str]]: 메시지 목록
         """
-        try:
-            # 프롬프트 생성
-            prompt = f"""
+        # 프롬프트 생성
+        prompt = f"""
 다음은 데이터베이스 스키마에 관한 정보입니다. 이 정보를 바탕으로 사용자의 질문에 답변해주세요.
 
 ### 컨텍스트:
@@ -133,14 +256,28 @@ class OpenAIService(LLMService):
 4. 가능한 경우 테이블, 컬럼, 관계 등의 구체적인 정보를 포함하세요.
 5. 답변에 사용된 정보의 출처를 명시하세요.
 """
+        
+        return [
+            {"role": "system", "content": "당신은 데이터베이스 스키마 전문가입니다."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    async def generate_rag_response(self, query: str, context: str) -> str:
+        """
+        RAG 컨텍스트를 기반으로 응답 생성
+        
+        Args:
+            query (str): 사용자 질의
+            context (str): 검색된 문서 컨텍스트
             
-            # API 호출
-            messages = [
-                {"role": "system", "content": "당신은 데이터베이스 스키마 전문가입니다."},
-                {"role": "user", "content": prompt}
-            ]
+        Returns:
+            str: 생성된 응답
+        """
+        try:
+            messages = self._rag_messages(query, context)
             
-            response_text = await self._call_openai_api(messages)
+            # API 호출
+            response_text = await self._call_openai_api(messages, hedge=True)
             
             return response_text
             
@@ -148,6 +285,61 @@ class OpenAIService(LLMService):
             logger.error(f"RAG 응답 생성 중 오류 발생: {str(e)}")
             return "죄송합니다. 응답을 생성하는 중에 오류가 발생했습니다."
     
+    async def stream_rag_response(self, query: str, context: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        RAG 컨텍스트를 기반으로 응답 생성 (토큰 단위 스트리밍)
+        
+        Args:
+            query (str): 사용자 질의
+            context (str): 검색된 문서 컨텍스트
+        
+        Yields:
+            Dict[str, Any]: "token" 이벤트들과 전체 응답을 담은 "done" 이벤트
+        """
+        chunks = []
+        try:
+            async for delta in self._stream_openai_api(self._rag_messages(query, context)):
+                chunks.append(delta)
+                yield {"event": "token", "content": delta}
+        except Exception as e:
+            logger.error(f"RAG 응답 스트리밍 중 오류 발생: {str(e)}")
+            if not chunks:
+                chunks = ["죄송합니다. 응답을 생성하는 중에 오류가 발생했습니다."]
+                yield {"event": "token", "content": chunks[0]}
+        
+        yield {"event": "done", "response": "".join(chunks)}
+    
+    async def _sql_generation_messages(self, natural_language: str, schema: Dict[str, Any], db_type: str, context: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, str]]:
+        """
+        SQL 생성 메시지 구성
+        
+        Args:
+            natural_language (str): 자연어 질의
+            schema (Dict[str, Any]): DB 스키마 정보
+            db_type (str): 데이터베이스 유형 ('mssql' 또는 'hana')
+            context (List[Dict[str, Any]], optional): 대화 컨텍스트
+        
+        Returns:
+            List[Dict[str, str]]: 메시지 목록
+        """
+        # 질문과 관련된 테이블만 포함한 스키마 및 컨텍스트 포맷 (RAG 검색과 토큰 계산은 스레드에서 실행)
+        schema_context = await self.schema_selector.build_context_async(schema, natural_language)
+        context_text = create_conversation_context(context or [])
+        
+        # 프롬프트 생성
+        prompt = SQL_GENERATION_TEMPLATE.format(
+            schema_json=schema_context.text,
+            db_type=db_type,
+            question=natural_language,
+            context=context_text
+        )
+        self._log_schema_pruning("SQL 생성", schema_context, prompt)
+        
+        return [
+            {"role": "system", "content": "당신은 자연어를 SQL로 변환하는 전문가입니다."},
+            {"role": "user", "content": prompt}
+        ]
+    
     async def generate_sql(self, natural_language: str, schema: Dict[str, Any], db_type: str, context: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         자연어를 SQL로 변환
@@ -162,25 +354,10 @@ class OpenAIService(LLMService):
             Dict[str, Any]: 생성된 SQL 및 메타데이터
         """
         try:
-            # 스키마 및 컨텍스트 포맷
-            schema_json = create_schema_context(schema)
-            context_text = create_conversation_context(context or [])
-            
-            # 프롬프트 생성
-            prompt = SQL_GENERATION_TEMPLATE.format(
-                schema_json=schema_json,
-                db_type=db_type,
-                question=natural_language,
-                context=context_text
-            )
+            messages = await self._sql_generation_messages(natural_language, schema, db_type, context)
             
             # API 호출
-            messages = [
-                {"role": "system", "content": "당신은 자연어를 SQL로 변환하는 전문가입니다."},
-                {"role": "user", "content": prompt}
-            ]
-            
-            response_text = await self._call_openai_api(messages)
+            response_text = await self._call_openai_api(messages, hedge=True)
             
             # 응답 파싱
             parsed_response = parse_llm_response(response_text, "sql")
@@ -202,6 +379,82 @@ class OpenAIService(LLMService):
             logger.error(f"SQL 생성 중 오류 발생: {str(e)}")
             raise
     
+    async def stream_generate_sql(self, natural_language: str, schema: Dict[str, Any], db_type: str, context: Optional[List[Dict[str, Any]]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        자연어를 SQL로 변환 (토큰 단위 스트리밍)
+        
+        SQL 코드 블록이 닫히는 즉시 "sql" 이벤트를 전달하므로, 모델이 설명을 작성하는 동안
+        호출자가 SQL 검증을 시작할 수 있습니다.
+        
+        Args:
+            natural_language (str): 자연어 질의
+            schema (Dict[str, Any]): DB 스키마 정보
+            db_type (str): 데이터베이스 유형 ('mssql' 또는 'hana')
+            context (List[Dict[str, Any]], optional): 대화 컨텍스트
+            
+        Yields:
+            Dict[str, Any]: "token" 이벤트들, 기본 검증 결과를 포함한 "sql" 이벤트,
+                generate_sql과 같은 결과를 담은 "done" 이벤트
+        """
+        try:
+            messages = await self._sql_generation_messages(natural_language, schema, db_type, context)
+            extractor = StreamingSQLExtractor()
+            
+            async for delta in self._stream_openai_api(messages):
+                yield {"event": "token", "content": delta}
+                sql = extractor.feed(delta)
+                if sql is not None:
+                    is_valid, error_message = validate_sql_query(sql)
+                    yield {"event": "sql", "sql": sql, "valid": is_valid, "error": error_message}
+            
+            # 응답 파싱
+            parsed_response = parse_llm_response(extractor.text, "sql")
+            
+            yield {
+                "event": "done",
+                "sql": parsed_response["sql"],
+                "explanation": parsed_response.get("explanation", ""),
+                "original_question": natural_language,
+                "db_type": db_type
+            }
+            
+        except ResponseParsingError as e:
+            logger.error(f"SQL 생성 응답 파싱 실패: {str(e)}")
+            raise
+        except ResponseValidationError as e:
+            logger.error(f"SQL 생성 응답 검증 실패: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"SQL 생성 스트리밍 중 오류 발생: {str(e)}")
+            raise
+    
+    def _summary_messages(self, query_result: Dict[str, Any], natural_language: str, sql_query: str) -> List[Dict[str, str]]:
+        """
+        결과 요약 메시지 구성
+        
+        Args:
+            query_result (Dict[str, Any]): 쿼리 실행 결과
+            natural_language (str): 원본 자연어 질의
+            sql_query (str): 실행된 SQL 쿼리
+            
+        Returns:
+            List[Dict[str, str]]: 메시지 목록
+        """
+        # 결과 포맷
+        result_json = create_result_context(query_result)
+        
+        # 프롬프트 생성
+        prompt = RESULT_SUMMARY_TEMPLATE.format(
+            question=natural_language,
+            sql_query=sql_query,
+            result_json=result_json
+        )
+        
+        return [
+            {"role": "system", "content": "당신은 데이터 분석 전문가입니다."},
+            {"role": "user", "content": prompt}
+        ]
+    
     async def summarize_results(self, query_result: Dict[str, Any], natural_language: str, sql_query: str) -> Dict[str, Any]:
         """
         쿼리 결과 요약
@@ -215,23 +468,10 @@ class OpenAIService(LLMService):
             Dict[str, Any]: 요약 및 인사이트
         """
         try:
-            # 결과 포맷
-            result_json = create_result_context(query_result)
-            
-            # 프롬프트 생성
-            prompt = RESULT_SUMMARY_TEMPLATE.format(
-                question=natural_language,
-                sql_query=sql_query,
-                result_json=result_json
-            )
+            messages = self._summary_messages(query_result, natural_language, sql_query)
             
-            # API 호출
-            messages = [
-                {"role": "system", "content": "당신은 데이터 분석 전문가입니다."},
-                {"role": "user", "content": prompt}
-            ]
-            
-            response_text = await self._call_openai_api(messages)
+            # API 호출 (요약은 백그라운드 작업이므로 대화형 요청보다 나중에 처리)
+            response_text = await self._call_openai_api(messages, priority=RequestPriority.BACKGROUND)
             
             # 응답 파싱
             parsed_response = parse_llm_response(response_text, "summary")
@@ -249,6 +489,43 @@ class OpenAIService(LLMService):
             logger.error(f"결과 요약 중 오류 발생: {str(e)}")
             raise
     
+    async def stream_summarize_results(self, query_result: Dict[str, Any], natural_language: str, sql_query: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        쿼리 결과 요약 (토큰 단위 스트리밍)
+        
+        Args:
+            query_result (Dict[str, Any]): 쿼리 실행 결과
+            natural_language (str): 원본 자연어 질의
+            sql_query (str): 실행된 SQL 쿼리
+            
+        Yields:
+            Dict[str, Any]: "token" 이벤트들과 summarize_results와 같은 결과를 담은 "done" 이벤트
+        """
+        try:
+            messages = self._summary_messages(query_result, natural_language, sql_query)
+            
+            chunks = []
+            async for delta in self._stream_openai_api(messages):
+                chunks.append(delta)
+                yield {"event": "token", "content": delta}
+            
+            # 응답 파싱
+            parsed_response = parse_llm_response("".join(chunks), "summary")
+            
+            yield {
+                "event": "done",
+                "summary": parsed_response["summary"],
+                "insights": parsed_response.get("insights", []),
+                "original_question": natural_language
+            }
+            
+        except ResponseParsingError as e:
+            logger.error(f"결과 요약 응답 파싱 실패: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"결과 요약 스트리밍 중 오류 발생: {str(e)}")
+            raise
+    
     async def generate_python_code(self, query_result: Dict[str, Any], natural_language: str, sql_query: str, analysis_request: Dict[str, Any]) -> Dict[str, Any]:
         """
         데이터 분석 및 시각화를 위한 파이썬 코드 생성
@@ -322,8 +599,9 @@ class OpenAIService(LLMService):
             return sql_query, False
         
         try:
-            # 스키마 포맷
-            schema_json = create_schema_context(schema)
+            # 쿼리와 오류 메시지에 나타난 테이블 위주로 스키마 포맷
+            schema_context = await self.schema_selector.build_context_async(schema, f"{sql_query}\n{error_message}")
+            schema_json = schema_context.text
             
             # 프롬프트 생성
             prompt = f"""
@@ -354,6 +632,7 @@ class OpenAIService(LLMService):
 -- 수정된 SQL 쿼리
 ```
 """
+            self._log_schema_pruning("SQL 수정", schema_context, prompt)
             
             # API 호출
             messages = [
@@ -361,7 +640,7 @@ class OpenAIService(LLMService):
                 {"role": "user", "content": prompt}
             ]
             
-            response_text = await self._call_openai_api(messages)
+            response_text = await self._call_openai_api(messages, hedge=True)
             
             # 응답 파싱
             parsed_response = parse_llm_response(response_text, "sql")
@@ -0,0 +1,499 @@
+"""
+LLM 제공자 요청 제한
+
+이 모듈은 제공자/모델별로 분당 요청 수, 분당 토큰 수, 동시 호출 수를 제한하는 기능을 제공합니다.
+동시 호출 슬롯은 우선순위 큐로 배정되므로 대화형 요청(NL→SQL 변환 등)이
+백그라운드 요청(결과 요약 등)보다 먼저 처리됩니다.
+재시도 가능한 오류(429, 5xx, 연결 오류)는 Retry-After 헤더를 따르거나
+지터를 적용한 지수 백오프로 재시도합니다.
+"""
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+
+import openai
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+class RequestPriority(IntEnum):
+    """LLM 요청 우선순위 (값이 작을수록 먼저 처리)"""
+    INTERACTIVE = 0
+    DEFAULT = 1
+    BACKGROUND = 2
+
+
+class AsyncRateLimiter:
+    """분당 허용량 기반 토큰 버킷 속도 제한기"""
+
+    def __init__(self, rate_per_minute: float):
+        """
+        속도 제한기 초기화
+
+        Args:
+            rate_per_minute (float): 분당 허용량 (요청 수 또는 토큰 수)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(rate_per_minute)
+        self._available = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, amount: float) -> float:
+        """
+        허용량을 예약하고 대기해야 하는 시간 계산
+
+        버킷 용량보다 큰 요청도 교착 없이 처리되도록 허용량을 음수로 당겨 쓰고,
+        부족한 만큼 대기합니다.
+
+        Args:
+            amount (float): 사용할 허용량
+
+        Returns:
+            float: 대기 시간 (초)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._available = min(self.capacity, self._available + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._available -= amount
+            return -self._available / self.rate if self._available < 0 else 0.0
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """
+        허용량을 사용할 수 있을 때까지 대기
+
+        Args:
+            amount (float): 사용할 허용량
+        """
+        wait = self._reserve(amount)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """
+    재시도 가능한 LLM API 오류인지 확인
+
+    Args:
+        error (Exception): 발생한 예외
+
+    Returns:
+        bool: 속도 제한, 서버 오류, 연결/시간 초과 오류이면 True
+    """
+    if isinstance(error, openai.APIConnectionError):
+        return True
+
+    status_code = getattr(error, "status_code", None)
+    return status_code in RETRYABLE_STATUS_CODES or (status_code is not None and status_code >= 500)
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """
+    오류 응답의 retry-after-ms / Retry-After 헤더에서 대기 시간 추출
+
+    Args:
+        error (Exception): 발생한 예외
+
+    Returns:
+        Optional[float]: 대기 시간 (초), 헤더가 없거나 해석할 수 없으면 None
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    try:
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms is not None:
+            return max(0.0, float(retry_after_ms) / 1000)
+
+        retry_after = headers.get("retry-after")
+        if retry_after is None:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _Waiter:
+    """동시 호출 슬롯 대기자"""
+
+    __slots__ = ("priority", "sequence", "loop", "future", "granted", "cancelled")
+
+    def __init__(self, priority: int, sequence: int, loop: asyncio.AbstractEventLoop, future: asyncio.Future):
+        self.priority = priority
+        self.sequence = sequence
+        self.loop = loop
+        self.future = future
+        self.granted = False
+        self.cancelled = False
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+def _wake(future: asyncio.Future) -> None:
+    """대기 중인 future 완료 처리 (대기자의 이벤트 루프에서 실행)"""
+    if not future.done():
+        future.set_result(None)
+
+
+class ProviderLimiter:
+    """제공자/모델별 요청 수·토큰 수·동시 호출 수 제한 및 재시도 클래스"""
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: Optional[int] = 500,
+        tokens_per_minute: Optional[int] = 300000,
+        max_concurrency: int = 8,
+        max_retries: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0
+    ):
+        """
+        제공자 요청 제한기 초기화
+
+        Args:
+            name (str): 제한기 이름 (제공자:모델)
+            requests_per_minute (Optional[int], optional): 분당 최대 요청 수 (None이면 제한 없음)
+            tokens_per_minute (Optional[int], optional): 분당 최대 토큰 수 (None이면 제한 없음)
+            max_concurrency (int, optional): 최대 동시 호출 수
+            max_retries (int, optional): 재시도 가능한 오류의 최대 재시도 횟수
+            base_delay (float, optional): 백오프 기본 대기 시간 (초)
+            max_delay (float, optional): 백오프 최대 대기 시간 (초)
+        """
+        self.name = name
+        self._lock = threading.Lock()
+        self._waiters: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._active = 0
+        self._blocked_until = 0.0
+        self._stats = {"calls": 0, "retries": 0, "rate_limited": 0, "failures": 0}
+        self._wait_seconds = {priority.name.lower(): [0, 0.0] for priority in RequestPriority}
+        self.request_limiter: Optional[AsyncRateLimiter] = None
+        self.token_limiter: Optional[AsyncRateLimiter] = None
+        self.configure(
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+            max_concurrency=max_concurrency,
+            max_retries=max_retries,
+            base_delay=base_delay,
+            max_delay=max_delay
+        )
+
+    def configure(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None
+    ) -> None:
+        """
+        제한 값 변경 (None인 항목은 현재 값 유지, 분당 한도에 0을 주면 제한 해제)
+
+        Args:
+            requests_per_minute (Optional[int]): 분당 최대 요청 수
+            tokens_per_minute (Optional[int]): 분당 최대 토큰 수
+            max_concurrency (Optional[int]): 최대 동시 호출 수
+            max_retries (Optional[int]): 최대 재시도 횟수
+            base_delay (Optional[float]): 백오프 기본 대기 시간 (초)
+            max_delay (Optional[float]): 백오프 최대 대기 시간 (초)
+        """
+        if requests_per_minute is not None:
+            self.request_limiter = AsyncRateLimiter(requests_per_minute) if requests_per_minute > 0 else None
+        if tokens_per_minute is not None:
+            self.token_limiter = AsyncRateLimiter(tokens_per_minute) if tokens_per_minute > 0 else None
+        if max_retries is not None:
+            self.max_retries = max_retries
+        if base_delay is not None:
+            self.base_delay = base_delay
+        if max_delay is not None:
+            self.max_delay = max_delay
+        if max_concurrency is not None:
+            with self._lock:
+                self.max_concurrency = max(1, max_concurrency)
+                while self._waiters and self._active < self.max_concurrency:
+                    self._grant_next_locked()
+
+    def _grant_next_locked(self) -> bool:
+        """
+        우선순위가 가장 높은 대기자에게 슬롯 배정 (잠금 상태에서 호출)
+
+        Returns:
+            bool: 배정했으면 True
+        """
+        while self._waiters:
+            waiter = heapq.heappop(self._waiters)
+            if waiter.cancelled:
+                continue
+            waiter.granted = True
+            self._active += 1
+            waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+            return True
+        return False
+
+    def _release(self) -> None:
+        """슬롯 반환 후 다음 대기자에게 배정"""
+        with self._lock:
+            self._active -= 1
+            if self._active < self.max_concurrency:
+                self._grant_next_locked()
+
+    async def _acquire_slot(self, priority: RequestPriority) -> None:
+        """
+        동시 호출 슬롯을 우선순위 순서로 획득
+
+        Args:
+            priority (RequestPriority): 요청 우선순위
+        """
+        with self._lock:
+            if self._active < self.max_concurrency and not self._waiters:
+                self._active += 1
+                return
+            loop = asyncio.get_running_loop()
+            waiter = _Waiter(int(priority), next(self._sequence), loop, loop.create_future())
+            heapq.heappush(self._waiters, waiter)
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                waiter.cancelled = True
+                granted = waiter.granted
+            if granted:
+                self._release()
+            raise
+
+    @asynccontextmanager
+    async def slot(self, tokens: int = 0, priority: RequestPriority = RequestPriority.DEFAULT) -> AsyncIterator[None]:
+        """
+        동시 호출 슬롯과 요청/토큰 허용량을 확보한 구간
+
+        Args:
+            tokens (int): 요청이 사용할 예상 토큰 수
+            priority (RequestPriority): 요청 우선순위
+        """
+        started_at = time.monotonic()
+        await self._acquire_slot(priority)
+        try:
+            blocked = self._blocked_until - time.monotonic()
+            if blocked > 0:
+                await asyncio.sleep(blocked)
+            if self.request_limiter:
+                await self.request_limiter.acquire()
+            if self.token_limiter and tokens:
+                await self.token_limiter.acquire(tokens)
+
+            with self._lock:
+                waits = self._wait_seconds[priority.name.lower()]
+                waits[0] += 1
+                waits[1] += time.monotonic() - started_at
+            yield
+        finally:
+            self._release()
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """
+        재시도 전 대기 시간 계산 (재시도하지 않으면 None)
+
+        Retry-After 헤더가 있으면 이를 따르고, 없으면 지수 백오프에 지터를 적용합니다.
+        속도 제한(429) 응답이면 다른 호출도 같은 시간 동안 대기하도록 제한기를 일시 정지합니다.
+
+        Args:
+            error (Exception): 발생한 예외
+            attempt (int): 지금까지의 재시도 횟수
+
+        Returns:
+            Optional[float]: 대기 시간 (초)
+        """
+        if attempt >= self.max_retries or not is_retryable_error(error):
+            return None
+
+        retry_after = get_retry_after(error)
+        if retry_after is not None:
+            delay = min(retry_after, self.max_delay) + random.uniform(0, 0.1 * min(retry_after, self.max_delay) + 0.05)
+        else:
+            cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+            delay = cap / 2 + random.uniform(0, cap / 2)
+
+        with self._lock:
+            self._stats["retries"] += 1
+            if getattr(error, "status_code", None) == 429:
+                self._stats["rate_limited"] += 1
+                self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        return delay
+
+    def _record_call(self, failed: bool = False) -> None:
+        """호출 결과 통계 기록"""
+        with self._lock:
+            self._stats["calls"] += 1
+            if failed:
+                self._stats["failures"] += 1
+
+    async def call(
+        self,
+        request: Callable[[], Awaitable[T]],
+        tokens: int = 0,
+        priority: RequestPriority = RequestPriority.DEFAULT
+    ) -> T:
+        """
+        제한 안에서 요청 실행 (재시도 가능한 오류는 백오프 후 재시도)
+
+        재시도 대기 중에는 슬롯을 반환하므로 다른 요청이 먼저 실행될 수 있습니다.
+
+        Args:
+            request (Callable[[], Awaitable[T]]): 요청을 생성하는 함수 (시도마다 호출)
+            tokens (int): 요청이 사용할 예상 토큰 수
+            priority (RequestPriority): 요청 우선순위
+
+        Returns:
+            T: 요청 결과
+        """
+        attempt = 0
+        while True:
+            async with self.slot(tokens, priority):
+                try:
+                    result = await request()
+                    self._record_call()
+                    return result
+                except Exception as e:
+                    error = e
+                    delay = self._retry_delay(e, attempt)
+                    if delay is None:
+                        self._record_call(failed=True)
+                        raise
+
+            attempt += 1
+            logger.warning(f"{self.name} 호출 재시도 {attempt}/{self.max_retries} ({delay:.2f}초 후): {str(error)}")
+            await asyncio.sleep(delay)
+
+    async def stream(
+        self,
+        request: Callable[[], Awaitable[AsyncIterable[T]]],
+        tokens: int = 0,
+        priority: RequestPriority = RequestPriority.DEFAULT
+    ) -> AsyncIterator[T]:
+        """
+        제한 안에서 스트리밍 요청 실행
+
+        스트림이 끝날 때까지 슬롯을 유지하며, 첫 조각을 받기 전의 오류만 재시도합니다.
+
+        Args:
+            request (Callable[[], Awaitable[AsyncIterable[T]]]): 스트림을 생성하는 함수 (시도마다 호출)
+            tokens (int): 요청이 사용할 예상 토큰 수
+            priority (RequestPriority): 요청 우선순위
+
+        Yields:
+            T: 스트림 조각
+        """
+        attempt = 0
+        while True:
+            received = False
+            async with self.slot(tokens, priority):
+                try:
+                    async for item in await request():
+                        received = True
+                        yield item
+                    self._record_call()
+                    return
+                except Exception as e:
+                    error = e
+                    delay = None if received else self._retry_delay(e, attempt)
+                    if delay is None:
+                        self._record_call(failed=True)
+                        raise
+
+            attempt += 1
+            logger.warning(f"{self.name} 스트리밍 호출 재시도 {attempt}/{self.max_retries} ({delay:.2f}초 후): {str(error)}")
+            await asyncio.sleep(delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        제한기 통계 조회
+
+        Returns:
+            Dict[str, Any]: 동시 호출/대기 수, 호출·재시도·속도 제한 횟수, 우선순위별 평균 대기 시간
+        """
+        with self._lock:
+            return {
+                "active": self._active,
+                "queued": sum(1 for waiter in self._waiters if not waiter.cancelled),
+                "max_concurrency": self.max_concurrency,
+                **self._stats,
+                "avg_wait_seconds": {
+                    priority: (total / count if count else 0.0)
+                    for priority, (count, total) in self._wait_seconds.items()
+                }
+            }
+
+
+# 제공자/모델별 공유 제한기와 새 제한기에 적용할 기본 한도
+_provider_limiters: Dict[str, ProviderLimiter] = {}
+_default_limits: Dict[str, Any] = {}
+_registry_lock = threading.Lock()
+
+
+def get_provider_limiter(provider: str, model_name: str) -> ProviderLimiter:
+    """
+    제공자/모델별 공유 제한기 조회 (없으면 기본 한도로 생성)
+
+    Args:
+        provider (str): LLM 제공자
+        model_name (str): 모델 이름
+
+    Returns:
+        ProviderLimiter: 제한기
+    """
+    name = f"{provider}:{model_name}"
+    with _registry_lock:
+        limiter = _provider_limiters.get(name)
+        if limiter is None:
+            limiter = ProviderLimiter(name, **_default_limits)
+            _provider_limiters[name] = limiter
+        return limiter
+
+
+def configure_provider_limits(**limits: Any) -> None:
+    """
+    모든 제공자 제한기의 한도 설정 (이미 생성된 제한기에도 적용)
+
+    Args:
+        **limits: ProviderLimiter.configure 인자 (requests_per_minute, tokens_per_minute, max_concurrency 등)
+    """
+    with _registry_lock:
+        _default_limits.update(limits)
+        limiters = list(_provider_limiters.values())
+    for limiter in limiters:
+        limiter.configure(**limits)
+
+
+def get_provider_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    모든 제공자 제한기의 통계 조회
+
+    Returns:
+        Dict[str, Dict[str, Any]]: 제한기 이름 -> 통계
+    """
+    with _registry_lock:
+        limiters = list(_provider_limiters.values())
+    return {limiter.name: limiter.get_stats() for limiter in limiters}
@@ -0,0 +1,519 @@
+"""
+녹화/재생(record/replay) LLM 서비스 구현
+
+이 모듈은 부하 테스트를 유료 API 없이 결정적으로 실행하기 위한 replay 제공자를 구현합니다.
+replay 모드는 카세트 파일에 녹화된 응답을 요청 내용(프롬프트 입력)의 해시로 찾아 반환하고,
+설정한 지연 시간 분포만큼 기다려 실제 LLM의 응답 시간을 재현합니다.
+record 모드는 실제 제공자로 요청을 보내고 응답과 지연 시간을 카세트 파일에 추가합니다.
+
+카세트 파일은 한 줄에 항목 하나인 JSON Lines 형식이며, 같은 키가 여러 번 나오면 마지막 항목을 사용합니다.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from datetime import datetime
+
+from .base import LLMService, LLMConfig
+from .local_embedding_service import HashingEmbedder
+
+
+logger = logging.getLogger(__name__)
+
+REPLAY_MODE = "replay"
+RECORD_MODE = "record"
+
+
+class CassetteMissError(LookupError):
+    """재생할 녹화 응답이 없을 때 발생하는 예외"""
+
+
+def _canonical_context(context: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """대화 컨텍스트에서 실행마다 달라지는 시각/메타데이터를 제외하고 질문과 답변만 남김"""
+    return [{"question": item.get("question"), "answer": item.get("answer")} for item in context or []]
+
+
+def prompt_hash(method: str, payload: Dict[str, Any]) -> str:
+    """
+    요청 메서드와 입력으로 카세트 키 계산
+
+    Args:
+        method (str): LLM 서비스 메서드 이름
+        payload (Dict[str, Any]): 프롬프트를 구성하는 입력
+
+    Returns:
+        str: SHA-256 16진수 문자열
+    """
+    body = json.dumps({"method": method, **payload}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class LatencyDistribution:
+    """
+    재생 응답의 지연 시간 분포
+
+    지원하는 설정 문자열:
+        "recorded"             녹화된 지연 시간 사용 (기본값)
+        "none"                 지연 없음
+        "fixed:<초>"           고정 지연 시간
+        "uniform:<최소>,<최대>"  균등 분포
+        "lognormal:<중앙값>,<sigma>"  로그 정규 분포 (LLM 응답 시간의 긴 꼬리 재현)
+    """
+
+    def __init__(self, spec: str = "recorded", scale: float = 1.0, seed: Optional[int] = None):
+        """
+        지연 시간 분포 초기화
+
+        Args:
+            spec (str): 분포 설정 문자열
+            scale (float): 모든 지연 시간에 곱할 배율
+            seed (Optional[int]): 난수 시드 (같은 시드면 같은 지연 시간 순서)
+
+        Raises:
+            ValueError: 지원하지 않는 분포 설정인 경우
+        """
+        kind, _, raw_params = spec.partition(":")
+        self.kind = kind.strip().lower()
+        try:
+            self.params = [float(value) for value in raw_params.split(",") if value.strip()]
+        except ValueError:
+            raise ValueError(f"잘못된 지연 시간 분포 설정: {spec}")
+
+        expected = {"recorded": 0, "none": 0, "fixed": 1, "uniform": 2, "lognormal": 2}
+        if self.kind not in expected or len(self.params) != expected[self.kind]:
+            raise ValueError(f"잘못된 지연 시간 분포 설정: {spec}")
+
+        self.spec = spec
+        self.scale = scale
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self, recorded: Optional[float] = None) -> float:
+        """
+        지연 시간 추출
+
+        Args:
+            recorded (Optional[float]): 녹화된 지연 시간 (초)
+
+        Returns:
+            float: 지연 시간 (초)
+        """
+        with self._lock:
+            if self.kind == "none":
+                latency = 0.0
+            elif self.kind == "recorded":
+                latency = recorded or 0.0
+            elif self.kind == "fixed":
+                latency = self.params[0]
+            elif self.kind == "uniform":
+                latency = self._random.uniform(*self.params)
+            else:
+                median, sigma = self.params
+                latency = self._random.lognormvariate(math.log(median), sigma)
+        return max(0.0, latency * self.scale)
+
+
+class Cassette:
+    """녹화된 LLM 응답 저장소 (JSON Lines 파일)"""
+
+    def __init__(self, path: str):
+        """
+        카세트 초기화 (파일이 있으면 녹화된 항목 로드)
+
+        Args:
+            path (str): 카세트 파일 경로
+        """
+        self.path = path
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._keys_by_method: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """카세트 파일 로드 (손상된 줄은 건너뜀)"""
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "r", encoding="utf-8") as file:
+            for line_number, line in enumerate(file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    self._index(json.loads(line))
+                except (ValueError, KeyError) as e:
+                    logger.warning(f"카세트 {self.path}의 {line_number}번째 줄을 읽을 수 없습니다: {str(e)}")
+        logger.info(f"카세트 {self.path}에서 녹화된 응답 {len(self._entries)}개를 로드했습니다.")
+
+    def _index(self, entry: Dict[str, Any]) -> None:
+        """항목을 키/메서드별로 색인"""
+        key = entry["key"]
+        if key not in self._entries:
+            self._keys_by_method.setdefault(entry["method"], []).append(key)
+        self._entries[key] = entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        키로 녹화 항목 조회
+
+        Args:
+            key (str): 카세트 키
+
+        Returns:
+            Optional[Dict[str, Any]]: 녹화 항목 (없으면 None)
+        """
+        with self._lock:
+            return self._entries.get(key)
+
+    def nearest(self, method: str, key: str) -> Optional[Dict[str, Any]]:
+        """
+        같은 메서드의 녹화 항목 중 키에 따라 결정적으로 하나 선택 (녹화되지 않은 요청의 대체 응답)
+
+        Args:
+            method (str): LLM 서비스 메서드 이름
+            key (str): 카세트 키
+
+        Returns:
+            Optional[Dict[str, Any]]: 녹화 항목 (해당 메서드의 녹화가 없으면 None)
+        """
+        with self._lock:
+            keys = self._keys_by_method.get(method)
+            if not keys:
+                return None
+            return self._entries[keys[int(key[:8], 16) % len(keys)]]
+
+    def add(self, key: str, method: str, response: Any, latency: float) -> None:
+        """
+        녹화 항목 추가 (파일에 바로 덧붙임)
+
+        Args:
+            key (str): 카세트 키
+            method (str): LLM 서비스 메서드 이름
+            response (Any): JSON으로 직렬화할 수 있는 응답
+            latency (float): 응답 지연 시간 (초)
+        """
+        entry = {
+            "key": key,
+            "method": method,
+            "response": response,
+            "latency": round(latency, 4),
+            "recorded_at": datetime.utcnow().isoformat()
+        }
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(line + "\n")
+            self._index(json.loads(line))
+
+
+# 경로별 공유 카세트 (같은 파일을 쓰는 서비스가 색인과 파일 쓰기 잠금을 공유)
+_cassettes: Dict[str, Cassette] = {}
+_cassettes_lock = threading.Lock()
+
+
+def get_cassette(path: str) -> Cassette:
+    """
+    경로별 공유 카세트 조회 (없으면 파일에서 로드)
+
+    Args:
+        path (str): 카세트 파일 경로
+
+    Returns:
+        Cassette: 카세트
+    """
+    key = os.path.abspath(path)
+    with _cassettes_lock:
+        cassette = _cassettes.get(key)
+        if cassette is None:
+            cassette = _cassettes[key] = Cassette(path)
+        return cassette
+
+
+class ReplayLLMService(LLMService):
+    """카세트 파일의 녹화된 응답을 재생하는 LLM 서비스 (record 모드에서는 실제 제공자 응답을 녹화)"""
+
+    def __init__(self, config: LLMConfig, delegate: Optional[LLMService] = None):
+        """
+        재생 서비스 초기화
+
+        추가 설정(additional_config):
+            cassette_path: 카세트 파일 경로 (기본값: cassettes/llm.jsonl)
+            replay_mode: "replay" 또는 "record" (기본값: "replay")
+            latency_distribution: 재생 지연 시간 분포 (LatencyDistribution 참고, 기본값: "recorded")
+            latency_scale: 지연 시간 배율 (기본값: 1.0)
+            latency_seed: 지연 시간 난수 시드
+            miss_policy: 녹화되지 않은 요청 처리 ("fallback"은 같은 메서드의 다른 녹화 응답 사용, "error"는 예외 발생)
+            embedding_dimension: 녹화된 임베딩이 없을 때 대체 임베딩 차원 (기본값: 1536)
+
+        Args:
+            config (LLMConfig): LLM 서비스 설정
+            delegate (Optional[LLMService]): record 모드에서 실제 요청을 보낼 서비스
+
+        Raises:
+            ValueError: record 모드인데 실제 제공자 서비스가 없는 경우
+        """
+        super().__init__(config)
+        options = config.additional_config
+        self.mode = options.get("replay_mode", REPLAY_MODE)
+        if self.mode == RECORD_MODE and delegate is None:
+            raise ValueError("record 모드에는 응답을 녹화할 실제 LLM 서비스가 필요합니다.")
+        if self.mode not in (REPLAY_MODE, RECORD_MODE):
+            raise ValueError(f"지원되지 않는 재생 모드: {self.mode}")
+
+        self.delegate = delegate
+        self.cassette = get_cassette(options.get("cassette_path", "cassettes/llm.jsonl"))
+        self.latency = LatencyDistribution(
+            options.get("latency_distribution", "recorded"),
+            scale=float(options.get("latency_scale", 1.0)),
+            seed=options.get("latency_seed")
+        )
+        self.miss_policy = options.get("miss_policy", "fallback")
+        self._fallback_embedder: Optional[HashingEmbedder] = None
+        self._embedding_dimension = int(options.get("embedding_dimension", 1536))
+        self._stats = {"hits": 0, "fallbacks": 0, "misses": 0, "recorded": 0}
+        self._lock = threading.Lock()
+
+        if self.delegate is not None:
+            # 녹화 중에는 실제 모델의 임베딩이므로 실제 모델 이름으로 임베딩 캐시 사용
+            self.config.embedding_model = self.delegate.config.embedding_model
+        else:
+            # 재생한 (대체) 임베딩이 실제 모델의 임베딩 캐시에 섞이지 않도록 모델 이름 구분
+            self.config.embedding_model = f"replay-{self.config.embedding_model}"
+
+    def _count(self, key: str) -> None:
+        """통계 항목 증가"""
+        with self._lock:
+            self._stats[key] += 1
+
+    async def _call(self, method: str, payload: Dict[str, Any], *args: Any) -> Any:
+        """
+        녹화된 응답 재생 또는 실제 응답 녹화
+
+        Args:
+            method (str): LLM 서비스 메서드 이름
+            payload (Dict[str, Any]): 카세트 키를 계산할 입력
+            *args: record 모드에서 실제 서비스 메서드에 전달할 인자
+
+        Returns:
+            Any: 응답 (JSON으로 직렬화된 형태)
+
+        Raises:
+            CassetteMissError: 녹화 응답이 없고 miss_policy가 "error"인 경우
+        """
+        # 빠른/대형 모델 서비스가 같은 카세트를 공유하므로 모델 이름도 키에 포함
+        key = prompt_hash(method, {"model_name": self.config.model_name, **payload})
+
+        if self.mode == RECORD_MODE:
+            started_at = time.monotonic()
+            response = await getattr(self.delegate, method)(*args)
+            self.cassette.add(key, method, response, time.monotonic() - started_at)
+            self._count("recorded")
+            return json.loads(json.dumps(response, default=str))
+
+        entry = self.cassette.get(key)
+        if entry is not None:
+            self._count("hits")
+        else:
+            entry = self.cassette.nearest(method, key) if self.miss_policy == "fallback" else None
+            if entry is None:
+                self._count("misses")
+                raise CassetteMissError(f"카세트에 {method} 요청의 녹화 응답이 없습니다 (키: {key[:12]}).")
+            self._count("fallbacks")
+
+        await asyncio.sleep(self.latency.sample(entry.get("latency")))
+        return entry["response"]
+
+    async def generate_sql(self, natural_language: str, schema: Dict[str, Any], db_type: str, context: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        자연어를 SQL로 변환 (녹화된 응답 재생)
+
+        Args:
+            natural_language (str): 자연어 질의
+            schema (Dict[str, Any]): DB 스키마 정보
+            db_type (str): 데이터베이스 유형 ('mssql' 또는 'hana')
+            context (List[Dict[str, Any]], optional): 대화 컨텍스트
+
+        Returns:
+            Dict[str, Any]: 생성된 SQL 및 메타데이터
+        """
+        payload = {
+            "natural_language": natural_language,
+            "schema": schema,
+            "db_type": db_type,
+            "context": _canonical_context(context)
+        }
+        return await self._call("generate_sql", payload, natural_language, schema, db_type, context)
+
+    async def summarize_results(self, query_result: Dict[str, Any], natural_language: str, sql_query: str) -> Dict[str, Any]:
+        """
+        쿼리 결과 요약 (녹화된 응답 재생)
+
+        Args:
+            query_result (Dict[str, Any]): 쿼리 실행 결과
+            natural_language (str): 원본 자연어 질의
+            sql_query (str): 실행된 SQL 쿼리
+
+        Returns:
+            Dict[str, Any]: 요약 및 인사이트
+        """
+        payload = {"query_result": query_result, "natural_language": natural_language, "sql_query": sql_query}
+        return await self._call("summarize_results", payload, query_result, natural_language, sql_query)
+
+    async def generate_python_code(self, query_result: Dict[str, Any], natural_language: str, sql_query: str, analysis_request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        데이터 분석 및 시각화를 위한 파이썬 코드 생성 (녹화된 응답 재생)
+
+        Args:
+            query_result (Dict[str, Any]): 쿼리 실행 결과
+            natural_language (str): 원본 자연어 질의
+            sql_query (str): 실행된 SQL 쿼리
+            analysis_request (Dict[str, Any]): 분석 요청 정보
+
+        Returns:
+            Dict[str, Any]: 생성된 파이썬 코드 및 메타데이터
+        """
+        payload = {
+            "query_result": query_result,
+            "natural_language": natural_language,
+            "sql_query": sql_query,
+            "analysis_request": analysis_request
+        }
+        return await self._call(
+            "generate_python_code", payload, query_result, natural_language, sql_query, analysis_request
+        )
+
+    async def validate_and_fix_sql(self, sql_query: str, schema: Dict[str, Any], db_type: str, error_message: Optional[str] = None) -> Tuple[str, bool]:
+        """
+        SQL 쿼리 검증 및 수정 (녹화된 응답 재생)
+
+        Args:
+            sql_query (str): 검증할 SQL 쿼리
+            schema (Dict[str, Any]): DB 스키마 정보
+            db_type (str): 데이터베이스 유형 ('mssql' 또는 'hana')
+            error_message (Optional[str], optional): 이전 실행에서 발생한 오류 메시지
+
+        Returns:
+            Tuple[str, bool]: (수정된 SQL 쿼리, 수정 여부)
+        """
+        payload = {"sql_query": sql_query, "schema": schema, "db_type": db_type, "error_message": error_message}
+        fixed_sql, modified = await self._call(
+            "validate_and_fix_sql", payload, sql_query, schema, db_type, error_message
+        )
+        return fixed_sql, modified
+
+    async def generate_rag_response(self, query: str, context: str) -> str:
+        """
+        RAG 컨텍스트를 기반으로 응답 생성 (녹화된 응답 재생)
+
+        Args:
+            query (str): 사용자 질의
+            context (str): 검색된 문서 컨텍스트
+
+        Returns:
+            str: 생성된 응답
+        """
+        return await self._call("generate_rag_response", {"query": query, "context": context}, query, context)
+
+    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        텍스트에 대한 임베딩 생성
+
+        임베딩은 배치 구성이 실행마다 달라질 수 있으므로 텍스트별로 녹화/재생하며,
+        녹화되지 않은 텍스트는 녹화된 임베딩과 같은 차원의 로컬 해싱 임베딩으로 대체합니다.
+        지연 시간은 호출마다 한 번 적용합니다.
+
+        Args:
+            texts (List[str]): 임베딩을 생성할 텍스트 목록
+
+        Returns:
+            List[List[float]]: 생성된 임베딩 목록
+        """
+        if not texts:
+            return []
+
+        keys = [prompt_hash("get_embeddings", {"text": text}) for text in texts]
+
+        if self.mode == RECORD_MODE:
+            started_at = time.monotonic()
+            embeddings = await self.delegate.get_embeddings(texts)
+            latency = time.monotonic() - started_at
+            for key, embedding in zip(keys, embeddings):
+                self.cassette.add(key, "get_embeddings", embedding, latency)
+            self._count("recorded")
+            return embeddings
+
+        entries = [self.cassette.get(key) for key in keys]
+        missing = [text for text, entry in zip(texts, entries) if entry is None]
+        self._count("hits" if not missing else "fallbacks")
+        if missing and self.miss_policy != "fallback":
+            self._count("misses")
+            raise CassetteMissError(f"카세트에 임베딩 {len(missing)}개의 녹화 응답이 없습니다.")
+
+        recorded = [entry for entry in entries if entry is not None]
+        recorded_latency = max((entry.get("latency") or 0.0) for entry in recorded) if recorded else None
+        await asyncio.sleep(self.latency.sample(recorded_latency))
+
+        dimension = len(recorded[0]["response"]) if recorded else None
+        fallback = iter(self._embed_fallback(missing, dimension) if missing else [])
+        return [entry["response"] if entry is not None else next(fallback) for entry in entries]
+
+    def _embed_fallback(self, texts: List[str], dimension: Optional[int]) -> List[List[float]]:
+        """
+        녹화되지 않은 텍스트의 대체 임베딩 생성
+
+        Args:
+            texts (List[str]): 텍스트 목록
+            dimension (Optional[int]): 녹화된 임베딩 차원 (없으면 설정값)
+
+        Returns:
+            List[List[float]]: 임베딩 목록
+        """
+        dimension = dimension or self._embedding_dimension
+        if self._fallback_embedder is None or self._fallback_embedder.dimension != dimension:
+            self._fallback_embedder = HashingEmbedder(dimension)
+        return self._fallback_embedder.embed(texts).tolist()
+
+    async def get_model_info(self) -> Dict[str, Any]:
+        """
+        모델 정보 조회
+
+        Returns:
+            Dict[str, Any]: 모델 정보 (제공자, 모델명, 기능, 재생 모드, 카세트 정보 등)
+        """
+        return {
+            "provider": self.config.provider.value,
+            "model_name": self.config.model_name,
+            "capabilities": [
+                "sql_generation",
+                "result_summarization",
+                "python_code_generation",
+                "sql_validation"
+            ],
+            "replay_mode": self.mode,
+            "cassette_path": self.cassette.path,
+            "cassette_entries": len(self.cassette),
+            "latency_distribution": self.latency.spec
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        재생 통계 조회
+
+        Returns:
+            Dict[str, Any]: 일치/대체/누락/녹화 횟수와 카세트 항목 수
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats["cassette_entries"] = len(self.cassette)
+        return stats
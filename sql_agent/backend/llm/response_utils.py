@@ -44,6 +44,43 @@ def extract_sql_from_response(response: str) -> str:
     return matches[0].strip()
 
 
+class StreamingSQLExtractor:
+    """
+    스트리밍 LLM 응답에서 SQL 추출
+    
+    토큰을 받을 때마다 누적하고, 첫 번째 SQL 코드 블록이 닫히는 즉시 SQL을 반환하므로
+    모델이 설명을 작성하는 동안 SQL 검증을 시작할 수 있습니다.
+    """
+    
+    _SQL_BLOCK_PATTERN = re.compile(r"```(?:sql)?\s*(.*?)\s*```", re.DOTALL)
+    
+    def __init__(self):
+        """SQL 추출기 초기화"""
+        self.text = ""
+        self.sql: Optional[str] = None
+    
+    def feed(self, delta: str) -> Optional[str]:
+        """
+        응답 토큰 추가
+        
+        Args:
+            delta (str): 새로 받은 응답 텍스트
+            
+        Returns:
+            Optional[str]: 이번 토큰으로 SQL 코드 블록이 닫혔으면 추출된 SQL, 아니면 None
+        """
+        self.text += delta
+        if self.sql is not None:
+            return None
+        
+        match = self._SQL_BLOCK_PATTERN.search(self.text)
+        if match is None:
+            return None
+        
+        self.sql = match.group(1).strip()
+        return self.sql
+
+
 def extract_python_code_from_response(response: str) -> str:
     """
     LLM 응답에서 파이썬 코드 추출
@@ -0,0 +1,300 @@
+"""
+스키마 심볼 인덱스
+
+이 모듈은 SQLValidator의 스키마 검증에서 사용하는 테이블/컬럼 이름 조회용 인덱스를 구현합니다.
+스키마 버전마다 한 번만 구축되며, 정규화된 이름에 대한 해시 맵으로 O(1) 조회를,
+트라이그램(trigram) 역색인으로 "혹시 다음을 찾으시나요?" 제안 후보를 빠르게 찾습니다.
+"""
+from typing import Dict, Any, List, Optional, Set, FrozenSet, Tuple
+from collections import OrderedDict, Counter, defaultdict
+from threading import Lock
+import logging
+
+from .validation_cache import get_schema_version
+
+
+logger = logging.getLogger(__name__)
+
+
+def trigrams(name: str) -> FrozenSet[str]:
+    """
+    이름의 트라이그램 집합 생성 (앞 2칸, 뒤 1칸 공백 패딩)
+
+    Args:
+        name (str): 이름 (소문자)
+
+    Returns:
+        FrozenSet[str]: 트라이그램 집합
+    """
+    padded = f"  {name} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class TrigramIndex:
+    """트라이그램 역색인 클래스"""
+
+    def __init__(self):
+        """트라이그램 역색인 초기화"""
+        self._postings: Dict[str, Set[str]] = defaultdict(set)  # 트라이그램 -> 이름 집합
+        self._grams: Dict[str, FrozenSet[str]] = {}  # 이름 -> 트라이그램 집합
+
+    def __len__(self) -> int:
+        return len(self._grams)
+
+    def add(self, name: str) -> None:
+        """
+        이름 추가
+
+        Args:
+            name (str): 추가할 이름 (소문자)
+        """
+        if name in self._grams:
+            return
+
+        grams = trigrams(name)
+        self._grams[name] = grams
+        for gram in grams:
+            self._postings[gram].add(name)
+
+    def suggest(self, name: str, limit: int = 5, min_similarity: float = 0.3) -> List[str]:
+        """
+        유사한 이름 제안
+
+        트라이그램을 하나 이상 공유하는 후보만 비교하며, 자카드 유사도가 임계값 이상이거나
+        한 이름이 다른 이름에 포함된 경우를 유사한 것으로 판단합니다.
+
+        Args:
+            name (str): 찾을 이름 (소문자)
+            limit (int): 최대 제안 수
+            min_similarity (float): 최소 자카드 유사도 (0.0 ~ 1.0)
+
+        Returns:
+            List[str]: 유사도 내림차순으로 정렬된 이름 목록
+        """
+        grams = trigrams(name)
+        shared_counts: Counter = Counter()
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings:
+                shared_counts.update(postings)
+
+        scored = []
+        for candidate, shared in shared_counts.items():
+            if candidate == name:
+                continue
+            similarity = shared / (len(grams) + len(self._grams[candidate]) - shared)
+            if similarity >= min_similarity or name in candidate or candidate in name:
+                scored.append((similarity, candidate))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [candidate for _, candidate in scored[:limit]]
+
+
+class SchemaSymbolIndex:
+    """스키마 심볼 인덱스 클래스"""
+
+    def __init__(self, schema: Dict[str, Any], schema_version: Optional[str] = None):
+        """
+        스키마 정보로부터 인덱스 구축
+
+        Args:
+            schema (Dict[str, Any]): DB 스키마 정보
+            schema_version (Optional[str]): 스키마 버전 (None이면 스키마 정보에서 계산)
+        """
+        self.schema_version = schema_version or get_schema_version(schema)
+        self.tables: Dict[str, Dict[str, Any]] = {}  # 테이블 이름(및 스키마.테이블) -> 테이블 정보
+        self.columns: Dict[str, Dict[str, Any]] = {}  # 테이블명.컬럼명 -> 컬럼 정보
+        self.column_tables: Dict[str, List[str]] = defaultdict(list)  # 컬럼명 -> 컬럼을 가진 테이블 목록
+        self._table_trigrams = TrigramIndex()
+        self._column_trigrams = TrigramIndex()
+        self._table_column_trigrams: Dict[str, TrigramIndex] = defaultdict(TrigramIndex)
+
+        for schema_item in schema.get("schemas", []):
+            schema_name = schema_item.get("name", "").lower()
+
+            for table in schema_item.get("tables", []):
+                table_name = table.get("name", "").lower()
+                self.tables[table_name] = table
+                if schema_name:
+                    self.tables[f"{schema_name}.{table_name}"] = table
+                self._table_trigrams.add(table_name)
+
+                for column in table.get("columns", []):
+                    column_name = column.get("name", "").lower()
+                    column_info = {
+                        "name": column_name,
+                        "type": column.get("type", ""),
+                        "nullable": column.get("nullable", True)
+                    }
+                    self.columns[f"{table_name}.{column_name}"] = column_info
+                    if schema_name:
+                        self.columns[f"{schema_name}.{table_name}.{column_name}"] = column_info
+                    if table_name not in self.column_tables[column_name]:
+                        self.column_tables[column_name].append(table_name)
+                    self._column_trigrams.add(column_name)
+                    self._table_column_trigrams[table_name].add(column_name)
+
+        # 조회 시 빈 목록이 추가되지 않도록 일반 dict로 고정
+        self.column_tables = dict(self.column_tables)
+        self._table_column_trigrams = dict(self._table_column_trigrams)
+
+    def has_table(self, table_name: str) -> bool:
+        """
+        테이블 존재 여부 확인
+
+        Args:
+            table_name (str): 테이블 이름 (스키마 한정 가능)
+
+        Returns:
+            bool: 존재하면 True
+        """
+        return table_name.lower() in self.tables
+
+    def has_column(self, qualified_column: str) -> bool:
+        """
+        테이블이 명시된 컬럼 존재 여부 확인
+
+        Args:
+            qualified_column (str): 테이블명.컬럼명 형식의 컬럼
+
+        Returns:
+            bool: 존재하면 True
+        """
+        return qualified_column.lower() in self.columns
+
+    def get_column_type(self, qualified_column: str) -> Optional[str]:
+        """
+        컬럼 데이터 타입 조회
+
+        Args:
+            qualified_column (str): 테이블명.컬럼명 형식의 컬럼
+
+        Returns:
+            Optional[str]: 데이터 타입 (컬럼이 없으면 None)
+        """
+        column_info = self.columns.get(qualified_column.lower())
+        return column_info["type"] if column_info else None
+
+    def tables_with_column(self, column_name: str) -> List[str]:
+        """
+        컬럼을 가진 테이블 목록 조회
+
+        Args:
+            column_name (str): 테이블이 명시되지 않은 컬럼 이름
+
+        Returns:
+            List[str]: 테이블 이름 목록
+        """
+        return list(self.column_tables.get(column_name.lower(), []))
+
+    def suggest_tables(self, table_name: str, limit: int = 5) -> List[str]:
+        """
+        유사한 테이블 이름 제안
+
+        Args:
+            table_name (str): 찾을 테이블 이름
+            limit (int): 최대 제안 수
+
+        Returns:
+            List[str]: 유사한 테이블 이름 목록
+        """
+        return self._table_trigrams.suggest(table_name.lower(), limit=limit)
+
+    def suggest_columns(self, column_name: str, table_name: Optional[str] = None, limit: int = 5) -> List[str]:
+        """
+        유사한 컬럼 이름 제안
+
+        Args:
+            column_name (str): 찾을 컬럼 이름
+            table_name (Optional[str]): 테이블 이름 (None이면 전체 컬럼에서 검색)
+            limit (int): 최대 제안 수
+
+        Returns:
+            List[str]: 유사한 컬럼 이름 목록
+        """
+        if table_name is None:
+            index = self._column_trigrams
+        else:
+            index = self._table_column_trigrams.get(table_name.lower())
+            if index is None:
+                return []
+        return index.suggest(column_name.lower(), limit=limit)
+
+
+class SchemaIndexCache:
+    """데이터베이스/스키마 버전별 심볼 인덱스 LRU 캐시 클래스"""
+
+    def __init__(self, max_size: int = 32):
+        """
+        심볼 인덱스 캐시 초기화
+
+        Args:
+            max_size (int): 보관할 최대 인덱스 수
+        """
+        self.max_size = max_size
+        self._indexes: "OrderedDict[Tuple[Optional[str], str], SchemaSymbolIndex]" = OrderedDict()
+        self._lock = Lock()
+
+    def get_index(
+        self,
+        schema: Dict[str, Any],
+        schema_version: Optional[str] = None,
+        db_id: Optional[str] = None
+    ) -> SchemaSymbolIndex:
+        """
+        데이터베이스와 스키마 버전에 해당하는 인덱스 조회 (없으면 구축)
+
+        스키마 버전은 데이터베이스마다 따로 매겨질 수 있으므로 (db_id, schema_version)을 키로 사용합니다.
+
+        Args:
+            schema (Dict[str, Any]): DB 스키마 정보
+            schema_version (Optional[str]): 스키마 버전 (None이면 스키마 정보에서 계산)
+            db_id (Optional[str]): 데이터베이스 ID
+
+        Returns:
+            SchemaSymbolIndex: 스키마 심볼 인덱스
+        """
+        if schema_version is None:
+            schema_version = get_schema_version(schema)
+        key = (db_id, schema_version)
+
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                return index
+
+        # 구축은 잠금 밖에서 수행 (동시에 구축되더라도 결과는 동일)
+        index = SchemaSymbolIndex(schema, schema_version)
+        logger.debug(
+            f"스키마 심볼 인덱스 구축: {db_id} {schema_version} "
+            f"(테이블 {len(index._table_trigrams)}개, 컬럼 {len(index.columns)}개)"
+        )
+
+        with self._lock:
+            self._indexes[key] = index
+            self._indexes.move_to_end(key)
+            while len(self._indexes) > self.max_size:
+                self._indexes.popitem(last=False)
+
+        return index
+
+    def invalidate(self, db_id: Optional[str] = None, schema_version: Optional[str] = None) -> None:
+        """
+        인덱스 무효화
+
+        Args:
+            db_id (Optional[str]): 무효화할 데이터베이스 ID (None이면 모든 데이터베이스)
+            schema_version (Optional[str]): 무효화할 스키마 버전 (None이면 모든 버전)
+        """
+        with self._lock:
+            if db_id is None and schema_version is None:
+                self._indexes.clear()
+                return
+            for key in list(self._indexes):
+                if (db_id is None or key[0] == db_id) and (schema_version is None or key[1] == schema_version):
+                    del self._indexes[key]
+
+
+# 모든 SQLValidator 인스턴스가 공유하는 기본 인덱스 캐시
+schema_index_cache = SchemaIndexCache()
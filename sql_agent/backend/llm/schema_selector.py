@@ -0,0 +1,535 @@
+"""
+관련성 기반 스키마 선택
+
+이 모듈은 SQL 생성/수정 프롬프트에 전체 스키마 JSON 대신 질문과 관련된 테이블만 포함하도록
+스키마를 선택합니다. RAG 인덱스의 테이블/컬럼 문서 검색 점수와 질문에 나타난 테이블/컬럼 이름의
+어휘 일치 점수로 상위 k개 테이블을 고르고, 외래 키로 연결된 테이블을 추가한 뒤
+한 테이블당 한 줄의 간결한 DDL 형식으로 출력하며, 토큰 예산을 넘지 않도록 관련성이 낮은 테이블부터 제외합니다.
+전체 스키마와 테이블별 DDL의 토큰 수, 질문별 선택 결과는 스키마 버전별로 캐시하며,
+RAG 검색과 토큰 계산은 비동기 호출자를 위해 asyncio.to_thread로 실행합니다.
+"""
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from threading import Lock
+import asyncio
+import json
+import logging
+import re
+
+from ..models.rag import DocumentType, SearchQuery
+from .validation_cache import get_schema_version
+
+
+logger = logging.getLogger(__name__)
+
+# 질문/SQL에서 이름 후보를 추출하는 패턴 (식별자 구분 기호는 무시)
+_WORD_PATTERN = re.compile(r"[A-Za-z0-9_$#]+")
+
+# RAG 검색 결과 문서 유형별 가중치 (컬럼 문서는 테이블 문서보다 약한 신호)
+_DOCUMENT_WEIGHTS = {
+    DocumentType.TABLE: 1.0,
+    DocumentType.COLUMN: 0.5,
+}
+
+# 외래 키로 추가된 테이블의 점수 감쇠율
+_FK_DECAY = 0.5
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """토큰 수 계산용 tiktoken 인코딩 (사용할 수 없으면 None)"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken 인코딩을 불러올 수 없어 근사 토큰 수를 사용합니다: {str(e)}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    텍스트의 토큰 수 계산 (tiktoken을 사용할 수 없으면 4자당 1토큰으로 근사)
+
+    Args:
+        text (str): 텍스트
+
+    Returns:
+        int: 토큰 수
+    """
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def _name_tokens(name: str) -> List[str]:
+    """이름을 소문자 단어로 분해 (snake_case, 복수형 s 제거)"""
+    words = [word for word in re.split(r"[^a-z0-9]+", name.lower()) if word]
+    return [word[:-1] if len(word) > 3 and word.endswith("s") else word for word in words]
+
+
+@dataclass
+class TableEntry:
+    """선택 후보 테이블"""
+    schema_name: str
+    table: Dict[str, Any]
+    score: float = 0.0
+    via_foreign_key: bool = False
+
+    @property
+    def name(self) -> str:
+        return self.table.get("name", "")
+
+    @property
+    def qualified_name(self) -> str:
+        return f"{self.schema_name}.{self.name}" if self.schema_name else self.name
+
+    @property
+    def key(self) -> str:
+        return self.qualified_name.lower()
+
+
+@dataclass
+class SchemaContext:
+    """프롬프트에 포함할 스키마 컨텍스트"""
+    text: str
+    tables: List[str] = field(default_factory=list)
+    total_tables: int = 0
+    tokens_before: int = 0
+    tokens_after: int = 0
+
+
+# 테이블 선택 결과 (관련성 순 테이블 목록, 전체 테이블 수)
+TableSelection = Tuple[List[TableEntry], int]
+
+
+@dataclass
+class _SchemaTokens:
+    """스키마 버전별 직렬화 결과와 토큰 수 캐시 항목"""
+    schema_json: str
+    tokens_before: int
+    table_lines: Dict[str, Tuple[str, int]] = field(default_factory=dict)  # 테이블 키 -> (DDL, 토큰 수)
+
+
+def _foreign_keys(table: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """테이블의 외래 키 목록 (snake_case/camelCase 키 모두 지원)"""
+    return table.get("foreign_keys") or table.get("foreignKeys") or []
+
+
+def _reference_table(fk: Dict[str, Any]) -> str:
+    """외래 키가 참조하는 테이블 이름"""
+    return fk.get("reference_table") or fk.get("referenceTable") or ""
+
+
+def _reference_columns(fk: Dict[str, Any]) -> List[str]:
+    """외래 키가 참조하는 컬럼 목록"""
+    return fk.get("reference_columns") or fk.get("referenceColumns") or []
+
+
+def render_table_ddl(entry: TableEntry, max_columns: Optional[int] = None) -> str:
+    """
+    테이블을 한 줄의 간결한 DDL 형식으로 변환
+
+    예: TABLE dbo.employees (employee_id INT PK, name NVARCHAR NOT NULL, department_id INT FK->dbo.departments.department_id)
+
+    Args:
+        entry (TableEntry): 테이블
+        max_columns (Optional[int]): 출력할 최대 컬럼 수 (None이면 전체)
+
+    Returns:
+        str: DDL 형식 문자열
+    """
+    table = entry.table
+    primary_key = set(table.get("primary_key") or table.get("primaryKey") or [])
+    column_refs: Dict[str, str] = {}
+    composite_fks = []
+    for fk in _foreign_keys(table):
+        columns, ref_columns = fk.get("columns", []), _reference_columns(fk)
+        if len(columns) == 1 and len(ref_columns) == 1:
+            column_refs[columns[0]] = f"{_reference_table(fk)}.{ref_columns[0]}"
+        else:
+            composite_fks.append(
+                f"FK ({', '.join(columns)})->{_reference_table(fk)}({', '.join(ref_columns)})"
+            )
+
+    columns = table.get("columns", [])
+    parts = []
+    for column in columns[:max_columns]:
+        part = f"{column.get('name', '')} {column.get('type', '')}".rstrip()
+        if column.get("name") in primary_key:
+            part += " PK"
+        elif column.get("nullable") is False:
+            part += " NOT NULL"
+        if column.get("name") in column_refs:
+            part += f" FK->{column_refs[column['name']]}"
+        parts.append(part)
+    if max_columns is not None and len(columns) > max_columns:
+        parts.append(f"... {len(columns) - max_columns} more")
+    parts.extend(composite_fks)
+
+    line = f"TABLE {entry.qualified_name} ({', '.join(parts)})"
+    if table.get("description"):
+        line += f" -- {table['description']}"
+    return line
+
+
+class SchemaSelector:
+    """관련성 기반 스키마 선택 클래스"""
+
+    def __init__(
+        self,
+        document_store: Optional[Any] = None,
+        top_k: int = 8,
+        max_tokens: int = 3000,
+        fk_depth: int = 1,
+        cache_size: int = 256
+    ):
+        """
+        스키마 선택기 초기화
+
+        Args:
+            document_store (Optional[Any]): 테이블/컬럼 문서가 색인된 RAG 문서 저장소 (없으면 어휘 일치만 사용)
+            top_k (int): 관련성 점수로 선택할 최대 테이블 수 (외래 키로 추가되는 테이블 제외)
+            max_tokens (int): 스키마 컨텍스트의 최대 토큰 수
+            fk_depth (int): 외래 키를 따라 추가할 깊이 (0이면 추가하지 않음)
+            cache_size (int): 스키마 버전별 토큰 수와 질문별 선택 결과 캐시의 최대 항목 수
+        """
+        self.document_store = document_store
+        self.top_k = top_k
+        self.max_tokens = max_tokens
+        self.fk_depth = fk_depth
+        self.cache_size = cache_size
+        self._schema_tokens: "OrderedDict[Tuple[Any, str], _SchemaTokens]" = OrderedDict()
+        self._selections: "OrderedDict[Tuple[Any, str, str], Tuple[Tuple[TableEntry, ...], int]]" = OrderedDict()
+        self._lock = Lock()
+
+    def _cache_get(self, cache: OrderedDict, key: Tuple) -> Any:
+        """LRU 캐시 조회"""
+        with self._lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _cache_put(self, cache: OrderedDict, key: Tuple, value: Any) -> None:
+        """LRU 캐시 저장 (최대 항목 수를 넘으면 가장 오래된 항목 제거)"""
+        with self._lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > self.cache_size:
+                cache.popitem(last=False)
+
+    def _get_schema_tokens(self, schema: Dict[str, Any], version: str, db_id: Optional[str]) -> _SchemaTokens:
+        """전체 스키마 JSON과 토큰 수 조회 (스키마 버전별로 한 번만 계산)"""
+        key = (db_id, version)
+        cached = self._cache_get(self._schema_tokens, key)
+        if cached is not None:
+            return cached
+
+        try:
+            schema_json = json.dumps(schema, ensure_ascii=False, indent=2, default=str)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Failed to serialize schema: {e}")
+        cached = _SchemaTokens(schema_json=schema_json, tokens_before=count_tokens(schema_json))
+        self._cache_put(self._schema_tokens, key, cached)
+        return cached
+
+    @staticmethod
+    def _table_line(cached: _SchemaTokens, entry: TableEntry) -> Tuple[str, int]:
+        """테이블의 전체 DDL과 토큰 수 조회 (스키마 버전별로 한 번만 계산)"""
+        line = cached.table_lines.get(entry.key)
+        if line is None:
+            text = render_table_ddl(entry)
+            line = (text, count_tokens(text) + 1)
+            cached.table_lines[entry.key] = line
+        return line
+
+    @staticmethod
+    def _collect_tables(schema: Dict[str, Any]) -> List[TableEntry]:
+        """스키마 정보에서 테이블 후보 수집 (스키마 순서 유지)"""
+        return [
+            TableEntry(schema_item.get("name", ""), table)
+            for schema_item in schema.get("schemas", [])
+            for table in schema_item.get("tables", [])
+        ]
+
+    @staticmethod
+    def _build_lookup(tables: List[TableEntry]) -> Dict[str, TableEntry]:
+        """"스키마.테이블" 및 스키마 없는 테이블 이름으로 후보를 찾는 조회 맵"""
+        lookup = {entry.key: entry for entry in tables}
+        for entry in tables:
+            lookup.setdefault(entry.name.lower(), entry)
+        return lookup
+
+    @staticmethod
+    def _resolve(lookup: Dict[str, TableEntry], name: str, schema_name: str = "") -> Optional[TableEntry]:
+        """테이블 이름(스키마 생략 가능)으로 후보 조회"""
+        name = name.lower()
+        if name in lookup:
+            return lookup[name]
+        bare_name = name.rsplit(".", 1)[-1]
+        if schema_name and f"{schema_name.lower()}.{bare_name}" in lookup:
+            return lookup[f"{schema_name.lower()}.{bare_name}"]
+        return lookup.get(bare_name)
+
+    def _score_lexical(self, tables: List[TableEntry], text: str) -> None:
+        """질문/SQL에 나타난 테이블/컬럼 이름으로 점수 부여"""
+        raw_words = {word.lower() for word in _WORD_PATTERN.findall(text)}
+        words = set()
+        for word in raw_words:
+            words.update(_name_tokens(word))
+
+        for entry in tables:
+            table_name = entry.name.lower()
+            if table_name in raw_words:
+                entry.score += 3.0
+            else:
+                table_tokens = _name_tokens(table_name)
+                if table_tokens:
+                    entry.score += 2.0 * sum(token in words for token in table_tokens) / len(table_tokens)
+
+            column_score = 0.0
+            for column in entry.table.get("columns", []):
+                column_name = column.get("name", "").lower()
+                if column_name in raw_words:
+                    column_score += 1.0
+                elif any(token in words for token in _name_tokens(column_name) if token not in ("id", "no", "cd")):
+                    column_score += 0.25
+            entry.score += min(column_score, 2.0)
+
+    def _score_rag(self, lookup: Dict[str, TableEntry], text: str, db_id: str) -> None:
+        """RAG 인덱스의 테이블/컬럼 문서 검색 점수로 점수 부여"""
+        try:
+            query = SearchQuery(
+                query=text,
+                db_id=db_id,
+                top_k=self.top_k * 4,
+                filter_doc_types=list(_DOCUMENT_WEIGHTS)
+            )
+            results = self.document_store.search(query, None, "keyword")
+        except Exception as e:
+            logger.warning(f"스키마 선택을 위한 RAG 검색 실패, 어휘 일치만 사용합니다: {str(e)}")
+            return
+
+        if not results:
+            return
+        top_score = max(result.score for result in results) or 1.0
+        for result in results:
+            metadata = result.document.metadata or {}
+            entry = self._resolve(lookup, metadata.get("table_name", ""), metadata.get("schema_name", ""))
+            if entry is not None:
+                weight = _DOCUMENT_WEIGHTS.get(result.document.doc_type, 0.0)
+                entry.score += 3.0 * weight * result.score / top_score
+
+    def _expand_foreign_keys(
+        self, tables: List[TableEntry], lookup: Dict[str, TableEntry], selected: List[TableEntry]
+    ) -> List[TableEntry]:
+        """선택된 테이블과 외래 키로 연결된 테이블 추가 (참조하는/참조되는 방향 모두)"""
+        neighbours: Dict[str, List[TableEntry]] = {entry.key: [] for entry in tables}
+        for entry in tables:
+            for fk in _foreign_keys(entry.table):
+                target = self._resolve(lookup, _reference_table(fk), entry.schema_name)
+                if target is not None and target is not entry:
+                    neighbours[entry.key].append(target)
+                    neighbours[target.key].append(entry)
+
+        selected_keys = {entry.key for entry in selected}
+        frontier = list(selected)
+        expanded: List[TableEntry] = []
+        for _ in range(self.fk_depth):
+            added: Dict[str, TableEntry] = {}
+            for entry in frontier:
+                for neighbour in neighbours[entry.key]:
+                    if neighbour.key in selected_keys:
+                        continue
+                    neighbour.score = max(neighbour.score, entry.score * _FK_DECAY)
+                    neighbour.via_foreign_key = True
+                    added[neighbour.key] = neighbour
+
+            selected_keys.update(added)
+            frontier = sorted(added.values(), key=lambda item: -item.score)
+            expanded.extend(frontier)
+        return expanded
+
+    def select_tables(self, schema: Dict[str, Any], question: str, db_id: Optional[str] = None) -> TableSelection:
+        """
+        질문과 관련된 테이블 선택
+
+        같은 스키마 버전과 질문의 선택 결과는 캐시된 결과를 재사용합니다.
+        반환된 테이블 항목은 캐시와 공유되므로 호출자가 수정하면 안 됩니다.
+
+        Args:
+            schema (Dict[str, Any]): DB 스키마 정보
+            question (str): 자연어 질문 (또는 수정할 SQL과 오류 메시지)
+            db_id (Optional[str]): RAG 인덱스 조회용 데이터베이스 ID (없으면 스키마 정보의 db_id)
+
+        Returns:
+            TableSelection: (관련성 순으로 정렬된 테이블 목록, 전체 테이블 수)
+        """
+        db_id = db_id or schema.get("db_id")
+        return self._cached_selection(schema, question, db_id, get_schema_version(schema))
+
+    def _cached_selection(self, schema: Dict[str, Any], question: str, db_id: Optional[str], version: str) -> TableSelection:
+        """스키마 버전과 질문별로 캐시된 테이블 선택 조회 (없으면 선택 후 저장)"""
+        key = (db_id, version, question)
+        cached = self._cache_get(self._selections, key)
+        if cached is not None:
+            tables, total_tables = cached
+            return list(tables), total_tables
+
+        tables, total_tables = self._select_tables(schema, question, db_id)
+        self._cache_put(self._selections, key, (tuple(tables), total_tables))
+        return list(tables), total_tables
+
+    def _select_tables(self, schema: Dict[str, Any], question: str, db_id: Optional[str]) -> TableSelection:
+        """관련성 점수 계산과 외래 키 확장으로 테이블 선택"""
+        tables = self._collect_tables(schema)
+        if len(tables) <= self.top_k:
+            return tables, len(tables)
+
+        lookup = self._build_lookup(tables)
+        self._score_lexical(tables, question)
+        if self.document_store is not None and db_id:
+            self._score_rag(lookup, question, db_id)
+
+        ranked = sorted((entry for entry in tables if entry.score > 0), key=lambda item: -item.score)
+        if not ranked:
+            # 관련 테이블을 찾지 못하면 토큰 예산 안에서 스키마 순서대로 포함
+            logger.info("질문과 관련된 테이블을 찾지 못해 스키마 순서대로 포함합니다.")
+            return tables, len(tables)
+
+        selected = ranked[:self.top_k]
+        return selected + self._expand_foreign_keys(tables, lookup, selected), len(tables)
+
+    async def select_tables_async(
+        self, schema: Dict[str, Any], question: str, db_id: Optional[str] = None
+    ) -> TableSelection:
+        """
+        질문과 관련된 테이블 선택 (RAG 검색이 이벤트 루프를 막지 않도록 스레드에서 실행)
+
+        Args:
+            schema (Dict[str, Any]): DB 스키마 정보
+            question (str): 자연어 질문 (또는 수정할 SQL과 오류 메시지)
+            db_id (Optional[str]): RAG 인덱스 조회용 데이터베이스 ID
+
+        Returns:
+            TableSelection: (관련성 순으로 정렬된 테이블 목록, 전체 테이블 수)
+        """
+        return await asyncio.to_thread(self.select_tables, schema, question, db_id)
+
+    def count_relevant_tables(
+        self,
+        schema: Dict[str, Any],
+        question: str,
+        db_id: Optional[str] = None,
+        selection: Optional[TableSelection] = None
+    ) -> int:
+        """
+        질문과 직접 관련된 테이블 수 계산 (외래 키로 추가되는 테이블 제외)
+
+        스키마가 작아 선택 없이 모든 테이블이 포함되는 경우에도 어휘 일치로 관련 테이블을 셉니다.
+
+        Args:
+            schema (Dict[str, Any]): DB 스키마 정보
+            question (str): 자연어 질문
+            db_id (Optional[str]): RAG 인덱스 조회용 데이터베이스 ID
+            selection (Optional[TableSelection]): 이미 계산한 select_tables 결과 (없으면 계산)
+
+        Returns:
+            int: 관련 테이블 수
+        """
+        tables, total_tables = selection or self.select_tables(schema, question, db_id)
+        if len(tables) == total_tables:
+            # 캐시된 선택 결과의 점수를 바꾸지 않도록 새 후보로 점수 계산
+            tables = self._collect_tables(schema)
+            self._score_lexical(tables, question)
+            matched = sum(1 for entry in tables if entry.score > 0)
+            return matched or total_tables
+        return sum(1 for entry in tables if not entry.via_foreign_key)
+
+    def build_context(
+        self,
+        schema: Dict[str, Any],
+        question: str,
+        db_id: Optional[str] = None,
+        selection: Optional[TableSelection] = None
+    ) -> SchemaContext:
+        """
+        토큰 예산 안에서 관련 테이블만 포함한 스키마 컨텍스트 생성
+
+        Args:
+            schema (Dict[str, Any]): DB 스키마 정보
+            question (str): 자연어 질문 (또는 수정할 SQL과 오류 메시지)
+            db_id (Optional[str]): RAG 인덱스 조회용 데이터베이스 ID
+            selection (Optional[TableSelection]): 이미 계산한 select_tables 결과 (없으면 계산)
+
+        Returns:
+            SchemaContext: 스키마 컨텍스트와 선택 전후 토큰 수
+        """
+        db_id = db_id or schema.get("db_id")
+        version = get_schema_version(schema)
+        cached = self._get_schema_tokens(schema, version, db_id)
+        tokens_before = cached.tokens_before
+
+        tables, total_tables = selection or self._cached_selection(schema, question, db_id, version)
+        if not tables:
+            # 테이블 목록이 없는 형식의 스키마 정보는 그대로 포함
+            return SchemaContext(text=cached.schema_json, tokens_before=tokens_before, tokens_after=tokens_before)
+
+        lines: List[str] = []
+        included: List[str] = []
+        used_tokens = 0
+        for entry in tables:
+            line, line_tokens = self._table_line(cached, entry)
+            if used_tokens + line_tokens > self.max_tokens:
+                if lines:
+                    continue
+                # 가장 관련성 높은 테이블 하나가 예산을 넘으면 컬럼을 줄여서라도 포함
+                max_columns = len(entry.table.get("columns", []))
+                while max_columns > 1 and used_tokens + line_tokens > self.max_tokens:
+                    max_columns //= 2
+                    line = render_table_ddl(entry, max_columns)
+                    line_tokens = count_tokens(line) + 1
+            lines.append(line)
+            included.append(entry.qualified_name)
+            used_tokens += line_tokens
+
+        omitted = total_tables - len(included)
+        if omitted > 0:
+            lines.append(f"-- 관련성이 낮은 테이블 {omitted}개는 생략되었습니다.")
+
+        text = "\n".join(lines)
+        return SchemaContext(
+            text=text,
+            tables=included,
+            total_tables=total_tables,
+            tokens_before=tokens_before,
+            tokens_after=count_tokens(text)
+        )
+
+    async def build_context_async(
+        self,
+        schema: Dict[str, Any],
+        question: str,
+        db_id: Optional[str] = None,
+        selection: Optional[TableSelection] = None
+    ) -> SchemaContext:
+        """
+        스키마 컨텍스트 생성 (RAG 검색과 토큰 계산이 이벤트 루프를 막지 않도록 스레드에서 실행)
+
+        Args:
+            schema (Dict[str, Any]): DB 스키마 정보
+            question (str): 자연어 질문 (또는 수정할 SQL과 오류 메시지)
+            db_id (Optional[str]): RAG 인덱스 조회용 데이터베이스 ID
+            selection (Optional[TableSelection]): 이미 계산한 select_tables 결과 (없으면 계산)
+
+        Returns:
+            SchemaContext: 스키마 컨텍스트와 선택 전후 토큰 수
+        """
+        return await asyncio.to_thread(self.build_context, schema, question, db_id, selection)
+
+
+# OpenAIService가 기본으로 사용하는 스키마 선택기 (RAG 인덱스는 API 초기화 시 연결)
+schema_selector = SchemaSelector()
@@ -13,7 +13,9 @@ import json
 from .base import LLMService
 from .response_utils import validate_sql_query, extract_sql_from_response
 from .prompt_utils import SQL_VALIDATION_TEMPLATE, create_schema_context
-from backend.db.connectors.dialect_handler import SQLDialectHandler
+from .validation_cache import ValidationCache, validation_cache as default_validation_cache, get_schema_version
+from .schema_index import SchemaIndexCache, schema_index_cache as default_schema_index_cache
+from ..db.connectors.dialect_handler import SQLDialectHandler
 
 logger = logging.getLogger(__name__)
 
@@ -28,30 +30,91 @@ class SQLValidationLevel(str, Enum):
 class SQLValidator:
     """SQL 검증 및 최적화 서비스 클래스"""
     
-    def __init__(self, llm_service: Optional[LLMService] = None):
+    def __init__(
+        self,
+        llm_service: Optional[LLMService] = None,
+        validation_cache: Optional[ValidationCache] = None,
+        use_cache: bool = True,
+        schema_index_cache: Optional[SchemaIndexCache] = None
+    ):
         """
         SQL 검증 및 최적화 서비스 초기화
         
         Args:
             llm_service (Optional[LLMService]): LLM 서비스 인스턴스 (고급 검증 및 최적화에 사용)
+            validation_cache (Optional[ValidationCache]): 검증 결과 캐시 (기본값: 공유 캐시)
+            use_cache (bool): 검증 결과 캐시 사용 여부
+            schema_index_cache (Optional[SchemaIndexCache]): 스키마 심볼 인덱스 캐시 (기본값: 공유 캐시)
         """
         self.llm_service = llm_service
+        self.validation_cache = (validation_cache or default_validation_cache) if use_cache else None
+        self.schema_index_cache = schema_index_cache or default_schema_index_cache
     
     def validate_sql(
         self,
         sql_query: str,
         db_type: str,
         schema: Optional[Dict[str, Any]] = None,
-        validation_level: SQLValidationLevel = SQLValidationLevel.STANDARD
+        validation_level: SQLValidationLevel = SQLValidationLevel.STANDARD,
+        schema_version: Optional[str] = None,
+        db_id: Optional[str] = None
     ) -> Tuple[bool, List[str], List[str]]:
         """
         SQL 쿼리 검증
         
+        같은 데이터베이스에서 동일한 SQL(정규화 기준), 스키마 버전, 검증 수준에 대한 결과는 캐시에서 반환됩니다.
+        데이터베이스 ID가 없으면 스키마 버전을 구분할 수 없으므로 캐시를 사용하지 않습니다.
+        
         Args:
             sql_query (str): 검증할 SQL 쿼리
             db_type (str): 데이터베이스 유형 ('mssql' 또는 'hana')
             schema (Optional[Dict[str, Any]]): DB 스키마 정보 (스키마 검증에 사용)
             validation_level (SQLValidationLevel): 검증 수준
+            schema_version (Optional[str]): 스키마 버전 (None이면 스키마 정보에서 계산)
+            db_id (Optional[str]): 데이터베이스 ID (캐시 키 및 스키마 버전 변경 시 캐시 무효화에 사용)
+            
+        Returns:
+            Tuple[bool, List[str], List[str]]: (유효성 여부, 오류 메시지 목록, 경고 메시지 목록)
+        """
+        if self.validation_cache is None or db_id is None:
+            return self._validate_sql_uncached(sql_query, db_type, schema, validation_level, schema_version, db_id)
+        
+        if schema_version is None:
+            schema_version = get_schema_version(schema)
+        
+        # 스키마 버전이 바뀌었으면 이 데이터베이스의 이전 버전 캐시 항목 무효화
+        self.validation_cache.update_schema_version(db_id, schema_version)
+        
+        level = getattr(validation_level, "value", validation_level)
+        cache_key = ValidationCache.make_key(sql_query, db_id, db_type, schema_version, level)
+        cached_result = self.validation_cache.get(cache_key)
+        if cached_result is not None:
+            return cached_result
+        
+        result = self._validate_sql_uncached(sql_query, db_type, schema, validation_level, schema_version, db_id)
+        self.validation_cache.put(cache_key, result)
+        
+        return result
+    
+    def _validate_sql_uncached(
+        self,
+        sql_query: str,
+        db_type: str,
+        schema: Optional[Dict[str, Any]],
+        validation_level: SQLValidationLevel,
+        schema_version: Optional[str] = None,
+        db_id: Optional[str] = None
+    ) -> Tuple[bool, List[str], List[str]]:
+        """
+        SQL 쿼리 검증 (캐시 미사용)
+        
+        Args:
+            sql_query (str): 검증할 SQL 쿼리
+            db_type (str): 데이터베이스 유형 ('mssql' 또는 'hana')
+            schema (Optional[Dict[str, Any]]): DB 스키마 정보
+            validation_level (SQLValidationLevel): 검증 수준
+            schema_version (Optional[str]): 스키마 버전 (스키마 심볼 인덱스 조회에 사용)
+            db_id (Optional[str]): 데이터베이스 ID (스키마 심볼 인덱스 조회에 사용)
             
         Returns:
             Tuple[bool, List[str], List[str]]: (유효성 여부, 오류 메시지 목록, 경고 메시지 목록)
@@ -78,7 +141,7 @@ class SQLValidator:
         
         # 4. 스키마 검증 (STANDARD 이상)
         if validation_level in [SQLValidationLevel.STANDARD, SQLValidationLevel.STRICT] and schema:
-            schema_issues = self._validate_schema(sql_query, schema)
+            schema_issues = self._validate_schema(sql_query, schema, schema_version, db_id)
             if schema_issues:
                 warnings.extend(schema_issues)
         
@@ -94,7 +157,8 @@ class SQLValidator:
         self,
         sql_query: str,
         db_type: str,
-        schema: Optional[Dict[str, Any]] = None
+        schema: Optional[Dict[str, Any]] = None,
+        db_id: Optional[str] = None
     ) -> Tuple[str, List[str]]:
         """
         SQL 쿼리 최적화
@@ -103,6 +167,7 @@ class SQLValidator:
             sql_query (str): 최적화할 SQL 쿼리
             db_type (str): 데이터베이스 유형 ('mssql' 또는 'hana')
             schema (Optional[Dict[str, Any]]): DB 스키마 정보
+            db_id (Optional[str]): 데이터베이스 ID (최적화된 쿼리 검증 시 캐시 키로 사용)
             
         Returns:
             Tuple[str, List[str]]: (최적화된 SQL 쿼리, 최적화 설명 목록)
@@ -140,7 +205,7 @@ class SQLValidator:
                 
                 if is_modified:
                     # 최적화된 쿼리가 유효한지 확인
-                    is_valid, errors, _ = self.validate_sql(llm_optimized_query, db_type, schema)
+                    is_valid, errors, _ = self.validate_sql(llm_optimized_query, db_type, schema, db_id=db_id)
                     
                     if is_valid:
                         optimized_query = llm_optimized_query
@@ -360,13 +425,23 @@ class SQLValidator:
         
         return injection_issues
     
-    def _validate_schema(self, sql_query: str, schema: Dict[str, Any]) -> List[str]:
+    def _validate_schema(
+        self,
+        sql_query: str,
+        schema: Dict[str, Any],
+        schema_version: Optional[str] = None,
+        db_id: Optional[str] = None
+    ) -> List[str]:
         """
         SQL 쿼리와 DB 스키마 일치 여부 검증
         
+        테이블/컬럼 이름은 데이터베이스/스키마 버전별로 한 번 구축되는 심볼 인덱스에서 조회합니다.
+        
         Args:
             sql_query (str): 검증할 SQL 쿼리
             schema (Dict[str, Any]): DB 스키마 정보
+            schema_version (Optional[str]): 스키마 버전 (None이면 스키마 정보에서 계산)
+            db_id (Optional[str]): 데이터베이스 ID
             
         Returns:
             List[str]: 스키마 관련 문제 목록
@@ -377,34 +452,15 @@ class SQLValidator:
         tables_in_query = self._extract_tables_from_query(sql_query)
         columns_in_query = self._extract_columns_from_query(sql_query)
         
-        # 스키마에서 테이블 및 컬럼 정보 가져오기
-        schema_tables = {}  # 테이블 이름 -> 테이블 정보 매핑
-        schema_columns = set()  # 모든 컬럼 (테이블명.컬럼명 형식)
-        table_columns = {}  # 테이블 이름 -> 컬럼 목록 매핑
-        
-        for schema_item in schema.get("schemas", []):
-            schema_name = schema_item.get("name", "").lower()
-            
-            for table in schema_item.get("tables", []):
-                table_name = table.get("name", "").lower()
-                schema_tables[table_name] = table
-                table_columns[table_name] = []
-                
-                for column in table.get("columns", []):
-                    column_name = column.get("name", "").lower()
-                    schema_columns.add(f"{table_name}.{column_name}")
-                    table_columns[table_name].append({
-                        "name": column_name,
-                        "type": column.get("type", ""),
-                        "nullable": column.get("nullable", True)
-                    })
+        # 스키마 심볼 인덱스 조회 (없으면 구축)
+        schema_index = self.schema_index_cache.get_index(schema, schema_version, db_id)
         
         # 테이블 존재 여부 확인
         for table in tables_in_query:
-            if table.lower() not in schema_tables:
+            if not schema_index.has_table(table):
                 schema_issues.append(f"테이블 '{table}'이(가) 스키마에 존재하지 않습니다.")
                 # 유사한 테이블 이름 제안
-                similar_tables = [t for t in schema_tables.keys() if self._is_similar(table.lower(), t)]
+                similar_tables = schema_index.suggest_tables(table)
                 if similar_tables:
                     schema_issues.append(f"혹시 다음 테이블을 찾으시나요? {', '.join(similar_tables)}")
         
@@ -412,33 +468,32 @@ class SQLValidator:
         for column in columns_in_query:
             if "." in column:
                 # 테이블이 명시된 컬럼 (예: table.column)
-                if column.lower() not in schema_columns:
-                    table_part, column_part = column.lower().split(".", 1)
+                if not schema_index.has_column(column):
+                    table_part, column_part = column.lower().rsplit(".", 1)
                     
                     # 테이블은 존재하지만 컬럼이 없는 경우
-                    if table_part in schema_tables:
+                    if schema_index.has_table(table_part):
                         schema_issues.append(f"컬럼 '{column}'이(가) 테이블 '{table_part}'에 존재하지 않습니다.")
                         
                         # 유사한 컬럼 이름 제안
-                        if table_part in table_columns:
-                            similar_columns = [col["name"] for col in table_columns[table_part] 
-                                              if self._is_similar(column_part, col["name"])]
-                            if similar_columns:
-                                schema_issues.append(f"혹시 다음 컬럼을 찾으시나요? {', '.join(similar_columns)}")
+                        similar_columns = schema_index.suggest_columns(column_part, table_part.split(".")[-1])
+                        if similar_columns:
+                            schema_issues.append(f"혹시 다음 컬럼을 찾으시나요? {', '.join(similar_columns)}")
                     else:
                         schema_issues.append(f"테이블 '{table_part}'이(가) 스키마에 존재하지 않습니다.")
             else:
                 # 테이블이 명시되지 않은 컬럼
-                matching_columns = []
-                for schema_column in schema_columns:
-                    if schema_column.endswith(f".{column.lower()}"):
-                        matching_columns.append(schema_column)
+                tables_with_column = schema_index.tables_with_column(column)
                 
-                if not matching_columns:
+                if not tables_with_column:
                     schema_issues.append(f"컬럼 '{column}'이(가) 스키마에 존재하지 않습니다.")
-                elif len(matching_columns) > 1:
+                    
+                    # 유사한 컬럼 이름 제안
+                    similar_columns = schema_index.suggest_columns(column)
+                    if similar_columns:
+                        schema_issues.append(f"혹시 다음 컬럼을 찾으시나요? {', '.join(similar_columns)}")
+                elif len(tables_with_column) > 1:
                     # 여러 테이블에 동일한 이름의 컬럼이 있는 경우
-                    tables_with_column = [col.split(".")[0] for col in matching_columns]
                     schema_issues.append(f"컬럼 '{column}'이(가) 여러 테이블({', '.join(tables_with_column)})에 존재하여 모호합니다. 테이블 이름을 명시하세요.")
         
         # JOIN 조건 검증
@@ -449,24 +504,18 @@ class SQLValidator:
                 left_col, right_col = condition
                 
                 # 양쪽 컬럼이 모두 스키마에 존재하는지 확인
-                if left_col.lower() not in schema_columns:
+                if not schema_index.has_column(left_col):
                     schema_issues.append(f"JOIN 조건의 컬럼 '{left_col}'이(가) 스키마에 존재하지 않습니다.")
                 
-                if right_col.lower() not in schema_columns:
+                if not schema_index.has_column(right_col):
                     schema_issues.append(f"JOIN 조건의 컬럼 '{right_col}'이(가) 스키마에 존재하지 않습니다.")
                 
                 # 데이터 타입 호환성 확인
-                if left_col.lower() in schema_columns and right_col.lower() in schema_columns:
-                    left_table, left_column = left_col.lower().split(".", 1)
-                    right_table, right_column = right_col.lower().split(".", 1)
-                    
-                    left_type = next((col["type"] for col in table_columns.get(left_table, []) 
-                                     if col["name"] == left_column), None)
-                    right_type = next((col["type"] for col in table_columns.get(right_table, []) 
-                                      if col["name"] == right_column), None)
-                    
-                    if left_type and right_type and not self._are_types_compatible(left_type, right_type):
-                        schema_issues.append(f"JOIN 조건의 컬럼 '{left_col}'({left_type})과 '{right_col}'({right_type})의 데이터 타입이 호환되지 않을 수 있습니다.")
+                left_type = schema_index.get_column_type(left_col)
+                right_type = schema_index.get_column_type(right_col)
+                
+                if left_type and right_type and not self._are_types_compatible(left_type, right_type):
+                    schema_issues.append(f"JOIN 조건의 컬럼 '{left_col}'({left_type})과 '{right_col}'({right_type})의 데이터 타입이 호환되지 않을 수 있습니다.")
         
         # WHERE 조건에서 NULL 비교 검증
         if "WHERE" in sql_query.upper():
@@ -482,36 +531,6 @@ class SQLValidator:
         
         return schema_issues
     
-    def _is_similar(self, str1: str, str2: str, threshold: float = 0.7) -> bool:
-        """
-        두 문자열의 유사도 확인 (간단한 구현)
-        
-        Args:
-            str1 (str): 첫 번째 문자열
-            str2 (str): 두 번째 문자열
-            threshold (float): 유사도 임계값 (0.0 ~ 1.0)
-            
-        Returns:
-            bool: 유사도가 임계값 이상이면 True
-        """
-        # 완전히 동일한 경우
-        if str1 == str2:
-            return True
-        
-        # 한 문자열이 다른 문자열에 포함된 경우
-        if str1 in str2 or str2 in str1:
-            return True
-        
-        # 문자열 길이가 너무 다른 경우
-        if len(str1) < 3 or len(str2) < 3:
-            return False
-        
-        # 간단한 편집 거리 기반 유사도 계산
-        common_chars = set(str1) & set(str2)
-        similarity = len(common_chars) / max(len(set(str1)), len(set(str2)))
-        
-        return similarity >= threshold
-    
     def _are_types_compatible(self, type1: str, type2: str) -> bool:
         """
         두 데이터 타입의 호환성 확인
@@ -794,95 +813,6 @@ class SQLValidator:
             if "GROUP BY" in sql_query.upper() and "/*+ PARALLEL" not in sql_query.upper():
                 performance_warnings.append("SAP HANA에서는 복잡한 집계 쿼리에 /*+ PARALLEL */ 힌트를 추가하여 성능을 향상시킬 수 있습니다.")
         
-        return performance_warnings상관 서브쿼리(correlated subquery)는 성능에 큰 영향을 줄 수 있습니다. 가능하면 JOIN으로 대체하세요.")
-        
-        # 5. 함수를 사용한 WHERE 조건 확인
-        function_in_where = re.findall(r"WHERE\s+.*?\w+\s*\(\s*[\w.]+\s*\)", sql_query, re.IGNORECASE | re.DOTALL)
-        if function_in_where:
-            performance_warnings.append("WHERE 절에서 컬럼에 함수를 적용하면 인덱스를 사용할 수 없어 성능이 저하될 수 있습니다.")
-            
-            # 구체적인 함수 이름 추출
-            functions = re.findall(r"(\w+)\s*\(\s*[\w.]+\s*\)", "".join(function_in_where), re.IGNORECASE)
-            if functions:
-                performance_warnings.append(f"WHERE 절에서 사용된 함수 {', '.join(functions)}는 인덱스 사용을 방해할 수 있습니다.")
-        
-        # 6. 대용량 결과 제한 확인
-        if not re.search(r"TOP\s+\d+|LIMIT\s+\d+", sql_query, re.IGNORECASE):
-            performance_warnings.append("대용량 결과를 제한하기 위해 TOP 또는 LIMIT 절 사용을 고려하세요.")
-        
-        # 7. 복잡한 ORDER BY 확인
-        order_by_columns = re.findall(r"ORDER\s+BY\s+(.*?)(?:LIMIT|$)", sql_query, re.IGNORECASE | re.DOTALL)
-        if order_by_columns:
-            columns_count = len(re.split(r",\s*", order_by_columns[0]))
-            if columns_count > 3:
-                performance_warnings.append(f"ORDER BY 절에 {columns_count}개의 컬럼이 사용되어 정렬 성능이 저하될 수 있습니다.")
-        
-        # 8. 복잡한 GROUP BY 확인
-        group_by_columns = re.findall(r"GROUP\s+BY\s+(.*?)(?:HAVING|ORDER|LIMIT|$)", sql_query, re.IGNORECASE | re.DOTALL)
-        if group_by_columns:
-            columns_count = len(re.split(r",\s*", group_by_columns[0]))
-            if columns_count > 3:
-                performance_warnings.append(f"GROUP BY 절에 {columns_count}개의 컬럼이 사용되어 집계 성능이 저하될 수 있습니다.")
-        
-        # 9. 다수의 JOIN 확인
-        join_count = len(re.findall(r"JOIN", sql_query, re.IGNORECASE))
-        if join_count > 3:
-            performance_warnings.append(f"{join_count}개의 JOIN이 사용되어 쿼리 복잡도가 높습니다. 필요한 JOIN만 사용하세요.")
-        
-        # 10. LIKE 패턴 확인
-        like_patterns = re.findall(r"LIKE\s+'([^']*)'", sql_query, re.IGNORECASE)
-        for pattern in like_patterns:
-            if pattern.startswith("%"):
-                performance_warnings.append(f"LIKE '{pattern}'와 같은 선행 와일드카드 패턴은 인덱스를 사용할 수 없어 성능이 저하될 수 있습니다.")
-            elif pattern.startswith("_"):
-                performance_warnings.append(f"LIKE '{pattern}'와 같은 선행 와일드카드 패턴은 인덱스를 사용할 수 없어 성능이 저하될 수 있습니다.")
-        
-        # 11. IN 절에 많은 값 확인
-        in_clauses = re.findall(r"IN\s*\((.*?)\)", sql_query, re.IGNORECASE | re.DOTALL)
-        for in_clause in in_clauses:
-            values_count = len(re.split(r",\s*", in_clause))
-            if values_count > 10:
-                performance_warnings.append(f"IN 절에 {values_count}개의 값이 사용되어 성능이 저하될 수 있습니다. 임시 테이블이나 JOIN을 고려하세요.")
-        
-        # 12. OR 조건 확인
-        or_count = len(re.findall(r"\bOR\b", sql_query, re.IGNORECASE))
-        if or_count > 3:
-            performance_warnings.append(f"{or_count}개의 OR 조건이 사용되어 인덱스 사용이 제한될 수 있습니다. UNION을 고려하세요.")
-        
-        # 13. 데이터베이스별 성능 이슈 확인
-        if db_type == "mssql":
-            # MS-SQL 특화 검사
-            if re.search(r"FROM\s+\w+(?:\s+\w+)?(?!\s+WITH\s*\(\s*NOLOCK\s*\))", sql_query, re.IGNORECASE):
-                performance_warnings.append("읽기 전용 쿼리에 WITH (NOLOCK) 힌트를 추가하면 동시성이 향상될 수 있습니다.")
-            
-            # 임시 테이블 사용 확인
-            if re.search(r"#\w+", sql_query, re.IGNORECASE):
-                performance_warnings.append("임시 테이블(#)은 tempdb 경합을 일으킬 수 있습니다. 필요한 경우에만 사용하세요.")
-            
-            # 테이블 변수 사용 확인
-            if re.search(r"@\w+", sql_query, re.IGNORECASE):
-                performance_warnings.append("테이블 변수(@)는 통계 정보가 제한되어 성능에 영향을 줄 수 있습니다.")
-            
-            # OPTION 힌트 확인
-            if not re.search(r"OPTION\s*\(", sql_query, re.IGNORECASE):
-                if join_count > 3 or subquery_count > 1:
-                    performance_warnings.append("복잡한 쿼리에 OPTION 힌트(RECOMPILE, OPTIMIZE FOR 등)를 고려하세요.")
-            
-        elif db_type == "hana":
-            # SAP HANA 특화 검사
-            if re.search(r"LIKE\s+'%", sql_query, re.IGNORECASE):
-                performance_warnings.append("LIKE '%...'와 같은 선행 와일드카드 패턴은 인덱스를 사용할 수 없어 성능이 저하될 수 있습니다.")
-            
-            # 문자열 함수 사용 확인
-            string_functions = ["UPPER", "LOWER", "SUBSTRING", "REPLACE", "TRIM"]
-            for func in string_functions:
-                if re.search(rf"{func}\s*\(", sql_query, re.IGNORECASE):
-                    performance_warnings.append(f"{func} 함수는 인덱스 사용을 방해할 수 있습니다. 필요한 경우에만 사용하세요.")
-            
-            # 계산 컬럼 확인
-            if re.search(r"SELECT\s+.*?[\w.]+\s*[+\-*/]\s*[\w.]", sql_query, re.IGNORECASE):
-                performance_warnings.append("SELECT 절에서 계산 컬럼은 성능에 영향을 줄 수 있습니다. 가능하면 미리 계산된 값을 사용하세요.")
-        
         return performance_warnings
     
     def _apply_basic_optimizations(self, sql_query: str, db_type: str) -> Tuple[str, List[str]]:
@@ -0,0 +1,203 @@
+"""
+SQL 검증 결과 캐시
+
+이 모듈은 SQLValidator.validate_sql의 결과를 정규화된 SQL 지문(fingerprint),
+데이터베이스 ID, 데이터베이스 유형, 스키마 버전, 검증 수준을 키로 하는 LRU 캐시에 저장합니다.
+동일한 SQL이 NL→SQL 변환, 수정, 실행 전 검증 단계에서 반복 검증될 때
+문법/인젝션/방언/스키마/성능 검사를 다시 수행하지 않도록 합니다.
+"""
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+from threading import Lock
+import hashlib
+import json
+import logging
+
+from ..utils.sql_fingerprint import normalize_sql, sql_fingerprint
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_schema_version(schema: Optional[Dict[str, Any]]) -> str:
+    """
+    스키마 버전 식별자 계산
+
+    스키마에 명시적인 버전("version") 또는 갱신 시각("last_updated")이 있으면 이를 사용하고,
+    없으면 스키마 내용의 해시를 버전으로 사용합니다.
+
+    Args:
+        schema (Optional[Dict[str, Any]]): DB 스키마 정보
+
+    Returns:
+        str: 스키마 버전 문자열 (스키마가 없으면 "none")
+    """
+    if not schema:
+        return "none"
+
+    for key in ("version", "last_updated"):
+        value = schema.get(key)
+        if value:
+            return f"{key}:{value}"
+
+    content = json.dumps(schema, sort_keys=True, default=str, ensure_ascii=False)
+    return "hash:" + hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+ValidationResult = Tuple[bool, List[str], List[str]]
+CacheKey = Tuple[str, str, str, str, str]  # (SQL 지문, 데이터베이스 ID, DB 유형, 스키마 버전, 검증 수준)
+
+
+class ValidationCache:
+    """SQL 검증 결과 LRU 캐시 클래스"""
+
+    def __init__(self, max_size: int = 1024):
+        """
+        검증 결과 캐시 초기화
+
+        Args:
+            max_size (int): 캐시에 보관할 최대 항목 수
+        """
+        self.max_size = max_size
+        self._entries: "OrderedDict[CacheKey, Tuple[bool, Tuple[str, ...], Tuple[str, ...]]]" = OrderedDict()
+        self._schema_versions: Dict[str, str] = {}  # 데이터베이스 ID -> 현재 스키마 버전
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @staticmethod
+    def make_key(sql_query: str, db_id: str, db_type: str, schema_version: str, validation_level: str) -> CacheKey:
+        """
+        캐시 키 생성
+
+        Args:
+            sql_query (str): SQL 쿼리
+            db_id (str): 데이터베이스 ID
+            db_type (str): 데이터베이스 유형
+            schema_version (str): 스키마 버전
+            validation_level (str): 검증 수준
+
+        Returns:
+            CacheKey: (SQL 지문, 데이터베이스 ID, DB 유형, 스키마 버전, 검증 수준)
+        """
+        return (sql_fingerprint(sql_query), db_id, db_type, schema_version, str(validation_level))
+
+    def get(self, key: CacheKey) -> Optional[ValidationResult]:
+        """
+        캐시된 검증 결과 조회
+
+        Args:
+            key (CacheKey): 캐시 키
+
+        Returns:
+            Optional[ValidationResult]: (유효성 여부, 오류 목록, 경고 목록) 또는 None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+
+        is_valid, errors, warnings = entry
+        # 호출자가 목록을 수정해도 캐시가 오염되지 않도록 복사본 반환
+        return is_valid, list(errors), list(warnings)
+
+    def put(self, key: CacheKey, result: ValidationResult) -> None:
+        """
+        검증 결과 저장
+
+        Args:
+            key (CacheKey): 캐시 키
+            result (ValidationResult): (유효성 여부, 오류 목록, 경고 목록)
+        """
+        is_valid, errors, warnings = result
+        with self._lock:
+            self._entries[key] = (is_valid, tuple(errors), tuple(warnings))
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def update_schema_version(self, db_id: str, schema_version: str) -> None:
+        """
+        데이터베이스의 스키마 버전 갱신 및 해당 데이터베이스의 이전 버전 항목 무효화
+
+        Args:
+            db_id (str): 데이터베이스 ID
+            schema_version (str): 현재 스키마 버전
+        """
+        with self._lock:
+            previous_version = self._schema_versions.get(db_id)
+            self._schema_versions[db_id] = schema_version
+
+            if previous_version is None or previous_version == schema_version:
+                return
+
+            stale_keys = [key for key in self._entries if key[1] == db_id and key[3] == previous_version]
+            for key in stale_keys:
+                del self._entries[key]
+            self._invalidations += len(stale_keys)
+
+        if stale_keys:
+            logger.info(f"스키마 버전 변경으로 검증 캐시 항목 {len(stale_keys)}개를 무효화했습니다: {db_id}")
+
+    def invalidate(self, schema_version: Optional[str] = None) -> int:
+        """
+        캐시 항목 무효화
+
+        Args:
+            schema_version (Optional[str]): 무효화할 스키마 버전 (None이면 전체 무효화)
+
+        Returns:
+            int: 제거된 항목 수
+        """
+        with self._lock:
+            if schema_version is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._schema_versions.clear()
+            else:
+                stale_keys = [key for key in self._entries if key[3] == schema_version]
+                for key in stale_keys:
+                    del self._entries[key]
+                removed = len(stale_keys)
+            self._invalidations += removed
+
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계 조회
+
+        Returns:
+            Dict[str, Any]: 적중/실패 횟수, 적중률, 크기 등 통계 정보
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations
+            }
+
+    def reset_stats(self) -> None:
+        """통계 카운터 초기화"""
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+            self._invalidations = 0
+
+
+# 모든 SQLValidator 인스턴스가 공유하는 기본 캐시
+validation_cache = ValidationCache()
@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from sqlalchemy.exc import SQLAlchemyError
+import asyncio
 import logging
 logger = logging.getLogger("main")
 import time
@@ -16,6 +17,7 @@ from .core.middleware import LoggingMiddleware
 from .core.error_middleware import EnhancedErrorHandler
 from .core.auth_middleware import PermissionMiddleware
 from .db.session import engine, Base
+from .db.connectors.factory import run_endpoint_health_checks
 
 # Initialize database tables and default data (roles, admin user)
 try:
@@ -60,7 +62,6 @@ async def create_tables():
 
 if settings.DEBUG:
     logger.info("Creating database tables...")
-    import asyncio
     asyncio.run(create_tables())
     logger.info("Database tables created successfully")
 
@@ -99,6 +100,19 @@ app.include_router(report_api.router)
 app.include_router(error_demo.router)
 app.include_router(feedback.router)
 
+# 복제본 엔드포인트 헬스 체크 (시작 시 한 번, 이후 주기적으로 실행)
+@app.on_event("startup")
+async def start_endpoint_health_checks():
+    interval = settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS
+    if interval > 0:
+        app.state.endpoint_health_check_task = asyncio.create_task(run_endpoint_health_checks(interval))
+
+@app.on_event("shutdown")
+async def stop_endpoint_health_checks():
+    task = getattr(app.state, "endpoint_health_check_task", None)
+    if task is not None:
+        task.cancel()
+
 @app.get("/")
 async def root():
     """
@@ -6,6 +6,7 @@ from enum import Enum
 class DBType(str, Enum):
     MSSQL = "mssql"
     HANA = "hana"
+    SQLITE = "sqlite"
 
 class ConnectionConfig(BaseModel):
     """
@@ -24,6 +25,29 @@ class ConnectionConfig(BaseModel):
             raise ValueError("Encrypt option must be a boolean")
         return v
 
+class EndpointRole(str, Enum):
+    PRIMARY = "primary"
+    REPLICA = "replica"
+
+class DatabaseEndpoint(BaseModel):
+    """
+    Additional network endpoint of a logical database (e.g. a readable secondary).
+    """
+    host: str
+    port: int = Field(..., gt=0, lt=65536)  # Valid port range
+    role: EndpointRole = EndpointRole.REPLICA
+    weight: float = Field(1.0, gt=0)  # Relative share of routed traffic
+    
+    @validator('host')
+    def validate_host(cls, v):
+        if not v or not v.strip():
+            raise ValueError("Endpoint host cannot be empty")
+        return v
+    
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
 class Column(BaseModel):
     """
     Database column definition with type information and constraints.
@@ -172,6 +196,7 @@ class Database(BaseModel):
     port: int = Field(..., gt=0, lt=65536)  # Valid port range
     default_schema: str
     connection_config: ConnectionConfig
+    endpoints: List[DatabaseEndpoint] = []  # Additional endpoints besides host/port (the primary)
     created_at: datetime
     updated_at: datetime
     
@@ -188,6 +213,36 @@ class Database(BaseModel):
         # Could add more validation for hostname format if needed
         return v
     
+    def get_endpoints(self) -> List[DatabaseEndpoint]:
+        """
+        Get all endpoints of the database, starting with the primary host/port.
+        
+        Returns:
+            List of DatabaseEndpoint objects
+        """
+        primary = DatabaseEndpoint(host=self.host, port=self.port, role=EndpointRole.PRIMARY)
+        return [primary] + [endpoint for endpoint in self.endpoints if endpoint.address != primary.address]
+    
+    def for_endpoint(self, endpoint: DatabaseEndpoint) -> "Database":
+        """
+        Get the configuration for connecting to a single endpoint.
+        Each endpoint gets its own identifier so that it has its own connection pool.
+        
+        Args:
+            endpoint: Endpoint of this database
+            
+        Returns:
+            Database configuration targeting the endpoint
+        """
+        if endpoint.host == self.host and endpoint.port == self.port:
+            return self
+        return self.model_copy(update={
+            "id": f"{self.id}@{endpoint.address}",
+            "host": endpoint.host,
+            "port": endpoint.port,
+            "endpoints": []
+        })
+    
     def get_connection_string(self) -> str:
         """
         Generate a connection string based on the database type.
@@ -199,6 +254,8 @@ class Database(BaseModel):
             return f"Server={self.host},{self.port};Database={self.default_schema};User Id={self.connection_config.username};Password=<encrypted>"
         elif self.type == DBType.HANA:
             return f"hdbcli://{self.host}:{self.port}?databaseName={self.default_schema}"
+        elif self.type == DBType.SQLITE:
+            return f"sqlite:///{self.connection_config.options.get('path', ':memory:')}"
         else:
             raise ValueError(f"Unsupported database type: {self.type}")
 
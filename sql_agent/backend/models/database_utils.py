@@ -30,6 +30,8 @@ def get_db_dialect(db_type: DBType) -> str:
         return "tsql"
     elif db_type == DBType.HANA:
         return "hana"
+    elif db_type == DBType.SQLITE:
+        return "sqlite"
     else:
         raise ValueError(f"Unsupported database type: {db_type}")
 
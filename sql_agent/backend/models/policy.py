@@ -39,6 +39,14 @@ class QueryLimitPolicySettings(BaseModel):
     allowed_query_types: Set[str] = Field(default={"SELECT"}, description="Allowed query types")
     blocked_keywords: Set[str] = Field(default={"DROP", "DELETE", "UPDATE", "INSERT", "TRUNCATE", "ALTER", "CREATE"}, 
                                       description="Blocked SQL keywords")
+    max_estimated_rows: Optional[int] = Field(default=None, ge=1,
+                                              description="Block queries whose estimated row count exceeds this value (None to disable)")
+    max_estimated_cost: Optional[float] = Field(default=None, gt=0,
+                                                description="Block queries whose estimated plan cost exceeds this value (None to disable)")
+    warn_estimated_rows: Optional[int] = Field(default=None, ge=1,
+                                               description="Run queries above this estimated row count at low priority (None to disable)")
+    warn_estimated_cost: Optional[float] = Field(default=None, gt=0,
+                                                 description="Run queries above this estimated plan cost at low priority (None to disable)")
 
 
 class SecurityPolicySettings(BaseModel):
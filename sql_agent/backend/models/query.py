@@ -56,6 +56,8 @@ class Query(BaseModel):
     end_time: Optional[datetime] = None
     error: Optional[str] = None
     result_id: Optional[str] = None
+    phase_timings: Optional[Dict[str, float]] = None
+    answer_fingerprint: Optional[str] = None
     created_at: datetime
 
     @validator('natural_language', 'generated_sql')
@@ -82,15 +84,20 @@ class QueryCreate(BaseModel):
     natural_language: str
     generated_sql: str
     executed_sql: Optional[str] = None
+    phase_timings: Optional[Dict[str, float]] = None
+    answer_fingerprint: Optional[str] = None
 
 
 class QueryUpdate(BaseModel):
     """Model for updating an existing query"""
+    generated_sql: Optional[str] = None
     executed_sql: Optional[str] = None
     status: Optional[QueryStatus] = None
+    start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     error: Optional[str] = None
     result_id: Optional[str] = None
+    phase_timings: Optional[Dict[str, float]] = None
 
     class Config:
         use_enum_values = True
@@ -109,6 +116,7 @@ class QueryResult(BaseModel):
     total_row_count: Optional[int] = None
     summary: Optional[str] = None
     report_id: Optional[str] = None
+    approximation: Optional[Dict[str, Any]] = None  # Set for approximate results of a sampled preview
     created_at: datetime
 
     @validator('columns')
@@ -127,6 +135,17 @@ class QueryResult(BaseModel):
         from_attributes = True
 
 
+class QueryCostEstimate(BaseModel):
+    """
+    Estimated cost of a query, taken from the database's execution plan without running it.
+    """
+    estimated_rows: Optional[float] = None
+    estimated_cost: Optional[float] = None
+    operators: List[str] = []
+    plan: Optional[str] = None
+    plan_source: Optional[str] = None  # plan_cache for the plan the server used, estimated for a compiled plan
+
+
 class QueryResultCreate(BaseModel):
     """Model for creating a new query result"""
     query_id: str
@@ -136,6 +155,7 @@ class QueryResultCreate(BaseModel):
     truncated: bool = False
     total_row_count: Optional[int] = None
     summary: Optional[str] = None
+    approximation: Optional[Dict[str, Any]] = None
 
 
 class Visualization(BaseModel):
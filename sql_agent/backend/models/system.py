@@ -118,4 +118,41 @@ class UserActivityStats(BaseModel):
 class UserActivityStatsResponse(BaseModel):
     """Model for user activity statistics response"""
     users: List[UserActivityStats]
-    total: int
\ No newline at end of file
+    total: int
+
+class SlowQueryLogResponse(BaseModel):
+    """Model for slow query log entry response"""
+    id: str
+    query_id: Optional[str] = None
+    user_id: Optional[str] = None
+    db_id: str
+    fingerprint: Optional[str] = None
+    sql: str
+    status: str
+    error: Optional[str] = None
+    duration_ms: float
+    phase_timings: Optional[Dict[str, float]] = None
+    row_count: Optional[int] = None
+    plan_source: Optional[str] = None
+    estimated_cost: Optional[float] = None
+    estimated_rows: Optional[float] = None
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class SlowQueryLogDetailResponse(SlowQueryLogResponse):
+    """Model for slow query log entry response including the execution plan"""
+    plan: Optional[str] = None
+    plan_error: Optional[str] = None
+
+
+class PaginatedSlowQueryLogs(BaseModel):
+    """Model for paginated slow query log response"""
+    entries: List[SlowQueryLogResponse]
+    total: int
+    page: int
+    page_size: int
+    total_pages: int
+    threshold_ms: int
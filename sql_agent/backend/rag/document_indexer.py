@@ -10,7 +10,8 @@ from langchain.text_splitter import RecursiveCharacterTextSplitter
 
 from ..models.database import DatabaseSchema, Schema, Table, Column, ForeignKey
 from ..models.rag import Document, DocumentType, DocumentChunk
-from ..llm.base import LLMService
+from ..llm.base import LLMService, run_sync
+from ..llm.embedding_pipeline import EmbeddingPipeline
 from .text_utils import normalize_text, extract_keywords
 
 logger = logging.getLogger(__name__)
@@ -21,14 +22,16 @@ class DocumentIndexer:
     that can be used by the RAG system.
     """
     
-    def __init__(self, llm_service: LLMService):
+    def __init__(self, llm_service: LLMService, embedding_pipeline: Optional[EmbeddingPipeline] = None):
         """
         Initialize the document indexer.
         
         Args:
             llm_service: LLM service for generating embeddings
+            embedding_pipeline: Optional embedding pipeline, will create one for llm_service if not provided
         """
         self.llm_service = llm_service
+        self.embedding_pipeline = embedding_pipeline or EmbeddingPipeline(llm_service)
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=1000,
             chunk_overlap=100,
@@ -80,6 +83,30 @@ class DocumentIndexer:
         """
         Index a database schema into documents.
         
+        Args:
+            db_schema: Database schema to index
+            
+        Returns:
+            List of created documents
+        """
+        return self._generate_embeddings(self.create_schema_documents(db_schema))
+    
+    async def index_database_schema_async(self, db_schema: DatabaseSchema) -> List[Document]:
+        """
+        Async version of index_database_schema, usable from a running event loop.
+        
+        Args:
+            db_schema: Database schema to index
+            
+        Returns:
+            List of created documents
+        """
+        return await self.generate_embeddings_async(self.create_schema_documents(db_schema))
+    
+    def create_schema_documents(self, db_schema: DatabaseSchema) -> List[Document]:
+        """
+        Create the documents describing a database schema, without embeddings.
+        
         Args:
             db_schema: Database schema to index
             
@@ -116,8 +143,7 @@ class DocumentIndexer:
                     )
                     documents.append(fk_doc)
         
-        # Generate embeddings for all documents
-        return self._generate_embeddings(documents)
+        return documents
     
     def _create_database_document(self, db_schema: DatabaseSchema) -> Document:
         """
@@ -655,35 +681,56 @@ class DocumentIndexer:
         Returns:
             List of documents with embeddings
         """
-        # Process documents in batches to avoid overwhelming the LLM service
-        batch_size = 10
-        processed_docs = []
+        return run_sync(self.generate_embeddings_async(documents))
+    
+    async def generate_embeddings_async(
+        self, items: List[Union[Document, DocumentChunk]]
+    ) -> List[Union[Document, DocumentChunk]]:
+        """
+        Generate embeddings for documents or chunks through the embedding pipeline.
         
-        for i in range(0, len(documents), batch_size):
-            batch = documents[i:i+batch_size]
-            texts = [self._preprocess_text_for_embedding(doc.content) for doc in batch]
+        The pipeline packs texts into token-bounded batches and sends several batches
+        concurrently. Items whose batch fails are returned without an embedding.
+        
+        Args:
+            items: Documents or chunks to generate embeddings for
             
-            try:
-                # 비동기 함수를 동기적으로 호출
-                embeddings = self.llm_service.get_embeddings_sync(texts)
-                
-                for j, doc in enumerate(batch):
-                    doc.embedding = embeddings[j]
-                    processed_docs.append(doc)
-                    
-                logger.info(f"Generated embeddings for {len(batch)} documents")
-            except Exception as e:
-                logger.error(f"Error generating embeddings: {e}")
-                # Add documents without embeddings
-                processed_docs.extend(batch)
-                logger.warning(f"Added {len(batch)} documents without embeddings")
-        
-        return processed_docs
+        Returns:
+            The same items with embeddings set
+        """
+        texts = [self._preprocess_text_for_embedding(item.content) for item in items]
+        embeddings = await self.embedding_pipeline.embed(texts)
+        
+        for item, embedding in zip(items, embeddings):
+            if embedding is not None:
+                item.embedding = embedding
+        
+        missing = sum(1 for embedding in embeddings if embedding is None)
+        if missing:
+            logger.warning(f"Added {missing} items without embeddings")
+        
+        return items
     
     def chunk_document(self, document: Document) -> Tuple[Document, List[DocumentChunk]]:
         """
         Split a document into chunks if it's too large.
         
+        Args:
+            document: Document to split
+            
+        Returns:
+            Tuple of (original document, list of document chunks)
+        """
+        document, doc_chunks = self.split_document(document)
+        if doc_chunks:
+            self._generate_embeddings(doc_chunks)
+        
+        return document, doc_chunks
+    
+    def split_document(self, document: Document) -> Tuple[Document, List[DocumentChunk]]:
+        """
+        Split a document into chunks if it's too large, without generating embeddings.
+        
         Args:
             document: Document to split
             
@@ -709,18 +756,6 @@ class DocumentIndexer:
             )
             doc_chunks.append(chunk)
         
-        # Generate embeddings for chunks
-        try:
-            chunk_texts = [self._preprocess_text_for_embedding(chunk.content) for chunk in doc_chunks]
-            embeddings = self.llm_service.get_embeddings_sync(chunk_texts)
-            
-            for i, chunk in enumerate(doc_chunks):
-                chunk.embedding = embeddings[i]
-                
-            logger.info(f"Generated embeddings for {len(doc_chunks)} chunks")
-        except Exception as e:
-            logger.error(f"Error generating embeddings for chunks: {e}")
-        
         return document, doc_chunks
     
     def normalize_text(self, text: str) -> str:
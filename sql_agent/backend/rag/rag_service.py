@@ -1,5 +1,6 @@
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional, Union, Tuple
+from typing import List, Dict, Any, Optional, Union, Tuple, AsyncIterator
 from datetime import datetime
 
 try:
@@ -9,6 +10,7 @@ try:
     from .document_indexer import DocumentIndexer
     from .document_store import DocumentStore
     from .text_utils import extract_keywords, normalize_text
+    from ..utils.query_timing import timed_phase
 except ImportError:
     # Fallback for direct execution
     import sys
@@ -20,6 +22,7 @@ except ImportError:
     from rag.document_indexer import DocumentIndexer
     from rag.document_store import DocumentStore
     from rag.text_utils import extract_keywords, normalize_text
+    from utils.query_timing import timed_phase
 
 logger = logging.getLogger(__name__)
 
@@ -28,16 +31,21 @@ class RagService:
     Service for Retrieval-Augmented Generation (RAG).
     """
     
-    def __init__(self, llm_service: LLMService, document_store: DocumentStore = None):
+    def __init__(
+        self, llm_service: LLMService, document_store: DocumentStore = None,
+        embedding_service: Optional[LLMService] = None
+    ):
         """
         Initialize the RAG service.
         
         Args:
             llm_service: LLM service for generating embeddings and responses
             document_store: Optional document store, will create a new one if not provided
+            embedding_service: Optional service for document and query embeddings, defaults to llm_service
         """
         self.llm_service = llm_service
-        self.document_indexer = DocumentIndexer(llm_service)
+        self.embedding_service = embedding_service or llm_service
+        self.document_indexer = DocumentIndexer(self.embedding_service)
         self.document_store = document_store or DocumentStore()
     
     def index_database_schema(self, db_schema: DatabaseSchema) -> List[str]:
@@ -75,6 +83,35 @@ class RagService:
         
         return doc_ids
     
+    async def index_database_schema_async(self, db_schema: DatabaseSchema) -> List[str]:
+        """
+        Async version of index_database_schema, usable from a running event loop.
+        
+        Documents and the chunks of large documents are embedded in one pipeline run,
+        so their batches are packed together and sent concurrently.
+        
+        Args:
+            db_schema: Database schema to index
+            
+        Returns:
+            List of document IDs
+        """
+        self.document_store.clear_db(db_schema.db_id)
+        
+        documents = self.document_indexer.create_schema_documents(db_schema)
+        
+        chunks_map = {}
+        for doc in documents:
+            if len(doc.content) > 1000:  # Simple heuristic, in practice use token count
+                _, chunks = self.document_indexer.split_document(doc)
+                if chunks:
+                    chunks_map[doc.id] = chunks
+        
+        all_chunks = [chunk for chunks in chunks_map.values() for chunk in chunks]
+        await self.document_indexer.generate_embeddings_async(documents + all_chunks)
+        
+        return self.document_store.add_documents(documents, chunks_map)
+    
     def index_query_history(
         self, db_id: str, query_text: str, sql: str, result_summary: Optional[str] = None
     ) -> str:
@@ -118,7 +155,7 @@ class RagService:
         if search_type in ["embedding", "hybrid"]:
             try:
                 # Generate embedding for the query
-                query_embedding = self.llm_service.get_embeddings_sync([query.query])[0]
+                query_embedding = self.embedding_service.get_embeddings_sync([query.query])[0]
             except Exception as e:
                 logger.warning(f"Failed to generate query embedding: {e}")
                 # Fall back to keyword search if embedding generation fails
@@ -436,7 +473,8 @@ class RagService:
         )
         
         # Search for relevant documents with fallback strategy
-        search_results = self._search_with_fallback(search_query, search_type)
+        with timed_phase("rag_retrieval"):
+            search_results = await asyncio.to_thread(self._search_with_fallback, search_query, search_type)
         
         if not search_results:
             logger.warning(f"No relevant documents found for query: '{query}'")
@@ -456,7 +494,8 @@ class RagService:
         
         # Generate response using LLM with enhanced prompting (async)
         try:
-            response_text = await self._generate_llm_response_async(query, context, include_citations)
+            with timed_phase("llm_generation"):
+                response_text = await self._generate_llm_response_async(query, context, include_citations)
         except Exception as e:
             logger.error(f"Failed to generate async LLM response: {e}")
             response_text = "죄송합니다. 응답을 생성하는 중에 오류가 발생했습니다."
@@ -487,6 +526,22 @@ class RagService:
         Returns:
             Generated response
         """
+        enhanced_prompt = self._build_async_prompt(context, include_citations)
+        
+        # Use the async LLM service to generate response
+        return await self.llm_service.generate_rag_response(query, enhanced_prompt)
+    
+    def _build_async_prompt(self, context: str, include_citations: bool) -> str:
+        """
+        Build the enhanced RAG prompt used by the async and streaming paths.
+        
+        Args:
+            context: Context from search results
+            include_citations: Whether to include citations
+            
+        Returns:
+            Prompt text
+        """
         # Enhanced prompt for better RAG responses
         enhanced_prompt = f"""
 다음은 데이터베이스 스키마에 관한 정보입니다. 이 정보를 바탕으로 사용자의 질문에 정확하고 도움이 되는 답변을 제공해주세요.
@@ -504,5 +559,64 @@ class RagService:
 
 답변:"""
         
-        # Use the async LLM service to generate response
-        return await self.llm_service.generate_rag_response(query, enhanced_prompt)
\ No newline at end of file
+        return enhanced_prompt
+    
+    async def stream_response_async(
+        self, db_id: str, query: str, top_k: int = 5, search_type: str = "hybrid",
+        include_citations: bool = True, context_window_size: int = 2000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming version of generate_response_async.
+        
+        Yields a "sources" event as soon as retrieval finishes, "token" events while the
+        LLM writes the answer, a "citations" event with the source list appended to the
+        answer, and a final "done" event carrying the complete RagResponse.
+        
+        Args:
+            db_id: Database ID
+            query: User query
+            top_k: Number of documents to retrieve
+            search_type: Type of search to use
+            include_citations: Whether to include source citations in response
+            context_window_size: Maximum size of context window in characters
+            
+        Yields:
+            Streaming events
+        """
+        logger.info(f"Streaming RAG response for query: '{query}' in database: {db_id}")
+        
+        search_query = SearchQuery(query=query, db_id=db_id, top_k=top_k)
+        with timed_phase("rag_retrieval"):
+            search_results = await asyncio.to_thread(self._search_with_fallback, search_query, search_type)
+        yield {"event": "sources", "sources": search_results}
+        
+        if not search_results:
+            logger.warning(f"No relevant documents found for query: '{query}'")
+            response_text = ("죄송합니다. 데이터베이스 스키마에서 관련 정보를 찾을 수 없습니다. "
+                             "다른 질문을 시도하거나 더 구체적인 정보를 제공해 주세요.")
+            yield {"event": "token", "content": response_text}
+            yield {"event": "done", "response": RagResponse(query=query, response=response_text, sources=[])}
+            return
+        
+        context = self._build_enhanced_context(
+            query, search_results, context_window_size, include_citations
+        )
+        enhanced_prompt = self._build_async_prompt(context, include_citations)
+        
+        response_text = ""
+        with timed_phase("llm_generation"):
+            async for event in self.llm_service.stream_rag_response(query, enhanced_prompt):
+                if event["event"] == "done":
+                    response_text = event["response"]
+                    break
+                yield event
+        
+        if include_citations:
+            cited_text = self._add_source_citations(response_text, search_results)
+            yield {"event": "citations", "content": cited_text[len(response_text):]}
+            response_text = cited_text
+        
+        yield {
+            "event": "done",
+            "response": RagResponse(query=query, response=response_text, sources=search_results)
+        }
@@ -30,6 +30,8 @@ from ..models.feedback import (
     FeedbackStatus,
     FeedbackPriority
 )
+from ..db.models.query import QueryDB
+from ..llm.nl_sql_cache import nl_sql_cache
 from ..utils.logging import log_event, log_error
 from ..services.notification_service import NotificationService
 
@@ -72,6 +74,9 @@ class FeedbackService:
                 "title": db_feedback.title
             })
             
+            # Stop serving a generated SQL answer that was reported as wrong
+            self._invalidate_cached_answer(db, feedback)
+            
             # Send notification to admins if notification service is available
             if self.notification_service:
                 self.notification_service.notify_admins_new_feedback(db_feedback)
@@ -85,6 +90,26 @@ class FeedbackService:
             })
             raise
     
+    def _invalidate_cached_answer(self, db: Session, feedback: FeedbackCreate) -> None:
+        """
+        Remove the SQL answer of a query reported as wrong from the NL→SQL cache.
+        The answer is identified by the fingerprint recorded when it was served, since
+        generated_sql may since have been edited or rewritten by /fix.
+        
+        Args:
+            db: Database session
+            feedback: Submitted feedback
+        """
+        if feedback.category != FeedbackCategory.QUERY_ISSUE or not feedback.related_query_id:
+            return
+        
+        try:
+            query = db.query(QueryDB).filter(QueryDB.id == feedback.related_query_id).first()
+            if query and query.answer_fingerprint:
+                nl_sql_cache.invalidate_fingerprint(query.db_id, query.answer_fingerprint)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate cached answer of query {feedback.related_query_id}: {str(e)}")
+    
     def get_feedback_by_id(self, db: Session, feedback_id: str) -> Optional[FeedbackRead]:
         """
         Get feedback by ID
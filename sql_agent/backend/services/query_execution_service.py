@@ -3,30 +3,85 @@ SQL query execution service for handling query execution, monitoring, and cancel
 """
 
 import asyncio
+import base64
 import logging
+import re
+import time
 import uuid
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Set, Tuple
 from datetime import datetime
+from collections import OrderedDict
 
-from ..models.query import QueryStatus, QueryUpdate, QueryResult, QueryResultCreate
+from ..models.query import QueryStatus, QueryCreate, QueryUpdate, QueryResult, QueryResultCreate
 from ..models.database import Database
-from ..db.crud.query import update_query, get_query_by_id
+from ..models.policy import QueryLimitPolicySettings
+from ..db.crud.query import create_query, update_query, get_query_by_id, merge_query_phase_timings
 from ..db.crud.query_result import create_query_result, get_query_result_by_id
+from ..db.crud.query_stats import record_fingerprint_execution
+from ..db.crud.slow_query_log import create_slow_query_log
 from ..db.connectors.factory import connector_factory
+from ..db.connectors.query_executor import is_lob_placeholder, lob_matches_placeholder
+from ..db.connectors.cost_estimator import QueryCostEstimator, CostDecision, evaluate_cost, has_cost_thresholds
+from ..db.connectors.query_sampler import SampledQuery, build_sampled_query, scale_sampled_result
+from ..llm.model_router import record_execution_failure
+from ..core.config import settings
 from ..utils.logging import log_event, log_error
+from ..utils.sql_fingerprint import sql_shape_fingerprint
+from ..utils.query_timing import PhaseTimer
 
 logger = logging.getLogger(__name__)
 
+# Tables referenced in FROM and JOIN clauses (used to find the primary key of LOB result rows)
+_TABLE_REFERENCE_PATTERN = re.compile(r"\b(?:FROM|JOIN)\s+([^\s,;()]+)", re.IGNORECASE)
+_COMMA_JOIN_PATTERN = re.compile(r"\bFROM\s+[^\s,;()]+(?:\s+(?:AS\s+)?\w+)?\s*,", re.IGNORECASE)
+
+
 class QueryExecutionService:
     """
     Service for executing SQL queries, monitoring their status, and handling cancellation.
     """
     
-    def __init__(self):
+    # Maximum number of cost estimates kept for status queries
+    MAX_COST_ESTIMATES = 1000
+    
+    # Maximum number of statements of a single batch running at once
+    BATCH_MAX_CONCURRENCY = 8
+    
+    # Maximum number of batches kept for status queries
+    MAX_BATCHES = 1000
+    
+    # Concurrent queries admitted per database if the pool manager has no size limit
+    DEFAULT_ADMISSION_LIMIT = 10
+    
+    # Seconds allowed for capturing the plan of a slow query
+    PLAN_CAPTURE_TIMEOUT = 30
+    
+    # Maximum number of speculative previews kept for queries that have not been executed yet
+    MAX_SPECULATIVE_PREVIEWS = 100
+    
+    def __init__(
+        self,
+        cost_estimator: Optional[QueryCostEstimator] = None,
+        low_priority_concurrency: int = 2,
+        speculative_concurrency: int = 2
+    ):
         """
         Initialize the query execution service.
+        
+        Args:
+            cost_estimator: Optional pre-flight cost estimator (a default estimator is created if None)
+            low_priority_concurrency: Maximum number of low priority (expensive) queries running at once
+            speculative_concurrency: Maximum number of speculative previews running at once
         """
         self._running_tasks = {}  # Dictionary to track running asyncio tasks
+        self.cost_estimator = cost_estimator or QueryCostEstimator()
+        self._low_priority_semaphore = asyncio.Semaphore(low_priority_concurrency)
+        self._cost_estimates: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # query_id -> pre-flight result
+        self._batches: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # batch_id -> batch information
+        self._admission_semaphores: Dict[str, asyncio.Semaphore] = {}  # db_id -> admission limit
+        self._background_tasks: Set[asyncio.Task] = set()  # Slow query plan captures in progress
+        self._speculative_semaphore = asyncio.Semaphore(speculative_concurrency)
+        self._speculative_previews: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # query_id -> speculative preview
     
     async def execute_query(
         self, 
@@ -35,7 +90,11 @@ class QueryExecutionService:
         sql: str, 
         query_id: Optional[str] = None,
         timeout: Optional[int] = 300,  # Default timeout of 5 minutes
-        max_rows: Optional[int] = 10000  # Default max rows
+        max_rows: Optional[int] = 10000,  # Default max rows
+        limit_settings: Optional[QueryLimitPolicySettings] = None,
+        preview: bool = False,
+        sample_percent: Optional[float] = None,
+        sample_table: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Execute a SQL query asynchronously.
@@ -47,15 +106,33 @@ class QueryExecutionService:
             query_id: Optional query ID (if updating an existing query)
             timeout: Optional query timeout in seconds
             max_rows: Optional maximum number of rows to return
+            limit_settings: Optional query limit policy. If it defines cost thresholds,
+                the query's plan is estimated before execution.
+            preview: Whether to run an approximate preview on a sample of the query's table
+            sample_percent: Sample size of the preview in percent (defaults to PREVIEW_SAMPLE_PERCENT)
+            sample_table: Table sampled by the preview (defaults to the first table of the FROM clause)
             
         Returns:
             Dictionary with query execution information
         """
+        sampled = None
         try:
             # Generate query ID if not provided
             if not query_id:
                 query_id = str(uuid.uuid4())
             
+            # An approximate preview reads a sample of the table and gets a short timeout
+            if preview:
+                db_config = self._get_db_config(db_id)
+                sampled = build_sampled_query(
+                    sql, db_config.type, sample_percent or settings.PREVIEW_SAMPLE_PERCENT, table=sample_table
+                )
+                timeout = min(timeout or settings.PREVIEW_TIMEOUT_SECONDS, settings.PREVIEW_TIMEOUT_SECONDS)
+            executed_sql = sampled.sql if sampled else sql
+            
+            # A speculative preview started after SQL generation is only reused for the unchanged SQL of the same user
+            speculative = self._take_speculative_preview(query_id, db_id, user_id, None if sampled else sql)
+            
             # Log the query execution request
             log_event("execute_query_request", {
                 "user_id": user_id,
@@ -63,7 +140,8 @@ class QueryExecutionService:
                 "query_id": query_id,
                 "sql": sql,
                 "timeout": timeout,
-                "max_rows": max_rows
+                "max_rows": max_rows,
+                "preview": preview
             })
             
             # Update query status to EXECUTING if it exists
@@ -71,19 +149,22 @@ class QueryExecutionService:
             if query:
                 await update_query(query_id, QueryUpdate(
                     status=QueryStatus.EXECUTING,
-                    executed_sql=sql,
+                    executed_sql=executed_sql,
                     start_time=datetime.utcnow()
                 ))
             
-            # Start the query execution as a background task
+            # Start the query execution as a background task once the database admits it
             task = asyncio.create_task(
-                self._execute_query_task(
+                self._execute_admitted_query(
                     user_id=user_id,
                     db_id=db_id,
-                    sql=sql,
+                    sql=executed_sql,
                     query_id=query_id,
                     timeout=timeout,
-                    max_rows=max_rows
+                    max_rows=max_rows,
+                    limit_settings=limit_settings,
+                    sampled=sampled,
+                    speculative=speculative
                 )
             )
             
@@ -91,11 +172,20 @@ class QueryExecutionService:
             self._running_tasks[query_id] = task
             
             # Return immediately with the query ID
-            return {
+            response = {
                 "query_id": query_id,
                 "status": QueryStatus.EXECUTING.value,
                 "start_time": datetime.utcnow().isoformat()
             }
+            if sampled:
+                response.update({
+                    "approximate": True,
+                    "executed_sql": sampled.sql,
+                    "sampled_table": sampled.table,
+                    "sample_percent": sampled.percent,
+                    "sampling_method": sampled.method
+                })
+            return response
             
         except Exception as e:
             log_error("execute_query_error", str(e), {
@@ -116,8 +206,295 @@ class QueryExecutionService:
                 except Exception as update_error:
                     logger.error(f"Failed to update query status: {str(update_error)}")
             
+            # Count the failure against the model route that generated the SQL
+            record_execution_failure(sql)
+            
             raise
     
+    async def execute_exact(
+        self,
+        user_id: str,
+        query_id: str,
+        timeout: Optional[int] = 300,
+        max_rows: Optional[int] = 10000,
+        limit_settings: Optional[QueryLimitPolicySettings] = None
+    ) -> Dict[str, Any]:
+        """
+        Run the exact query of an approximate preview under the same query ID.
+        The exact result replaces the preview result once it completes.
+        
+        Args:
+            user_id: User ID
+            query_id: Query ID of the preview
+            timeout: Optional query timeout in seconds
+            max_rows: Optional maximum number of rows to return
+            limit_settings: Optional query limit policy with cost thresholds
+            
+        Returns:
+            Dictionary with query execution information
+            
+        Raises:
+            ValueError: If the query is not found, still running or not a preview
+        """
+        query = await get_query_by_id(query_id)
+        if not query:
+            raise ValueError(f"Query with ID {query_id} not found")
+        if query_id in self._running_tasks:
+            raise ValueError(f"Query with ID {query_id} is still running")
+        
+        result = await get_query_result_by_id(query.result_id) if query.result_id else None
+        if not result or not result.approximation:
+            raise ValueError(f"Query with ID {query_id} has no approximate preview result")
+        
+        return await self.execute_query(
+            user_id=user_id,
+            db_id=query.db_id,
+            sql=result.approximation["original_sql"],
+            query_id=query_id,
+            timeout=timeout,
+            max_rows=max_rows,
+            limit_settings=limit_settings
+        )
+    
+    async def execute_many(
+        self,
+        user_id: str,
+        db_id: str,
+        statements: List[str],
+        labels: Optional[List[Optional[str]]] = None,
+        timeout: Optional[int] = 300,
+        max_rows: Optional[int] = 10000,
+        limit_settings: Optional[QueryLimitPolicySettings] = None,
+        max_concurrency: Optional[int] = None,
+        wait: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Execute several independent SQL queries against one database concurrently.
+        
+        Every statement gets its own query record and can be polled or cancelled like a
+        single query. Statements of all batches and single queries on a database share its
+        connection pool and are admitted up to the pool size, so a batch never exhausts the pool.
+        
+        Args:
+            user_id: User ID
+            db_id: Database ID
+            statements: SQL queries to execute
+            labels: Optional label per statement (e.g. dashboard widget name)
+            timeout: Optional timeout per query in seconds
+            max_rows: Optional maximum number of rows per query
+            limit_settings: Optional query limit policy applied to every query
+            max_concurrency: Optional maximum number of statements of this batch running at once
+            wait: Whether to wait for all statements and return their final status
+            
+        Returns:
+            Dictionary with the batch ID and per-statement query information
+            
+        Raises:
+            ValueError: If no statements are given or the labels do not match the statements
+        """
+        if not statements:
+            raise ValueError("At least one statement is required")
+        if labels is not None and len(labels) != len(statements):
+            raise ValueError("The number of labels must match the number of statements")
+        
+        batch_id = str(uuid.uuid4())
+        log_event("execute_batch_request", {
+            "user_id": user_id,
+            "db_id": db_id,
+            "batch_id": batch_id,
+            "statement_count": len(statements)
+        })
+        
+        # Create a query record per statement so that each one can be polled and cancelled
+        query_ids = []
+        for index, sql in enumerate(statements):
+            label = labels[index] if labels and labels[index] else f"Batch {batch_id} statement {index + 1}"
+            created_query = await create_query(QueryCreate(
+                user_id=user_id,
+                db_id=db_id,
+                natural_language=label,
+                generated_sql=sql,
+                executed_sql=sql
+            ))
+            query_ids.append(created_query.id)
+        
+        concurrency = max(1, min(max_concurrency or self.BATCH_MAX_CONCURRENCY, len(statements)))
+        batch_semaphore = asyncio.Semaphore(concurrency)
+        admission_semaphore = self._get_admission_semaphore(db_id)
+        
+        tasks = []
+        for query_id, sql in zip(query_ids, statements):
+            task = asyncio.create_task(
+                self._execute_batch_query(
+                    batch_semaphore=batch_semaphore,
+                    admission_semaphore=admission_semaphore,
+                    user_id=user_id,
+                    db_id=db_id,
+                    sql=sql,
+                    query_id=query_id,
+                    timeout=timeout,
+                    max_rows=max_rows,
+                    limit_settings=limit_settings
+                )
+            )
+            self._running_tasks[query_id] = task
+            tasks.append(task)
+        
+        self._batches[batch_id] = {
+            "user_id": user_id,
+            "db_id": db_id,
+            "query_ids": query_ids,
+            "created_at": datetime.utcnow()
+        }
+        while len(self._batches) > self.MAX_BATCHES:
+            self._batches.popitem(last=False)
+        
+        if wait:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            return await self.get_batch_status(batch_id)
+        
+        return {
+            "batch_id": batch_id,
+            "db_id": db_id,
+            "status": QueryStatus.EXECUTING.value,
+            "queries": [
+                {"index": index, "query_id": query_id, "status": QueryStatus.PENDING.value}
+                for index, query_id in enumerate(query_ids)
+            ],
+            "start_time": datetime.utcnow().isoformat()
+        }
+    
+    def _get_admission_semaphore(self, db_id: str) -> asyncio.Semaphore:
+        """
+        Get the semaphore limiting concurrent queries on a database to its pool size.
+        
+        Args:
+            db_id: Database ID
+            
+        Returns:
+            Semaphore shared by single queries and all batches on the database
+        """
+        if db_id not in self._admission_semaphores:
+            pool_manager = connector_factory.get_connection_pool_manager()
+            limit = getattr(pool_manager, "max_pool_size", None)
+            if not isinstance(limit, int) or limit <= 0:
+                limit = self.DEFAULT_ADMISSION_LIMIT
+            self._admission_semaphores[db_id] = asyncio.Semaphore(limit)
+        return self._admission_semaphores[db_id]
+    
+    async def _execute_admitted_query(self, db_id: str, query_id: str, **kwargs: Any) -> None:
+        """
+        Run a single query once the database admits it, so that single queries and batch
+        statements together never hold more connections than the pool provides.
+        
+        Args:
+            db_id: Database ID
+            query_id: Query ID
+            **kwargs: Remaining arguments of _execute_query_task
+        """
+        try:
+            async with self._get_admission_semaphore(db_id):
+                await self._execute_query_task(db_id=db_id, query_id=query_id, **kwargs)
+        finally:
+            # Queued queries that were cancelled never reach the query task
+            self._running_tasks.pop(query_id, None)
+    
+    async def _execute_batch_query(
+        self,
+        batch_semaphore: asyncio.Semaphore,
+        admission_semaphore: asyncio.Semaphore,
+        user_id: str,
+        db_id: str,
+        sql: str,
+        query_id: str,
+        timeout: Optional[int],
+        max_rows: Optional[int],
+        limit_settings: Optional[QueryLimitPolicySettings]
+    ) -> None:
+        """
+        Run one statement of a batch once the batch and the database admit it.
+        
+        Args:
+            batch_semaphore: Concurrency limit of the batch
+            admission_semaphore: Concurrency limit of the database
+            user_id: User ID
+            db_id: Database ID
+            sql: SQL query to execute
+            query_id: Query ID
+            timeout: Query timeout in seconds
+            max_rows: Maximum number of rows to return
+            limit_settings: Optional query limit policy
+        """
+        try:
+            async with batch_semaphore, admission_semaphore:
+                await update_query(query_id, QueryUpdate(
+                    status=QueryStatus.EXECUTING,
+                    start_time=datetime.utcnow()
+                ))
+                await self._execute_query_task(
+                    user_id=user_id,
+                    db_id=db_id,
+                    sql=sql,
+                    query_id=query_id,
+                    timeout=timeout,
+                    max_rows=max_rows,
+                    limit_settings=limit_settings
+                )
+        finally:
+            # Queued statements that were cancelled never reach the query task
+            self._running_tasks.pop(query_id, None)
+    
+    async def get_batch_status(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Get the status of a batch and of each of its statements.
+        
+        Args:
+            batch_id: Batch ID
+            
+        Returns:
+            Dictionary with aggregated counts and per-statement query status
+            
+        Raises:
+            ValueError: If the batch is not found
+        """
+        batch = self._batches.get(batch_id)
+        if batch is None:
+            raise ValueError(f"Batch with ID {batch_id} not found")
+        
+        statuses = await asyncio.gather(
+            *(self.get_query_status(query_id) for query_id in batch["query_ids"]),
+            return_exceptions=True
+        )
+        
+        queries = []
+        counts = {status.value: 0 for status in QueryStatus}
+        for index, (query_id, query_status) in enumerate(zip(batch["query_ids"], statuses)):
+            if isinstance(query_status, Exception):
+                query_status = {"query_id": query_id, "status": QueryStatus.FAILED.value, "error": str(query_status)}
+            status_value = getattr(query_status["status"], "value", query_status["status"])
+            counts[status_value] = counts.get(status_value, 0) + 1
+            queries.append({"index": index, **query_status})
+        
+        if counts[QueryStatus.PENDING.value] or counts[QueryStatus.EXECUTING.value]:
+            batch_status = QueryStatus.EXECUTING.value
+        elif counts[QueryStatus.COMPLETED.value] == len(queries):
+            batch_status = QueryStatus.COMPLETED.value
+        elif counts[QueryStatus.COMPLETED.value]:
+            batch_status = "partially_completed"
+        else:
+            batch_status = QueryStatus.FAILED.value
+        
+        return {
+            "batch_id": batch_id,
+            "user_id": batch["user_id"],
+            "db_id": batch["db_id"],
+            "status": batch_status,
+            "total": len(queries),
+            "counts": counts,
+            "queries": queries,
+            "created_at": batch["created_at"].isoformat()
+        }
+    
     async def _execute_query_task(
         self, 
         user_id: str, 
@@ -125,7 +502,10 @@ class QueryExecutionService:
         sql: str, 
         query_id: str,
         timeout: Optional[int],
-        max_rows: Optional[int]
+        max_rows: Optional[int],
+        limit_settings: Optional[QueryLimitPolicySettings] = None,
+        sampled: Optional[SampledQuery] = None,
+        speculative: Optional[Dict[str, Any]] = None
     ) -> None:
         """
         Background task for executing a SQL query.
@@ -137,59 +517,90 @@ class QueryExecutionService:
             query_id: Query ID
             timeout: Query timeout in seconds
             max_rows: Maximum number of rows to return
+            limit_settings: Optional query limit policy with cost thresholds
+            sampled: Sampled query of an approximate preview (sql is its rewritten SQL)
+            speculative: Speculative preview of the same SQL whose result is adopted if it is complete
         """
         result_id = None
+        db_config = None
+        connector = None
+        task_start = time.monotonic()
+        execution_start = None
+        timer = PhaseTimer()
         try:
             # Get database configuration
-            # In a real implementation, this would fetch the actual database config
-            # For now, we'll create a dummy config
-            db_config = Database(
-                id=db_id,
-                name=f"Database {db_id}",
-                type="mssql" if db_id == "db1" else "hana",
-                host="localhost",
-                port=1433 if db_id == "db1" else 30015,
-                default_schema="dbo" if db_id == "db1" else "SYSTEM"
-            )
+            db_config = self._get_db_config(db_id)
             
             # Get the appropriate connector for this database type
             connector = connector_factory.create_connector(db_config)
             
             # Check if the query is read-only
-            if not connector.is_read_only_query(sql):
+            with timer.phase("validation"):
+                is_read_only = connector.is_read_only_query(sql)
+            if not is_read_only:
                 raise ValueError("Only read-only queries are allowed")
             
-            # Execute the query with timeout
-            result = await asyncio.wait_for(
-                asyncio.to_thread(
-                    connector.execute_query,
-                    db_config=db_config,
-                    query=sql,
-                    timeout=timeout,
-                    max_rows=max_rows
-                ),
-                timeout=timeout if timeout else None
-            )
+            # Pre-flight cost estimation (only when the policy defines cost thresholds)
+            decision = CostDecision.ALLOW
+            if has_cost_thresholds(limit_settings):
+                with timer.phase("cost_estimation"):
+                    decision = await self._check_query_cost(
+                        user_id, db_config, connector, sql, query_id, limit_settings
+                    )
             
-            # Create query result record
-            result_create = QueryResultCreate(
-                query_id=query_id,
-                columns=result.columns,
-                rows=result.rows,
-                row_count=result.row_count,
-                truncated=result.truncated,
-                total_row_count=result.total_row_count
-            )
+            # Adopt the result of a speculative preview if it holds the complete result
+            result = None
+            if speculative is not None:
+                result = await self._adopt_speculative_preview(speculative, max_rows, timer)
             
-            created_result = await create_query_result(result_create)
-            result_id = created_result.id
+            # Execute the query with timeout (expensive queries share a limited number of slots).
+            # The connector records conversion, connection, execution and fetch phases on the active timer.
+            if result is None:
+                if decision == CostDecision.LOW_PRIORITY:
+                    with timer.phase("queue_wait"):
+                        await self._low_priority_semaphore.acquire()
+                    try:
+                        execution_start = time.monotonic()
+                        with timer.activate():
+                            result = await self._run_connector_query(connector, db_config, sql, timeout, max_rows)
+                    finally:
+                        self._low_priority_semaphore.release()
+                else:
+                    execution_start = time.monotonic()
+                    with timer.activate():
+                        result = await self._run_connector_query(connector, db_config, sql, timeout, max_rows)
+                execution_ms = (time.monotonic() - execution_start) * 1000
+                
+                await self._record_workload(db_id, sql, execution_ms, row_count=result.row_count)
             
-            # Update query status to COMPLETED
-            await update_query(query_id, QueryUpdate(
-                status=QueryStatus.COMPLETED,
-                end_time=datetime.utcnow(),
-                result_id=result_id
-            ))
+            # Scale the aggregates of a preview to estimates for the full table
+            approximation = None
+            if sampled is not None:
+                result, approximation = scale_sampled_result(result, sampled)
+            
+            with timer.phase("persistence"):
+                # Create query result record
+                result_create = QueryResultCreate(
+                    query_id=query_id,
+                    columns=result.columns,
+                    rows=result.rows,
+                    row_count=result.row_count,
+                    truncated=result.truncated,
+                    total_row_count=result.total_row_count,
+                    approximation=approximation
+                )
+                
+                created_result = await create_query_result(result_create)
+                result_id = created_result.id
+                
+                # Update query status to COMPLETED
+                await update_query(query_id, QueryUpdate(
+                    status=QueryStatus.COMPLETED,
+                    end_time=datetime.utcnow(),
+                    result_id=result_id
+                ))
+            
+            await self._store_phase_timings(query_id, timer)
             
             log_event("execute_query_completed", {
                 "user_id": user_id,
@@ -197,15 +608,24 @@ class QueryExecutionService:
                 "query_id": query_id,
                 "result_id": result_id,
                 "row_count": result.row_count,
-                "truncated": result.truncated
+                "truncated": result.truncated,
+                "approximate": approximation is not None,
+                "speculative": speculative is not None and execution_start is None,
+                "phase_timings": timer.timings
             })
             
+            self._check_slow_query(
+                user_id, db_id, sql, query_id, connector, db_config, task_start, timer.timings,
+                row_count=result.row_count
+            )
+            
         except asyncio.CancelledError:
             # Query was cancelled
             await update_query(query_id, QueryUpdate(
                 status=QueryStatus.CANCELLED,
                 end_time=datetime.utcnow()
             ))
+            await self._store_phase_timings(query_id, timer)
             
             log_event("execute_query_cancelled", {
                 "user_id": user_id,
@@ -217,17 +637,28 @@ class QueryExecutionService:
             # Query execution failed
             error_message = str(e)
             
+            # Only statements that reached the database count towards the workload and slow query log
+            if execution_start is not None:
+                await self._record_workload(db_id, sql, (time.monotonic() - execution_start) * 1000, error=True)
+                self._check_slow_query(
+                    user_id, db_id, sql, query_id, connector, db_config, task_start, timer.timings,
+                    error=error_message
+                )
+            
             await update_query(query_id, QueryUpdate(
                 status=QueryStatus.FAILED,
                 error=error_message,
                 end_time=datetime.utcnow()
             ))
+            await self._store_phase_timings(query_id, timer)
+            record_execution_failure(sql)
             
             log_error("execute_query_failed", error_message, {
                 "user_id": user_id,
                 "db_id": db_id,
                 "query_id": query_id,
-                "sql": sql
+                "sql": sql,
+                "phase_timings": timer.timings
             })
             
         finally:
@@ -235,6 +666,580 @@ class QueryExecutionService:
             if query_id in self._running_tasks:
                 del self._running_tasks[query_id]
     
+    async def start_speculative_preview(
+        self,
+        user_id: str,
+        db_id: str,
+        sql: str,
+        query_id: str,
+        limit_settings: Optional[QueryLimitPolicySettings] = None
+    ) -> bool:
+        """
+        Start a row-limited, low priority preview of freshly generated SQL while the user reviews it.
+        If the unchanged SQL is executed later, the preview result is adopted when it is complete.
+        
+        The preview is capped at SPECULATIVE_PREVIEW_MAX_ROWS to bound the work spent before the
+        user confirms. This is intended: a preview that hits the cap (truncated) does not hold the
+        complete result for an execution that requests more rows, so that execution runs the full
+        query from scratch and the preview only saved time for results within the cap.
+        
+        Args:
+            user_id: User ID
+            db_id: Database ID
+            sql: Generated SQL query
+            query_id: Query ID of the generated SQL
+            limit_settings: Optional query limit policy. Queries the policy would not
+                run right away are not previewed.
+            
+        Returns:
+            True if a preview was started, False if the query is not eligible
+        """
+        try:
+            db_config = self._get_db_config(db_id)
+            connector = connector_factory.create_connector(db_config)
+            if not connector.is_read_only_query(sql):
+                return False
+        except Exception as e:
+            logger.warning(f"Speculative preview of query {query_id} not started: {str(e)}")
+            return False
+        
+        self.discard_speculative_preview(query_id)
+        entry = {
+            "user_id": user_id,
+            "db_id": db_id,
+            "sql": sql,
+            "started": False,
+            "result": None,
+            "phase_timings": {},
+            "completed_at": None
+        }
+        entry["task"] = asyncio.create_task(
+            self._run_speculative_preview(entry, connector, db_config, query_id, limit_settings)
+        )
+        self._speculative_previews[query_id] = entry
+        while len(self._speculative_previews) > self.MAX_SPECULATIVE_PREVIEWS:
+            self.discard_speculative_preview(next(iter(self._speculative_previews)))
+        
+        log_event("speculative_preview_started", {
+            "user_id": user_id,
+            "db_id": db_id,
+            "query_id": query_id
+        })
+        return True
+    
+    async def _run_speculative_preview(
+        self,
+        entry: Dict[str, Any],
+        connector: Any,
+        db_config: Database,
+        query_id: str,
+        limit_settings: Optional[QueryLimitPolicySettings]
+    ) -> None:
+        """
+        Background task running a speculative preview. The result is kept on the entry.
+        
+        Args:
+            entry: Speculative preview entry
+            connector: Database connector
+            db_config: Database configuration
+            query_id: Query ID
+            limit_settings: Optional query limit policy with cost thresholds
+        """
+        timer = PhaseTimer()
+        execution_start = None
+        try:
+            # Expensive queries are not run speculatively
+            if has_cost_thresholds(limit_settings):
+                estimate = await asyncio.to_thread(self.cost_estimator.estimate, connector, db_config, entry["sql"])
+                if estimate is not None and evaluate_cost(estimate, limit_settings)[0] != CostDecision.ALLOW:
+                    return
+            
+            with timer.phase("queue_wait"):
+                await self._speculative_semaphore.acquire()
+            try:
+                entry["started"] = True
+                execution_start = time.monotonic()
+                with timer.activate():
+                    result = await self._run_connector_query(
+                        connector, db_config, entry["sql"],
+                        settings.SPECULATIVE_PREVIEW_TIMEOUT_SECONDS, settings.SPECULATIVE_PREVIEW_MAX_ROWS
+                    )
+            finally:
+                self._speculative_semaphore.release()
+            
+            await self._record_workload(
+                db_config.id, entry["sql"], (time.monotonic() - execution_start) * 1000, row_count=result.row_count
+            )
+            entry["result"] = result
+            entry["phase_timings"] = timer.timings
+            entry["completed_at"] = time.monotonic()
+            
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if execution_start is not None:
+                await self._record_workload(
+                    db_config.id, entry["sql"], (time.monotonic() - execution_start) * 1000, error=True
+                )
+            log_event("speculative_preview_failed", {
+                "db_id": db_config.id,
+                "query_id": query_id,
+                "error": str(e)
+            })
+    
+    def discard_speculative_preview(self, query_id: str) -> bool:
+        """
+        Cancel and forget the speculative preview of a query (e.g. after its SQL was edited).
+        
+        Args:
+            query_id: Query ID
+            
+        Returns:
+            True if a preview was discarded
+        """
+        entry = self._speculative_previews.pop(query_id, None)
+        if entry is None:
+            return False
+        entry["task"].cancel()
+        return True
+    
+    def _take_speculative_preview(
+        self, query_id: str, db_id: str, user_id: str, sql: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Take the speculative preview of a query for execution.
+        Previews of different SQL, previews that have not started and stale results are discarded.
+        A preview started for another user is never handed out and is left for its owner.
+        
+        Args:
+            query_id: Query ID
+            db_id: Database ID of the execution
+            user_id: User executing the query
+            sql: SQL being executed (None discards any preview)
+            
+        Returns:
+            Speculative preview entry, or None if there is no usable preview
+        """
+        entry = self._speculative_previews.get(query_id)
+        if entry is None:
+            return None
+        if entry["user_id"] != user_id:
+            logger.warning(f"Speculative preview of query {query_id} belongs to another user and is not reused")
+            return None
+        
+        is_stale = (
+            entry["completed_at"] is not None
+            and time.monotonic() - entry["completed_at"] > settings.SPECULATIVE_PREVIEW_MAX_AGE_SECONDS
+        )
+        unchanged = sql is not None and entry["db_id"] == db_id and " ".join(entry["sql"].split()) == " ".join(sql.split())
+        if not unchanged or not entry["started"] or is_stale:
+            self.discard_speculative_preview(query_id)
+            return None
+        
+        del self._speculative_previews[query_id]
+        return entry
+    
+    async def _adopt_speculative_preview(
+        self,
+        entry: Dict[str, Any],
+        max_rows: Optional[int],
+        timer: PhaseTimer
+    ) -> Optional[QueryResult]:
+        """
+        Wait for a speculative preview and adopt its result if it is complete for the execution.
+        
+        Args:
+            entry: Speculative preview entry
+            max_rows: Maximum number of rows of the execution
+            timer: Phase timer of the execution (receives the preview's phases if adopted)
+            
+        Returns:
+            Query result, or None if the full query has to run
+        """
+        await asyncio.wait([entry["task"]])
+        result = entry["result"]
+        if result is None:
+            return None
+        
+        # A truncated preview holds the complete result only if no more rows are requested;
+        # otherwise the full query runs from scratch (see start_speculative_preview)
+        if result.truncated and (not max_rows or max_rows > result.row_count):
+            log_event("speculative_preview_incomplete", {
+                "db_id": entry["db_id"],
+                "row_count": result.row_count,
+                "max_rows": max_rows
+            })
+            return None
+        if max_rows and result.row_count > max_rows:
+            result = result.model_copy(update={
+                "rows": result.rows[:max_rows], "row_count": max_rows, "truncated": True
+            })
+        
+        for phase, duration_ms in entry["phase_timings"].items():
+            if phase != "queue_wait":
+                timer.add(phase, duration_ms)
+        return result
+    
+    async def _store_phase_timings(self, query_id: str, timer: PhaseTimer) -> None:
+        """
+        Store the execution phase timings on the query record, next to the phases
+        measured while the SQL was generated.
+        Failures are logged and never affect the query itself.
+        
+        Args:
+            query_id: Query ID
+            timer: Phase timer of the execution
+        """
+        try:
+            await merge_query_phase_timings(query_id, timer.timings)
+        except Exception as e:
+            logger.warning(f"Failed to store phase timings for query {query_id}: {str(e)}")
+    
+    async def _record_workload(
+        self,
+        db_id: str,
+        sql: str,
+        duration_ms: float,
+        row_count: int = 0,
+        error: bool = False
+    ) -> None:
+        """
+        Add an executed statement to the workload statistics of its fingerprint.
+        Failures are logged and never affect the query itself.
+        
+        Args:
+            db_id: Database ID
+            sql: Executed SQL query
+            duration_ms: Execution time in milliseconds
+            row_count: Number of returned rows
+            error: Whether the execution failed
+        """
+        try:
+            # No result cache exists yet, so every execution is a cache miss
+            await record_fingerprint_execution(
+                sql_shape_fingerprint(sql), db_id, sql, duration_ms,
+                row_count=row_count, error=error, cache_hit=False
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record workload statistics for database {db_id}: {str(e)}")
+    
+    def _check_slow_query(
+        self,
+        user_id: str,
+        db_id: str,
+        sql: str,
+        query_id: str,
+        connector: Any,
+        db_config: Database,
+        task_start: float,
+        phase_timings: Dict[str, float],
+        row_count: Optional[int] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """
+        Log a query in the slow query log if it exceeded the threshold.
+        The plan is captured in the background so that the query itself is not delayed.
+        
+        Args:
+            user_id: User ID
+            db_id: Database ID
+            sql: Executed SQL query
+            query_id: Query ID
+            connector: Database connector that ran the query
+            db_config: Database configuration
+            task_start: Monotonic time the query task started
+            phase_timings: Duration of each lifecycle phase in milliseconds
+            row_count: Number of returned rows, if the query completed
+            error: Error message, if the query failed
+        """
+        duration_ms = (time.monotonic() - task_start) * 1000
+        if duration_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+            return
+        
+        task = asyncio.create_task(self._log_slow_query({
+            "query_id": query_id,
+            "user_id": user_id,
+            "db_id": db_id,
+            "fingerprint": sql_shape_fingerprint(sql),
+            "sql": sql,
+            "status": (QueryStatus.FAILED if error else QueryStatus.COMPLETED).value,
+            "error": error,
+            "duration_ms": round(duration_ms, 3),
+            "phase_timings": dict(phase_timings),
+            "row_count": row_count
+        }, connector, db_config))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    async def _log_slow_query(self, entry: Dict[str, Any], connector: Any, db_config: Database) -> None:
+        """
+        Capture the execution plan of a slow query and store it in the slow query log.
+        Failures are logged and never affect the query itself.
+        
+        Args:
+            entry: Slow query log entry without plan
+            connector: Database connector that ran the query
+            db_config: Database configuration
+        """
+        if settings.SLOW_QUERY_CAPTURE_PLAN:
+            try:
+                estimate = await asyncio.wait_for(
+                    asyncio.to_thread(connector.capture_plan, db_config, entry["sql"], self.PLAN_CAPTURE_TIMEOUT),
+                    timeout=self.PLAN_CAPTURE_TIMEOUT
+                )
+                if estimate is not None:
+                    entry.update(
+                        plan=estimate.plan,
+                        plan_source=estimate.plan_source,
+                        estimated_cost=estimate.estimated_cost,
+                        estimated_rows=estimate.estimated_rows
+                    )
+            except Exception as e:
+                entry["plan_error"] = str(e) or type(e).__name__
+        
+        try:
+            await create_slow_query_log(
+                entry,
+                max_entries=settings.SLOW_QUERY_LOG_MAX_ENTRIES,
+                retention_days=settings.SLOW_QUERY_LOG_RETENTION_DAYS
+            )
+            log_event("slow_query_logged", {
+                "user_id": entry["user_id"],
+                "db_id": entry["db_id"],
+                "query_id": entry["query_id"],
+                "duration_ms": entry["duration_ms"]
+            })
+        except Exception as e:
+            logger.warning(f"Failed to write slow query log entry for query {entry['query_id']}: {str(e)}")
+    
+    def _get_db_config(self, db_id: str) -> Database:
+        """
+        Get the configuration of a database.
+        
+        Args:
+            db_id: Database ID
+            
+        Returns:
+            Database configuration
+        """
+        # In a real implementation, this would fetch the actual database config
+        # For now, we'll create a dummy config
+        return Database(
+            id=db_id,
+            name=f"Database {db_id}",
+            type="mssql" if db_id == "db1" else "hana",
+            host="localhost",
+            port=1433 if db_id == "db1" else 30015,
+            default_schema="dbo" if db_id == "db1" else "SYSTEM"
+        )
+    
+    async def get_lob_value(self, query_id: str, row_index: int, column_name: str) -> Dict[str, Any]:
+        """
+        Get the full value of a result cell that was stored as a LOB placeholder.
+        The query is executed again to read the value. The row is located by its primary key
+        when the result contains one; otherwise by position, which needs a stable row order.
+        The value read is checked against the preview stored for the cell.
+        
+        Args:
+            query_id: Query ID
+            row_index: Zero-based row index in the stored result
+            column_name: Column name
+            
+        Returns:
+            Dictionary with the cell value (binary values are base64 encoded)
+            
+        Raises:
+            ValueError: If the query, result, row or column is not found, or the row
+                read again no longer matches the stored cell
+        """
+        query = await get_query_by_id(query_id)
+        if not query:
+            raise ValueError(f"Query with ID {query_id} not found")
+        if not query.result_id:
+            raise ValueError(f"Query {query_id} has no result")
+        
+        result = await get_query_result_by_id(query.result_id)
+        if not result:
+            raise ValueError(f"Result of query {query_id} not found")
+        
+        # Stored columns are JSON dictionaries or ResultColumn models
+        column_names = [column["name"] if isinstance(column, dict) else column.name for column in result.columns]
+        if column_name not in column_names:
+            raise ValueError(f"Column {column_name} not found in query result")
+        if not 0 <= row_index < len(result.rows):
+            raise ValueError(f"Row {row_index} not found in query result")
+        
+        row = result.rows[row_index]
+        value = row[column_names.index(column_name)]
+        if is_lob_placeholder(value):
+            placeholder = value
+            sql = query.executed_sql or query.generated_sql
+            db_config = self._get_db_config(query.db_id)
+            connector = connector_factory.create_connector(db_config)
+            row_key = await self._get_lob_row_key(connector, db_config, sql, column_names, row)
+            value = await asyncio.to_thread(
+                connector.fetch_lob_value, db_config, sql, row_index, column_name, row_key=row_key
+            )
+            
+            # Without a stable ORDER BY the re-executed query may return another row at this position
+            if not lob_matches_placeholder(placeholder, value):
+                raise ValueError(
+                    f"Row {row_index} of query {query_id} no longer matches the stored result; "
+                    f"execute the query again with a stable ORDER BY"
+                )
+        
+        encoding = None
+        if isinstance(value, (bytes, bytearray)):
+            value = base64.b64encode(value).decode("ascii")
+            encoding = "base64"
+        
+        return {
+            "query_id": query_id,
+            "row": row_index,
+            "column": column_name,
+            "value": value,
+            "encoding": encoding
+        }
+    
+    async def _get_lob_row_key(
+        self,
+        connector: Any,
+        db_config: Database,
+        sql: str,
+        column_names: List[str],
+        row: List[Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the primary key values identifying a stored result row, if the query reads a single
+        table and its result contains the whole primary key.
+        
+        Args:
+            connector: Database connector
+            db_config: Database configuration
+            sql: Query that produced the result
+            column_names: Column names of the stored result
+            row: Stored result row
+            
+        Returns:
+            Primary key values by column name, or None if the row cannot be keyed
+        """
+        tables = _TABLE_REFERENCE_PATTERN.findall(sql)
+        if len(tables) != 1 or _COMMA_JOIN_PATTERN.search(sql):
+            return None
+        
+        parts = [part.strip('"[]`') for part in tables[0].split(".")]
+        table_name, schema_name = parts[-1], (parts[-2] if len(parts) > 1 else None)
+        
+        try:
+            schema = await asyncio.to_thread(connector.get_schema, db_config)
+        except Exception as e:
+            logger.warning(f"Could not read the schema to key LOB fetch for {table_name}: {e}")
+            return None
+        
+        for db_schema in schema.schemas:
+            if schema_name and db_schema.name.lower() != schema_name.lower():
+                continue
+            for table in db_schema.tables:
+                if table.name.lower() != table_name.lower() or not table.primary_key:
+                    continue
+                if not all(column in column_names for column in table.primary_key):
+                    return None
+                row_key = {column: row[column_names.index(column)] for column in table.primary_key}
+                # Only keys that survive JSON storage unchanged can be compared with fresh rows
+                if all(isinstance(value, (int, str)) for value in row_key.values()):
+                    return row_key
+                return None
+        
+        return None
+    
+    async def _check_query_cost(
+        self,
+        user_id: str,
+        db_config: Database,
+        connector: Any,
+        sql: str,
+        query_id: str,
+        limit_settings: QueryLimitPolicySettings
+    ) -> CostDecision:
+        """
+        Estimate the cost of a query and evaluate it against the query limit policy.
+        
+        Args:
+            user_id: User ID
+            db_config: Database configuration
+            connector: Database connector
+            sql: SQL query to execute
+            query_id: Query ID
+            limit_settings: Query limit policy with cost thresholds
+            
+        Returns:
+            Cost decision (ALLOW if no estimate is available)
+            
+        Raises:
+            ValueError: If the estimated cost exceeds the policy limits
+        """
+        estimate = await asyncio.to_thread(self.cost_estimator.estimate, connector, db_config, sql)
+        if estimate is None:
+            return CostDecision.ALLOW
+        
+        decision, reason = evaluate_cost(estimate, limit_settings)
+        
+        self._cost_estimates[query_id] = {
+            "estimated_rows": estimate.estimated_rows,
+            "estimated_cost": estimate.estimated_cost,
+            "decision": decision.value,
+            "reason": reason
+        }
+        while len(self._cost_estimates) > self.MAX_COST_ESTIMATES:
+            self._cost_estimates.popitem(last=False)
+        
+        if decision != CostDecision.ALLOW:
+            log_event("query_cost_" + decision.value, {
+                "user_id": user_id,
+                "db_id": db_config.id,
+                "query_id": query_id,
+                "estimated_rows": estimate.estimated_rows,
+                "estimated_cost": estimate.estimated_cost,
+                "reason": reason
+            })
+        
+        if decision == CostDecision.BLOCK:
+            raise ValueError(f"Query blocked by cost policy: {reason}")
+        
+        return decision
+    
+    async def _run_connector_query(
+        self,
+        connector: Any,
+        db_config: Database,
+        sql: str,
+        timeout: Optional[int],
+        max_rows: Optional[int]
+    ) -> QueryResult:
+        """
+        Run a query on a connector in a worker thread with a timeout.
+        
+        Args:
+            connector: Database connector
+            db_config: Database configuration
+            sql: SQL query to execute
+            timeout: Query timeout in seconds
+            max_rows: Maximum number of rows to return
+            
+        Returns:
+            Query result from the connector
+        """
+        return await asyncio.wait_for(
+            asyncio.to_thread(
+                connector.execute_query,
+                db_config=db_config,
+                query=sql,
+                timeout=timeout,
+                max_rows=max_rows
+            ),
+            timeout=timeout if timeout else None
+        )
+    
     async def get_query_status(self, query_id: str) -> Dict[str, Any]:
         """
         Get the status of a query.
@@ -270,6 +1275,8 @@ class QueryExecutionService:
             "natural_language": query.natural_language,
             "generated_sql": query.generated_sql,
             "executed_sql": query.executed_sql,
+            "cost_estimate": self._cost_estimates.get(query_id),
+            "phase_timings": query.phase_timings or {},
         }
         
         # Add result information if available
@@ -279,6 +1286,7 @@ class QueryExecutionService:
                 "truncated": result.truncated,
                 "total_row_count": result.total_row_count,
                 "column_count": len(result.columns),
+                "approximation": result.approximation,
                 "created_at": result.created_at.isoformat()
             }
         
@@ -19,10 +19,28 @@ from ..db.crud.system_log import (
     count_errors_by_period
 )
 from ..db.crud.user import get_users
-from ..db.crud.query_stats import get_query_count, get_recent_queries, get_avg_query_time, get_query_error_count
+from ..db.crud.query_stats import (
+    get_query_count,
+    get_recent_queries,
+    get_avg_query_time,
+    get_query_error_count,
+    get_fingerprint_stats,
+    get_phase_latency_percentiles
+)
+from ..db.crud.slow_query_log import (
+    get_slow_query_logs,
+    count_slow_query_logs,
+    get_slow_query_log,
+    trim_slow_query_logs
+)
 from ..db.models.user import User
 from ..db.models.system_log import SystemLog
 from ..db.models.query import QueryDB
+from ..llm.validation_cache import validation_cache
+from ..llm.nl_sql_cache import nl_sql_cache
+from ..llm.embedding_cache import embedding_cache
+from ..llm.hedging import get_hedging_stats
+from ..llm.model_router import get_model_routing_stats
 from ..models.system import (
     SystemLogCreate, 
     LogLevel, 
@@ -32,8 +50,11 @@ from ..models.system import (
     LogFilterParams,
     PaginatedSystemLogs,
     UserActivityStats,
-    UserActivityStatsResponse
+    UserActivityStatsResponse,
+    SlowQueryLogDetailResponse,
+    PaginatedSlowQueryLogs
 )
+from ..core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -102,6 +123,173 @@ class SystemMonitoringService:
         
         create_system_metric(db, metric_data)
     
+    @staticmethod
+    def get_validation_cache_stats() -> Dict[str, Any]:
+        """
+        Get SQL validation cache statistics
+        
+        Returns:
+            Current validation cache statistics
+        """
+        return validation_cache.get_stats()
+    
+    @staticmethod
+    def record_validation_cache_metrics(db: Session) -> Dict[str, Any]:
+        """
+        Record SQL validation cache statistics as system metrics
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            Current validation cache statistics
+        """
+        stats = SystemMonitoringService.get_validation_cache_stats()
+        
+        SystemMonitoringService.record_metric(
+            db,
+            metric_name="validation_cache_hit_rate",
+            metric_value=f"{stats['hit_rate']:.4f}",
+            details=stats
+        )
+        
+        return stats
+    
+    @staticmethod
+    def get_nl_sql_cache_stats() -> Dict[str, Any]:
+        """
+        Get NL→SQL generation cache statistics
+        
+        Returns:
+            Current generation cache statistics
+        """
+        return nl_sql_cache.get_stats()
+    
+    @staticmethod
+    def record_nl_sql_cache_metrics(db: Session) -> Dict[str, Any]:
+        """
+        Record NL→SQL generation cache statistics as system metrics
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            Current generation cache statistics
+        """
+        stats = SystemMonitoringService.get_nl_sql_cache_stats()
+        
+        SystemMonitoringService.record_metric(
+            db,
+            metric_name="nl_sql_cache_hit_rate",
+            metric_value=f"{stats['hit_rate']:.4f}",
+            details=stats
+        )
+        
+        return stats
+    
+    @staticmethod
+    def get_embedding_cache_stats() -> Dict[str, Any]:
+        """
+        Get persistent embedding cache statistics
+        
+        Returns:
+            Current embedding cache statistics
+        """
+        return embedding_cache.get_stats()
+    
+    @staticmethod
+    def record_embedding_cache_metrics(db: Session) -> Dict[str, Any]:
+        """
+        Record persistent embedding cache statistics as system metrics
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            Current embedding cache statistics
+        """
+        stats = SystemMonitoringService.get_embedding_cache_stats()
+        
+        SystemMonitoringService.record_metric(
+            db,
+            metric_name="embedding_cache_hit_rate",
+            metric_value=f"{stats['hit_rate']:.4f}",
+            details=stats
+        )
+        
+        return stats
+    
+    @staticmethod
+    def get_llm_hedging_stats() -> Dict[str, Any]:
+        """
+        Get hedged LLM request statistics
+        
+        Returns:
+            Totals across all models and per-model hedging statistics
+        """
+        callers = get_hedging_stats()
+        totals = {
+            key: sum(stats[key] for stats in callers.values())
+            for key in ("calls", "hedged", "hedge_wins", "fallbacks", "deadline_exceeded", "latency_saved_seconds")
+        }
+        totals["hedge_rate"] = totals["hedged"] / totals["calls"] if totals["calls"] else 0.0
+        return {**totals, "models": callers}
+    
+    @staticmethod
+    def record_llm_hedging_metrics(db: Session) -> Dict[str, Any]:
+        """
+        Record hedged LLM request statistics as system metrics
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            Totals across all models and per-model hedging statistics
+        """
+        stats = SystemMonitoringService.get_llm_hedging_stats()
+        
+        SystemMonitoringService.record_metric(
+            db,
+            metric_name="llm_hedge_rate",
+            metric_value=f"{stats['hedge_rate']:.4f}",
+            details=stats
+        )
+        
+        return stats
+    
+    @staticmethod
+    def get_model_routing_stats() -> Dict[str, Any]:
+        """
+        Get model routing statistics
+        
+        Returns:
+            Routing statistics per fast/strong model pair
+        """
+        return get_model_routing_stats()
+    
+    @staticmethod
+    def record_model_routing_metrics(db: Session) -> Dict[str, Any]:
+        """
+        Record model routing statistics as system metrics
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            Routing statistics per fast/strong model pair
+        """
+        stats = SystemMonitoringService.get_model_routing_stats()
+        
+        for name, router_stats in stats.items():
+            SystemMonitoringService.record_metric(
+                db,
+                metric_name="llm_fast_route_win_rate",
+                metric_value=f"{router_stats['fast']['win_rate']:.4f}",
+                details={"router": name, **router_stats}
+            )
+        
+        return stats
+    
     @staticmethod
     def get_system_stats(db: Session) -> SystemStatsResponse:
         """
@@ -318,4 +506,131 @@ class SystemMonitoringService:
         return UserActivityStatsResponse(
             users=user_stats,
             total=total_users
-        )
\ No newline at end of file
+        )
+    
+    @staticmethod
+    def get_query_workload_stats(
+        db: Session,
+        sort_by: str = "total_time",
+        limit: int = 50,
+        db_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get workload statistics aggregated per query fingerprint
+        
+        Args:
+            db: Database session
+            sort_by: Sort column (total_time, mean_time, max_time, calls, errors, rows, last_seen)
+            limit: Maximum number of fingerprints to return
+            db_id: Optional database ID to filter by
+            
+        Returns:
+            Fingerprint statistics sorted by the given column
+        """
+        fingerprints = get_fingerprint_stats(db, sort_by=sort_by, limit=limit, db_id=db_id)
+        
+        return {
+            "sort_by": sort_by,
+            "db_id": db_id,
+            "fingerprints": fingerprints
+        }
+    
+    @staticmethod
+    def get_paginated_slow_queries(
+        db: Session,
+        page: int = 1,
+        page_size: int = 50,
+        db_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        min_duration_ms: Optional[float] = None
+    ) -> PaginatedSlowQueryLogs:
+        """
+        Get paginated slow query log entries, newest first
+        
+        Args:
+            db: Database session
+            page: Page number
+            page_size: Number of items per page
+            db_id: Optional database ID filter
+            user_id: Optional user ID filter
+            min_duration_ms: Optional minimum duration in milliseconds
+            
+        Returns:
+            Paginated slow query log entries (without execution plans)
+        """
+        skip = (page - 1) * page_size
+        
+        entries = get_slow_query_logs(
+            db, skip=skip, limit=page_size, db_id=db_id, user_id=user_id, min_duration_ms=min_duration_ms
+        )
+        total = count_slow_query_logs(db, db_id=db_id, user_id=user_id, min_duration_ms=min_duration_ms)
+        
+        return PaginatedSlowQueryLogs(
+            entries=entries,
+            total=total,
+            page=page,
+            page_size=page_size,
+            total_pages=(total + page_size - 1) // page_size,
+            threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS
+        )
+    
+    @staticmethod
+    def get_slow_query_detail(db: Session, entry_id: str) -> Optional[SlowQueryLogDetailResponse]:
+        """
+        Get a slow query log entry including its execution plan
+        
+        Args:
+            db: Database session
+            entry_id: Entry ID
+            
+        Returns:
+            Slow query log entry or None if not found
+        """
+        entry = get_slow_query_log(db, entry_id)
+        if not entry:
+            return None
+        
+        return SlowQueryLogDetailResponse.model_validate(entry)
+    
+    @staticmethod
+    def purge_slow_queries(db: Session, retention_days: Optional[int] = None) -> int:
+        """
+        Delete slow query log entries past the retention period or the maximum log size
+        
+        Args:
+            db: Database session
+            retention_days: Optional retention period overriding the configured one
+            
+        Returns:
+            Number of deleted entries
+        """
+        deleted = trim_slow_query_logs(
+            db,
+            max_entries=settings.SLOW_QUERY_LOG_MAX_ENTRIES,
+            retention_days=retention_days if retention_days is not None else settings.SLOW_QUERY_LOG_RETENTION_DAYS
+        )
+        db.commit()
+        
+        return deleted
+    
+    @staticmethod
+    def get_query_phase_stats(
+        db: Session,
+        days: int = 7,
+        db_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get latency percentiles per query lifecycle phase
+        
+        Args:
+            db: Database session
+            days: Number of days to look back
+            db_id: Optional database ID to filter by
+            
+        Returns:
+            Per-phase latency statistics in waterfall order
+        """
+        stats = get_phase_latency_percentiles(db, days=days, db_id=db_id)
+        stats.update(days=days, db_id=db_id)
+        
+        return stats
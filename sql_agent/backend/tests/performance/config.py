@@ -10,6 +10,12 @@ BASE_DIR = Path(__file__).parent.parent.parent.parent
 # Test database settings
 TEST_DB_URL = os.environ.get("PERF_TEST_DB_URL", "sqlite:///./test_performance.db")
 
+# Local SQLite stand-in database used when no MS-SQL or SAP HANA server is available
+SQLITE_BENCH_PATH = os.environ.get("PERF_TEST_SQLITE_PATH", "./perf_test_standin.db")
+SQLITE_LATENCY_MS = float(os.environ.get("PERF_TEST_SQLITE_LATENCY_MS", "0"))  # artificial latency per query
+SQLITE_LATENCY_JITTER_MS = float(os.environ.get("PERF_TEST_SQLITE_JITTER_MS", "0"))
+SQLITE_FAILURE_RATE = float(os.environ.get("PERF_TEST_SQLITE_FAILURE_RATE", "0"))  # injected transient failures
+
 # Test user credentials
 TEST_USER = {
     "username": "perftest",
@@ -0,0 +1,136 @@
+"""
+Unit tests for concurrent batch query execution.
+"""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sql_agent.backend.models.query import QueryStatus
+from sql_agent.backend.services.query_execution_service import QueryExecutionService
+
+SERVICE_MODULE = "sql_agent.backend.services.query_execution_service"
+
+
+class TestBatchExecution(unittest.TestCase):
+    """
+    Tests for QueryExecutionService.execute_many and batch status.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.service = QueryExecutionService()
+        self.statuses = {}
+        self.created = 0
+
+        async def create_query(query_data):
+            self.created += 1
+            query_id = f"q{self.created}"
+            self.statuses[query_id] = QueryStatus.PENDING.value
+            return SimpleNamespace(id=query_id)
+
+        async def get_query_status(query_id):
+            return {"query_id": query_id, "status": self.statuses[query_id]}
+
+        self.patches = [
+            patch(f"{SERVICE_MODULE}.create_query", side_effect=create_query),
+            patch(f"{SERVICE_MODULE}.update_query", new=AsyncMock()),
+            patch(f"{SERVICE_MODULE}.connector_factory", MagicMock(**{"get_connection_pool_manager.return_value.max_pool_size": 2}))
+        ]
+        for p in self.patches:
+            p.start()
+        self.service.get_query_status = get_query_status
+
+    def tearDown(self):
+        """
+        Stop patches.
+        """
+        for p in self.patches:
+            p.stop()
+
+    def test_execute_many_respects_admission_limit(self):
+        """
+        Test that statements run concurrently but never more than the pool size at once.
+        """
+        running = 0
+        peak = 0
+
+        async def execute_query_task(user_id, db_id, sql, query_id, timeout, max_rows, limit_settings=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            self.statuses[query_id] = QueryStatus.FAILED.value if "bad" in sql else QueryStatus.COMPLETED.value
+
+        self.service._execute_query_task = execute_query_task
+        statements = ["SELECT 1", "SELECT 2", "SELECT bad", "SELECT 4", "SELECT 5"]
+
+        result = asyncio.run(self.service.execute_many("user1", "db1", statements, wait=True))
+
+        self.assertEqual(peak, 2)
+        self.assertEqual(result["total"], 5)
+        self.assertEqual(result["status"], "partially_completed")
+        self.assertEqual(result["counts"]["completed"], 4)
+        self.assertEqual([q["query_id"] for q in result["queries"]], ["q1", "q2", "q3", "q4", "q5"])
+        self.assertEqual(self.service._running_tasks, {})
+
+    def test_single_queries_share_admission_limit(self):
+        """
+        Test that single queries and batch statements on a database are admitted together up to the pool size.
+        """
+        running = 0
+        peak = 0
+
+        async def execute_query_task(user_id, db_id, sql, query_id, timeout, max_rows, limit_settings=None, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            self.statuses[query_id] = QueryStatus.COMPLETED.value
+
+        async def run():
+            self.service._execute_query_task = execute_query_task
+            with patch(f"{SERVICE_MODULE}.get_query_by_id", new=AsyncMock(return_value=None)):
+                for index in range(3):
+                    await self.service.execute_query("user1", "db1", f"SELECT {index}", query_id=f"single{index}")
+            await self.service.execute_many("user1", "db1", ["SELECT 1", "SELECT 2"], wait=True)
+            await asyncio.gather(*self.service._running_tasks.values())
+
+        asyncio.run(run())
+        self.assertEqual(peak, 2)
+        self.assertEqual(self.service._running_tasks, {})
+
+    def test_execute_many_returns_immediately(self):
+        """
+        Test that a batch without wait returns its id and pending statements.
+        """
+        async def run():
+            self.service._execute_query_task = AsyncMock()
+            result = await self.service.execute_many("user1", "db1", ["SELECT 1", "SELECT 2"], max_concurrency=1)
+            self.assertEqual(result["status"], QueryStatus.EXECUTING.value)
+            self.assertEqual(len(result["queries"]), 2)
+            self.assertEqual((await self.service.get_batch_status(result["batch_id"]))["status"], QueryStatus.EXECUTING.value)
+            await asyncio.sleep(0.01)
+            self.assertEqual(self.service._execute_query_task.await_count, 2)
+
+        asyncio.run(run())
+
+    def test_invalid_batches(self):
+        """
+        Test validation of statements, labels and batch ids.
+        """
+        with self.assertRaises(ValueError):
+            asyncio.run(self.service.execute_many("user1", "db1", []))
+        with self.assertRaises(ValueError):
+            asyncio.run(self.service.execute_many("user1", "db1", ["SELECT 1"], labels=["a", "b"]))
+        with self.assertRaises(ValueError):
+            asyncio.run(self.service.get_batch_status("missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Unit tests for the per-database circuit breaker and retry budget.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from datetime import datetime
+
+from sql_agent.backend.models.database import Database, DBType, ConnectionConfig
+from sql_agent.backend.db.connectors.mssql import MSSQLConnector
+from sql_agent.backend.db.connectors.pool import DefaultConnectionPoolManager
+from sql_agent.backend.db.connectors.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    RetryBudget,
+    RetryBudgetExhaustedError
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """
+    Tests for circuit state transitions, the retry budget and their use by the pool.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.clock = FakeClock()
+        self.db_config = Database(
+            id="test-db",
+            name="Test Database",
+            type=DBType.MSSQL,
+            host="localhost",
+            port=1433,
+            default_schema="dbo",
+            connection_config=ConnectionConfig(
+                username="sa",
+                password_encrypted="encrypted_password"
+            ),
+            created_at=datetime.now(),
+            updated_at=datetime.now()
+        )
+
+    def test_circuit_opens_and_recovers(self):
+        """
+        Test closed -> open -> half-open -> closed transitions.
+        """
+        breaker = CircuitBreaker("db1", failure_threshold=2, recovery_timeout=10, clock=self.clock)
+        breaker.record_failure()
+        breaker.allow_request()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+
+        with self.assertRaises(CircuitOpenError) as context:
+            breaker.allow_request()
+        self.assertIn("circuit breaker is open", str(context.exception))
+
+        self.clock.now = 10
+        self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+        breaker.allow_request()
+        # Only one probe at a time
+        with self.assertRaises(CircuitOpenError):
+            breaker.allow_request()
+
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+        self.assertEqual(breaker.get_state()["times_opened"], 1)
+        self.assertEqual(breaker.get_state()["rejected_requests"], 2)
+
+    def test_failed_probe_reopens_circuit(self):
+        """
+        Test that a failing half-open probe opens the circuit again.
+        """
+        breaker = CircuitBreaker("db1", failure_threshold=1, recovery_timeout=5, clock=self.clock)
+        breaker.record_failure()
+        self.clock.now = 5
+        breaker.allow_request()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        self.assertEqual(breaker.get_state()["retry_after_seconds"], 5)
+
+        # An unreported probe expires after the recovery timeout
+        self.clock.now = 10
+        breaker.allow_request()
+        self.clock.now = 15
+        breaker.allow_request()
+
+    def test_retry_budget(self):
+        """
+        Test that retries are limited and the budget refills over time.
+        """
+        budget = RetryBudget(capacity=2, refill_rate=0.5, clock=self.clock)
+        self.assertTrue(budget.try_acquire())
+        self.assertTrue(budget.try_acquire())
+        self.assertFalse(budget.try_acquire())
+
+        self.clock.now = 2
+        self.assertTrue(budget.try_acquire())
+        self.assertFalse(budget.try_acquire())
+        self.assertEqual(budget.get_state()["retries_denied"], 2)
+
+    def test_pool_fails_fast_when_open(self):
+        """
+        Test that the pool rejects requests without connecting while the circuit is open.
+        """
+        pool_manager = DefaultConnectionPoolManager(failure_threshold=2)
+        creator = MagicMock(side_effect=Exception("connection refused"))
+        pool_manager.register_connection_creator("mssql", creator)
+
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                pool_manager.get_connection(self.db_config)
+        with self.assertRaises(CircuitOpenError):
+            pool_manager.get_connection(self.db_config)
+        self.assertEqual(creator.call_count, 2)
+
+        stats = pool_manager.get_pool_stats("test-db")["test-db"]
+        self.assertEqual(stats["circuit_breaker"]["state"], "open")
+        self.assertIn("retry_budget", stats)
+
+    @patch("sql_agent.backend.db.connectors.mssql.MSSQL_DRIVER", "pyodbc")
+    def test_connector_stops_retrying_when_budget_exhausted(self):
+        """
+        Test that transient query errors are not retried once the budget is used up.
+        """
+        pool_manager = DefaultConnectionPoolManager(retry_budget_capacity=1)
+        connector = MSSQLConnector(pool_manager)
+        connection = MagicMock()
+        connection.cursor.return_value.execute.side_effect = Exception("Timeout expired")
+
+        with patch("time.sleep"), self.assertRaises(RetryBudgetExhaustedError):
+            connector._execute_query_with_retry(connection, "SELECT 1", None, None, None, "q1", db_id="test-db")
+
+        # One retry was granted, the second attempt's failure was not retried
+        self.assertEqual(connection.cursor.return_value.execute.call_count, 2)
+        self.assertEqual(pool_manager.get_retry_budget("test-db").get_state()["retries_denied"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,216 @@
+"""
+Unit tests for pre-flight query cost estimation.
+"""
+
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+from datetime import datetime
+
+from sql_agent.backend.models.database import Database, DBType, ConnectionConfig
+from sql_agent.backend.models.policy import QueryLimitPolicySettings
+from sql_agent.backend.models.query import QueryCostEstimate
+from sql_agent.backend.db.connectors.mssql import MSSQLConnector
+from sql_agent.backend.db.connectors.pool import DefaultConnectionPoolManager
+from sql_agent.backend.db.connectors.cost_estimator import (
+    CostDecision,
+    QueryCostEstimator,
+    QueryPlanCache,
+    evaluate_cost,
+    has_cost_thresholds,
+    parse_hana_explain_plan,
+    parse_showplan_xml
+)
+from sql_agent.backend.services.query_execution_service import QueryExecutionService
+
+SHOWPLAN_XML = """<?xml version="1.0" encoding="utf-16"?>
+<ShowPlanXML xmlns="http://schemas.microsoft.com/sqlserver/2004/07/showplan" Version="1.5">
+  <BatchSequence>
+    <Batch>
+      <Statements>
+        <StmtSimple StatementText="SELECT * FROM orders" StatementEstRows="2000000" StatementSubTreeCost="154.25">
+          <QueryPlan>
+            <RelOp PhysicalOp="Parallelism" EstimateRows="2000000">
+              <RelOp PhysicalOp="Clustered Index Scan" EstimateRows="2000000" />
+            </RelOp>
+          </QueryPlan>
+        </StmtSimple>
+      </Statements>
+    </Batch>
+  </BatchSequence>
+</ShowPlanXML>"""
+
+
+class TestCostEstimator(unittest.TestCase):
+    """
+    Tests for plan parsing, policy evaluation and plan caching.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.db_config = Database(
+            id="test-db",
+            name="Test Database",
+            type=DBType.MSSQL,
+            host="localhost",
+            port=1433,
+            default_schema="dbo",
+            connection_config=ConnectionConfig(
+                username="sa",
+                password_encrypted="encrypted_password"
+            ),
+            created_at=datetime.now(),
+            updated_at=datetime.now()
+        )
+        self.settings = QueryLimitPolicySettings(
+            max_estimated_rows=1000000,
+            warn_estimated_cost=100.0
+        )
+
+    def test_parse_showplan_xml(self):
+        """
+        Test parsing an MS-SQL showplan document.
+        """
+        estimate = parse_showplan_xml(SHOWPLAN_XML.replace('encoding="utf-16"', ''))
+        self.assertEqual(estimate.estimated_rows, 2000000)
+        self.assertEqual(estimate.estimated_cost, 154.25)
+        self.assertEqual(estimate.operators, ["Parallelism", "Clustered Index Scan"])
+
+        with self.assertRaises(ValueError):
+            parse_showplan_xml("<not-xml")
+
+    def test_parse_hana_explain_plan(self):
+        """
+        Test parsing SAP HANA EXPLAIN_PLAN_TABLE rows.
+        """
+        rows = [
+            {"OPERATOR_ID": 2, "PARENT_OPERATOR_ID": 1, "OPERATOR_NAME": "COLUMN TABLE",
+             "TABLE_NAME": "ORDERS", "OUTPUT_SIZE": 500.0, "SUBTREE_COST": 0.5},
+            {"OPERATOR_ID": 1, "PARENT_OPERATOR_ID": None, "OPERATOR_NAME": "PROJECT",
+             "TABLE_NAME": None, "OUTPUT_SIZE": 500.0, "SUBTREE_COST": 0.75}
+        ]
+        estimate = parse_hana_explain_plan(rows)
+        self.assertEqual(estimate.estimated_rows, 500.0)
+        self.assertEqual(estimate.estimated_cost, 0.75)
+        self.assertEqual(estimate.operators, ["PROJECT", "COLUMN TABLE ORDERS"])
+        self.assertIn("COLUMN TABLE ORDERS", estimate.plan)
+
+    def test_evaluate_cost(self):
+        """
+        Test block, low priority and allow decisions.
+        """
+        self.assertTrue(has_cost_thresholds(self.settings))
+        self.assertFalse(has_cost_thresholds(QueryLimitPolicySettings()))
+        self.assertFalse(has_cost_thresholds(None))
+
+        decision, reason = evaluate_cost(QueryCostEstimate(estimated_rows=2000000, estimated_cost=10), self.settings)
+        self.assertEqual(decision, CostDecision.BLOCK)
+        self.assertIn("row count", reason)
+
+        decision, _ = evaluate_cost(QueryCostEstimate(estimated_rows=10, estimated_cost=150), self.settings)
+        self.assertEqual(decision, CostDecision.LOW_PRIORITY)
+
+        decision, reason = evaluate_cost(QueryCostEstimate(estimated_rows=10, estimated_cost=1), self.settings)
+        self.assertEqual(decision, CostDecision.ALLOW)
+        self.assertIsNone(reason)
+
+        decision, _ = evaluate_cost(QueryCostEstimate(), self.settings)
+        self.assertEqual(decision, CostDecision.ALLOW)
+
+    def test_plan_cache(self):
+        """
+        Test that plans are cached per database and normalized query.
+        """
+        cache = QueryPlanCache(max_size=1)
+        estimate = QueryCostEstimate(estimated_rows=1)
+        cache.put("db1", "SELECT * FROM t", estimate)
+        self.assertIs(cache.get("db1", "SELECT *   FROM t;"), estimate)
+        self.assertIsNone(cache.get("db2", "SELECT * FROM t"))
+
+        cache.put("db1", "SELECT * FROM u", estimate)
+        self.assertIsNone(cache.get("db1", "SELECT * FROM t"))
+        self.assertEqual(cache.get_stats()["size"], 1)
+
+        expired_cache = QueryPlanCache(ttl_seconds=0)
+        expired_cache.put("db1", "SELECT 1", estimate)
+        self.assertIsNone(expired_cache.get("db1", "SELECT 1"))
+
+    def test_estimator_caches_and_fails_open(self):
+        """
+        Test that the estimator caches plans and returns None on errors.
+        """
+        connector = MagicMock()
+        connector.explain_query.return_value = QueryCostEstimate(estimated_rows=5)
+        estimator = QueryCostEstimator()
+
+        first = estimator.estimate(connector, self.db_config, "SELECT * FROM t")
+        second = estimator.estimate(connector, self.db_config, "SELECT * FROM t")
+        self.assertIs(first, second)
+        connector.explain_query.assert_called_once()
+
+        connector.explain_query.side_effect = Exception("permission denied")
+        self.assertIsNone(estimator.estimate(connector, self.db_config, "SELECT * FROM u"))
+
+    def test_mssql_explain_query(self):
+        """
+        Test that the MS-SQL connector wraps the query in SHOWPLAN_XML.
+        """
+        pool_manager = MagicMock(spec=DefaultConnectionPoolManager)
+        connection = MagicMock()
+        cursor = MagicMock()
+        cursor.fetchall.return_value = [(SHOWPLAN_XML.replace('encoding="utf-16"', ''),)]
+        connection.cursor.return_value = cursor
+        pool_manager.get_connection.return_value = connection
+
+        connector = MSSQLConnector(pool_manager)
+        estimate = connector.explain_query(self.db_config, "SELECT * FROM orders", auto_convert=False)
+
+        self.assertEqual(estimate.estimated_rows, 2000000)
+        executed = [c.args[0] for c in cursor.execute.call_args_list]
+        self.assertEqual(executed, ["SET SHOWPLAN_XML ON", "SELECT * FROM orders", "SET SHOWPLAN_XML OFF"])
+        pool_manager.invalidate_connection.assert_not_called()
+        pool_manager.release_connection.assert_called_once_with(connection, self.db_config.id)
+
+    def test_mssql_explain_query_invalidates_connection_left_in_showplan_mode(self):
+        """
+        Test that a connection is invalidated when SHOWPLAN_XML cannot be turned off.
+        """
+        pool_manager = MagicMock(spec=DefaultConnectionPoolManager)
+        connection = MagicMock()
+        cursor = MagicMock()
+        cursor.fetchall.return_value = [(SHOWPLAN_XML.replace('encoding="utf-16"', ''),)]
+        cursor.execute.side_effect = [None, None, Exception("Communication link failure")]
+        connection.cursor.return_value = cursor
+        pool_manager.get_connection.return_value = connection
+
+        connector = MSSQLConnector(pool_manager)
+        estimate = connector.explain_query(self.db_config, "SELECT * FROM orders", auto_convert=False)
+
+        self.assertEqual(estimate.estimated_rows, 2000000)
+        pool_manager.invalidate_connection.assert_called_once_with(connection, self.db_config.id)
+
+    def test_service_blocks_expensive_query(self):
+        """
+        Test that the execution service blocks queries over the policy limit.
+        """
+        estimator = MagicMock()
+        estimator.estimate.return_value = QueryCostEstimate(estimated_rows=5000000, estimated_cost=10)
+        service = QueryExecutionService(cost_estimator=estimator)
+
+        with self.assertRaises(ValueError):
+            asyncio.run(service._check_query_cost(
+                "user1", self.db_config, MagicMock(), "SELECT * FROM orders", "q1", self.settings
+            ))
+        self.assertEqual(service._cost_estimates["q1"]["decision"], CostDecision.BLOCK.value)
+
+        estimator.estimate.return_value = QueryCostEstimate(estimated_rows=10, estimated_cost=500)
+        decision = asyncio.run(service._check_query_cost(
+            "user1", self.db_config, MagicMock(), "SELECT * FROM orders", "q2", self.settings
+        ))
+        self.assertEqual(decision, CostDecision.LOW_PRIORITY)
+
+
+if __name__ == "__main__":
+    unittest.main()
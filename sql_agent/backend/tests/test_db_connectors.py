@@ -166,6 +166,67 @@ class TestConnectionPoolManager(unittest.TestCase):
         
         # Verify that the connection was closed
         self.mock_connection.close.assert_called_once()
+    
+    def test_lifecycle_hooks(self):
+        """
+        Test that lifecycle hooks run on create, checkout and dirty return.
+        """
+        on_create = MagicMock()
+        on_checkout = MagicMock()
+        on_return = MagicMock()
+        self.pool_manager.register_lifecycle_hook("mssql", "on_create", on_create)
+        self.pool_manager.register_lifecycle_hook("mssql", "on_checkout", on_checkout)
+        self.pool_manager.register_lifecycle_hook("mssql", "on_return", on_return)
+        
+        # Clean sessions are returned without a reset
+        connection = self.pool_manager.get_connection(self.db_config)
+        self.pool_manager.release_connection(connection, self.db_config.id)
+        on_create.assert_called_once_with(self.mock_connection)
+        on_return.assert_not_called()
+        
+        # Dirty sessions are reset once on return
+        connection = self.pool_manager.get_connection(self.db_config)
+        self.pool_manager.mark_session_dirty(connection)
+        self.pool_manager.release_connection(connection, self.db_config.id)
+        on_return.assert_called_once_with(self.mock_connection)
+        self.assertEqual(on_create.call_count, 1)
+        self.assertEqual(on_checkout.call_count, 2)
+        
+        stats = self.pool_manager.get_pool_stats(self.db_config.id)[self.db_config.id]
+        self.assertEqual(stats["idle_connections"], 1)
+        self.assertEqual(stats["hooks"]["on_checkout"]["count"], 2)
+        self.assertEqual(stats["hooks"]["on_return"]["count"], 1)
+        self.assertEqual(stats["hooks"]["on_create"]["errors"], 0)
+        
+        with self.assertRaises(ValueError):
+            self.pool_manager.register_lifecycle_hook("mssql", "on_close", MagicMock())
+    
+    def test_failed_reset_discards_connection(self):
+        """
+        Test that a connection is closed when its session reset fails.
+        """
+        self.pool_manager.register_lifecycle_hook("mssql", "on_return", MagicMock(side_effect=Exception("reset failed")))
+        
+        connection = self.pool_manager.get_connection(self.db_config)
+        self.pool_manager.mark_session_dirty(connection, self.db_config.id)
+        self.pool_manager.release_connection(connection, self.db_config.id)
+        
+        stats = self.pool_manager.get_pool_stats(self.db_config.id)[self.db_config.id]
+        self.assertEqual(stats["total_connections"], 0)
+        self.assertEqual(stats["hooks"]["on_return"]["errors"], 1)
+        self.mock_connection.close.assert_called_once()
+    
+    def test_invalidated_connection_is_discarded(self):
+        """
+        Test that an invalidated connection is closed on return instead of being reused.
+        """
+        connection = self.pool_manager.get_connection(self.db_config)
+        self.pool_manager.invalidate_connection(connection, self.db_config.id)
+        self.pool_manager.release_connection(connection, self.db_config.id)
+        
+        stats = self.pool_manager.get_pool_stats(self.db_config.id)[self.db_config.id]
+        self.assertEqual(stats["total_connections"], 0)
+        self.mock_connection.close.assert_called_once()
 
 class TestDBConnectorFactory(unittest.TestCase):
     """
@@ -15,6 +15,10 @@ from rag.rag_service import RagService
 
 # Mock LLM service for testing
 class MockLLMService:
+    async def get_embeddings(self, texts):
+        # Return random embeddings of fixed dimension for testing
+        return [np.random.rand(384).tolist() for _ in texts]
+    
     def get_embeddings_sync(self, texts):
         # Return random embeddings of fixed dimension for testing
         return [np.random.rand(384).tolist() for _ in texts]
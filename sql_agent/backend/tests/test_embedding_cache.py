@@ -0,0 +1,107 @@
+"""
+Unit tests for the persistent content-hash embedding cache.
+"""
+
+import asyncio
+import tempfile
+import unittest
+
+from sql_agent.backend.llm.embedding_cache import EmbeddingCache, _ModelStore
+from sql_agent.backend.llm.embedding_pipeline import EmbeddingPipeline
+
+
+class CountingEmbeddingService:
+    """
+    LLM service stub that records every text sent for embedding.
+    """
+
+    def __init__(self):
+        self.sent = []
+
+    async def get_embeddings(self, texts):
+        self.sent.extend(texts)
+        return [[float(len(text)), 1.0, 2.0] for text in texts]
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    """
+    Tests for persistence, growth, model separation and pipeline integration.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_persists_across_instances_and_grows(self):
+        """
+        Test that entries survive reopening, the vector file grows past its initial capacity and models are separate.
+        """
+        cache = EmbeddingCache(self.cache_dir, initial_capacity=2)
+        texts = [f"text {i}" for i in range(5)]
+        self.assertEqual(cache.put_many("model-a", texts, [[float(i), 0.5] for i in range(5)]), 5)
+        self.assertEqual(cache.put_many("model-a", texts[:1], [[9.0, 9.0]]), 0)
+
+        reopened = EmbeddingCache(self.cache_dir)
+        self.assertEqual(reopened.get_many("model-a", ["text 4", "unknown", "text 0"]), [[4.0, 0.5], None, [0.0, 0.5]])
+        self.assertEqual(reopened.get_many("model-b", ["text 4"]), [None])
+
+        stats = reopened.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 2))
+        self.assertEqual(stats["models"], {"model-a": 5, "model-b": 0})
+
+    def test_writers_sharing_a_directory(self):
+        """
+        Test that two caches on the same directory allocate distinct rows and see each other's entries.
+        """
+        first = EmbeddingCache(self.cache_dir, initial_capacity=2)
+        second = EmbeddingCache(self.cache_dir, initial_capacity=2)
+        self.assertEqual(first.put_many("model-a", ["a", "b"], [[1.0, 1.0], [2.0, 2.0]]), 2)
+        self.assertEqual(second.put_many("model-a", ["b", "c", "d"], [[9.0, 9.0], [3.0, 3.0], [4.0, 4.0]]), 2)
+        self.assertEqual(first.put_many("model-a", ["e"], [[5.0, 5.0]]), 1)
+
+        expected = [[1.0, 1.0], [2.0, 2.0], [3.0, 3.0], [4.0, 4.0], [5.0, 5.0]]
+        self.assertEqual(first.get_many("model-a", ["a", "b", "c", "d", "e"]), expected)
+        self.assertEqual(second.get_many("model-a", ["a", "b", "c", "d", "e"]), expected)
+        self.assertEqual(EmbeddingCache(self.cache_dir).get_many("model-a", ["a", "b", "c", "d", "e"]), expected)
+
+    def test_index_journal_is_appended_and_compacted(self):
+        """
+        Test that each write appends one journal line and that a long journal is compacted.
+        """
+        store = _ModelStore(self.cache_dir, initial_capacity=2, compact_after=3)
+        for i in range(3):
+            store.put({f"key {i}": [float(i), 0.0]})
+        with open(store._path(_ModelStore.INDEX_FILE), encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+        store.put({"key 3": [3.0, 0.0]})
+        with open(store._path(_ModelStore.INDEX_FILE), encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+        reopened = _ModelStore(self.cache_dir, initial_capacity=2)
+        self.assertEqual([reopened.get(f"key {i}") for i in range(4)], [[float(i), 0.0] for i in range(4)])
+
+    def test_pipeline_sends_only_misses(self):
+        """
+        Test that a second indexing run embeds only new or changed texts.
+        """
+        cache = EmbeddingCache(self.cache_dir)
+        service = CountingEmbeddingService()
+        pipeline = EmbeddingPipeline(service, cache=cache, model_name="model-a")
+
+        first = asyncio.run(pipeline.embed(["users table", "orders table", "users table"]))
+        self.assertEqual(service.sent, ["users table", "orders table"])
+
+        service.sent.clear()
+        second = asyncio.run(pipeline.embed(["users table", "orders table v2", "orders table"]))
+        self.assertEqual(service.sent, ["orders table v2"])
+        self.assertEqual(second[0], first[0])
+        self.assertEqual(second[2], first[1])
+        self.assertAlmostEqual(cache.get_stats()["hit_rate"], 2 / 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Unit tests for the token-packed, concurrent embedding pipeline.
+"""
+
+import asyncio
+import time
+import unittest
+
+from sql_agent.backend.llm.embedding_pipeline import AsyncRateLimiter, EmbeddingPipeline
+
+
+class FakeEmbeddingService:
+    """
+    LLM service stub that records request sizes and peak concurrency.
+    """
+
+    def __init__(self, delay=0.02, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.requests = []
+        self.active = 0
+        self.peak = 0
+
+    async def get_embeddings(self, texts):
+        self.requests.append(len(texts))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail_on and self.fail_on in texts:
+                raise RuntimeError("provider error")
+            return [[float(len(text))] for text in texts]
+        finally:
+            self.active -= 1
+
+
+class TestEmbeddingPipeline(unittest.TestCase):
+    """
+    Tests for batch packing, concurrent requests, failure isolation and sync access.
+    """
+
+    def test_pack_batches_by_token_count(self):
+        """
+        Test that batches respect the token and size limits and oversized texts get their own batch.
+        """
+        pipeline = EmbeddingPipeline(FakeEmbeddingService(), max_batch_tokens=40, max_batch_size=3)
+        texts = ["a" * 40, "b" * 40, "c" * 40, "d" * 400, "e" * 4, "f" * 4, "g" * 4, "h" * 4]
+
+        self.assertEqual(pipeline.pack_batches(texts), [[0, 1, 2], [3], [4, 5, 6], [7]])
+
+    def test_embed_runs_batches_concurrently_in_order(self):
+        """
+        Test that batches overlap up to the concurrency limit and results keep the input order.
+        """
+        service = FakeEmbeddingService()
+        pipeline = EmbeddingPipeline(service, max_batch_size=2, max_concurrency=3)
+        texts = ["x" * i for i in range(1, 13)]
+
+        embeddings = asyncio.run(pipeline.embed(texts))
+
+        self.assertEqual(embeddings, [[float(i)] for i in range(1, 13)])
+        self.assertEqual(service.requests, [2] * 6)
+        self.assertEqual(service.peak, 3)
+
+    def test_failed_batch_returns_none_and_sync_works_in_running_loop(self):
+        """
+        Test that only the failing batch loses its embeddings and that embed_sync works inside an event loop.
+        """
+        pipeline = EmbeddingPipeline(FakeEmbeddingService(fail_on="bad"), max_batch_size=2)
+
+        async def call_from_loop():
+            return pipeline.embed_sync(["ok", "bad", "fine", "good"])
+
+        self.assertEqual(asyncio.run(call_from_loop()), [None, None, [4.0], [4.0]])
+
+    def test_rate_limiter_spaces_requests(self):
+        """
+        Test that requests beyond the bucket capacity wait for the refill.
+        """
+        limiter = AsyncRateLimiter(rate_per_minute=600)  # 10 per second, capacity 600
+
+        async def acquire():
+            await limiter.acquire(600)
+            started_at = time.monotonic()
+            await limiter.acquire(1)
+            return time.monotonic() - started_at
+
+        self.assertGreaterEqual(asyncio.run(acquire()), 0.09)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,8 +2,9 @@
 Unit tests for the SAP HANA database connector.
 """
 
+import asyncio
 import unittest
-from unittest.mock import MagicMock, patch, call
+from unittest.mock import AsyncMock, MagicMock, patch, call, ANY
 from datetime import datetime
 import uuid
 
@@ -13,7 +14,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 from backend.models.database import Database, DBType, ConnectionConfig
 from backend.db.connectors.hana import HANAConnector
 from backend.db.connectors.pool import DefaultConnectionPoolManager
+from backend.db.connectors.query_executor import is_lob_placeholder, lob_matches_placeholder, make_lob_placeholder
 from backend.models.query import QueryResult, ResultColumn
+from backend.services.query_execution_service import QueryExecutionService
 
 class TestHANAConnector(unittest.TestCase):
     """
@@ -85,19 +88,16 @@ class TestHANAConnector(unittest.TestCase):
             packetSize=1048576,
             compress=True,
             communicationTimeout=0,
-            connectTimeout=30000
+            connectTimeout=30000,
+            **{
+                "sessionVariable:QUERY_TIMEOUT": "300",
+                "sessionVariable:IDLE_TIMEOUT": "1800",
+                "sessionVariable:ABAP_AS_DECIMAL": "TRUE"
+            }
         )
         
-        # Verify the connection settings were configured
-        self.assertEqual(mock_cursor.execute.call_count, 3)
-        mock_cursor.execute.assert_has_calls([
-            call("SET SESSION 'QUERY_TIMEOUT' = '300'"),
-            call("SET SESSION 'IDLE_TIMEOUT' = '1800'"),
-            call("SET SESSION 'ABAP_AS_DECIMAL' = 'TRUE'")
-        ])
-        
-        # Verify the cursor was closed
-        mock_cursor.close.assert_called_once()
+        # Verify the session settings were sent with the connect request (no extra round trips)
+        mock_cursor.execute.assert_not_called()
         
         # Verify the connection was returned
         self.assertEqual(connection, mock_connection)
@@ -270,7 +270,7 @@ class TestHANAConnector(unittest.TestCase):
         
         # Set up the mock result
         mock_result = MagicMock(spec=QueryResult)
-        self.connector.query_processor.process_result = MagicMock(return_value=mock_result)
+        self.connector.query_processor.process_result_batched = MagicMock(return_value=mock_result)
         
         # Call the method
         query = "SELECT * FROM USERS WHERE ID = :user_id"
@@ -291,9 +291,10 @@ class TestHANAConnector(unittest.TestCase):
         # Verify the query was executed with parameters
         mock_cursor.execute.assert_any_call(query, params)
         
-        # Verify the result was processed
-        self.connector.query_processor.process_result.assert_called_once_with(
-            mock_cursor, query, max_rows
+        # Verify the result was fetched in bulk
+        mock_cursor.setfetchsize.assert_called_once_with(HANAConnector.DEFAULT_FETCH_SIZE)
+        self.connector.query_processor.process_result_batched.assert_called_once_with(
+            mock_cursor, query, max_rows, HANAConnector.DEFAULT_FETCH_SIZE, ANY
         )
         
         # Verify the query ID was set
@@ -316,7 +317,7 @@ class TestHANAConnector(unittest.TestCase):
         
         # Set up the mock result
         mock_result = MagicMock(spec=QueryResult)
-        self.connector.query_processor.process_result = MagicMock(return_value=mock_result)
+        self.connector.query_processor.process_result_batched = MagicMock(return_value=mock_result)
         
         # Call the method
         query = "SELECT * FROM USERS"
@@ -334,9 +335,10 @@ class TestHANAConnector(unittest.TestCase):
         # Verify the query was executed without parameters
         mock_cursor.execute.assert_called_once_with(query)
         
-        # Verify the result was processed
-        self.connector.query_processor.process_result.assert_called_once_with(
-            mock_cursor, query, max_rows
+        # Verify the result was fetched in bulk
+        mock_cursor.setfetchsize.assert_called_once_with(HANAConnector.DEFAULT_FETCH_SIZE)
+        self.connector.query_processor.process_result_batched.assert_called_once_with(
+            mock_cursor, query, max_rows, HANAConnector.DEFAULT_FETCH_SIZE, ANY
         )
         
         # Verify the query ID was set
@@ -580,6 +582,196 @@ class TestHANAConnector(unittest.TestCase):
         error.errorcode = 129
         formatted = self.connector.format_error(error)
         self.assertEqual(formatted, "Transient error (will retry): Connection timeout")
+    
+    def test_bulk_fetch_with_lob_placeholders(self):
+        """
+        Test fetchmany batches with LOB values cut to the preview length.
+        """
+        rows = [(i, FakeLOB("x" * (i * 10)) if i % 2 else None) for i in range(1, 8)]
+        cursor = FakeCursor(rows)
+        
+        result = self.connector.query_processor.process_result_batched(
+            cursor, "SELECT ID, DOC FROM DOCS", max_rows=5, fetch_size=2,
+            lob_converter=lambda lob: self.connector._read_lob_preview(lob, 25)
+        )
+        
+        self.assertEqual(result.row_count, 5)
+        self.assertTrue(result.truncated)
+        self.assertEqual(cursor.fetch_sizes, [2, 2, 2])
+        self.assertEqual(result.rows[0], [1, "x" * 10])
+        self.assertIsNone(result.rows[1][1])
+        self.assertTrue(is_lob_placeholder(result.rows[2][1]))
+        self.assertEqual(result.rows[2][1]["preview"], "x" * 25)
+        # Only the preview was read
+        self.assertEqual(rows[2][1].read_sizes, [26])
+    
+    def test_fetch_lob_value(self):
+        """
+        Test reading a full LOB value of a single result cell.
+        """
+        rows = [(i, FakeLOB(f"document {i} " * 100)) for i in range(10)]
+        cursor = FakeCursor(rows)
+        connection = MagicMock()
+        connection.cursor.return_value = cursor
+        self.connector.get_connection = MagicMock()
+        self.connector.get_connection.return_value.__enter__.return_value = connection
+        self.connector.LOB_READ_CHUNK_SIZE = 64
+        self.db_config.connection_config.options["fetch_size"] = 3
+        
+        value = self.connector.fetch_lob_value(self.db_config, "SELECT ID, DOC FROM DOCS ORDER BY ID", 7, "DOC")
+        
+        self.assertEqual(value, "document 7 " * 100)
+        self.assertEqual(cursor.fetch_sizes, [3, 3, 2])
+        with self.assertRaises(ValueError):
+            self.connector.fetch_lob_value(self.db_config, "SELECT ID, DOC FROM DOCS", 0, "MISSING")
+    
+    def test_fetch_lob_value_by_row_key(self):
+        """
+        Test that a row key selects only the keyed row instead of re-reading the whole result.
+        """
+        cursor = FakeCursor([(FakeLOB("document 7 " * 100),)])
+        cursor.execute = MagicMock()
+        connection = MagicMock()
+        connection.cursor.return_value = cursor
+        self.connector.get_connection = MagicMock()
+        self.connector.get_connection.return_value.__enter__.return_value = connection
+        
+        value = self.connector.fetch_lob_value(
+            self.db_config, "SELECT ID, DOC FROM DOCS;", 0, "DOC", row_key={"ID": 7}, auto_convert=False
+        )
+        self.assertEqual(value, "document 7 " * 100)
+        cursor.execute.assert_called_once_with(
+            'SELECT "DOC" FROM (SELECT ID, DOC FROM DOCS) AS LOB_SOURCE WHERE "ID" = ?', [7]
+        )
+        self.assertEqual(cursor.fetch_sizes, [1])
+        
+        with self.assertRaises(ValueError):
+            self.connector.fetch_lob_value(self.db_config, "SELECT ID, DOC FROM DOCS", 0, "DOC", row_key={"ID": 8})
+    
+    def test_fetch_lob_value_by_row_key_falls_back_to_scan(self):
+        """
+        Test that the row is located by scanning the result when the keyed query cannot run.
+        """
+        rows = [(i, FakeLOB(f"document {i} " * 100)) for i in (3, 9, 7, 1, 5)]
+        cursor = FakeCursor(rows)
+        cursor.execute = MagicMock(side_effect=[Exception("column ambiguously defined"), None])
+        connection = MagicMock()
+        connection.cursor.return_value = cursor
+        self.connector.get_connection = MagicMock()
+        self.connector.get_connection.return_value.__enter__.return_value = connection
+        self.db_config.connection_config.options["fetch_size"] = 2
+        
+        value = self.connector.fetch_lob_value(self.db_config, "SELECT ID, DOC FROM DOCS", 0, "DOC", row_key={"ID": 7})
+        self.assertEqual(value, "document 7 " * 100)
+        self.assertEqual(cursor.fetch_sizes, [2, 2])
+    
+    def test_lob_matches_placeholder(self):
+        """
+        Test comparing fully read values with the prefix recorded in their placeholder.
+        """
+        self.assertTrue(lob_matches_placeholder(make_lob_placeholder("document 7"), "document 7 and more"))
+        self.assertFalse(lob_matches_placeholder(make_lob_placeholder("document 7"), "document 8 and more"))
+        
+        placeholder = HANAConnector._read_lob_preview(FakeLOB(b"\x00\x01\x02\x03"), 2)
+        self.assertTrue(lob_matches_placeholder(placeholder, b"\x00\x01\x02\x03"))
+        self.assertFalse(lob_matches_placeholder(placeholder, b"\x00\x02\x02\x03"))
+
+
+class TestLOBValueService(unittest.TestCase):
+    """
+    Tests for reading stored LOB cells through the query execution service.
+    """
+    
+    SERVICE_MODULE = "backend.services.query_execution_service"
+    
+    def setUp(self):
+        """
+        Set up a stored result with a LOB placeholder in its second row.
+        """
+        self.query = MagicMock(result_id="r1", db_id="db2", executed_sql="SELECT ID, DOC FROM DOCS")
+        self.result = MagicMock(
+            columns=[{"name": "ID"}, {"name": "DOC"}],
+            rows=[[1, "short"], [2, make_lob_placeholder("document 2")]]
+        )
+        self.connector = MagicMock()
+        self.connector.get_schema.side_effect = RuntimeError("no schema")
+    
+    def _get_lob_value(self, fetched_value):
+        """
+        Read the placeholder cell with the connector returning the given value.
+        """
+        self.connector.fetch_lob_value.return_value = fetched_value
+        with patch(f"{self.SERVICE_MODULE}.get_query_by_id", AsyncMock(return_value=self.query)), \
+                patch(f"{self.SERVICE_MODULE}.get_query_result_by_id", AsyncMock(return_value=self.result)), \
+                patch(f"{self.SERVICE_MODULE}.connector_factory") as factory:
+            factory.create_connector.return_value = self.connector
+            service = QueryExecutionService()
+            service._get_db_config = MagicMock()
+            return asyncio.run(service.get_lob_value("q1", 1, "DOC"))
+    
+    def test_rejects_value_of_another_row(self):
+        """
+        Test that a re-executed query returning another row at the same position is detected.
+        """
+        self.assertEqual(self._get_lob_value("document 2 " * 100)["value"], "document 2 " * 100)
+        with self.assertRaises(ValueError):
+            self._get_lob_value("document 5 " * 100)
+    
+    def test_keys_fetch_by_primary_key(self):
+        """
+        Test that the row is located by primary key when the result contains it.
+        """
+        table = MagicMock(primary_key=["ID"])
+        table.name = "DOCS"
+        db_schema = MagicMock(tables=[table])
+        db_schema.name = "TESTDB"
+        self.connector.get_schema.side_effect = None
+        self.connector.get_schema.return_value = MagicMock(schemas=[db_schema])
+        
+        self._get_lob_value("document 2 " * 100)
+        self.assertEqual(self.connector.fetch_lob_value.call_args.kwargs["row_key"], {"ID": 2})
+
+
+class FakeLOB:
+    """hdbcli LOB locator stand-in"""
+    
+    def __init__(self, data):
+        self.data = data
+        self.position = 0
+        self.read_sizes = []
+    
+    def read(self, size):
+        self.read_sizes.append(size)
+        chunk = self.data[self.position:self.position + size]
+        self.position += len(chunk)
+        return chunk
+    
+    def close(self):
+        pass
+
+
+class FakeCursor:
+    """Cursor stand-in serving rows through fetchmany"""
+    
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.description = [("ID", 3), ("DOC", 26)]
+        self.rowcount = -1
+        self.fetch_sizes = []
+    
+    def execute(self, query, *args):
+        pass
+    
+    def setfetchsize(self, size):
+        pass
+    
+    def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+    
+    def close(self):
+        pass
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,188 @@
+"""
+Unit tests for request deadlines and hedged LLM calls.
+"""
+
+import asyncio
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from sql_agent.backend.api.admin import record_metrics_snapshot
+from sql_agent.backend.llm.hedging import HedgedCaller
+from sql_agent.backend.services.system_monitoring_service import SystemMonitoringService
+from sql_agent.backend.utils.deadline import DeadlineExceededError, current_deadline, deadline_scope
+
+
+class TestDeadlineScope(unittest.TestCase):
+    """
+    Tests for deadline propagation.
+    """
+
+    def test_nested_scopes_only_shorten_the_deadline(self):
+        """
+        Test that an inner scope cannot extend the outer deadline and None keeps it.
+        """
+        self.assertIsNone(current_deadline())
+        with deadline_scope(1.0) as outer:
+            with deadline_scope(10.0) as inner:
+                self.assertIs(inner, outer)
+            with deadline_scope(0.5) as inner:
+                self.assertLess(inner.expires_at, outer.expires_at)
+                self.assertIs(current_deadline(), inner)
+            with deadline_scope(None) as inner:
+                self.assertIs(inner, outer)
+            self.assertIs(current_deadline(), outer)
+        self.assertIsNone(current_deadline())
+
+
+class TestHedgedCaller(unittest.TestCase):
+    """
+    Tests for hedging, fallback models and deadline enforcement.
+    """
+
+    def test_hedge_wins_and_cancels_slow_primary(self):
+        """
+        Test that a hedge is sent after the hedge delay and the slower request is cancelled.
+        """
+        caller = HedgedCaller("test:primary", "primary", max_hedge_ratio=1.0, default_hedge_delay=0.05)
+        started = []
+        cancelled = []
+
+        async def request(model_name):
+            started.append(model_name)
+            try:
+                await asyncio.sleep(1.0 if len(started) == 1 else 0.01)
+            except asyncio.CancelledError:
+                cancelled.append(model_name)
+                raise
+            return len(started)
+
+        async def scenario():
+            begin = time.monotonic()
+            result = await caller.run(request, hedge=True)
+            await asyncio.sleep(0)
+            return result, time.monotonic() - begin
+
+        result, elapsed = asyncio.run(scenario())
+        self.assertEqual(result, 2)
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(started, ["primary", "primary"])
+        self.assertEqual(cancelled, ["primary"])
+
+        stats = caller.get_stats()
+        self.assertEqual((stats["calls"], stats["hedged"], stats["hedge_wins"]), (1, 1, 1))
+        self.assertEqual(stats["hedge_rate"], 1.0)
+
+    def test_cancelled_requests_record_own_elapsed_time(self):
+        """
+        Test that a losing hedge is not recorded and a cancelled slow primary is timed from its own start.
+        """
+        caller = HedgedCaller("test:primary", "primary", max_hedge_ratio=1.0, default_hedge_delay=0.05)
+        tracker = caller.tracker("primary")
+        started = []
+
+        async def request(model_name):
+            started.append(model_name)
+            # The primary answers shortly after the hedge is sent; the hedge would take much longer
+            await asyncio.sleep(0.08 if len(started) == 1 else 1.0)
+            return len(started)
+
+        async def scenario():
+            result = await caller.run(request, hedge=True)
+            await asyncio.sleep(0)
+            return result
+
+        self.assertEqual(asyncio.run(scenario()), 2)
+        self.assertEqual(started, ["primary", "primary"])
+        # Only the completed primary is a sample; the hedge ran ~0.03s before it was cancelled
+        self.assertEqual(len(tracker._samples), 1)
+        self.assertGreaterEqual(tracker._samples[0], 0.08)
+
+        caller._record_cancelled("primary", 0.2)
+        caller._record_cancelled("primary", 0.01)
+        self.assertEqual(list(tracker._samples)[1:], [0.2])
+
+    def test_hedge_ratio_cap(self):
+        """
+        Test that no hedge is sent once the hedge budget is used up.
+        """
+        caller = HedgedCaller("test:primary", "primary", max_hedge_ratio=0.0, default_hedge_delay=0.01)
+        started = []
+
+        async def request(model_name):
+            started.append(model_name)
+            await asyncio.sleep(0.05)
+            return "ok"
+
+        self.assertEqual(asyncio.run(caller.run(request, hedge=True)), "ok")
+        self.assertEqual(len(started), 1)
+        self.assertEqual(caller.get_stats()["hedged"], 0)
+
+    def test_short_deadline_uses_fallback_model(self):
+        """
+        Test that the fallback model is used when the remaining time is below the expected latency.
+        """
+        caller = HedgedCaller("test:primary", "primary", fallback_model="fast", default_latency=5.0)
+        models = []
+
+        async def request(model_name):
+            models.append(model_name)
+            return model_name
+
+        async def scenario():
+            with deadline_scope(1.0):
+                return await caller.run(request, hedge=False)
+
+        self.assertEqual(asyncio.run(scenario()), "fast")
+        self.assertEqual(asyncio.run(caller.run(request, hedge=False)), "primary")
+        self.assertEqual(models, ["fast", "primary"])
+        self.assertEqual(caller.get_stats()["fallbacks"], 1)
+
+    def test_deadline_exceeded_cancels_request(self):
+        """
+        Test that the call fails with DeadlineExceededError and the pending request is cancelled.
+        """
+        caller = HedgedCaller("test:primary", "primary")
+        cancelled = []
+
+        async def request(model_name):
+            try:
+                await asyncio.sleep(1.0)
+            except asyncio.CancelledError:
+                cancelled.append(model_name)
+                raise
+
+        async def scenario():
+            with deadline_scope(0.05):
+                await caller.run(request, hedge=True)
+
+        begin = time.monotonic()
+        with self.assertRaises(DeadlineExceededError):
+            asyncio.run(scenario())
+        self.assertLess(time.monotonic() - begin, 0.5)
+        self.assertEqual(cancelled, ["primary"])
+        self.assertEqual(caller.get_stats()["deadline_exceeded"], 1)
+
+
+
+class TestMetricsSnapshot(unittest.TestCase):
+    """
+    Tests for recording cache and LLM statistics as system metrics.
+    """
+
+    def test_snapshot_records_every_metric(self):
+        """
+        Test that the snapshot endpoint records the hedge rate along with the other statistics.
+        """
+        with patch.object(SystemMonitoringService, "record_metric") as record_metric:
+            snapshot = asyncio.run(record_metrics_snapshot(current_user=MagicMock(), db=MagicMock()))
+
+        self.assertEqual(
+            set(snapshot), {"validation_cache", "nl_sql_cache", "embedding_cache", "llm_hedging", "model_routing"}
+        )
+        recorded = {c.kwargs["metric_name"]: c.kwargs["metric_value"] for c in record_metric.call_args_list}
+        self.assertEqual(recorded["llm_hedge_rate"], f"{snapshot['llm_hedging']['hedge_rate']:.4f}")
+
+
+if __name__ == "__main__":
+    unittest.main()
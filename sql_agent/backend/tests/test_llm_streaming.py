@@ -0,0 +1,132 @@
+"""
+Unit tests for streaming SQL generation, early SQL extraction and SSE formatting.
+"""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from sql_agent.backend.llm.base import LLMConfig, LLMProvider
+from sql_agent.backend.llm.openai_service import OpenAIService
+from sql_agent.backend.llm.nl_sql_cache import NLSQLCache
+from sql_agent.backend.llm.nl_to_sql_service import NLToSQLService
+from sql_agent.backend.llm.response_utils import StreamingSQLExtractor
+from sql_agent.backend.utils.deadline import DeadlineExceededError, deadline_scope
+from sql_agent.backend.utils.sse import format_sse
+
+SCHEMA = {
+    "schemas": [{"name": "dbo", "tables": [{"name": "employees", "columns": [{"name": "employee_id", "type": "INT"}]}]}]
+}
+
+# Completion split into the chunks a streaming API would deliver
+CHUNKS = ["```sql\nSELECT COUNT(*) ", "FROM dbo.employees\n``", "`\n이 쿼리는 ", "직원 수를 ", "셉니다."]
+
+
+class TestLLMStreaming(unittest.TestCase):
+    """
+    Tests for the streaming variants of SQL generation.
+    """
+
+    def _openai_service(self):
+        """
+        Create an OpenAI service whose streaming API call replays CHUNKS.
+        """
+        service = OpenAIService(LLMConfig(provider=LLMProvider.OPENAI, model_name="gpt-4", api_key="test"))
+
+        async def stream(messages):
+            for chunk in CHUNKS:
+                await asyncio.sleep(0)
+                yield chunk
+
+        service._stream_openai_api = stream
+        return service
+
+    def test_extractor_returns_sql_when_fence_closes(self):
+        """
+        Test that SQL is extracted exactly once, as soon as the closing fence arrives.
+        """
+        extractor = StreamingSQLExtractor()
+        self.assertEqual([extractor.feed(chunk) for chunk in CHUNKS],
+                         [None, None, "SELECT COUNT(*) FROM dbo.employees", None, None])
+
+    def test_stream_generate_sql_emits_sql_before_explanation(self):
+        """
+        Test the event order and that the final result matches generate_sql.
+        """
+        async def collect():
+            service = self._openai_service()
+            return [event async for event in service.stream_generate_sql("직원 수", SCHEMA, "mssql")]
+
+        events = asyncio.run(collect())
+        names = [event["event"] for event in events]
+        self.assertEqual(names, ["token", "token", "token", "sql", "token", "token", "done"])
+        self.assertTrue(events[3]["valid"])
+        self.assertEqual(events[-1]["sql"], "SELECT COUNT(*) FROM dbo.employees")
+        self.assertEqual(events[-1]["explanation"], "이 쿼리는 직원 수를 셉니다.")
+
+    def test_validation_overlaps_explanation(self):
+        """
+        Test that validation starts while the explanation is still streaming and the result is cached.
+        """
+        order = []
+        validator = MagicMock()
+        validator.validate_sql.side_effect = lambda *args, **kwargs: order.append("validate") or (True, [], [])
+
+        llm_service = self._openai_service()
+        original_stream = llm_service._stream_openai_api
+
+        async def tracked_stream(messages):
+            async for chunk in original_stream(messages):
+                order.append(chunk)
+                await asyncio.sleep(0.01)
+                yield chunk
+
+        llm_service._stream_openai_api = tracked_stream
+        llm_service.get_embeddings = MagicMock(side_effect=Exception("no embeddings"))
+        cache = NLSQLCache()
+        service = NLToSQLService(llm_service, cache=cache, sql_validator=validator)
+
+        async def collect():
+            return [event async for event in service.stream_nl_to_sql("user1", "직원 수", SCHEMA, "mssql", db_id="db1")]
+
+        events = asyncio.run(collect())
+        self.assertLess(order.index("validate"), order.index(CHUNKS[-1]))
+        self.assertEqual([event["event"] for event in events].count("validation"), 1)
+        self.assertIn("conversation_id", events[-1])
+        self.assertEqual(cache.get_stats()["size"], 1)
+
+    def test_stream_respects_request_deadline(self):
+        """
+        Test that the streaming call gets the remaining deadline as its timeout and stops once it expires.
+        """
+        service = OpenAIService(LLMConfig(provider=LLMProvider.OPENAI, model_name="gpt-4", api_key="test"))
+
+        async def chunks():
+            for chunk in CHUNKS:
+                await asyncio.sleep(0.05)
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=chunk))])
+
+        service.client = MagicMock()
+        service.client.chat.completions.create = AsyncMock(side_effect=lambda **kwargs: chunks())
+
+        async def collect():
+            received = []
+            with deadline_scope(0.12):
+                async for delta in service._stream_openai_api([{"role": "user", "content": "직원 수"}]):
+                    received.append(delta)
+            return received
+
+        with self.assertRaises(DeadlineExceededError):
+            asyncio.run(collect())
+        self.assertLessEqual(service.client.chat.completions.create.call_args.kwargs["timeout"], 1.0)
+
+    def test_format_sse(self):
+        """
+        Test the Server-Sent Events message format.
+        """
+        self.assertEqual(format_sse("token", {"content": "셉니다"}), 'event: token\ndata: {"content": "셉니다"}\n\n')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Unit tests for the offline feature-hashing embedding provider.
+"""
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock
+
+import numpy as np
+
+from sql_agent.backend.llm.base import LLMConfig, LLMProvider
+from sql_agent.backend.llm.factory import LLMServiceFactory, get_embedding_service
+from sql_agent.backend.llm.local_embedding_service import HashingEmbedder, LocalEmbeddingService, extract_features
+from sql_agent.backend.llm.openai_service import OpenAIService
+
+
+class TestLocalEmbeddingService(unittest.TestCase):
+    """
+    Tests for determinism, similarity, factory registration and the removed random fallback.
+    """
+
+    def tearDown(self):
+        LLMServiceFactory.clear_cache()
+
+    def test_embeddings_are_deterministic_and_normalized(self):
+        """
+        Test that the same text always maps to the same unit vector, across embedder instances.
+        """
+        texts = ["Table: dbo.employees", "직원 급여 평균", ""]
+        first = HashingEmbedder(256).embed(texts)
+        second = HashingEmbedder(256).embed(texts)
+
+        self.assertEqual(first.shape, (3, 256))
+        np.testing.assert_array_equal(first, second)
+        np.testing.assert_allclose(np.linalg.norm(first[:2], axis=1), [1.0, 1.0], rtol=1e-5)
+        self.assertFalse(first[2].any())
+
+    def test_related_texts_are_closer(self):
+        """
+        Test that texts sharing words and identifier parts score higher than unrelated ones.
+        """
+        self.assertIn(("w:employee", 0.7), extract_features("employeeId"))
+
+        query, related, unrelated = HashingEmbedder().embed([
+            "average employee salary",
+            "Column: employee_salary in table dbo.employees",
+            "Foreign key from orders.customer_id to customers.id"
+        ])
+        self.assertGreater(float(query @ related), float(query @ unrelated))
+
+    def test_factory_registration(self):
+        """
+        Test that the local provider is created by the factory and only supports embeddings.
+        """
+        service = get_embedding_service("local", embedding_dimension=64)
+        self.assertIsInstance(service, LocalEmbeddingService)
+        self.assertIs(get_embedding_service("local", embedding_dimension=64), service)
+        self.assertEqual(service.config.embedding_model, "local-hashing-64")
+
+        embeddings = asyncio.run(service.get_embeddings(["a", "b"]))
+        self.assertEqual([len(embedding) for embedding in embeddings], [64, 64])
+        self.assertEqual(service.get_embeddings_sync(["a"]), embeddings[:1])
+
+        with self.assertRaises(NotImplementedError):
+            asyncio.run(service.generate_sql("직원 수", {}, "mssql"))
+
+    def test_openai_embedding_failure_is_raised(self):
+        """
+        Test that OpenAI embedding errors propagate instead of returning random vectors.
+        """
+        service = OpenAIService(LLMConfig(provider=LLMProvider.OPENAI, model_name="gpt-4", api_key="test"))
+        service.client.embeddings.create = AsyncMock(side_effect=RuntimeError("network down"))
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(service.get_embeddings(["employees"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,8 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
 from fastapi.testclient import TestClient
 import pytest
 
@@ -42,4 +47,20 @@ def test_openapi_endpoint():
     schema = response.json()
     assert "openapi" in schema
     assert "info" in schema
-    assert "paths" in schema
\ No newline at end of file
+    assert "paths" in schema
+
+def test_main_imports_as_package(tmp_path):
+    """
+    start_server.py와 동일하게 저장소 루트만 경로에 둔 상태에서 패키지로 임포트되는지 테스트
+    """
+    repo_root = Path(__file__).resolve().parents[3]
+    env = dict(os.environ, PYTHONPATH=str(repo_root), DATABASE_URL=f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+    result = subprocess.run(
+        [sys.executable, "-c", "import sql_agent.backend.main"],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,132 @@
+"""
+Unit tests for routing SQL generation between a fast and a large model.
+"""
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from sql_agent.backend.llm.model_router import (
+    ModelRouter, count_join_hints, get_model_router, record_execution_failure
+)
+from sql_agent.backend.llm.nl_to_sql_service import NLToSQLService
+
+
+SCHEMA = {
+    "schemas": [
+        {
+            "name": "dbo",
+            "tables": [
+                {"name": "customers", "columns": [{"name": "id"}, {"name": "name"}, {"name": "region"}]},
+                {"name": "orders", "columns": [{"name": "id"}, {"name": "customer_id"}, {"name": "amount"}]},
+                {"name": "products", "columns": [{"name": "id"}, {"name": "title"}, {"name": "price"}]},
+                {"name": "shipments", "columns": [{"name": "id"}, {"name": "order_id"}, {"name": "carrier"}]}
+            ]
+        }
+    ]
+}
+
+
+def _service(model_name, sql):
+    """
+    Build a mock LLM service that answers every SQL generation request with the given SQL.
+    """
+    service = MagicMock()
+    service.config.model_name = model_name
+    service.generate_sql = AsyncMock(return_value={"sql": sql, "explanation": model_name})
+    service.validate_and_fix_sql = AsyncMock(return_value=("SELECT name FROM dbo.customers", True))
+    return service
+
+
+class TestModelRouter(unittest.TestCase):
+    """
+    Tests for complexity classification, escalation and route statistics.
+    """
+
+    def setUp(self):
+        self.fast = _service("fast-model", "SELECT nme FROM customers")
+        self.strong = _service("strong-model", "SELECT name FROM customers")
+        self.router = ModelRouter(self.fast, self.strong)
+
+    def test_classification(self):
+        """
+        Test that table count, join hints and conversation depth decide the route.
+        """
+        self.assertEqual(self.router.classify("list customer names", SCHEMA).route, "fast")
+
+        decision = self.router.classify("orders and shipments of customers with products", SCHEMA)
+        self.assertEqual((decision.route, decision.tables), ("strong", 4))
+
+        self.assertEqual(count_join_hints("total amount per region compared across each year"), 4)
+        self.assertEqual(self.router.classify("customers per region compared across years", SCHEMA).route, "strong")
+
+        context = [{"question": "q", "answer": "a"}] * 3
+        self.assertEqual(self.router.classify("list customer names", SCHEMA, context).route, "strong")
+
+    def test_escalates_only_when_validation_fails(self):
+        """
+        Test that the large model is used only after the fast model's SQL fails validation.
+        """
+        result = asyncio.run(self.router.generate_sql("list customer names", SCHEMA, "mssql", validate=lambda sql: True))
+        self.assertEqual((result["route"], result["model"]), ("fast", "fast-model"))
+        self.strong.generate_sql.assert_not_awaited()
+
+        result = asyncio.run(
+            self.router.generate_sql("list customer names", SCHEMA, "mssql", validate=lambda sql: "nme" not in sql)
+        )
+        self.assertEqual((result["route"], result["sql"]), ("escalated", "SELECT name FROM customers"))
+
+        stats = self.router.get_stats()
+        self.assertEqual(stats["fast"]["attempts"], 2)
+        self.assertEqual(stats["fast"]["validation_failures"], 1)
+        self.assertEqual(stats["fast"]["win_rate"], 0.5)
+        self.assertEqual(stats["routes"]["escalated"]["calls"], 1)
+
+    def test_execution_failure_counts_against_fast_route(self):
+        """
+        Test that fixing a failed fast-model query uses the large model and lowers the fast win rate.
+        """
+        result = asyncio.run(self.router.generate_sql("list customer names", SCHEMA, "mssql"))
+        self.assertEqual(self.router.route_for_sql(result["sql"]), "fast")
+
+        fixed_sql, modified = asyncio.run(
+            self.router.escalate_after_execution_error(result["sql"], SCHEMA, "mssql", "Invalid column name 'nme'")
+        )
+        self.assertTrue(modified)
+        self.assertEqual(fixed_sql, "SELECT name FROM dbo.customers")
+        self.strong.validate_and_fix_sql.assert_awaited_once()
+
+        stats = self.router.get_stats()
+        self.assertEqual((stats["fast"]["execution_failures"], stats["fast"]["win_rate"]), (1, 0.0))
+
+    def test_failed_execution_counts_once_against_fast_route(self):
+        """
+        Test that a failed execution of fast-model SQL is counted once, even when it is fixed afterwards.
+        """
+        fast = _service("failing-fast-model", "SELECT nme FROM customers")
+        router = get_model_router(fast, self.strong)
+        router.reset_stats()
+        result = asyncio.run(router.generate_sql("list customer names", SCHEMA, "mssql"))
+
+        self.assertIsNone(record_execution_failure("SELECT name FROM customers"))
+        self.assertEqual(record_execution_failure(result["sql"]), "failing-fast-model->strong-model")
+        self.assertIsNone(record_execution_failure(result["sql"]))
+        asyncio.run(router.escalate_after_execution_error(result["sql"], SCHEMA, "mssql", "Invalid column name 'nme'"))
+
+        stats = router.get_stats()
+        self.assertEqual((stats["fast"]["execution_failures"], stats["fast"]["win_rate"]), (1, 0.0))
+
+    def test_nl_to_sql_service_validates_fast_results(self):
+        """
+        Test that NLToSQLService escalates SQL that fails validation.
+        """
+        self.fast.generate_sql.return_value = {"sql": "SELECT name FROM customers WHERE (", "explanation": ""}
+        service = NLToSQLService(self.strong, use_cache=False, model_router=self.router)
+        result = asyncio.run(service.convert_nl_to_sql("user1", "list customer names", SCHEMA, "mssql"))
+
+        self.assertEqual(result["route"], "escalated")
+        self.assertEqual(result["sql"], "SELECT name FROM customers")
+
+
+if __name__ == "__main__":
+    unittest.main()
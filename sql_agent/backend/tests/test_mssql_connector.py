@@ -79,17 +79,10 @@ class TestMSSQLConnector(unittest.TestCase):
         self.assertIn("timeout=30", conn_str)
         self.assertIn("encrypt=True", conn_str)
         
-        # Verify the connection settings were configured
-        self.assertEqual(mock_cursor.execute.call_count, 5)
-        mock_cursor.execute.assert_has_calls([
-            call("SET ARITHABORT ON"),
-            call("SET ANSI_NULLS ON"),
-            call("SET ANSI_WARNINGS ON"),
-            call("SET QUOTED_IDENTIFIER ON"),
-            call("SET CONCAT_NULL_YIELDS_NULL ON")
-        ])
-        
-        # Verify the cursor was closed
+        # Session settings are applied by the pool's on_create hook as a single batch
+        mock_cursor.execute.assert_not_called()
+        self.connector._init_session(connection)
+        mock_cursor.execute.assert_called_once_with(MSSQLConnector.SESSION_INIT_SQL)
         mock_cursor.close.assert_called_once()
         
         # Verify the connection was returned
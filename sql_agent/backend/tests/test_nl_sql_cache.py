@@ -0,0 +1,166 @@
+"""
+Unit tests for the two-tier NL→SQL generation cache.
+"""
+
+import asyncio
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sql_agent.backend.llm.nl_sql_cache import NLSQLCache, normalize_question, context_hash, extract_literals
+from sql_agent.backend.llm.nl_to_sql_service import NLToSQLService
+from sql_agent.backend.llm.embedding_cache import EmbeddingCache
+from sql_agent.backend.llm.embedding_pipeline import EmbeddingPipeline
+from sql_agent.backend.models.feedback import FeedbackCategory
+from sql_agent.backend.services.feedback_service import FeedbackService
+from sql_agent.backend.utils.sql_fingerprint import sql_fingerprint
+
+SCHEMA = {
+    "version": "1",
+    "schemas": [{"name": "dbo", "tables": [{"name": "employees", "columns": [{"name": "employee_id", "type": "INT"}]}]}]
+}
+
+# Questions with near-identical meaning share a direction in this toy embedding space
+EMBEDDINGS = {
+    "how many employees are there": [1.0, 0.0, 0.0],
+    "how many employees do we have": [0.99, 0.1, 0.0],
+    "list all departments": [0.0, 0.0, 1.0],
+}
+
+
+class TestNLSQLCache(unittest.TestCase):
+    """
+    Tests for exact and semantic lookups, expiry and invalidation.
+    """
+
+    def setUp(self):
+        """
+        Set up a service with a mocked LLM and a private cache.
+        """
+        self.cache = NLSQLCache(max_size=10, similarity_threshold=0.95)
+        self.llm_service = MagicMock()
+        self.llm_service.generate_sql = AsyncMock(return_value={
+            "sql": "SELECT COUNT(*) FROM dbo.employees", "explanation": "count", "db_type": "mssql"
+        })
+        self.llm_service.get_embeddings = AsyncMock(side_effect=lambda texts: [EMBEDDINGS[texts[0]]])
+        validator = MagicMock()
+        validator.validate_sql.return_value = (True, [], [])
+        self.service = NLToSQLService(self.llm_service, cache=self.cache, sql_validator=validator)
+
+    def _convert(self, question, db_id="db1"):
+        """
+        Convert a question on the test schema.
+        """
+        return asyncio.run(self.service.convert_nl_to_sql(
+            user_id="user1", natural_language=question, schema=SCHEMA, db_type="mssql",
+            conversation_id="c1", db_id=db_id
+        ))
+
+    def test_normalize_question(self):
+        """
+        Test that case, whitespace, width and trailing punctuation are folded.
+        """
+        self.assertEqual(normalize_question("  How many\nEMPLOYEES are there？ "), "how many employees are there")
+        self.assertEqual(context_hash([]), "none")
+        self.assertNotEqual(context_hash([{"question": "a", "answer": "b"}]), context_hash([{"question": "a", "answer": "c"}]))
+
+    def test_exact_and_semantic_hits_skip_llm(self):
+        """
+        Test that repeated and near-identical questions are served from the cache.
+        """
+        with patch.object(self.service, "_get_conversation_context", return_value=[]):
+            self.assertNotIn("cache", self._convert("How many employees are there?"))
+            self.assertEqual(self._convert("how many employees are there")["cache"], "exact")
+
+            result = self._convert("How many employees do we have?")
+            self.assertEqual(result["cache"], "semantic")
+            self.assertGreaterEqual(result["cache_similarity"], 0.95)
+
+            # Different meaning or database misses
+            self.assertNotIn("cache", self._convert("List all departments"))
+            self.assertNotIn("cache", self._convert("How many employees are there?", db_id="db2"))
+
+        self.assertEqual(self.llm_service.generate_sql.await_count, 3)
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["exact_hits"], stats["semantic_hits"]), (1, 1))
+
+    def test_question_embeddings_use_the_embedding_pipeline(self):
+        """
+        Test that question embeddings come from the shared embedding service and persistent cache.
+        """
+        embedding_service = MagicMock()
+        embedding_service.get_embeddings = AsyncMock(side_effect=lambda texts: [EMBEDDINGS[text] for text in texts])
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.service.embedding_pipeline = EmbeddingPipeline(
+                embedding_service, cache=EmbeddingCache(cache_dir), model_name="model-a"
+            )
+            with patch.object(self.service, "_get_conversation_context", return_value=[]):
+                self._convert("How many employees are there?")
+                self.assertEqual(self._convert("How many employees do we have?")["cache"], "semantic")
+                self.cache.invalidate()
+                self._convert("How many employees do we have?")
+
+        self.llm_service.get_embeddings.assert_not_awaited()
+        # The repeated question is embedded from the persistent cache
+        self.assertEqual(embedding_service.get_embeddings.await_count, 2)
+
+    def test_feedback_invalidates_the_served_answer(self):
+        """
+        Test that feedback invalidates the answer that was served even after the query's SQL was edited.
+        """
+        served_sql = "SELECT COUNT(*) FROM dbo.employees"
+        key = NLSQLCache.make_key("q", "db1", "v1", "none")
+        self.cache.put(key, {"sql": served_sql})
+
+        query = MagicMock(db_id="db1", generated_sql="SELECT COUNT(*) FROM dbo.employees WHERE active = 1",
+                          answer_fingerprint=sql_fingerprint(served_sql))
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = query
+        feedback = MagicMock(category=FeedbackCategory.QUERY_ISSUE, related_query_id="query1")
+
+        with patch("sql_agent.backend.services.feedback_service.nl_sql_cache", self.cache):
+            FeedbackService()._invalidate_cached_answer(db, feedback)
+        self.assertIsNone(self.cache.get(key))
+        self.assertFalse(self.cache.put(key, {"sql": served_sql}))
+
+    def test_semantic_hit_requires_matching_literals(self):
+        """
+        Test that questions differing only in numbers or quoted names never share cached SQL.
+        """
+        self.assertEqual(extract_literals(normalize_question("Sales of 'Acme Co' in 2023?")), ("acme co", "2023"))
+
+        embedding = [1.0, 0.0, 0.0]
+        self.cache.put(NLSQLCache.make_key("Total sales in 2023", "db1", "v1", "none"), {"sql": "SELECT 2023"}, embedding)
+        self.cache.put(NLSQLCache.make_key("Orders for 'Acme'", "db1", "v1", "none"), {"sql": "SELECT 'Acme'"}, embedding)
+
+        self.assertIsNone(self.cache.get_similar(NLSQLCache.make_key("Total sales in 2024", "db1", "v1", "none"), embedding))
+        self.assertIsNone(self.cache.get_similar(NLSQLCache.make_key("Orders for 'Globex'", "db1", "v1", "none"), embedding))
+
+        result, _ = self.cache.get_similar(NLSQLCache.make_key("Sum of sales in 2023", "db1", "v1", "none"), embedding)
+        self.assertEqual(result["sql"], "SELECT 2023")
+        self.assertEqual(self.cache.get_stats()["literal_mismatches"], 2)
+
+    def test_expiry_eviction_and_invalidation(self):
+        """
+        Test TTL expiry, LRU eviction and invalidation of answers reported as wrong.
+        """
+        key = NLSQLCache.make_key("q", "db1", "v1", "none")
+        self.cache.put(key, {"sql": "SELECT 1"})
+        self.assertEqual(self.cache.get(key)["sql"], "SELECT 1")
+
+        self.cache.ttl_seconds = -1
+        self.assertIsNone(self.cache.get(key))
+        self.cache.ttl_seconds = 3600
+
+        self.cache.max_size = 1
+        self.cache.put(key, {"sql": "SELECT 1"})
+        self.cache.put(NLSQLCache.make_key("other", "db1", "v1", "none"), {"sql": "SELECT 2"})
+        self.assertIsNone(self.cache.get(key))
+
+        self.assertEqual(self.cache.invalidate_answer("db1", "SELECT  2"), 1)
+        self.assertFalse(self.cache.put(key, {"sql": "SELECT 2"}))
+        self.assertTrue(self.cache.put(NLSQLCache.make_key("q", "db2", "v1", "none"), {"sql": "SELECT 2"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Unit tests for automatic query parameterization.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from decimal import Decimal
+
+from sql_agent.backend.db.connectors.query_parameterizer import (
+    PreparedStatementCache,
+    build_sp_executesql,
+    parameterize_query
+)
+from sql_agent.backend.db.connectors.hana import HANAConnector
+from sql_agent.backend.db.connectors.pool import DefaultConnectionPoolManager
+
+
+class TestQueryParameterizer(unittest.TestCase):
+    """
+    Tests for literal lifting, sp_executesql rewriting and the prepared statement cache.
+    """
+
+    def test_parameterize_where_literals(self):
+        """
+        Test that comparison literals in WHERE are lifted.
+        """
+        sql = "SELECT name FROM sales WHERE region = 'EMEA' AND year >= 2024 AND amount < 10.50"
+        statement, values = parameterize_query(sql)
+        self.assertEqual(statement, "SELECT name FROM sales WHERE region = ? AND year >= ? AND amount < ?")
+        self.assertEqual(values, ["EMEA", 2024, Decimal("10.50")])
+
+        # Literal variants produce the same statement text
+        other_statement, other_values = parameterize_query(sql.replace("EMEA", "APAC").replace("2024", "2023"))
+        self.assertEqual(other_statement, statement)
+        self.assertEqual(other_values[:2], ["APAC", 2023])
+
+    def test_parameterize_in_between_like(self):
+        """
+        Test IN lists, BETWEEN ranges, LIKE patterns and escaped quotes.
+        """
+        sql = ("SELECT * FROM t WHERE a IN (1, 2, 3) AND b BETWEEN 5 AND 10 "
+               "AND c LIKE N'O''Brien%' AND d IN (SELECT x FROM u WHERE y = 7)")
+        statement, values = parameterize_query(sql)
+        self.assertEqual(
+            statement,
+            "SELECT * FROM t WHERE a IN (?, ?, ?) AND b BETWEEN ? AND ? "
+            "AND c LIKE ? AND d IN (SELECT x FROM u WHERE y = ?)"
+        )
+        self.assertEqual(values, [1, 2, 3, 5, 10, "O'Brien%", 7])
+
+    def test_literals_outside_predicates_are_kept(self):
+        """
+        Test that literals in SELECT, TOP, GROUP BY, ORDER BY and function arguments stay inline.
+        """
+        sql = ("SELECT TOP 10 CASE WHEN qty > 5 THEN 'big' END AS size, COUNT(*) FROM t "
+               "WHERE LEFT(code, 3) = 'ABC' GROUP BY CASE WHEN qty > 5 THEN 'big' END ORDER BY 2")
+        statement, values = parameterize_query(sql)
+        self.assertEqual(values, ["ABC"])
+        self.assertIn("TOP 10", statement)
+        self.assertIn("LEFT(code, 3) = ?", statement)
+        self.assertEqual(statement.count("qty > 5"), 2)
+        self.assertTrue(statement.endswith("ORDER BY 2"))
+
+    def test_existing_parameters_and_comments(self):
+        """
+        Test that queries with parameters or variables are left alone and comments are preserved.
+        """
+        for sql in ("SELECT * FROM t WHERE a = ? AND b = 1",
+                    "SELECT * FROM t WHERE a = :a AND b = 1",
+                    "SELECT * FROM t WHERE a = @a AND b = 1",
+                    "SELECT * FROM t"):
+            self.assertEqual(parameterize_query(sql), (sql, []))
+
+        statement, values = parameterize_query("SELECT * FROM t -- a = 1\nWHERE b = 2")
+        self.assertEqual(statement, "SELECT * FROM t -- a = 1\nWHERE b = ?")
+        self.assertEqual(values, [2])
+
+    def test_build_sp_executesql(self):
+        """
+        Test rewriting into sp_executesql with stable parameter types.
+        """
+        sql, args = build_sp_executesql("SELECT * FROM t WHERE a = 'x' AND b = N'한글' AND c = 1 AND d = 1.25")
+        self.assertEqual(sql, "EXEC sp_executesql ?, ?, ?, ?, ?, ?")
+        self.assertEqual(args[0], "SELECT * FROM t WHERE a = @p0 AND b = @p1 AND c = @p2 AND d = @p3")
+        self.assertEqual(args[1], "@p0 varchar(8000), @p1 nvarchar(4000), @p2 bigint, @p3 decimal(38, 2)")
+        self.assertEqual(args[2:], ["x", "한글", 1, Decimal("1.25")])
+
+        self.assertIsNone(build_sp_executesql("SELECT TOP 5 * FROM t"))
+
+    def test_prepared_statement_cache(self):
+        """
+        Test per-connection LRU caching and cleanup of prepared statements.
+        """
+        cache = PreparedStatementCache(max_statements_per_connection=1)
+        connection = object()
+        first, second = MagicMock(), MagicMock()
+
+        cache.put(connection, "SELECT ?", first)
+        self.assertIs(cache.get(connection, "SELECT ?"), first)
+        self.assertIsNone(cache.get(object(), "SELECT ?"))
+
+        cache.put(connection, "SELECT ?, ?", second)
+        first.close.assert_called_once()
+        self.assertIsNone(cache.get(connection, "SELECT ?"))
+
+        cache.discard_connection(connection)
+        second.close.assert_called_once()
+        self.assertEqual(cache.get_stats()["statements"], 0)
+
+    @patch("sql_agent.backend.db.connectors.hana.HANA_DRIVER", "hdbcli")
+    def test_hana_reuses_prepared_statement(self):
+        """
+        Test that the HANA connector prepares a statement once per connection.
+        """
+        connector = HANAConnector(MagicMock(spec=DefaultConnectionPoolManager))
+        connector.query_processor = MagicMock()
+        connection = MagicMock()
+        prepared_cursor = MagicMock()
+        connection.cursor.side_effect = [MagicMock(), prepared_cursor, MagicMock()]
+
+        for region in ("EMEA", "APAC"):
+            connector._execute_query_with_retry(
+                connection, f"SELECT * FROM sales WHERE region = '{region}'", None, None, None, "q1"
+            )
+
+        prepared_cursor.prepare.assert_called_once_with("SELECT * FROM sales WHERE region = ?")
+        self.assertEqual(
+            [c.args[0] for c in prepared_cursor.executeprepared.call_args_list],
+            [["EMEA"], ["APAC"]]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Unit tests for approximate preview execution on table samples.
+"""
+
+import unittest
+from datetime import datetime
+
+from sql_agent.backend.models.database import Database, DBType, ConnectionConfig
+from sql_agent.backend.models.query import QueryResult, ResultColumn
+from sql_agent.backend.db.connectors.pool import DefaultConnectionPoolManager
+from sql_agent.backend.db.connectors.sqlite import SQLiteConnector
+from sql_agent.backend.db.connectors.query_sampler import build_sampled_query, scale_sampled_result
+
+
+class TestQuerySampler(unittest.TestCase):
+    """
+    Tests for sampled query rewriting and aggregate scaling.
+    """
+
+    def test_build_sampled_query(self):
+        """
+        Test the TABLESAMPLE clause per database type and the sum-of-squares columns.
+        """
+        sampled = build_sampled_query(
+            "SELECT region, SUM(s.amount) AS total, COUNT(*) n FROM dbo.sales s "
+            "JOIN dbo.regions r ON r.id = s.region_id GROUP BY region",
+            DBType.MSSQL, 2
+        )
+        self.assertEqual(
+            sampled.sql,
+            "SELECT region, SUM(s.amount) AS total, COUNT(*) n, "
+            "SUM(CAST(s.amount AS FLOAT) * CAST(s.amount AS FLOAT)) AS sample_sq_1 "
+            "FROM dbo.sales s TABLESAMPLE SYSTEM (2 PERCENT) JOIN dbo.regions r ON r.id = s.region_id GROUP BY region"
+        )
+        self.assertEqual([(a.position, a.function) for a in sampled.aggregates], [(1, "SUM"), (2, "COUNT")])
+
+        # A joined table can be sampled by name; HANA supports row-level sampling
+        sampled = build_sampled_query(
+            "SELECT r.name, AVG(amount) FROM regions r INNER JOIN sales AS s ON r.id = s.region_id GROUP BY r.name",
+            "hana", 0.5, method="bernoulli", table="sales"
+        )
+        self.assertIn("JOIN sales AS s TABLESAMPLE BERNOULLI (0.5) ON", sampled.sql)
+        self.assertEqual(sampled.aggregates, [])
+
+        # MS-SQL only samples pages
+        sampled = build_sampled_query("SELECT TOP 10 * FROM [sales] WITH (NOLOCK)", "mssql", 1, method="bernoulli")
+        self.assertEqual(sampled.sql, "SELECT TOP 10 * FROM [sales] TABLESAMPLE SYSTEM (1 PERCENT) WITH (NOLOCK)")
+        self.assertEqual(sampled.method, "system")
+        self.assertTrue(sampled.row_level)
+
+        for query in ["SELECT a FROM t UNION SELECT a FROM u", "SELECT * FROM (SELECT a FROM t) x", "DELETE FROM t"]:
+            with self.assertRaises(ValueError):
+                build_sampled_query(query, "mssql", 1)
+        with self.assertRaises(ValueError):
+            build_sampled_query("SELECT * FROM t", "mssql", 100)
+
+    def test_scale_sampled_result(self):
+        """
+        Test that COUNT and SUM are scaled and get Horvitz-Thompson error bounds.
+        """
+        sampled = build_sampled_query("SELECT region, SUM(amount) AS total, COUNT(*) AS n FROM sales GROUP BY region", "hana", 10)
+        result = QueryResult(
+            id="r1", query_id="", created_at=datetime.now(),
+            columns=[ResultColumn(name=name, type="FLOAT") for name in ["region", "total", "n", "sample_sq_1"]],
+            rows=[["north", 50.0, 10, 400.0]], row_count=1
+        )
+
+        scaled, approximation = scale_sampled_result(result, sampled)
+        self.assertEqual([c.name for c in scaled.columns], ["region", "total", "n", "total_error_bound", "n_error_bound"])
+        region, total, count, total_bound, count_bound = scaled.rows[0]
+        self.assertEqual((region, total, count), ("north", 500.0, 100))
+        self.assertAlmostEqual(total_bound, 1.96 * (0.9 * 400.0) ** 0.5 / 0.1)
+        self.assertAlmostEqual(count_bound, 1.96 * (0.9 * 10) ** 0.5 / 0.1)
+        self.assertTrue(approximation["approximate"])
+        self.assertEqual(approximation["scaled_columns"]["total"]["error_bound_column"], "total_error_bound")
+
+    def test_sqlite_preview(self):
+        """
+        Test an end-to-end preview on the SQLite stand-in connector.
+        """
+        db_config = Database(
+            id=f"sampler-test-{id(self)}",
+            name="Sampler Test Database",
+            type=DBType.SQLITE,
+            host="localhost",
+            port=1,
+            default_schema="main",
+            connection_config=ConnectionConfig(username="test", password_encrypted=""),
+            created_at=datetime.now(),
+            updated_at=datetime.now()
+        )
+        pool_manager = DefaultConnectionPoolManager()
+        connector = SQLiteConnector(pool_manager)
+        connection = connector._create_connection(db_config)
+        connection.execute("CREATE TABLE sales (id INTEGER PRIMARY KEY, amount REAL)")
+        connection.executemany("INSERT INTO sales VALUES (?, ?)", [(i, 2.0) for i in range(5000)])
+        connection.commit()
+
+        try:
+            sampled = build_sampled_query("SELECT COUNT(*) AS n, SUM(amount) AS total FROM sales", db_config.type, 20)
+            result = connector.execute_query(db_config, sampled.sql)
+            scaled, _ = scale_sampled_result(result, sampled)
+        finally:
+            pool_manager.close_all_connections()
+            connection.close()
+
+        count, total, count_bound, total_bound = scaled.rows[0]
+        self.assertLess(abs(count - 5000), 3 * count_bound)
+        self.assertLess(abs(total - 10000), 3 * total_bound)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Unit tests for per-phase query latency measurement.
+"""
+
+import asyncio
+import time
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from sql_agent.backend.utils.query_timing import PhaseTimer, QUERY_PHASES, timed_phase
+from sql_agent.backend.models.database import Database, DBType, ConnectionConfig
+from sql_agent.backend.db.models.query import QueryDB
+from sql_agent.backend.db.models.policy import Policy  # noqa: F401 (registers the mapper User refers to)
+from sql_agent.backend.db.crud.query_stats import get_phase_latency_percentiles
+from sql_agent.backend.db.connectors.pool import DefaultConnectionPoolManager
+from sql_agent.backend.db.connectors.sqlite import SQLiteConnector
+
+
+class TestPhaseTimer(unittest.TestCase):
+    """
+    Tests for the phase timer and its propagation into connectors.
+    """
+
+    def test_phases_accumulate_in_waterfall_order(self):
+        """
+        Test that repeated phases add up and timings follow the lifecycle order.
+        """
+        timer = PhaseTimer()
+        timer.add("fetch", 2.0)
+        timer.add("schema_fetch", 1.0)
+        timer.add("fetch", 3.0)
+        with timer.phase("custom"):
+            pass
+
+        self.assertEqual(list(timer.timings), ["schema_fetch", "fetch", "custom"])
+        self.assertEqual(timer.timings["fetch"], 5.0)
+
+        # Without an active timer, timed_phase measures nothing
+        with timed_phase("fetch"):
+            pass
+        self.assertEqual(timer.timings["fetch"], 5.0)
+
+    def test_active_timer_reaches_worker_threads(self):
+        """
+        Test that phases measured in asyncio.to_thread workers land on the active timer.
+        """
+        timer = PhaseTimer()
+
+        def work():
+            with timed_phase("server_execution"):
+                time.sleep(0.01)
+
+        async def run():
+            with timer.activate():
+                await asyncio.to_thread(work)
+            # Outside the block the timer no longer receives phases
+            await asyncio.to_thread(work)
+
+        asyncio.run(run())
+        self.assertGreaterEqual(timer.timings["server_execution"], 10)
+        self.assertLess(timer.timings["server_execution"], 20)
+
+    def test_connector_records_phases(self):
+        """
+        Test that a connector records conversion, validation, connection, execution and fetch.
+        """
+        db_config = Database(
+            id=f"timing-test-{id(self)}",
+            name="Timing Test Database",
+            type=DBType.SQLITE,
+            host="localhost",
+            port=1,
+            default_schema="main",
+            connection_config=ConnectionConfig(username="test", password_encrypted=""),
+            created_at=datetime.now(),
+            updated_at=datetime.now()
+        )
+        pool_manager = DefaultConnectionPoolManager()
+        connector = SQLiteConnector(pool_manager)
+
+        timer = PhaseTimer()
+        with timer.activate():
+            connector.execute_query(db_config, "SELECT name FROM sqlite_master LIMIT 1")
+        pool_manager.close_all_connections()
+
+        self.assertEqual(
+            list(timer.timings),
+            ["validation", "dialect_conversion", "connection_acquire", "server_execution", "fetch"]
+        )
+
+
+class TestPhaseLatencyPercentiles(unittest.TestCase):
+    """
+    Tests for per-phase percentile aggregation.
+    """
+
+    def test_get_phase_latency_percentiles(self):
+        """
+        Test percentiles over stored phase timings, filtered by database and period.
+        """
+        engine = create_engine("sqlite://")
+        QueryDB.__table__.create(engine)
+        db = sessionmaker(bind=engine)()
+
+        now = datetime.utcnow()
+        for index in range(1, 101):
+            db.add(QueryDB(
+                user_id="user1", db_id="db1", natural_language="q", generated_sql="SELECT 1",
+                status="completed", start_time=now, phase_timings={"server_execution": float(index), "fetch": 1.0}
+            ))
+        db.add(QueryDB(
+            user_id="user1", db_id="db2", natural_language="q", generated_sql="SELECT 1",
+            status="completed", start_time=now, phase_timings={"llm_generation": 900.0}
+        ))
+        db.add(QueryDB(
+            user_id="user1", db_id="db1", natural_language="q", generated_sql="SELECT 1",
+            status="completed", created_at=now - timedelta(days=30), phase_timings={"server_execution": 5000.0}
+        ))
+        # Generated but never executed
+        db.add(QueryDB(
+            user_id="user1", db_id="db1", natural_language="q", generated_sql="SELECT 1",
+            status="pending", phase_timings={"llm_generation": 700.0}
+        ))
+        db.commit()
+
+        stats = get_phase_latency_percentiles(db, days=7, db_id="db1")
+        self.assertEqual(stats["query_count"], 101)
+        execution = stats["phases"]["server_execution"]
+        self.assertEqual((execution["p50_ms"], execution["p95_ms"], execution["max_ms"]), (50.0, 95.0, 100.0))
+        self.assertEqual(list(stats["phases"]), ["llm_generation", "server_execution", "fetch"])
+
+        stats = get_phase_latency_percentiles(db, days=None)
+        self.assertEqual(stats["query_count"], 103)
+        self.assertEqual(
+            list(stats["phases"]),
+            [phase for phase in QUERY_PHASES if phase in ("llm_generation", "server_execution", "fetch")]
+        )
+        db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Unit tests for query fingerprinting and per-fingerprint workload statistics.
+"""
+
+import unittest
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from sql_agent.backend.utils.sql_fingerprint import normalize_sql_shape, sql_shape_fingerprint
+from sql_agent.backend.db.models.query import QueryFingerprintStatsDB
+from sql_agent.backend.db.models.policy import Policy  # noqa: F401 (registers the mapper User refers to)
+from sql_agent.backend.db.crud.query_stats import (
+    LATENCY_BUCKETS_MS,
+    latency_bucket,
+    latency_percentile,
+    _apply_execution,
+    get_fingerprint_stats
+)
+
+
+class TestQueryFingerprint(unittest.TestCase):
+    """
+    Tests for literal-free query shapes.
+    """
+
+    def test_normalize_sql_shape(self):
+        """
+        Test that literals, whitespace, case and IN list lengths are folded.
+        """
+        self.assertEqual(
+            normalize_sql_shape("SELECT  *\nFROM Orders WHERE id = 42 AND name = 'O''Brien';"),
+            "select * from orders where id = ? and name = ?"
+        )
+        self.assertEqual(
+            normalize_sql_shape("select * from orders where id in (1, 2, 3)"),
+            normalize_sql_shape("SELECT * FROM orders WHERE id IN (7)")
+        )
+
+        # Comments are dropped, including the text after -- up to the newline
+        self.assertEqual(
+            normalize_sql_shape("SELECT id -- only ids\nFROM orders /* recent */ WHERE id = 3"),
+            "select id from orders where id = ?"
+        )
+
+        # Quoted identifiers keep their case
+        self.assertIn('"Orders"', normalize_sql_shape('SELECT * FROM "Orders" WHERE x = 1.5'))
+
+        self.assertEqual(
+            sql_shape_fingerprint("SELECT * FROM t WHERE a = 1"),
+            sql_shape_fingerprint("select * from t where a = 99")
+        )
+        self.assertNotEqual(
+            sql_shape_fingerprint("SELECT * FROM t WHERE a = 1"),
+            sql_shape_fingerprint("SELECT * FROM t WHERE b = 1")
+        )
+
+
+class TestWorkloadStats(unittest.TestCase):
+    """
+    Tests for incremental statistics and their aggregation.
+    """
+
+    def setUp(self):
+        """
+        Set up an in-memory statistics table.
+        """
+        engine = create_engine("sqlite://")
+        QueryFingerprintStatsDB.__table__.create(engine)
+        self.db = sessionmaker(bind=engine)()
+
+    def tearDown(self):
+        """
+        Close the session.
+        """
+        self.db.close()
+
+    def test_latency_percentile(self):
+        """
+        Test bucket lookup and percentile interpolation.
+        """
+        self.assertEqual(latency_bucket(0.5), 0)
+        self.assertEqual(latency_bucket(150), LATENCY_BUCKETS_MS.index(200))
+        self.assertEqual(latency_bucket(10 ** 6), len(LATENCY_BUCKETS_MS))
+
+        histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        histogram[latency_bucket(15)] = 95
+        histogram[latency_bucket(900)] = 5
+        self.assertLessEqual(latency_percentile(histogram, 95), 20)
+        self.assertGreater(latency_percentile(histogram, 99), 500)
+        self.assertEqual(latency_percentile(histogram, 100, max_time_ms=900), 900)
+        self.assertIsNone(latency_percentile([], 95))
+
+    def test_get_fingerprint_stats(self):
+        """
+        Test that executions accumulate per fingerprint and sort by total time.
+        """
+        now = datetime.utcnow()
+        fast = QueryFingerprintStatsDB(fingerprint="fast", db_id="db1", normalized_sql="select ?", first_seen=now)
+        slow = QueryFingerprintStatsDB(fingerprint="slow", db_id="db1", normalized_sql="select * from t", first_seen=now)
+
+        for _ in range(10):
+            _apply_execution(fast, 5.0, 1, False, False, now)
+        _apply_execution(slow, 800.0, 100, False, False, now)
+        _apply_execution(slow, 20.0, 0, True, False, now)
+        self.db.add_all([fast, slow])
+        self.db.commit()
+
+        stats = get_fingerprint_stats(self.db)
+        self.assertEqual([s["fingerprint"] for s in stats], ["slow", "fast"])
+        self.assertEqual(stats[0]["calls"], 2)
+        self.assertEqual(stats[0]["errors"], 1)
+        self.assertEqual(stats[0]["rows"], 100)
+        self.assertEqual(stats[0]["mean_time_ms"], 410.0)
+        self.assertEqual(stats[0]["min_time_ms"], 20.0)
+        self.assertAlmostEqual(stats[0]["time_share"] + stats[1]["time_share"], 1.0)
+
+        self.assertEqual(get_fingerprint_stats(self.db, sort_by="calls")[0]["fingerprint"], "fast")
+        self.assertEqual(get_fingerprint_stats(self.db, db_id="db2"), [])
+        with self.assertRaises(ValueError):
+            get_fingerprint_stats(self.db, sort_by="unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
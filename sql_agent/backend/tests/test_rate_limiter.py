@@ -0,0 +1,110 @@
+"""
+Unit tests for provider-level LLM rate limiting, priority scheduling and retries.
+"""
+
+import asyncio
+import time
+import unittest
+from email.utils import formatdate
+
+import httpx
+import openai
+
+from sql_agent.backend.llm.base import LLMConfig, LLMProvider
+from sql_agent.backend.llm.openai_service import OpenAIService
+from sql_agent.backend.llm.rate_limiter import ProviderLimiter, RequestPriority, get_retry_after
+
+
+def _rate_limit_error(headers):
+    """
+    Build the error the OpenAI client raises for a 429 response.
+    """
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers=headers, request=request)
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+class TestProviderLimiter(unittest.TestCase):
+    """
+    Tests for priority ordering, Retry-After handling and client configuration.
+    """
+
+    def test_interactive_requests_are_served_first(self):
+        """
+        Test that queued interactive calls get the next free slot before earlier background calls.
+        """
+        limiter = ProviderLimiter("test:model", requests_per_minute=None, tokens_per_minute=None, max_concurrency=1)
+        order = []
+
+        async def run(name, priority, hold=0.0):
+            async def request():
+                order.append(name)
+                await asyncio.sleep(hold)
+            await limiter.call(request, priority=priority)
+
+        async def scenario():
+            first = asyncio.create_task(run("running", RequestPriority.DEFAULT, hold=0.05))
+            await asyncio.sleep(0.01)
+            queued = [
+                asyncio.create_task(run("summary", RequestPriority.BACKGROUND)),
+                asyncio.create_task(run("nl_to_sql", RequestPriority.INTERACTIVE)),
+            ]
+            await asyncio.sleep(0.01)
+            self.assertEqual(limiter.get_stats()["queued"], 2)
+            await asyncio.gather(first, *queued)
+
+        asyncio.run(scenario())
+        self.assertEqual(order, ["running", "nl_to_sql", "summary"])
+
+    def test_retries_honor_retry_after(self):
+        """
+        Test that a 429 is retried after the server-provided delay and non-retryable errors are raised at once.
+        """
+        limiter = ProviderLimiter("test:model", max_retries=2)
+        attempts = []
+
+        async def request():
+            attempts.append(time.monotonic())
+            if len(attempts) == 1:
+                raise _rate_limit_error({"retry-after-ms": "200"})
+            return "ok"
+
+        self.assertEqual(asyncio.run(limiter.call(request)), "ok")
+        self.assertGreaterEqual(attempts[1] - attempts[0], 0.2)
+        stats = limiter.get_stats()
+        self.assertEqual((stats["retries"], stats["rate_limited"], stats["active"]), (1, 1, 0))
+
+        async def invalid():
+            attempts.append(time.monotonic())
+            raise ValueError("bad request")
+
+        attempts.clear()
+        with self.assertRaises(ValueError):
+            asyncio.run(limiter.call(invalid))
+        self.assertEqual(len(attempts), 1)
+
+    def test_get_retry_after(self):
+        """
+        Test parsing of millisecond, second and HTTP-date Retry-After values.
+        """
+        self.assertEqual(get_retry_after(_rate_limit_error({"retry-after-ms": "1500"})), 1.5)
+        self.assertEqual(get_retry_after(_rate_limit_error({"retry-after": "3"})), 3.0)
+        self.assertAlmostEqual(
+            get_retry_after(_rate_limit_error({"retry-after": formatdate(time.time() + 10, usegmt=True)})), 10, delta=1.5
+        )
+        self.assertIsNone(get_retry_after(ValueError("no response")))
+
+    def test_openai_client_configuration(self):
+        """
+        Test that the OpenAI client leaves retries to the limiter and shares one limiter per model.
+        """
+        config = LLMConfig(provider=LLMProvider.OPENAI, model_name="gpt-4", api_key="test")
+        service, other = OpenAIService(config), OpenAIService(config)
+
+        self.assertEqual(service.client.max_retries, 0)
+        self.assertIs(service.rate_limiter, other.rate_limiter)
+        self.assertEqual(service.rate_limiter.name, "openai:gpt-4")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+Unit tests for the record/replay LLM provider.
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from sql_agent.backend.llm.base import LLMConfig, LLMProvider
+from sql_agent.backend.llm.factory import LLMServiceFactory
+from sql_agent.backend.llm.replay_service import (
+    Cassette,
+    CassetteMissError,
+    LatencyDistribution,
+    ReplayLLMService
+)
+
+
+SCHEMA = {"schemas": [{"name": "dbo", "tables": [{"name": "customers", "columns": [{"name": "name"}]}]}]}
+
+
+def _config(path, model_name="gpt-4", **options):
+    """
+    Build a replay provider configuration using the given cassette file.
+    """
+    return LLMConfig(provider=LLMProvider.REPLAY, model_name=model_name, api_key="", cassette_path=path, **options)
+
+
+class TestReplayLLMService(unittest.TestCase):
+    """
+    Tests for recording live responses and replaying them with simulated latency.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "llm.jsonl")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _record(self):
+        """
+        Record one response per method through a mocked live service.
+        """
+        live = MagicMock()
+        live.config.embedding_model = "text-embedding-ada-002"
+        live.generate_sql = AsyncMock(return_value={"sql": "SELECT name FROM customers", "explanation": "all"})
+        live.validate_and_fix_sql = AsyncMock(return_value=("SELECT name FROM dbo.customers", True))
+        live.get_embeddings = AsyncMock(return_value=[[1.0, 0.0], [0.0, 1.0]])
+
+        recorder = ReplayLLMService(_config(self.path, replay_mode="record"), delegate=live)
+        context = [{"question": "q", "answer": "a", "timestamp": "2024-01-01T00:00:00"}]
+        asyncio.run(recorder.generate_sql("list customers", SCHEMA, "mssql", context))
+        asyncio.run(recorder.validate_and_fix_sql("SELECT nme FROM customers", SCHEMA, "mssql", "bad column"))
+        asyncio.run(recorder.get_embeddings(["customers", "orders"]))
+        self.assertEqual(recorder.get_stats()["recorded"], 3)
+        return live
+
+    def test_record_then_replay(self):
+        """
+        Test that recorded responses are replayed by prompt hash without calling the live service.
+        """
+        live = self._record()
+        replayer = ReplayLLMService(_config(self.path, latency_distribution="none"))
+        # Reload the cassette from disk as a separate load-test process would
+        replayer.cassette = Cassette(self.path)
+
+        # Volatile conversation metadata does not change the key
+        context = [{"question": "q", "answer": "a", "timestamp": "2025-06-30T12:00:00"}]
+        result = asyncio.run(replayer.generate_sql("list customers", SCHEMA, "mssql", context))
+        self.assertEqual(result["sql"], "SELECT name FROM customers")
+
+        fixed_sql, modified = asyncio.run(
+            replayer.validate_and_fix_sql("SELECT nme FROM customers", SCHEMA, "mssql", "bad column")
+        )
+        self.assertEqual((fixed_sql, modified), ("SELECT name FROM dbo.customers", True))
+
+        embeddings = asyncio.run(replayer.get_embeddings(["orders", "customers", "products"]))
+        self.assertEqual(embeddings[:2], [[0.0, 1.0], [1.0, 0.0]])
+        self.assertEqual(len(embeddings[2]), 2)
+
+        self.assertEqual(live.generate_sql.await_count, 1)
+        self.assertEqual(replayer.get_stats()["hits"], 2)
+
+    def test_models_sharing_a_cassette_do_not_collide(self):
+        """
+        Test that the same prompt recorded for two models replays each model's own response.
+        """
+        responses = [("fast-model", "SELECT nme FROM customers"), ("strong-model", "SELECT name FROM customers")]
+        for model_name, sql in responses:
+            live = MagicMock()
+            live.config.embedding_model = "text-embedding-ada-002"
+            live.generate_sql = AsyncMock(return_value={"sql": sql, "explanation": model_name})
+            recorder = ReplayLLMService(_config(self.path, model_name, replay_mode="record"), delegate=live)
+            asyncio.run(recorder.generate_sql("list customers", SCHEMA, "mssql"))
+
+        for model_name, sql in responses:
+            replayer = ReplayLLMService(_config(self.path, model_name, latency_distribution="none", miss_policy="error"))
+            result = asyncio.run(replayer.generate_sql("list customers", SCHEMA, "mssql"))
+            self.assertEqual(result["sql"], sql)
+
+    def test_miss_policy(self):
+        """
+        Test that unrecorded prompts fall back to another recording or fail when configured to.
+        """
+        self._record()
+        fallback = ReplayLLMService(_config(self.path, latency_distribution="none"))
+        result = asyncio.run(fallback.generate_sql("count orders", SCHEMA, "mssql"))
+        self.assertEqual(result["sql"], "SELECT name FROM customers")
+        self.assertEqual(fallback.get_stats()["fallbacks"], 1)
+
+        strict = ReplayLLMService(_config(self.path, latency_distribution="none", miss_policy="error"))
+        with self.assertRaises(CassetteMissError):
+            asyncio.run(strict.generate_sql("count orders", SCHEMA, "mssql"))
+        with self.assertRaises(CassetteMissError):
+            asyncio.run(strict.generate_rag_response("question", "context"))
+
+    def test_latency_distributions(self):
+        """
+        Test recorded, fixed and seeded random latency distributions.
+        """
+        self.assertEqual(LatencyDistribution("recorded", scale=2.0).sample(0.25), 0.5)
+        self.assertEqual(LatencyDistribution("fixed:0.3").sample(5.0), 0.3)
+
+        first, second = LatencyDistribution("lognormal:1.0,0.5", seed=7), LatencyDistribution("lognormal:1.0,0.5", seed=7)
+        self.assertEqual([first.sample() for _ in range(3)], [second.sample() for _ in range(3)])
+        self.assertTrue(0.5 <= LatencyDistribution("uniform:0.5,1.0").sample() <= 1.0)
+
+        with self.assertRaises(ValueError):
+            LatencyDistribution("gamma:1,2")
+
+        self._record()
+        replayer = ReplayLLMService(_config(self.path, latency_distribution="fixed:0.1"))
+        started_at = time.monotonic()
+        asyncio.run(replayer.generate_sql("list customers", SCHEMA, "mssql"))
+        self.assertGreaterEqual(time.monotonic() - started_at, 0.1)
+
+    def test_factory_creates_replay_provider(self):
+        """
+        Test that the factory builds the replay provider and requires a live provider for record mode.
+        """
+        config = LLMConfig(provider=LLMProvider.REPLAY, model_name="replay-test", api_key="", cassette_path=self.path)
+        try:
+            service = LLMServiceFactory.create_service(config)
+            self.assertIsInstance(service, ReplayLLMService)
+            self.assertEqual(service.config.embedding_model, "replay-text-embedding-ada-002")
+        finally:
+            LLMServiceFactory.clear_cache()
+
+        with self.assertRaises(ValueError):
+            ReplayLLMService(_config(self.path, replay_mode="record"))
+
+
+if __name__ == "__main__":
+    unittest.main()
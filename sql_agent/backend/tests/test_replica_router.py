@@ -0,0 +1,185 @@
+"""
+Unit tests for read-replica routing of logical databases.
+"""
+
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+from datetime import datetime
+
+from sql_agent.backend.models.database import (
+    Database, DBType, ConnectionConfig, DatabaseEndpoint, EndpointRole
+)
+from sql_agent.backend.db.connectors.mssql import MSSQLConnector
+from sql_agent.backend.db.connectors.pool import DefaultConnectionPoolManager
+from sql_agent.backend.db.connectors.replica_router import ReplicaRouter
+from sql_agent.backend.db.connectors.factory import DBConnectorFactory, run_endpoint_health_checks
+
+
+class TestReplicaRouter(unittest.TestCase):
+    """
+    Tests for endpoint selection, failover and health checks.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.db_config = Database(
+            id="sales",
+            name="Sales",
+            type=DBType.MSSQL,
+            host="primary",
+            port=1433,
+            default_schema="dbo",
+            connection_config=ConnectionConfig(
+                username="sa",
+                password_encrypted="encrypted_password"
+            ),
+            endpoints=[
+                DatabaseEndpoint(host="replica1", port=1433, weight=1),
+                DatabaseEndpoint(host="replica2", port=1433, weight=2)
+            ],
+            created_at=datetime.now(),
+            updated_at=datetime.now()
+        )
+        self.utilization = {}
+        self.pool_manager = MagicMock()
+        self.pool_manager.get_pool_stats.side_effect = lambda db_id: {
+            db_id: {"pool_utilization": self.utilization.get(db_id, 0.0)}
+        }
+        self.router = ReplicaRouter(self.pool_manager)
+
+    def test_endpoints(self):
+        """
+        Test that the primary comes first and endpoint configurations get their own ids.
+        """
+        endpoints = self.db_config.get_endpoints()
+        self.assertEqual([e.role for e in endpoints], [EndpointRole.PRIMARY, EndpointRole.REPLICA, EndpointRole.REPLICA])
+        self.assertIs(self.db_config.for_endpoint(endpoints[0]), self.db_config)
+
+        replica_config = self.db_config.for_endpoint(endpoints[1])
+        self.assertEqual(replica_config.id, "sales@replica1:1433")
+        self.assertEqual(replica_config.host, "replica1")
+        self.assertEqual(replica_config.endpoints, [])
+
+    def test_read_only_prefers_replicas_by_weight(self):
+        """
+        Test that reads go to replicas by weight, with utilization breaking ties.
+        """
+        candidates = self.router.get_candidates(self.db_config, read_only=True)
+        self.assertEqual([c.host for c in candidates], ["replica2", "replica1", "primary"])
+
+        # Writes only go to the primary
+        self.assertEqual(self.router.route(self.db_config, read_only=False).host, "primary")
+
+        # Equally weighted replicas take turns, the less utilized one first
+        self.utilization = {"sales@replica1:1433": 0.2, "sales@replica2:1433": 0.1}
+        self.db_config.endpoints[0].weight = 2
+        router = ReplicaRouter(self.pool_manager)
+        hosts = [router.route(self.db_config, read_only=True).host for _ in range(2)]
+        self.assertEqual(hosts, ["replica2", "replica1"])
+
+    def test_idle_replicas_split_by_weight(self):
+        """
+        Test that idle replicas with weights 3 and 1 receive reads in a 3:1 ratio.
+        """
+        self.db_config.endpoints[0].weight = 3
+        self.db_config.endpoints[1].weight = 1
+        hosts = [self.router.route(self.db_config, read_only=True).host for _ in range(400)]
+        self.assertEqual((hosts.count("replica1"), hosts.count("replica2")), (300, 100))
+        # Turns are interleaved rather than sent in bursts
+        self.assertEqual(hosts[:4].count("replica2"), 1)
+
+    def test_unavailable_endpoints_are_skipped(self):
+        """
+        Test that endpoints marked down or with an open circuit are not routed to.
+        """
+        self.router.mark_down("sales@replica2:1433")
+        self.pool_manager.get_pool_stats.side_effect = lambda db_id: {
+            db_id: {"pool_utilization": 0.0, "circuit_breaker": {"state": "open" if "replica1" in db_id else "closed"}}
+        }
+        self.assertEqual(self.router.route(self.db_config, read_only=True).host, "primary")
+
+        self.router.mark_up("sales@replica2:1433")
+        self.assertEqual(self.router.route(self.db_config, read_only=True).host, "replica2")
+
+        stats = self.router.get_routing_stats(self.db_config)
+        self.assertEqual([s["available"] for s in stats], [True, False, True])
+
+    def test_check_endpoints(self):
+        """
+        Test that failed health checks take endpoints out of rotation.
+        """
+        results = self.router.check_endpoints(self.db_config, lambda config: config.host != "replica2")
+        self.assertEqual(results, {"primary:1433": True, "replica1:1433": True, "replica2:1433": False})
+        self.assertEqual(
+            [c.host for c in self.router.get_candidates(self.db_config, read_only=True)],
+            ["replica1", "primary"]
+        )
+
+    def test_connector_fails_over(self):
+        """
+        Test that the connector retries a read on the next endpoint when one is unavailable.
+        """
+        connector = MSSQLConnector(MagicMock(spec=DefaultConnectionPoolManager))
+        connector.replica_router = self.router
+        result = MagicMock()
+        connector._execute_query_impl = MagicMock(side_effect=[Exception("Communication link failure"), result])
+
+        self.assertIs(connector.execute_query(self.db_config, "SELECT 1", auto_convert=False), result)
+        tried = [c.args[0].host for c in connector._execute_query_impl.call_args_list]
+        self.assertEqual(sorted(tried), ["replica1", "replica2"])
+
+        # Non-transient errors are not failed over
+        connector._execute_query_impl = MagicMock(side_effect=ValueError("Invalid query"))
+        with self.assertRaises(ValueError):
+            connector.execute_query(self.db_config, "SELECT 1", auto_convert=False)
+        self.assertEqual(connector._execute_query_impl.call_count, 1)
+
+    def test_only_connection_errors_mark_endpoints_down(self):
+        """
+        Test that a deadlock fails over without taking the endpoint out of rotation.
+        """
+        connector = MSSQLConnector(MagicMock(spec=DefaultConnectionPoolManager))
+        connector.replica_router = self.router
+        result = MagicMock()
+
+        deadlock = Exception(1205, "Transaction was deadlocked on lock resources")
+        connector._execute_query_impl = MagicMock(side_effect=[deadlock, result])
+        self.assertIs(connector.execute_query(self.db_config, "SELECT 1", auto_convert=False), result)
+        stats = self.router.get_routing_stats(self.db_config)
+        self.assertEqual([s["available"] for s in stats], [True, True, True])
+
+        connector._execute_query_impl = MagicMock(side_effect=[Exception("Communication link failure"), result])
+        connector.execute_query(self.db_config, "SELECT 1", auto_convert=False)
+        stats = self.router.get_routing_stats(self.db_config)
+        self.assertEqual([s["available"] for s in stats].count(False), 1)
+
+    def test_scheduled_health_check_covers_routed_databases(self):
+        """
+        Test that the periodic health check probes the endpoints of databases that were routed.
+        """
+        factory = DBConnectorFactory()
+        factory.set_connection_pool_manager(self.pool_manager)
+        factory.register_connector("mssql", MSSQLConnector)
+        factory._replica_router = self.router
+        self.assertEqual(factory.check_replica_endpoints(), {})
+
+        self.router.route(self.db_config, read_only=True)
+        with patch.object(
+            MSSQLConnector, "test_connection", lambda connector, config: (config.host != "replica1", "")
+        ):
+            async def run_once():
+                task = asyncio.create_task(run_endpoint_health_checks(3600, factory))
+                await asyncio.sleep(0.1)
+                task.cancel()
+
+            asyncio.run(run_once())
+
+        stats = self.router.get_routing_stats(self.db_config)
+        self.assertEqual([s["available"] for s in stats], [True, False, True])
+
+
+if __name__ == "__main__":
+    unittest.main()
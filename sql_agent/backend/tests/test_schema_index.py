@@ -0,0 +1,148 @@
+"""
+Unit tests for the schema symbol index used by SQLValidator.
+"""
+
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from backend.llm.sql_validator import SQLValidator
+from backend.llm.schema_index import (
+    SchemaSymbolIndex,
+    SchemaIndexCache,
+    TrigramIndex,
+    trigrams
+)
+
+
+class TestSchemaIndex(unittest.TestCase):
+    """
+    Tests for the schema symbol index and its use in schema validation.
+    """
+
+    def setUp(self):
+        """
+        Set up test environment before each test.
+        """
+        self.schema = {
+            "schemas": [
+                {
+                    "name": "dbo",
+                    "tables": [
+                        {
+                            "name": "employees",
+                            "columns": [
+                                {"name": "employee_id", "type": "INT", "nullable": False},
+                                {"name": "first_name", "type": "VARCHAR(50)", "nullable": False},
+                                {"name": "department_id", "type": "INT", "nullable": True}
+                            ]
+                        },
+                        {
+                            "name": "departments",
+                            "columns": [
+                                {"name": "department_id", "type": "INT", "nullable": False},
+                                {"name": "department_name", "type": "VARCHAR(100)", "nullable": False}
+                            ]
+                        }
+                    ]
+                }
+            ]
+        }
+        self.index = SchemaSymbolIndex(self.schema)
+        self.index_cache = SchemaIndexCache(max_size=2)
+        self.validator = SQLValidator(use_cache=False, schema_index_cache=self.index_cache)
+
+    def test_trigrams_are_padded(self):
+        """
+        Short names still produce trigrams.
+        """
+        self.assertEqual(trigrams("id"), frozenset({"  i", " id", "id "}))
+
+    def test_name_lookups(self):
+        """
+        Qualified and unqualified names resolve case-insensitively.
+        """
+        self.assertTrue(self.index.has_table("Employees"))
+        self.assertTrue(self.index.has_table("dbo.employees"))
+        self.assertFalse(self.index.has_table("salaries"))
+        self.assertTrue(self.index.has_column("employees.EMPLOYEE_ID"))
+        self.assertTrue(self.index.has_column("dbo.employees.employee_id"))
+        self.assertEqual(self.index.get_column_type("departments.department_name"), "VARCHAR(100)")
+        self.assertIsNone(self.index.get_column_type("departments.salary"))
+        self.assertEqual(set(self.index.tables_with_column("department_id")), {"employees", "departments"})
+        self.assertEqual(self.index.tables_with_column("salary"), [])
+
+    def test_suggestions(self):
+        """
+        Suggestions come from the trigram index, most similar first.
+        """
+        self.assertEqual(self.index.suggest_tables("employee"), ["employees"])
+        self.assertEqual(self.index.suggest_columns("employe_id")[0], "employee_id")
+        self.assertEqual(self.index.suggest_columns("department_nam", "departments"), ["department_name", "department_id"])
+        self.assertEqual(self.index.suggest_columns("first_nam", "departments"), [])
+        self.assertEqual(self.index.suggest_columns("first_name", "unknown"), [])
+        self.assertEqual(self.index.suggest_tables("xyz"), [])
+
+    def test_trigram_index_substring_match(self):
+        """
+        Substring matches are suggested even with low trigram overlap.
+        """
+        index = TrigramIndex()
+        for name in ["department", "employee", "location"]:
+            index.add(name)
+        self.assertEqual(index.suggest("depart"), ["department"])
+        self.assertEqual(len(index), 3)
+
+    def test_index_cached_per_schema_version(self):
+        """
+        The index is built once per schema version and evicted LRU.
+        """
+        first = self.index_cache.get_index(self.schema, "v1")
+        self.assertIs(self.index_cache.get_index(self.schema, "v1"), first)
+        self.index_cache.get_index(self.schema, "v2")
+        self.index_cache.get_index(self.schema, "v3")
+        self.assertIsNot(self.index_cache.get_index(self.schema, "v1"), first)
+
+        self.index_cache.invalidate()
+        self.assertIsNot(self.index_cache.get_index(self.schema, "v1"), first)
+
+    def test_index_cached_per_database(self):
+        """
+        Databases with the same schema version get their own index.
+        """
+        other_schema = {"schemas": [{"name": "dbo", "tables": [{"name": "salaries", "columns": []}]}]}
+        first = self.index_cache.get_index(self.schema, "v1", "db1")
+        second = self.index_cache.get_index(other_schema, "v1", "db2")
+        self.assertIsNot(first, second)
+        self.assertIs(self.index_cache.get_index(self.schema, "v1", "db1"), first)
+        self.assertTrue(second.has_table("salaries"))
+        self.assertFalse(first.has_table("salaries"))
+
+        self.index_cache.invalidate(db_id="db1")
+        self.assertIs(self.index_cache.get_index(other_schema, "v1", "db2"), second)
+        self.assertIsNot(self.index_cache.get_index(self.schema, "v1", "db1"), first)
+
+        issues = self.validator._validate_schema("SELECT * FROM salaries", other_schema, "v1", "db2")
+        self.assertEqual(issues, [])
+        issues = self.validator._validate_schema("SELECT * FROM salaries", self.schema, "v1", "db1")
+        self.assertIn("테이블 'salaries'이(가) 스키마에 존재하지 않습니다.", issues)
+
+    def test_validate_schema_uses_index(self):
+        """
+        Schema validation reports missing names with suggestions.
+        """
+        issues = self.validator._validate_schema("SELECT employe_id FROM employee", self.schema)
+        self.assertIn("테이블 'employee'이(가) 스키마에 존재하지 않습니다.", issues)
+        self.assertTrue(any("employees" in issue for issue in issues))
+        self.assertIn("컬럼 'employe_id'이(가) 스키마에 존재하지 않습니다.", issues)
+        self.assertTrue(any("혹시 다음 컬럼을 찾으시나요? employee_id" in issue for issue in issues))
+
+        issues = self.validator._validate_schema("SELECT department_id FROM employees", self.schema)
+        self.assertTrue(any("모호합니다" in issue for issue in issues))
+
+        issues = self.validator._validate_schema("SELECT employees.first_name FROM employees", self.schema)
+        self.assertEqual(issues, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Unit tests for relevance-based schema selection in SQL generation prompts.
+"""
+
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+
+from sql_agent.backend.models.rag import Document, DocumentType, SearchResult
+from sql_agent.backend.llm.schema_selector import SchemaSelector, TableEntry, render_table_ddl
+
+
+def _table(name, columns, primary_key=None, foreign_keys=None):
+    """
+    Build a table in the schema dictionary format.
+    """
+    return {
+        "name": name,
+        "columns": [{"name": column, "type": "INT", "nullable": True} for column in columns],
+        "primary_key": primary_key or [],
+        "foreign_keys": foreign_keys or []
+    }
+
+
+SCHEMA = {
+    "db_id": "db1",
+    "schemas": [{
+        "name": "dbo",
+        "tables": [
+            _table("employees", ["employee_id", "name", "salary", "department_id"], ["employee_id"], [
+                {"columns": ["department_id"], "reference_table": "departments", "reference_columns": ["department_id"]}
+            ]),
+            _table("departments", ["department_id", "department_name"], ["department_id"]),
+            _table("projects", ["project_id", "title"], ["project_id"]),
+        ] + [_table(f"audit_log_{i}", ["log_id", "payload"]) for i in range(20)]
+    }]
+}
+
+
+class TestSchemaSelector(unittest.TestCase):
+    """
+    Tests for table ranking, foreign-key expansion, the token budget and DDL rendering.
+    """
+
+    def test_render_table_ddl(self):
+        """
+        Test the compact DDL line with key annotations.
+        """
+        entry = TableEntry("dbo", SCHEMA["schemas"][0]["tables"][0])
+        self.assertEqual(
+            render_table_ddl(entry),
+            "TABLE dbo.employees (employee_id INT PK, name INT, salary INT, department_id INT FK->departments.department_id)"
+        )
+        self.assertTrue(render_table_ddl(entry, max_columns=2).endswith("name INT, ... 2 more)"))
+
+    def test_selects_relevant_tables_with_foreign_keys(self):
+        """
+        Test that matching tables are kept, referenced tables are added and the rest is omitted.
+        """
+        selector = SchemaSelector(top_k=1)
+        context = selector.build_context(SCHEMA, "What is the average salary of employees?")
+
+        self.assertEqual(context.tables, ["dbo.employees", "dbo.departments"])
+        self.assertEqual(context.total_tables, 23)
+        self.assertIn("-- 관련성이 낮은 테이블 21개는 생략되었습니다.", context.text)
+        self.assertLess(context.tokens_after, context.tokens_before)
+
+        # Tables referencing a selected table are added as well
+        context = selector.build_context(SCHEMA, "list department names")
+        self.assertEqual(context.tables, ["dbo.departments", "dbo.employees"])
+
+    def test_rag_scores_and_token_budget(self):
+        """
+        Test that RAG table documents rank tables the question does not name and that the budget is enforced.
+        """
+        document = Document(
+            id="table_db1_dbo_projects", db_id="db1", doc_type=DocumentType.TABLE,
+            content="Table: dbo.projects", metadata={"schema_name": "dbo", "table_name": "projects"}
+        )
+        store = MagicMock()
+        store.search.return_value = [SearchResult(document=document, score=0.8)]
+
+        selector = SchemaSelector(document_store=store, top_k=1)
+        context = selector.build_context(SCHEMA, "진행 중인 과제 목록")
+        self.assertEqual(context.tables, ["dbo.projects"])
+        self.assertEqual(store.search.call_args.args[0].db_id, "db1")
+
+        selector = SchemaSelector(top_k=3, max_tokens=12)
+        context = selector.build_context(SCHEMA, "employees departments projects")
+        self.assertEqual(len(context.tables), 1)
+        self.assertLessEqual(context.tokens_after, 12 + 20)
+
+    def test_token_counts_and_selections_are_cached(self):
+        """
+        Test that schema token counts and selections are computed once per schema version and question.
+        """
+        store = MagicMock()
+        store.search.return_value = []
+        selector = SchemaSelector(document_store=store, top_k=1)
+        question = "What is the average salary of employees?"
+
+        with patch("sql_agent.backend.llm.schema_selector.count_tokens", side_effect=lambda text: len(text)) as counter:
+            first = selector.build_context(SCHEMA, question)
+            calls = counter.call_count
+            selection = asyncio.run(selector.select_tables_async(SCHEMA, question))
+            second = asyncio.run(selector.build_context_async(SCHEMA, question, selection=selection))
+
+            # Only the pruned context is counted again
+            self.assertEqual(counter.call_count, calls + 1)
+        self.assertEqual(store.search.call_count, 1)
+        self.assertEqual(second, first)
+        self.assertEqual(selector.count_relevant_tables(SCHEMA, question, selection=selection), 1)
+
+        # A new schema version is counted again
+        changed = dict(SCHEMA, version="2")
+        self.assertEqual(selector.build_context(changed, question).tables, first.tables)
+        self.assertEqual(store.search.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
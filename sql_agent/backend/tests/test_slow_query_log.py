@@ -0,0 +1,183 @@
+"""
+Unit tests for the slow query log and execution plan capture.
+"""
+
+import asyncio
+import hashlib
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from sql_agent.backend.models.database import Database, DBType, ConnectionConfig
+from sql_agent.backend.models.query import QueryCostEstimate
+from sql_agent.backend.db.models.query import SlowQueryLogDB
+from sql_agent.backend.db.models.policy import Policy  # noqa: F401 (registers the mapper User refers to)
+from sql_agent.backend.db.crud.slow_query_log import trim_slow_query_logs, get_slow_query_logs
+from sql_agent.backend.db.connectors.mssql import MSSQLConnector
+from sql_agent.backend.db.connectors.hana import HANAConnector
+from sql_agent.backend.db.connectors.pool import DefaultConnectionPoolManager
+from sql_agent.backend.services.query_execution_service import QueryExecutionService
+
+SERVICE_MODULE = "sql_agent.backend.services.query_execution_service"
+
+PLAN_XML = """<ShowPlanXML xmlns="http://schemas.microsoft.com/sqlserver/2004/07/showplan" Version="1.5">
+  <BatchSequence><Batch><Statements>
+    <StmtSimple StatementText="SELECT * FROM orders" StatementEstRows="120" StatementSubTreeCost="3.5">
+      <QueryPlan><RelOp PhysicalOp="Index Seek" EstimateRows="120" /></QueryPlan>
+    </StmtSimple>
+  </Statements></Batch></BatchSequence>
+</ShowPlanXML>"""
+
+
+class TestSlowQueryLog(unittest.TestCase):
+    """
+    Tests for slow query detection, plan capture and log retention.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.db_config = Database(
+            id="test-db",
+            name="Test Database",
+            type=DBType.MSSQL,
+            host="localhost",
+            port=1433,
+            default_schema="dbo",
+            connection_config=ConnectionConfig(
+                username="sa",
+                password_encrypted="encrypted_password"
+            ),
+            created_at=datetime.now(),
+            updated_at=datetime.now()
+        )
+
+    def test_trim_slow_query_logs(self):
+        """
+        Test that entries past the retention period or the maximum size are deleted oldest first.
+        """
+        engine = create_engine("sqlite://")
+        SlowQueryLogDB.__table__.create(engine)
+        db = sessionmaker(bind=engine)()
+
+        now = datetime.utcnow()
+        for age_days in [0, 1, 2, 3, 40]:
+            db.add(SlowQueryLogDB(
+                db_id="db1", sql=f"SELECT {age_days}", status="completed", duration_ms=6000.0,
+                created_at=now - timedelta(days=age_days)
+            ))
+        db.commit()
+
+        self.assertEqual(trim_slow_query_logs(db, max_entries=3, retention_days=30), 2)
+        db.commit()
+        self.assertEqual([e.sql for e in get_slow_query_logs(db)], ["SELECT 0", "SELECT 1", "SELECT 2"])
+        db.close()
+
+    @patch("sql_agent.backend.db.connectors.mssql.MSSQL_DRIVER", "pyodbc")
+    def test_mssql_capture_plan(self):
+        """
+        Test that the MS-SQL connector reads the cached plan and falls back to the estimated plan.
+        """
+        pool_manager = MagicMock(spec=DefaultConnectionPoolManager)
+        connection = MagicMock()
+        cursor = MagicMock()
+        cursor.fetchone.return_value = (PLAN_XML,)
+        connection.cursor.return_value = cursor
+        pool_manager.get_connection.return_value = connection
+
+        connector = MSSQLConnector(pool_manager)
+        estimate = connector.capture_plan(
+            self.db_config, "SELECT * FROM orders WHERE status = 'open'", auto_convert=False
+        )
+
+        self.assertEqual(estimate.plan_source, "plan_cache")
+        self.assertEqual(estimate.operators, ["Index Seek"])
+        sql, params = cursor.execute.call_args_list[-1].args
+        self.assertIn("sys.dm_exec_query_plan", sql)
+        self.assertEqual(params, ("%SELECT * FROM orders WHERE status = @p0%",))
+
+        # Missing VIEW SERVER STATE permission
+        cursor.execute.side_effect = Exception("VIEW SERVER STATE permission was denied")
+        connector._explain_query_impl = MagicMock(return_value=QueryCostEstimate(operators=["Table Scan"]))
+        estimate = connector.capture_plan(self.db_config, "SELECT * FROM orders", auto_convert=False)
+        self.assertEqual(estimate.plan_source, "estimated")
+
+    @patch("sql_agent.backend.db.connectors.hana.HANA_DRIVER", "hdbcli")
+    def test_hana_capture_plan(self):
+        """
+        Test that the SAP HANA connector looks up the plan cache entry by statement hash.
+        """
+        pool_manager = MagicMock(spec=DefaultConnectionPoolManager)
+        connection = MagicMock()
+        cursor = MagicMock()
+        cursor.fetchone.return_value = (42,)
+        cursor.description = [("OPERATOR_ID",), ("PARENT_OPERATOR_ID",), ("OPERATOR_NAME",),
+                              ("TABLE_NAME",), ("OUTPUT_SIZE",), ("SUBTREE_COST",)]
+        cursor.fetchall.return_value = [(1, None, "COLUMN SEARCH", None, 120, 3.5),
+                                        (2, 1, "COLUMN TABLE", "ORDERS", 120, 3.0)]
+        connection.cursor.return_value = cursor
+        pool_manager.get_connection.return_value = connection
+
+        connector = HANAConnector(pool_manager)
+        estimate = connector.capture_plan(
+            self.db_config, "SELECT * FROM orders WHERE status = 'open'", auto_convert=False
+        )
+
+        self.assertEqual(estimate.plan_source, "plan_cache")
+        self.assertEqual(estimate.estimated_cost, 3.5)
+        sql, params = cursor.execute.call_args_list[0].args
+        self.assertIn("STATEMENT_HASH", sql)
+        self.assertNotIn("STATEMENT_STRING", sql)
+        statement_hash = hashlib.md5("SELECT * FROM orders WHERE status = ?".encode("utf-8")).hexdigest()
+        self.assertEqual(params, (statement_hash,))
+        self.assertIn("FOR SQL PLAN CACHE ENTRY 42", cursor.execute.call_args_list[1].args[0])
+
+    def test_slow_query_is_logged_with_plan(self):
+        """
+        Test that queries over the threshold are logged with phase timings and plan.
+        """
+        service = QueryExecutionService()
+        connector = MagicMock()
+        connector.capture_plan.return_value = QueryCostEstimate(
+            estimated_cost=3.5, plan=PLAN_XML, plan_source="plan_cache"
+        )
+        phase_timings = {"validation": 1.0, "server_execution": 7000.0}
+
+        async def run(threshold_ms, start_offset):
+            with patch(f"{SERVICE_MODULE}.settings") as settings, \
+                    patch(f"{SERVICE_MODULE}.create_slow_query_log", new=AsyncMock()) as create:
+                settings.SLOW_QUERY_THRESHOLD_MS = threshold_ms
+                settings.SLOW_QUERY_CAPTURE_PLAN = True
+                start = time.monotonic() - start_offset
+                service._check_slow_query(
+                    "user1", "db1", "SELECT * FROM orders", "q1", connector, self.db_config,
+                    start, phase_timings, row_count=5
+                )
+                await asyncio.gather(*service._background_tasks)
+                return create
+
+        create = asyncio.run(run(5000, 7))
+        entry = create.await_args.args[0]
+        self.assertEqual(entry["status"], "completed")
+        self.assertEqual(entry["phase_timings"], phase_timings)
+        self.assertEqual(entry["plan_source"], "plan_cache")
+        self.assertEqual(entry["estimated_cost"], 3.5)
+        self.assertGreaterEqual(entry["duration_ms"], 7000)
+
+        # Fast queries are not logged
+        create = asyncio.run(run(5000, 0))
+        create.assert_not_awaited()
+
+        # Plan capture failures are recorded on the entry
+        connector.capture_plan.side_effect = Exception("plan cache unavailable")
+        create = asyncio.run(run(0, 0))
+        self.assertEqual(create.await_args.args[0]["plan_error"], "plan cache unavailable")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+Unit tests for speculative preview execution of generated SQL.
+"""
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+from datetime import datetime
+
+from sql_agent.backend.models.database import Database, DBType, ConnectionConfig
+from sql_agent.backend.models.query import QueryResult, ResultColumn
+from sql_agent.backend.services.query_execution_service import QueryExecutionService
+
+SERVICE_MODULE = "sql_agent.backend.services.query_execution_service"
+
+
+class TestSpeculativePreview(unittest.TestCase):
+    """
+    Tests for adopting, discarding and completing speculative previews.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.db_config = Database(
+            id="test-db",
+            name="Test Database",
+            type=DBType.MSSQL,
+            host="localhost",
+            port=1433,
+            default_schema="dbo",
+            connection_config=ConnectionConfig(
+                username="sa",
+                password_encrypted="encrypted_password"
+            ),
+            created_at=datetime.now(),
+            updated_at=datetime.now()
+        )
+        self.connector = MagicMock()
+        self.connector.is_read_only_query.return_value = True
+
+    def _result(self, row_count, truncated=False):
+        """
+        Build a connector result with the given number of rows.
+        """
+        return QueryResult(
+            id="r1", query_id="", columns=[ResultColumn(name="id", type="INT")],
+            rows=[[i] for i in range(row_count)], row_count=row_count, truncated=truncated,
+            created_at=datetime.now()
+        )
+
+    def _run(self, scenario):
+        """
+        Run a scenario with the persistence layer and connector factory mocked.
+
+        Returns:
+            Mock of create_query_result
+        """
+        service = QueryExecutionService()
+        service._get_db_config = MagicMock(return_value=self.db_config)
+
+        async def run():
+            with patch(f"{SERVICE_MODULE}.connector_factory") as factory, \
+                    patch(f"{SERVICE_MODULE}.get_query_by_id", new=AsyncMock(return_value=None)), \
+                    patch(f"{SERVICE_MODULE}.update_query", new=AsyncMock()), \
+                    patch(f"{SERVICE_MODULE}.merge_query_phase_timings", new=AsyncMock()), \
+                    patch(f"{SERVICE_MODULE}.record_fingerprint_execution", new=AsyncMock()), \
+                    patch(f"{SERVICE_MODULE}.create_query_result", new=AsyncMock(return_value=MagicMock(id="res1"))) as create:
+                factory.create_connector.return_value = self.connector
+                await scenario(service)
+                await asyncio.gather(*service._running_tasks.values())
+                return create
+
+        return asyncio.run(run())
+
+    def test_unchanged_sql_adopts_preview(self):
+        """
+        Test that executing the unchanged SQL adopts the completed preview without running it again.
+        """
+        self.connector.execute_query.return_value = self._result(3)
+
+        async def scenario(service):
+            self.assertTrue(await service.start_speculative_preview("user1", "test-db", "SELECT id FROM t", "q1"))
+            await service._speculative_previews["q1"]["task"]
+            await service.execute_query("user1", "test-db", "SELECT  id\nFROM t", query_id="q1")
+
+        create = self._run(scenario)
+        self.assertEqual(self.connector.execute_query.call_count, 1)
+        self.assertEqual(create.await_args.args[0].row_count, 3)
+
+    def test_edited_sql_discards_preview(self):
+        """
+        Test that executing edited SQL cancels the preview and runs the new SQL.
+        """
+        self.connector.execute_query.return_value = self._result(1)
+
+        async def scenario(service):
+            await service.start_speculative_preview("user1", "test-db", "SELECT id FROM t", "q1")
+            preview_task = service._speculative_previews["q1"]["task"]
+            await service.execute_query("user1", "test-db", "SELECT id FROM t WHERE id > 1", query_id="q1")
+            await asyncio.gather(preview_task, return_exceptions=True)
+            self.assertTrue(preview_task.cancelled())
+
+        self._run(scenario)
+        queries = [call.kwargs["query"] for call in self.connector.execute_query.call_args_list]
+        self.assertEqual(queries, ["SELECT id FROM t WHERE id > 1"])
+
+    def test_preview_of_another_user_is_not_adopted(self):
+        """
+        Test that a preview is only handed to the user it was started for.
+        """
+        self.connector.execute_query.side_effect = [self._result(3), self._result(4)]
+
+        async def scenario(service):
+            await service.start_speculative_preview("user1", "test-db", "SELECT id FROM t", "q1")
+            await service._speculative_previews["q1"]["task"]
+            await service.execute_query("user2", "test-db", "SELECT id FROM t", query_id="q1")
+            await asyncio.gather(*service._running_tasks.values())
+            self.assertIn("q1", service._speculative_previews)
+
+        create = self._run(scenario)
+        self.assertEqual(self.connector.execute_query.call_count, 2)
+        self.assertEqual(create.await_args.args[0].row_count, 4)
+
+    def test_truncated_preview_runs_full_query(self):
+        """
+        Test that a row-limited preview is not adopted when more rows are requested.
+        """
+        self.connector.execute_query.side_effect = [self._result(5, truncated=True), self._result(8)]
+
+        async def scenario(service):
+            with patch(f"{SERVICE_MODULE}.settings") as settings:
+                settings.SPECULATIVE_PREVIEW_MAX_ROWS = 5
+                settings.SPECULATIVE_PREVIEW_TIMEOUT_SECONDS = 60
+                settings.SPECULATIVE_PREVIEW_MAX_AGE_SECONDS = 300
+                settings.SLOW_QUERY_THRESHOLD_MS = 60000
+                await service.start_speculative_preview("user1", "test-db", "SELECT id FROM t", "q1")
+                await service._speculative_previews["q1"]["task"]
+                await service.execute_query("user1", "test-db", "SELECT id FROM t", query_id="q1", max_rows=100)
+                await asyncio.gather(*service._running_tasks.values())
+
+        create = self._run(scenario)
+        self.assertEqual(self.connector.execute_query.call_count, 2)
+        self.assertEqual(create.await_args.args[0].row_count, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -432,25 +432,6 @@ class TestSQLValidator(unittest.TestCase):
         self.assertNotEqual(optimized_sql, "OPTIMIZED SQL")
         self.assertTrue(any("실패" in opt for opt in optimizations))
     
-    def test_is_similar(self):
-        """
-        Test string similarity function.
-        """
-        # Test exact match
-        self.assertTrue(self.validator._is_similar("employee", "employee"))
-        
-        # Test substring
-        self.assertTrue(self.validator._is_similar("employee", "employees"))
-        
-        # Test similar strings
-        self.assertTrue(self.validator._is_similar("employee", "employe"))
-        
-        # Test dissimilar strings
-        self.assertFalse(self.validator._is_similar("employee", "department"))
-        
-        # Test short strings
-        self.assertFalse(self.validator._is_similar("id", "di"))
-    
     def test_are_types_compatible(self):
         """
         Test data type compatibility function.
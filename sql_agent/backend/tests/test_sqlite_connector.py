@@ -0,0 +1,156 @@
+"""
+Unit tests for the SQLite stand-in connector.
+"""
+
+import threading
+import time
+import unittest
+from datetime import datetime
+
+from sql_agent.backend.models.database import Database, DBType, ConnectionConfig
+from sql_agent.backend.db.connectors.pool import DefaultConnectionPoolManager
+from sql_agent.backend.db.connectors.sqlite import SQLiteConnector
+
+
+class TestSQLiteConnector(unittest.TestCase):
+    """
+    Tests for query execution, schema introspection, cancellation and fault injection.
+    """
+
+    def setUp(self):
+        """
+        Set up test fixtures.
+        """
+        self.db_config = Database(
+            id=f"sqlite-test-{id(self)}",
+            name="SQLite Test Database",
+            type=DBType.SQLITE,
+            host="localhost",
+            port=1,
+            default_schema="main",
+            connection_config=ConnectionConfig(
+                username="test",
+                password_encrypted="",
+                options={"seed": 1}
+            ),
+            created_at=datetime.now(),
+            updated_at=datetime.now()
+        )
+        self.pool_manager = DefaultConnectionPoolManager()
+        self.connector = SQLiteConnector(self.pool_manager)
+
+        # Keeps the shared in-memory database alive for the duration of the test
+        self.connection = self.connector._create_connection(self.db_config)
+        self.connection.executescript("""
+            CREATE TABLE departments (department_id INTEGER PRIMARY KEY, department_name TEXT NOT NULL);
+            CREATE TABLE employees (
+                employee_id INTEGER PRIMARY KEY,
+                department_id INTEGER REFERENCES departments(department_id),
+                salary REAL,
+                hire_date TEXT
+            );
+            INSERT INTO departments VALUES (1, 'Sales'), (2, 'Marketing');
+            INSERT INTO employees VALUES (1, 1, 100.5, '2020-01-31'), (2, 1, NULL, '2021-06-30'), (3, 2, 80, '2022-03-01');
+        """)
+        self.connection.commit()
+
+    def tearDown(self):
+        """
+        Close connections.
+        """
+        self.pool_manager.close_all_connections()
+        self.connection.close()
+
+    def test_execute_query(self):
+        """
+        Test query execution with dialect conversion and inferred column types.
+        """
+        result = self.connector.execute_query(
+            self.db_config,
+            "SELECT TOP 2 employee_id, salary, ISNULL(salary, 0) AS pay FROM employees WHERE salary > 50.5"
+        )
+
+        self.assertEqual(result.rows, [[1, 100.5, 100.5], [3, 80.0, 80.0]])
+        self.assertEqual([c.type for c in result.columns], ["INTEGER", "REAL", "REAL"])
+
+        # Named parameters
+        result = self.connector.execute_query(
+            self.db_config, "SELECT employee_id FROM employees WHERE department_id = :dept", params={"dept": 2}
+        )
+        self.assertEqual(result.rows, [[3]])
+
+        with self.assertRaises(ValueError):
+            self.connector.execute_query(self.db_config, "DELETE FROM employees")
+
+    def test_dialect_functions(self):
+        """
+        Test the SAP HANA functions registered on SQLite connections.
+        """
+        result = self.connector.execute_query(
+            self.db_config,
+            "SELECT DAYS_BETWEEN('2020-01-01', '2020-03-01'), ADD_MONTHS('2020-01-31', 1), "
+            "MONTHS_BETWEEN('2020-01-15', '2021-03-01'), LOCATE('abcabc', 'c', 4), CONCAT('a', NULL)",
+            auto_convert=False
+        )
+        self.assertEqual(result.rows, [[60, "2020-02-29 00:00:00", 14, 6, "a"]])
+
+    def test_get_schema(self):
+        """
+        Test schema introspection including primary and foreign keys.
+        """
+        schema = self.connector.get_schema(self.db_config)
+        tables = {t.name: t for t in schema.schemas[0].tables}
+
+        self.assertEqual(schema.schemas[0].name, "main")
+        self.assertEqual(set(tables), {"departments", "employees"})
+        self.assertEqual(tables["employees"].primary_key, ["employee_id"])
+        self.assertEqual(tables["employees"].foreign_keys[0].reference_table, "main.departments")
+        self.assertFalse(tables["departments"].columns[1].nullable)
+
+        estimate = self.connector.explain_query(self.db_config, "SELECT * FROM employees WHERE employee_id = 1")
+        self.assertTrue(estimate.operators)
+
+    def test_cancel_query(self):
+        """
+        Test that cancelling a query interrupts its artificial latency.
+        """
+        self.db_config.connection_config.options["latency_ms"] = 5000
+        errors = []
+
+        def run():
+            try:
+                self.connector.execute_query(self.db_config, "SELECT 1")
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=run)
+        start_time = time.time()
+        thread.start()
+        while not self.connector.query_tracker._running_queries:
+            time.sleep(0.01)
+
+        query_id = next(iter(self.connector.query_tracker._running_queries))
+        self.assertTrue(self.connector.cancel_query(query_id))
+        thread.join()
+
+        self.assertLess(time.time() - start_time, 2)
+        self.assertIn("cancelled", str(errors[0]))
+
+    def test_failure_injection(self):
+        """
+        Test that injected failures are transient and retried within the retry budget.
+        """
+        self.db_config.connection_config.options["failure_rate"] = 1.0
+
+        with self.assertRaises(Exception) as context:
+            self.connector.execute_query(self.db_config, "SELECT 1")
+
+        self.assertTrue(self.connector._is_transient_error(context.exception))
+        self.assertEqual(
+            self.pool_manager.get_retry_budget(self.db_config.id).get_state()["retries_granted"],
+            SQLiteConnector.MAX_RETRY_ATTEMPTS
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
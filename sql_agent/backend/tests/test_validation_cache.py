@@ -0,0 +1,181 @@
+"""
+Unit tests for the SQL validation result cache.
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import patch
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from backend.llm.sql_validator import SQLValidator, SQLValidationLevel
+from backend.llm.validation_cache import (
+    ValidationCache,
+    normalize_sql,
+    sql_fingerprint,
+    get_schema_version
+)
+
+
+class TestValidationCache(unittest.TestCase):
+    """
+    Tests for the validation cache and its integration with SQLValidator.
+    """
+
+    def setUp(self):
+        """
+        Set up test environment before each test.
+        """
+        self.cache = ValidationCache(max_size=2)
+        self.validator = SQLValidator(validation_cache=self.cache)
+        self.schema = {
+            "schemas": [
+                {
+                    "name": "dbo",
+                    "tables": [
+                        {
+                            "name": "employees",
+                            "columns": [
+                                {"name": "employee_id", "type": "INT", "nullable": False},
+                                {"name": "first_name", "type": "VARCHAR(50)", "nullable": False}
+                            ]
+                        }
+                    ]
+                }
+            ]
+        }
+
+    def test_normalize_sql_preserves_literals(self):
+        """
+        Whitespace is collapsed outside string literals only.
+        """
+        sql = "SELECT  *\n  FROM employees WHERE name = 'a  b' ;"
+        self.assertEqual(normalize_sql(sql), "SELECT * FROM employees WHERE name = 'a  b'")
+        self.assertEqual(
+            sql_fingerprint("SELECT * FROM employees"),
+            sql_fingerprint("  SELECT *\tFROM   employees;")
+        )
+        self.assertNotEqual(
+            sql_fingerprint("SELECT * FROM t WHERE a = 'x y'"),
+            sql_fingerprint("SELECT * FROM t WHERE a = 'x  y'")
+        )
+
+    def test_normalize_sql_keeps_line_comment_boundaries(self):
+        """
+        A line comment keeps its terminating newline, so commented-out code stays distinct.
+        """
+        self.assertNotEqual(
+            sql_fingerprint("SELECT a -- x\nFROM t"),
+            sql_fingerprint("SELECT a -- x FROM t")
+        )
+        self.assertEqual(normalize_sql("SELECT a  -- x  \n\n  FROM   t"), "SELECT a -- x\nFROM t")
+        self.assertEqual(normalize_sql("SELECT \"a--b\"  FROM t"), 'SELECT "a--b" FROM t')
+        self.assertEqual(normalize_sql("SELECT /* it's\n  a */ a FROM t"), "SELECT /* it's\n  a */ a FROM t")
+
+    def test_schema_version(self):
+        """
+        Explicit versions take precedence over content hashes.
+        """
+        self.assertEqual(get_schema_version(None), "none")
+        self.assertEqual(get_schema_version({"version": 3, "schemas": []}), "version:3")
+        self.assertTrue(get_schema_version(self.schema).startswith("hash:"))
+        self.assertEqual(get_schema_version(self.schema), get_schema_version(dict(self.schema)))
+
+    def test_validate_sql_uses_cache(self):
+        """
+        Repeated validation of equivalent SQL skips the checks.
+        """
+        sql = "SELECT employee_id FROM employees WHERE employee_id = 1"
+        first = self.validator.validate_sql(sql, "mssql", self.schema, db_id="db1")
+
+        with patch.object(self.validator, "_validate_basic_syntax") as mock_syntax:
+            second = self.validator.validate_sql(sql + "  ", "mssql", self.schema, db_id="db1")
+            mock_syntax.assert_not_called()
+
+        self.assertEqual(first, second)
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_cache_key_includes_level_and_db_type(self):
+        """
+        Different validation levels and database types are cached separately.
+        """
+        sql = "SELECT employee_id FROM employees"
+        self.validator.validate_sql(sql, "mssql", self.schema, SQLValidationLevel.BASIC, db_id="db1")
+        self.validator.validate_sql(sql, "mssql", self.schema, SQLValidationLevel.STRICT, db_id="db1")
+        self.validator.validate_sql(sql, "hana", self.schema, SQLValidationLevel.BASIC, db_id="db1")
+        self.assertEqual(self.cache.get_stats()["hits"], 0)
+
+    def test_databases_do_not_share_entries(self):
+        """
+        Databases with the same schema version string are cached and invalidated separately.
+        """
+        sql = "SELECT employee_id FROM employees"
+        self.validator.validate_sql(sql, "mssql", self.schema, schema_version="v1", db_id="db1")
+        self.validator.validate_sql(sql, "mssql", self.schema, schema_version="v1", db_id="db2")
+        self.assertEqual(self.cache.get_stats()["hits"], 0)
+
+        # A schema change of db2 keeps db1's entry
+        self.validator.validate_sql(sql, "mssql", self.schema, schema_version="v2", db_id="db2")
+        self.validator.validate_sql(sql, "mssql", self.schema, schema_version="v1", db_id="db1")
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["hits"], stats["invalidations"]), (1, 1))
+
+    def test_validation_without_db_id_skips_cache(self):
+        """
+        Without a database ID the schema version cannot be attributed, so nothing is cached.
+        """
+        self.validator.validate_sql("SELECT employee_id FROM employees", "mssql", self.schema)
+        self.validator.validate_sql("SELECT employee_id FROM employees", "mssql", self.schema)
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["size"], stats["hits"], stats["misses"]), (0, 0, 0))
+
+    def test_lru_eviction(self):
+        """
+        The least recently used entry is evicted when the cache is full.
+        """
+        for i in range(3):
+            self.validator.validate_sql(f"SELECT employee_id FROM employees WHERE employee_id = {i}", "mssql", db_id="db1")
+
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["evictions"], 1)
+
+    def test_schema_version_change_invalidates_entries(self):
+        """
+        Entries for the previous schema version are dropped when the version changes.
+        """
+        sql = "SELECT employee_id FROM employees"
+        self.validator.validate_sql(sql, "mssql", self.schema, schema_version="v1", db_id="db1")
+        self.assertEqual(self.cache.get_stats()["size"], 1)
+
+        self.validator.validate_sql(sql, "mssql", self.schema, schema_version="v2", db_id="db1")
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["size"], 1)
+        self.assertEqual(stats["invalidations"], 1)
+        self.assertEqual(stats["hits"], 0)
+
+    def test_cached_lists_are_copies(self):
+        """
+        Mutating a returned result does not affect the cached entry.
+        """
+        sql = "SELECT unknown_column FROM employees"
+        _, _, warnings = self.validator.validate_sql(sql, "mssql", self.schema, db_id="db1")
+        warnings.append("mutated")
+        _, _, cached_warnings = self.validator.validate_sql(sql, "mssql", self.schema, db_id="db1")
+        self.assertNotIn("mutated", cached_warnings)
+
+    def test_cache_disabled(self):
+        """
+        Validation still works without a cache.
+        """
+        validator = SQLValidator(use_cache=False)
+        self.assertIsNone(validator.validation_cache)
+        is_valid, errors, _ = validator.validate_sql("DELETE FROM employees", "mssql")
+        self.assertFalse(is_valid)
+        self.assertTrue(errors)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Request deadlines propagated from API handlers into LLM calls
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# Deadline of the request being processed; copied into tasks and worker threads started from it
+_current_deadline: ContextVar[Optional["Deadline"]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceededError(TimeoutError):
+    """
+    Raised when a request's deadline expires before a result is available
+    """
+
+
+class Deadline:
+    """
+    Point in time (monotonic clock) by which a request must be answered
+    """
+
+    def __init__(self, seconds: float):
+        """
+        Create a deadline the given number of seconds from now
+
+        Args:
+            seconds: Time budget in seconds
+        """
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """
+        Get the time left before the deadline
+
+        Returns:
+            Seconds left (negative once expired)
+        """
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        """
+        Whether the deadline has passed
+        """
+        return self.remaining() <= 0
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """
+    Apply a deadline to the enclosed block. A nested scope can only shorten
+    the deadline of the enclosing one. None keeps the current deadline.
+
+    Args:
+        seconds: Time budget in seconds, or None
+
+    Yields:
+        Deadline in effect for the block
+    """
+    outer = _current_deadline.get()
+    if seconds is None:
+        yield outer
+        return
+
+    deadline = Deadline(seconds)
+    if outer is not None and outer.expires_at < deadline.expires_at:
+        deadline = outer
+
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """
+    Get the deadline of the request being processed
+
+    Returns:
+        Active deadline or None
+    """
+    return _current_deadline.get()
@@ -0,0 +1,119 @@
+"""
+Per-phase latency measurement for the query lifecycle
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Dict, Iterator, Optional
+
+# Phases of a query's lifecycle in waterfall order
+QUERY_PHASES = [
+    "schema_fetch",
+    "rag_retrieval",
+    "llm_generation",
+    "validation",
+    "cost_estimation",
+    "dialect_conversion",
+    "queue_wait",
+    "connection_acquire",
+    "server_execution",
+    "fetch",
+    "persistence",
+    "summary",
+]
+
+# Timer of the query being processed; copied into worker threads started with asyncio.to_thread
+_current_timer: ContextVar[Optional["PhaseTimer"]] = ContextVar("query_phase_timer", default=None)
+
+
+class PhaseTimer:
+    """
+    Accumulates the time spent in each phase of a query.
+    A phase entered several times (e.g. server execution on retry) adds up.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty timer
+        """
+        self._timings: Dict[str, float] = {}
+        self._lock = Lock()
+
+    def add(self, phase: str, duration_ms: float) -> None:
+        """
+        Add time to a phase
+
+        Args:
+            phase: Phase name
+            duration_ms: Duration in milliseconds
+        """
+        with self._lock:
+            self._timings[phase] = self._timings.get(phase, 0.0) + duration_ms
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        """
+        Measure the enclosed block as a phase
+
+        Args:
+            phase: Phase name
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, (time.perf_counter() - start) * 1000)
+
+    @contextmanager
+    def activate(self) -> Iterator["PhaseTimer"]:
+        """
+        Make this timer the target of timed_phase for the enclosed block,
+        including worker threads started from it with asyncio.to_thread
+        """
+        token = _current_timer.set(self)
+        try:
+            yield self
+        finally:
+            _current_timer.reset(token)
+
+    @property
+    def timings(self) -> Dict[str, float]:
+        """
+        Get the phase durations in waterfall order
+
+        Returns:
+            Dictionary of phase name -> milliseconds
+        """
+        with self._lock:
+            timings = dict(self._timings)
+        ordered = {phase: round(timings.pop(phase), 3) for phase in QUERY_PHASES if phase in timings}
+        ordered.update({phase: round(duration, 3) for phase, duration in timings.items()})
+        return ordered
+
+
+def current_timer() -> Optional[PhaseTimer]:
+    """
+    Get the timer of the query being processed
+
+    Returns:
+        Active phase timer or None
+    """
+    return _current_timer.get()
+
+
+@contextmanager
+def timed_phase(phase: str) -> Iterator[None]:
+    """
+    Measure the enclosed block as a phase of the active timer, if any
+
+    Args:
+        phase: Phase name
+    """
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+
+    with timer.phase(phase):
+        yield
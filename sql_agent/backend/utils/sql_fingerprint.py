@@ -0,0 +1,121 @@
+"""
+SQL normalization and fingerprinting utilities
+"""
+import hashlib
+import re
+
+# Matches a string literal, quoted identifier, comment or run of whitespace
+# (literals, identifiers and comments are preserved, whitespace is collapsed)
+_LITERAL_OR_WHITESPACE = re.compile(
+    r"""(?P<verbatim>N?'(?:[^']|'')*'|"(?:[^"]|"")*"|\[[^\]]*\]|/\*.*?\*/)"""
+    r"""|(?P<line_comment>--[^\n]*(?:\n\s*|$))"""
+    r"""|(?P<space>\s+)""",
+    re.DOTALL | re.IGNORECASE
+)
+
+
+def normalize_sql(sql_query: str) -> str:
+    """
+    Normalize a SQL query by collapsing whitespace outside string literals, quoted
+    identifiers and comments, and stripping trailing semicolons
+    
+    A line comment keeps the newline that ends it, since everything up to that
+    newline is part of the comment.
+    
+    Args:
+        sql_query: SQL query
+        
+    Returns:
+        Normalized SQL query
+    """
+    if not sql_query:
+        return ""
+
+    def _replace(match: "re.Match") -> str:
+        if match.lastgroup == "verbatim":
+            return match.group()
+        if match.lastgroup == "line_comment":
+            return match.group().rstrip() + "\n"
+        return " "
+
+    normalized = _LITERAL_OR_WHITESPACE.sub(_replace, sql_query).strip()
+    return normalized.rstrip(";").rstrip()
+
+
+def sql_fingerprint(sql_query: str) -> str:
+    """
+    Compute a hash fingerprint of a normalized SQL query
+    
+    Args:
+        sql_query: SQL query
+        
+    Returns:
+        SHA-256 hex digest of the normalized query
+    """
+    return hashlib.sha256(normalize_sql(sql_query).encode("utf-8")).hexdigest()
+
+
+# Tokens of a SQL query for shape normalization: string literals, quoted identifiers,
+# comments, numbers (not part of identifiers), parameter markers and whitespace
+_SHAPE_TOKEN = re.compile(
+    r"""(?P<string>N?'(?:[^']|'')*')"""
+    r"""|(?P<quoted>"(?:[^"]|"")*"|\[[^\]]*\])"""
+    r"""|(?P<comment>--[^\n]*|/\*.*?\*/)"""
+    r"""|(?P<number>(?<![\w.])[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?(?![\w.]))"""
+    r"""|(?P<space>\s+)""",
+    re.DOTALL | re.IGNORECASE
+)
+
+# A list of placeholders, e.g. IN (?, ?, ?)
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def normalize_sql_shape(sql_query: str) -> str:
+    """
+    Normalize a SQL query to its shape: literals are replaced by ?, lists of literals
+    are collapsed to a single ?, comments are removed, whitespace is collapsed and the
+    case of everything outside quoted identifiers is folded to lower case
+    
+    Queries that differ only in their literal values have the same shape.
+    
+    Args:
+        sql_query: SQL query
+        
+    Returns:
+        Normalized query shape
+    """
+    if not sql_query:
+        return ""
+
+    parts = []
+    position = 0
+    for match in _SHAPE_TOKEN.finditer(sql_query):
+        text = sql_query[position:match.start()].lower()
+        position = match.end()
+        if match.lastgroup in ("comment", "space"):
+            # Runs of whitespace and comments collapse into a single space
+            if text or not parts or parts[-1] != " ":
+                parts.extend([text, " "])
+            continue
+        parts.append(text)
+        if match.lastgroup in ("string", "number"):
+            parts.append("?")
+        else:
+            parts.append(match.group())
+    parts.append(sql_query[position:].lower())
+
+    shape = _PLACEHOLDER_LIST.sub("(?)", "".join(parts)).strip()
+    return shape.rstrip(";").rstrip()
+
+
+def sql_shape_fingerprint(sql_query: str) -> str:
+    """
+    Compute a hash fingerprint of the shape of a SQL query
+    
+    Args:
+        sql_query: SQL query
+        
+    Returns:
+        SHA-256 hex digest of the normalized query shape
+    """
+    return hashlib.sha256(normalize_sql_shape(sql_query).encode("utf-8")).hexdigest()
@@ -0,0 +1,63 @@
+"""
+Server-Sent Events helpers for streaming endpoints
+"""
+import json
+from typing import Any, AsyncIterator, Dict
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+from .logging import log_error
+
+
+def format_sse(event: str, data: Any) -> str:
+    """
+    Format one Server-Sent Events message
+
+    Args:
+        event: Event name
+        data: JSON-serializable payload
+
+    Returns:
+        SSE message text
+    """
+    payload = json.dumps(jsonable_encoder(data), ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+async def sse_events(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """
+    Convert streaming event dictionaries ({"event": name, ...}) into SSE messages.
+    An exception raised while streaming is sent as a final "error" event, since the
+    response status has already been sent.
+
+    Args:
+        events: Streaming events
+
+    Yields:
+        SSE message text
+    """
+    try:
+        async for event in events:
+            data = {key: value for key, value in event.items() if key != "event"}
+            yield format_sse(event["event"], data)
+    except Exception as e:
+        log_error("sse_stream_failed", str(e))
+        yield format_sse("error", {"detail": str(e)})
+
+
+def sse_response(events: AsyncIterator[Dict[str, Any]]) -> StreamingResponse:
+    """
+    Create a streaming response that sends events as they are produced
+
+    Args:
+        events: Streaming events
+
+    Returns:
+        text/event-stream response
+    """
+    return StreamingResponse(
+        sse_events(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )